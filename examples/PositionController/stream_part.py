@@ -0,0 +1,70 @@
+# BSD 2-Clause License
+#
+# Copyright (c) 2025, Social Cognition in Human-Robot Interaction,
+#                     Istituto Italiano di Tecnologia, Genova
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+stream_part.py
+==============
+
+This script plays a dense neck trajectory on the iCub humanoid robot with the position-direct
+streaming engine. Instead of one positionMove and one wait per checkpoint, the checkpoints are
+interpolated with a cubic spline and streamed at a fixed rate from a single thread.
+
+Usage:
+------
+Run this script to draw a circle with the iCub's neck and print the streaming timing statistics.
+
+
+"""
+
+import math
+
+from pyicub.helper import iCub, JointPose, LimbMotion, JointsTrajectory, ICUB_NECK
+
+def stream_neck_circle():
+    """
+    Streams a circular neck trajectory made of 100 checkpoints.
+
+    Example
+    -------
+    >>> stream_neck_circle()
+    """
+    icub = iCub()
+
+    neck_motion = LimbMotion(ICUB_NECK)
+    for i in range(0, 101):
+        angle = 2.0*math.pi*i/100
+        pose = JointPose(target_joints=[10.0*math.sin(angle), 0.0, 15.0*math.cos(angle)])
+        neck_motion.createJointsTrajectory(pose, duration=0.04)
+    neck_motion.createJointsTrajectory(JointPose(target_joints=[0.0, 0.0, 0.0]))
+
+    stats = icub.streamPart(neck_motion, period=0.01, method=JointsTrajectory.SPLINE)
+    print(stats.toJSON())
+
+if __name__ == "__main__":
+    stream_neck_circle()
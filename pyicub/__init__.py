@@ -33,3 +33,8 @@ __emails__ = 'davide.detommaso@iit.it, adam.lukomski@iit.it, nicola.russi@iit.it
 __license__ = 'BSD-2'
 __version__ = '8.3.6'
 __description__ = 'Developing iCub applications using Python'
+
+import os as _os
+if _os.getenv('PYICUB_FAKE_YARP') == 'true':
+    import pyicub.fake
+    pyicub.fake.install()
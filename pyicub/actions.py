@@ -27,11 +27,68 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 from pyicub.utils import importFromJSONFile, exportJSONFile
+from pyicub.store import canonicalJSON
+from pyicub.binary import importActionFile, exportBinaryFile
 from pyicub.controllers.position import JointPose, iCubPart, DEFAULT_TIMEOUT
+from pyicub.controllers.optimizer import ActionOptimizer, StepMerger
 
+from collections import OrderedDict
+
+import copy
+import hashlib
 import importlib
 import inspect
+import itertools
 import json
+import threading
+
+# instance attributes holding caches and revisions: they are never serialized
+TRANSIENT_ATTRIBUTES = frozenset(('_cache_', '_serialized_', '_revision_'))
+
+# revisions of the steps, limb and gaze motions: a new one at every change, unique across the objects
+_REVISIONS_ = itertools.count(1)
+
+_PLAIN_TYPES_ = (str, int, float, bool, type(None))
+
+
+def toJSONDict(obj):
+    """
+    Converts an action (or any of its parts) into plain dicts, lists and values, as
+    json.loads(json.dumps(obj, default=lambda o: o.__dict__)) would, without going through the JSON text.
+    The containers are new: the result can be modified without touching `obj`.
+    """
+    t = type(obj)
+    if t in _PLAIN_TYPES_:
+        return obj
+    if t is list or t is tuple:
+        for v in obj:
+            if not type(v) in _PLAIN_TYPES_:
+                return [toJSONDict(v) for v in obj]
+        return list(obj)
+    if isinstance(obj, dict):
+        return {k if type(k) is str else json.dumps(k): toJSONDict(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [toJSONDict(v) for v in obj]
+    if isinstance(obj, (str, int, float)):
+        # subclasses (enums, numpy floats, ...) as the JSON encoder writes them
+        return json.loads(json.dumps(obj))
+    return {k: toJSONDict(v) for k, v in vars(obj).items() if not k in TRANSIENT_ATTRIBUTES}
+
+
+class _Revisioned_:
+    """
+    A part of an action whose methods change its revision, so that the actions holding it drop their cached
+    serialized forms (see iCubFullbodyAction.toJSON). Call invalidate() after modifying it in place.
+    """
+
+    def invalidate(self):
+        self._revision_ = next(_REVISIONS_)
+
+    def __setstate__(self, state):
+        # copies and unpickled objects (maybe from another process) get a revision of this process
+        self.__dict__.update(state)
+        self.invalidate()
+
 
 class JointsTrajectoryCheckpoint:
 
@@ -42,11 +99,12 @@ class JointsTrajectoryCheckpoint:
         self.joints_speed = joints_speed
 
     def toJSON(self):
-        return json.dumps(self, default=lambda o: o.__dict__, indent=4)
+        return json.dumps(toJSONDict(self), indent=4)
 
 
-class LimbMotion:
+class LimbMotion(_Revisioned_):
     def __init__(self, part: iCubPart):
+        self.invalidate()
         self.part = part
         self.checkpoints = []
 
@@ -57,10 +115,11 @@ class LimbMotion:
             joints_speed = self.part.joints_speed
         checkpoint = JointsTrajectoryCheckpoint(pose=pose, duration=duration, timeout=timeout, joints_speed=joints_speed)
         self.checkpoints.append(checkpoint)
+        self.invalidate()
         return checkpoint
 
     def toJSON(self):
-        return json.dumps(self, default=lambda o: o.__dict__, indent=4)
+        return json.dumps(toJSONDict(self), indent=4)
 
 class PyiCubCustomCall:
 
@@ -69,22 +128,25 @@ class PyiCubCustomCall:
         self.args = args
 
     def toJSON(self):
-        return json.dumps(self, default=lambda o: o.__dict__, indent=4, ensure_ascii=False)
+        return json.dumps(toJSONDict(self), indent=4, ensure_ascii=False)
 
-class GazeMotion:
+class GazeMotion(_Revisioned_):
     def __init__(self, lookat_method: str):
+        self.invalidate()
         self.checkpoints = []
         self.lookat_method = lookat_method
 
     def addCheckpoint(self, value: list):
         self.checkpoints.append(value)
+        self.invalidate()
 
     def toJSON(self):
-        return json.dumps(self, default=lambda o: o.__dict__, indent=4)
+        return json.dumps(toJSONDict(self), indent=4)
 
-class iCubFullbodyStep:
+class iCubFullbodyStep(_Revisioned_):
 
     def __init__(self, offset_ms=None, name=None, JSON_dict=None, JSON_file=None):
+        self.invalidate()
         if not name:
             self.name = self.__class__.__name__
         self.limb_motions = {}
@@ -124,21 +186,22 @@ class iCubFullbodyStep:
         exportJSONFile(filepath, self.toJSON())
 
     def importFromJSONDict(self, json_dict):
+        # the lists are copied: the step never shares mutable nodes with `json_dict`
         self.name = json_dict["name"]
         self.offset_ms = json_dict["offset_ms"]
         for part,pose in json_dict["limb_motions"].items():
-            part = self.createPart(pose["part"]["name"], pose["part"]["robot_part"], pose["part"]["joints_nr"], pose["part"]["joints_list"], pose["part"]["joints_speed"])
+            part = self.createPart(pose["part"]["name"], pose["part"]["robot_part"], pose["part"]["joints_nr"], copy.copy(pose["part"]["joints_list"]), copy.copy(pose["part"]["joints_speed"]))
             lm = self.createLimbMotion(part)
             for v in pose["checkpoints"]:
-                pose = JointPose(target_joints=v['pose']['target_joints'], joints_list=v['pose']['joints_list'])
-                lm.createJointsTrajectory(pose, duration=v['duration'], timeout=v['timeout'], joints_speed=v["joints_speed"])
+                pose = JointPose(target_joints=copy.copy(v['pose']['target_joints']), joints_list=copy.copy(v['pose']['joints_list']))
+                lm.createJointsTrajectory(pose, duration=v['duration'], timeout=v['timeout'], joints_speed=copy.copy(v["joints_speed"]))
         if json_dict["gaze_motion"]:
             gaze = self.createGazeMotion(lookat_method=json_dict["gaze_motion"]["lookat_method"])
             for v in json_dict["gaze_motion"]["checkpoints"]:
-                gaze.addCheckpoint(v)
+                gaze.addCheckpoint(copy.copy(v))
         if json_dict["custom_calls"]:
             for v in json_dict["custom_calls"]:
-                self.createCustomCall(target=v["target"], args=v["args"])
+                self.createCustomCall(target=v["target"], args=copy.deepcopy(v["args"]))
 
     def importFromJSONFile(self, JSON_file):
         JSON_dict = importFromJSONFile(JSON_file)
@@ -155,23 +218,43 @@ class iCubFullbodyStep:
             self.custom_calls.extend(step.custom_calls)
         if step.gaze_motion:
             self.gaze_motion = step.gaze_motion
+        self.invalidate()
     
     def setLimbMotion(self, limb_motion: LimbMotion):
         self.limb_motions[limb_motion.part.name] = limb_motion
+        self.invalidate()
 
     def setCustomCall(self, custom_call: PyiCubCustomCall):
         self.custom_calls.append(custom_call)
+        self.invalidate()
 
     def setGazeMotion(self, gaze_motion: GazeMotion):
         self.gaze_motion = gaze_motion
+        self.invalidate()
+
+    def revisions(self):
+        """
+        Returns:
+            tuple: the revisions of the step and of its limb and gaze motions, changed by any of their methods.
+        """
+        gaze = self.gaze_motion._revision_ if self.gaze_motion is not None else None
+        return (self._revision_, gaze) + tuple(limb_motion._revision_ for limb_motion in self.limb_motions.values())
+
+    def toJSONDict(self):
+        return toJSONDict(self)
 
     def toJSON(self):
-        return json.dumps(self, default=lambda o: o.__dict__, indent=4, ensure_ascii=False)
+        return json.dumps(toJSONDict(self), indent=4, ensure_ascii=False)
 
 
 class iCubFullbodyAction:
 
+    # set to True in an action class to merge its steps that can be played together when it is added to an
+    # ActionsManager (see StepMerger)
+    MERGE_STEPS = False
+
     def __init__(self, description=None, name=None, offset_ms=None, JSON_dict=None, JSON_file=None):
+        self._serialized_ = {}
         self.steps = []
         self.wait_for_steps = []
         if not name:
@@ -194,10 +277,20 @@ class iCubFullbodyAction:
     def addAction(self, action):
         self.steps.extend(action.steps)
         self.wait_for_steps.extend(action.wait_for_steps)
+        self.invalidate()
 
     def addStep(self, step: iCubFullbodyStep, wait_for_completed: bool=True):
         self.steps.append(step)
         self.wait_for_steps.append(wait_for_completed)
+        self.invalidate()
+
+    def invalidate(self):
+        """
+        Drops the cached serialized forms (see toJSON). Called by the methods of the action, the changes made
+        through the methods of its steps, limb and gaze motions are detected by their revisions; call it after
+        modifying the action or the checkpoints in place.
+        """
+        self._serialized_ = {}
 
     def importFromJSONDict(self, json_dict):
         self.name = json_dict["name"]
@@ -209,23 +302,68 @@ class iCubFullbodyAction:
             self.addStep(res, json_dict["wait_for_steps"][i])
 
     def importFromJSONFile(self, JSON_file):
-        JSON_dict = importFromJSONFile(JSON_file)
+        JSON_dict = importActionFile(JSON_file)
         self.importFromJSONDict(JSON_dict)
 
     def exportJSONFile(self, filepath):
         exportJSONFile(filepath, self.toJSON())
 
+    def exportBinaryFile(self, filepath):
+        return exportBinaryFile(filepath, self.toJSONDict())
+
     def setName(self, name):
         self.name = name
+        self.invalidate()
 
     def setDescription(self, description):
         self.description = description
+        self.invalidate()
 
     def setOffset(self, offset_ms):
         self.offset_ms = offset_ms
+        self.invalidate()
+
+    def __serialized__(self, form, serialize):
+        revisions = (tuple(self.wait_for_steps),) + tuple(step.revisions() for step in self.steps)
+        if self._serialized_.get('revisions') != revisions:
+            self._serialized_ = {'revisions': revisions}
+        serialized = self._serialized_
+        text = serialized.get(form)
+        if text is None:
+            text = serialize()
+            serialized[form] = text
+        return text
+
+    def toJSONDict(self):
+        """
+        Returns:
+            dict: a new dict of the action, equal to json.loads(self.toJSON()) but built without the JSON text.
+        """
+        return toJSONDict(self)
 
     def toJSON(self):
-        return json.dumps(self, default=lambda o: o.__dict__, indent=4, ensure_ascii=False)
+        """
+        Returns:
+            str: the indented JSON text of the action, cached until the action is modified (see invalidate).
+        """
+        return self.__serialized__('json', lambda: json.dumps(toJSONDict(self), indent=4, ensure_ascii=False))
+
+    def toCanonicalJSON(self):
+        """
+        Returns:
+            str: the compact JSON text of the action with sorted keys (see pyicub.store.canonicalJSON), for the
+            wire and the action hashes. Cached as toJSON().
+        """
+        return self.__serialized__('canonical', lambda: canonicalJSON(toJSONDict(self)))
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop('_serialized_', None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._serialized_ = {}
 
 
 class TemplateParameter:
@@ -247,44 +385,151 @@ class TemplateParameter:
     def toJSON(self):
         return json.dumps(self._param_, default=lambda o: o.__dict__, indent=4, ensure_ascii=False)
 
+class CompiledTemplate:
+    """
+    A template dict with the paths of its '$name' placeholders. instantiate() copies only the containers along
+    those paths: the result shares all the other nodes with the template and must not be modified in place.
+    """
+
+    def __init__(self, template_dict, names):
+        self.template = template_dict
+        self.slots = []
+        self.__collect__(template_dict, (), set(names))
+
+    def __collect__(self, node, path, names):
+        if isinstance(node, dict):
+            for key, value in node.items():
+                self.__collect__(value, path + (key,), names)
+        elif isinstance(node, list):
+            for i, item in enumerate(node):
+                self.__collect__(item, path + (i,), names)
+        elif isinstance(node, str) and node.startswith('$') and node[1:] in names:
+            self.slots.append((path, node[1:]))
+
+    def instantiate(self, params):
+        if not self.slots:
+            return self.template
+        root = copy.copy(self.template)
+        copied = {(): root}
+        for path, name in self.slots:
+            node = root
+            for i in range(len(path) - 1):
+                child = copied.get(path[:i + 1])
+                if child is None:
+                    child = copy.copy(node[path[i]])
+                    node[path[i]] = child
+                    copied[path[:i + 1]] = child
+                node = child
+            node[path[-1]] = params[name]
+        return root
+
+
+class TemplateCache:
+    """
+    The compiled form of a template and an LRU cache of its instantiated action dicts, keyed by parameter values.
+    The cached dicts share nodes with the compiled template and are never modified.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.compiled = None
+        self.dicts = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def invalidate(self):
+        with self.lock:
+            self.compiled = None
+            self.dicts.clear()
+
+    def info(self):
+        return {'size': self.size, 'cached': len(self.dicts), 'hits': self.hits, 'misses': self.misses,
+                'slots': len(self.compiled.slots) if self.compiled is not None else None}
+
+
 class iCubActionTemplate(iCubFullbodyAction):
 
+    CACHE_SIZE = 32
+
     def __init__(self, name='TemplateAction', description=None, offset_ms=None):
+        self._cache_ = TemplateCache(self.CACHE_SIZE)
         self.name = name
         self.params = {}
         self.prepare_params()
         iCubFullbodyAction.__init__(self, description=description, name=name, offset_ms=offset_ms)
 
-    def __replace_params__(self, template_dict, params_dict):
-        if isinstance(template_dict, dict):
-            for key, value in template_dict.items():
-                template_dict[key] = self.__replace_params__(value, params_dict)
-        elif isinstance(template_dict, list):
-            for i, item in enumerate(template_dict):
-                template_dict[i] = self.__replace_params__(item, params_dict)
-        elif isinstance(template_dict, str) and template_dict.startswith('$'):
-            param_key = template_dict[1:]  # Remove the '$' character
-            if param_key in params_dict:
-                return params_dict[param_key]
-        return template_dict
-
     def prepare_params(self):
         raise NotImplementedError("The method 'prepare_params' contains definition for creating custom actions.")
             
     def createParam(self, name):
         self.params[name] = '$' + name
+        self.invalidate()
+
+    def addStep(self, step: iCubFullbodyStep, wait_for_completed: bool=True):
+        iCubFullbodyAction.addStep(self, step, wait_for_completed)
+        self.invalidate()
+
+    def addAction(self, action):
+        iCubFullbodyAction.addAction(self, action)
+        self.invalidate()
+
+    def invalidate(self):
+        """
+        Drops the compiled template, the cached actions and the serialized forms. Called when steps or parameters
+        are added; call it after modifying the template in any other way.
+        """
+        iCubFullbodyAction.invalidate(self)
+        self._cache_.invalidate()
+
+    def templateDict(self):
+        template_dict = self.toJSONDict()
+        template_dict['params'] = {name: '$' + name for name in self.params.keys()}
+        return template_dict
+
+    def compile(self):
+        with self._cache_.lock:
+            if self._cache_.compiled is None:
+                self._cache_.compiled = CompiledTemplate(self.templateDict(), self.params.keys())
+            return self._cache_.compiled
 
     def getActionDict(self):
-        return self.__replace_params__(json.loads(self.toJSON()), self.params)
+        return self.compile().instantiate(self.params)
+
+    def __paramsKey__(self):
+        data = json.dumps(self.params, default=lambda o: o.__dict__, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha1(data.encode('utf-8')).hexdigest()
 
     def getAction(self, action_name=None):
-        action_dict = self.getActionDict()
-        action = iCubFullbodyAction(JSON_dict=action_dict)
+        """
+        Returns a new action for the current parameter values. The instantiated dicts are cached (see CACHE_SIZE):
+        the same parameters only cost building the action, that copies the lists it keeps, so the returned action
+        can be modified in place.
+        """
         if not action_name:
-            action_name = self.name    
+            action_name = self.name
+        key = self.__paramsKey__()
+        cache = self._cache_
+        with cache.lock:
+            JSON_dict = cache.dicts.get(key)
+            if JSON_dict is not None:
+                cache.dicts.move_to_end(key)
+                cache.hits += 1
+        if JSON_dict is None:
+            JSON_dict = self.getActionDict()
+            with cache.lock:
+                cache.misses += 1
+                if cache.size > 0:
+                    cache.dicts[key] = JSON_dict
+                    while len(cache.dicts) > cache.size:
+                        cache.dicts.popitem(last=False)
+        action = iCubFullbodyAction(JSON_dict=JSON_dict)
         action.setName(action_name)
         return action
 
+    def cacheInfo(self):
+        return self._cache_.info()
+
     def getParams(self):
         return self.params
 
@@ -293,14 +538,24 @@ class iCubActionTemplate(iCubFullbodyAction):
     
     def setParams(self, params):
         for param in params:
-            self.setParam(param.name, param.value)
+            self.setParam(param.name(), param.value()[param.name()])
 
     def setParam(self, name, value):
         if name in self.params.keys():
             self.params[name] = value
+            iCubFullbodyAction.invalidate(self)
         else:
             raise Exception("The key %s is not present among the parameter names" % name)
 
+    def __getstate__(self):
+        state = iCubFullbodyAction.__getstate__(self)
+        state.pop('_cache_', None)
+        return state
+
+    def __setstate__(self, state):
+        iCubFullbodyAction.__setstate__(self, state)
+        self._cache_ = TemplateCache(self.CACHE_SIZE)
+
 
 
 class iCubActionTemplateImportedJSON(iCubActionTemplate):
@@ -310,9 +565,9 @@ class iCubActionTemplateImportedJSON(iCubActionTemplate):
         self.name = JSON_dict['name']
         iCubActionTemplate.__init__(self, description=JSON_dict["description"], name=JSON_dict["name"], offset_ms=JSON_dict["offset_ms"])
 
-    def getActionDict(self):
-        return self.__replace_params__(self._json_dict_, self.params)
-    
+    def templateDict(self):
+        return self._json_dict_
+
     def prepare_params(self):
         for k in self._json_dict_['params'].keys():
             self.createParam(name=k)
@@ -320,17 +575,27 @@ class iCubActionTemplateImportedJSON(iCubActionTemplate):
     def prepare(self):
         pass
 
+    def setParams(self, params):
+        # setParam() of the imported templates reads a JSON file
+        for param in params:
+            iCubActionTemplate.setParam(self, param.name(), param.value()[param.name()])
+
     def setParam(self, JSON_file):
         value = importFromJSONFile(JSON_file)
         name = list(value.keys())[0]
         value = value[name]
         self.params[name] = value
+        iCubFullbodyAction.invalidate(self)
 
 
 class ActionsManager:
 
+    _VERSIONS_ = itertools.count(1)
+
     def __init__(self):
         self.__actions__ = {}
+        self.__versions__ = {}
+        self.__repositories__ = []
 
     def __get_subclasses__(self, module, base_class):
         subclasses = []
@@ -361,12 +626,18 @@ class ActionsManager:
             action_id = action.name
         if action_id in self.__actions__.keys():
             raise Exception("An error occurred adding a new action! Class name '%s' already present! Please choose different names for each class actions." % action_id)
+        if action.MERGE_STEPS:
+            StepMerger().mergeAction(action)
         self.__actions__[action_id] = action
+        self.touchAction(action_id)
         return action_id
     
     def deleteAction(self, action_id: str):
         if action_id in self.__actions__.keys():
             del self.__actions__[action_id]
+            self.__versions__.pop(action_id, None)
+        elif self.__findRepository__(action_id) is not None:
+            self.__findRepository__(action_id).forget(action_id)
         else:
             raise Exception("action_id '%s' not found! Please provide an action identifier previously imported!" % action_id)
         
@@ -375,25 +646,143 @@ class ActionsManager:
             keys_to_delete = [k for k in self.__actions__.keys() if k.startswith(name_prefix)]
             for k in keys_to_delete:
                 del self.__actions__[k]
+                self.__versions__.pop(k, None)
+            for repository in self.__repositories__:
+                for k in repository.keys():
+                    if k.startswith(name_prefix):
+                        repository.forget(k)
         else:
             self.__actions__.clear()
+            self.__versions__.clear()
+            self.__repositories__.clear()
+
+    def getActionVersion(self, action_id: str):
+        """
+        Returns:
+            int: a number that changes every time the action is added, replaced, modified in place (see touchAction)
+            or reloaded from its repository, None if the action is not present. Used to invalidate the compiled plans.
+        """
+        if action_id in self.__versions__.keys():
+            return self.__versions__[action_id]
+        repository = self.__findRepository__(action_id)
+        if repository is not None:
+            return repository.getVersion(action_id)
+        return None
+
+    def touchAction(self, action_id: str, action: iCubFullbodyAction=None):
+        """
+        Marks an action as modified, e.g. after editing its steps in place. An action of a repository is kept in
+        memory with the changes (`action`, default the cached one) until its file changes (see ActionRepository.touch).
+        """
+        if action_id in self.__actions__.keys():
+            self.__actions__[action_id].invalidate()
+        else:
+            repository = self.__findRepository__(action_id)
+            if repository is not None:
+                if action is not None:
+                    action.invalidate()
+                repository.touch(action_id, action)
+                return
+        self.__versions__[action_id] = next(ActionsManager._VERSIONS_)
 
     def importActionsFromModule(self, module):
         actions = self.__instantiate_actions__(module)
         for action in actions:
             self.addAction(action)
 
+    def addRepository(self, repository):
+        """
+        Adds a lazy ActionRepository (see pyicub.repository): its actions are listed by getActions() and parsed on
+        their first getAction(). Actions added with addAction() take precedence.
+        """
+        self.__repositories__.append(repository)
+        return repository
+
+    def getRepositories(self):
+        return list(self.__repositories__)
+
+    def rescanRepositories(self):
+        return {repository.path: repository.rescan() for repository in self.__repositories__}
+
+    def __findRepository__(self, action_id):
+        for repository in self.__repositories__:
+            if action_id in repository:
+                return repository
+        return None
+
     def getAction(self, action_id: str):
         if action_id in self.__actions__.keys():
             return self.__actions__[action_id]
+        repository = self.__findRepository__(action_id)
+        if repository is not None:
+            return repository.getAction(action_id)
         raise Exception("action_id '%s' not found! Please provide an action identifier previously imported!" % action_id)
 
     def getActions(self):
-        return self.__actions__.keys()
-
-    def exportActions(self, path):
-        for k, action in self.__actions__.items():
-            action.exportJSONFile('%s/%s.json' % (path, k))
+        if not self.__repositories__:
+            return self.__actions__.keys()
+        actions = dict.fromkeys(self.__actions__.keys())
+        for repository in self.__repositories__:
+            actions.update(dict.fromkeys(repository.keys()))
+        return actions.keys()
+
+    def optimizeAction(self, action_id: str, tolerance=0.5, resample_period=None, time_scale=1.0, respect_speeds=True):
+        """
+        Reduces, resamples and re-times in place the checkpoints of an action (see ActionOptimizer).
+
+        Returns:
+            OptimizationReport: checkpoint counts and predicted durations before and after the pass.
+        """
+        optimizer = ActionOptimizer(tolerance=tolerance, resample_period=resample_period, time_scale=time_scale, respect_speeds=respect_speeds)
+        action = self.getAction(action_id)
+        report = optimizer.optimizeAction(action)
+        self.touchAction(action_id, action)
+        return report
+
+    def optimizeActions(self, tolerance=0.5, resample_period=None, time_scale=1.0, respect_speeds=True):
+        return {action_id: self.optimizeAction(action_id, tolerance, resample_period, time_scale, respect_speeds) for action_id in self.getActions()}
+
+    def mergeSteps(self, action_id: str, merge_calls=False):
+        """
+        Merges in place the consecutive steps of an action that move disjoint parts (see StepMerger).
+
+        Returns:
+            MergeReport: the merged steps and the predicted duration saving.
+        """
+        action = self.getAction(action_id)
+        report = StepMerger(merge_calls=merge_calls).mergeAction(action)
+        self.touchAction(action_id, action)
+        return report
+
+    def mergeActionsSteps(self, merge_calls=False):
+        return {action_id: self.mergeSteps(action_id, merge_calls) for action_id in self.getActions()}
+
+    def exportActions(self, path, processes=1, indent=4, progress=None, binary=False):
+        """
+        Writes every action to `path`/<action id>.json (<action id>.pyact if `binary`, see pyicub.binary). With
+        `processes` other than 1 the files are serialized and written from a process pool (None: one process per
+        CPU), see pyicub.bulk, and the write errors are reported instead of raised.
+
+        Returns:
+            BulkReport: the files that could not be written.
+        """
+        from pyicub.bulk import exportActions
+        actions = {k: self.getAction(k) for k in self.getActions()}
+        return exportActions(actions, path, processes=processes, indent=indent, progress=progress, binary=binary, strict=processes == 1)
+
+    def importActions(self, path, processes=None, name_prefix=None, limits=None, clamp=False, progress=None, use_file_names=False):
+        """
+        Parses, builds and optionally validates all the actions (*.json and *.pyact) of `path` across a process pool and adds them
+        (see pyicub.bulk.importActions). The files that fail are reported, not raised.
+
+        Returns:
+            BulkReport: the imported actions, failed files and invalid actions.
+        """
+        from pyicub.bulk import importActions
+        report = importActions(path, processes=processes, name_prefix=name_prefix, limits=limits, clamp=clamp, progress=progress, use_file_names=use_file_names)
+        for action_id, action in report.items.items():
+            self.addAction(action, action_id=action_id)
+        return report
    
     def importTemplateFromJSONFile(self, JSON_file):
         JSON_dict = importFromJSONFile(JSON_file)
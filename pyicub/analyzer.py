@@ -0,0 +1,376 @@
+# BSD 2-Clause License
+#
+# Copyright (c) 2025, Social Cognition in Human-Robot Interaction,
+#                     Istituto Italiano di Tecnologia, Genova
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Module: analyzer.py
+
+Offline timing analysis of the actions, without a robot. The steps are replayed on a simulated clock with the
+same rules as the helper: a step starts at its offset from the end of the last step that was waited for (or from
+the start of the action), limb checkpoints are planned by the SpeedProfilePlanner as PositionController does
+(SPEED_SCALING, SYNC_JOINTS, starting from the targets of the previous steps), and each checkpoint is cut at its
+timeout. With a MotionProfiler the learned durations are used instead of the nominal ones. Gaze checkpoints and
+custom calls have no model: they take `gaze_time` and `call_durations[target]` seconds.
+
+The result is a per-limb timeline, the total duration and the critical path of each action, exported as JSON or
+as Chrome trace events. fitTimeScale() finds the time scale (see PlanExecution.time_scale) that makes an action
+last a given time.
+"""
+
+import numpy as np
+
+from pyicub.controllers.planner import SpeedProfilePlanner
+from pyicub.controllers.position import PositionController
+
+
+DEFAULT_GAZE_TIME = 0.75
+
+
+class Retiming:
+    """
+    The time scale fitting an action to a target duration.
+
+    Attributes:
+        target (float): Requested duration (seconds).
+        time_scale (float): Factor for the step offsets and the checkpoint durations.
+        duration (float): Predicted duration with `time_scale`.
+        nominal (float): Predicted duration without retiming.
+        reachable (bool): False if the joints maximum speeds (or the gaze and custom calls, that are not scaled)
+                          do not allow the target duration.
+    """
+
+    def __init__(self, target, time_scale, duration, nominal, reachable):
+        self.target = target
+        self.time_scale = time_scale
+        self.duration = duration
+        self.nominal = nominal
+        self.reachable = reachable
+
+    def toJSON(self):
+        return {'target': self.target,
+                'time_scale': self.time_scale,
+                'duration': self.duration,
+                'nominal': self.nominal,
+                'reachable': self.reachable}
+
+
+class TimelineSegment:
+    """
+    A timed activity of a step on one resource (a limb, 'gaze' or 'calls'). Times are seconds from the start
+    of the action.
+    """
+
+    __slots__ = ('step', 'resource', 'start', 'end', 'checkpoints')
+
+    def __init__(self, step, resource, start, end, checkpoints=None):
+        self.step = step
+        self.resource = resource
+        self.start = start
+        self.end = end
+        self.checkpoints = checkpoints or []
+
+    @property
+    def duration(self):
+        return self.end - self.start
+
+    def toJSON(self):
+        return {'step': self.step,
+                'resource': self.resource,
+                'start': self.start,
+                'end': self.end,
+                'checkpoints': [list(c) for c in self.checkpoints]}
+
+
+class StepTiming:
+
+    def __init__(self, index, name, offset, start, wait_for_completed, origin):
+        self.index = index
+        self.name = name
+        self.offset = offset
+        self.start = start
+        self.end = start
+        self.wait_for_completed = wait_for_completed
+        # index of the waited step the offset is counted from (None: the start of the action)
+        self.origin = origin
+        self.segments = []
+
+    @property
+    def critical(self):
+        return max(self.segments, key=lambda s: s.end, default=None)
+
+    def toJSON(self):
+        critical = self.critical
+        return {'index': self.index,
+                'name': self.name,
+                'offset': self.offset,
+                'start': self.start,
+                'end': self.end,
+                'wait_for_completed': self.wait_for_completed,
+                'critical': critical.resource if critical is not None else None,
+                'segments': [s.toJSON() for s in self.segments]}
+
+
+class ActionAnalysis:
+    """
+    Predicted timing of an action.
+
+    Attributes:
+        steps (list[StepTiming]): The steps, with their start, end and segments.
+        duration (float): Predicted duration of the action (seconds, from its start).
+        critical_path (list[TimelineSegment]): The chain of segments that sets the duration.
+        warnings (list[str]): Checkpoints cut by their timeout and other anomalies.
+    """
+
+    def __init__(self, action_id, offset):
+        self.action_id = action_id
+        self.offset = offset
+        self.steps = []
+        self.warnings = []
+        self.critical_path = []
+        self.duration = 0.0
+
+    def limbTimeline(self):
+        """
+        Returns:
+            dict: resource -> list of (step name, start, end), in time order.
+        """
+        res = {}
+        for step in self.steps:
+            for segment in step.segments:
+                res.setdefault(segment.resource, []).append((step.name, segment.start, segment.end))
+        for segments in res.values():
+            segments.sort(key=lambda s: s[1])
+        return res
+
+    def toJSON(self):
+        return {'action_id': self.action_id,
+                'offset': self.offset,
+                'duration': self.duration,
+                'steps': [step.toJSON() for step in self.steps],
+                'timeline': {k: [list(s) for s in v] for k, v in self.limbTimeline().items()},
+                'critical_path': [{'step': s.step, 'resource': s.resource, 'start': s.start, 'end': s.end} for s in self.critical_path],
+                'warnings': list(self.warnings)}
+
+    def traceEvents(self, pid=0):
+        """
+        Returns:
+            list: Chrome trace events, one thread per resource, one slice per step segment and per checkpoint.
+        """
+        events = [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 0, 'args': {'name': str(self.action_id)}}]
+        tids = {}
+        critical = set((s.step, s.resource) for s in self.critical_path)
+        for step in self.steps:
+            for segment in step.segments:
+                if not segment.resource in tids.keys():
+                    tids[segment.resource] = len(tids) + 1
+                    events.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tids[segment.resource], 'args': {'name': segment.resource}})
+                tid = tids[segment.resource]
+                events.append({'name': step.name,
+                               'cat': 'critical' if (step.name, segment.resource) in critical else 'step',
+                               'ph': 'X',
+                               'ts': round(segment.start*1e6, 3),
+                               'dur': round(segment.duration*1e6, 3),
+                               'pid': pid,
+                               'tid': tid,
+                               'args': {'step': step.index}})
+                for i, (start, end) in enumerate(segment.checkpoints):
+                    events.append({'name': '%s/%d' % (segment.resource, i),
+                                   'cat': 'checkpoint',
+                                   'ph': 'X',
+                                   'ts': round(start*1e6, 3),
+                                   'dur': round((end - start)*1e6, 3),
+                                   'pid': pid,
+                                   'tid': tid})
+        return events
+
+    def toChromeTrace(self):
+        return {'traceEvents': self.traceEvents(), 'displayTimeUnit': 'ms'}
+
+
+class ActionAnalyzer:
+    """
+    Simulates the playback of actions on a clock.
+
+    Args:
+        initial_pose (dict): Robot part (e.g. 'head') or part name -> encoders at the start. Missing parts start at 0.
+        speed_scaling (float): See PositionController.SPEED_SCALING (default: its current value).
+        synchronize (bool): See PositionController.SYNC_JOINTS (default: its current value).
+        profiler (MotionProfiler): Learned timing models, used when they exist for a part.
+        gaze_time (float): Duration of a gaze checkpoint (the default neck trajectory time of the gaze controller).
+        call_durations (dict): Custom call target -> duration. Unknown targets take no time.
+    """
+
+    def __init__(self, initial_pose=None, speed_scaling=None, synchronize=None, profiler=None, gaze_time=DEFAULT_GAZE_TIME, call_durations=None):
+        if speed_scaling is None:
+            speed_scaling = PositionController.SPEED_SCALING
+        if synchronize is None:
+            synchronize = PositionController.SYNC_JOINTS
+        self.planner = SpeedProfilePlanner(speed_scaling=speed_scaling, synchronize=synchronize)
+        self.initial_pose = initial_pose or {}
+        self.profiler = profiler
+        self.gaze_time = gaze_time
+        self.call_durations = call_durations or {}
+
+    def _encoders_(self, positions, part):
+        current = positions.get(part.robot_part)
+        if current is None:
+            initial = self.initial_pose.get(part.robot_part, self.initial_pose.get(part.name, []))
+            current = np.zeros(max(part.joints_nr, len(initial)))
+            current[:len(initial)] = initial
+            positions[part.robot_part] = current
+        elif current.size < part.joints_nr:
+            current = np.concatenate([current, np.zeros(part.joints_nr - current.size)])
+            positions[part.robot_part] = current
+        return current
+
+    def analyze(self, action, action_id=None, time_scale=1.0):
+        """
+        Args:
+            time_scale (float): Factor applied to the step offsets and to the checkpoint durations, as when the
+                                action is played with this time scale.
+
+        Returns:
+            ActionAnalysis: the predicted timing of an iCubFullbodyAction.
+        """
+        analysis = ActionAnalysis(action_id if action_id is not None else action.name, action.offset_ms/1000.0 if action.offset_ms else 0.0)
+        positions = {}
+        start = 0.0
+        origin = None
+        for i, step in enumerate(action.steps):
+            offset = step.offset_ms/1000.0*time_scale if step.offset_ms else 0.0
+            timing = StepTiming(i, step.name, offset, start + offset, action.wait_for_steps[i], origin)
+            self._simulateStep_(step, timing, positions, analysis, time_scale)
+            analysis.steps.append(timing)
+            if timing.wait_for_completed:
+                start = timing.end
+                origin = i
+        analysis.duration = max([step.end for step in analysis.steps], default=0.0)
+        analysis.critical_path = self._criticalPath_(analysis)
+        return analysis
+
+    def analyzeActions(self, actions):
+        """
+        Args:
+            actions (dict): Action id -> iCubFullbodyAction (e.g. BulkReport.items).
+
+        Returns:
+            dict: Action id -> ActionAnalysis.
+        """
+        return {action_id: self.analyze(action, action_id) for action_id, action in actions.items()}
+
+    def fitTimeScale(self, action, duration, tolerance=1e-3, max_iterations=60):
+        """
+        Searches the time scale that makes the predicted duration of an action equal to `duration` (the duration
+        grows with the time scale, but not linearly: the checkpoints are bounded by the joints maximum speeds and
+        the gaze motions and custom calls are not scaled).
+
+        Returns:
+            Retiming
+        """
+        nominal = self.analyze(action).duration
+        if nominal <= 0.0:
+            return Retiming(duration, 1.0, nominal, nominal, duration == nominal)
+        predict = lambda time_scale: self.analyze(action, time_scale=time_scale).duration
+        time_scale = duration/nominal
+        predicted = predict(time_scale)
+        if abs(predicted - duration) <= tolerance:
+            return Retiming(duration, time_scale, predicted, nominal, True)
+        if predicted > duration:
+            lo, hi = 0.0, time_scale
+            if predict(lo) > duration + tolerance:
+                return Retiming(duration, time_scale, predicted, nominal, False)
+        else:
+            lo, hi = time_scale, time_scale*2.0
+            while predict(hi) < duration and max_iterations > 0:
+                lo, hi = hi, hi*2.0
+                max_iterations -= 1
+        for _ in range(max_iterations):
+            time_scale = (lo + hi)/2.0
+            predicted = predict(time_scale)
+            if abs(predicted - duration) <= tolerance:
+                break
+            if predicted > duration:
+                hi = time_scale
+            else:
+                lo = time_scale
+        return Retiming(duration, time_scale, predicted, nominal, abs(predicted - duration) <= tolerance)
+
+    def _simulateStep_(self, step, timing, positions, analysis, time_scale=1.0):
+        encoders = {part_name: self._encoders_(positions, limb_motion.part) for part_name, limb_motion in step.limb_motions.items()}
+        profile = self.planner.planStep(step, encoders, profiler=self.profiler)
+        durations = profile.retimed(time_scale, predicted=self.profiler is not None)
+        for part_name, limb_motion in step.limb_motions.items():
+            t = timing.start
+            checkpoints = []
+            for k, checkpoint in enumerate(limb_motion.checkpoints):
+                duration = durations[part_name][k]
+                timeout = checkpoint.timeout*max(1.0, time_scale)
+                if timeout and duration > timeout:
+                    analysis.warnings.append("Step <%s>: checkpoint %d of %s takes %.3fs, cut by its timeout (%.3fs)" % (step.name, k, part_name, duration, timeout))
+                    duration = timeout
+                checkpoints.append((t, t + duration))
+                t += duration
+                joints_list = checkpoint.pose.joints_list or limb_motion.part.joints_list
+                positions[limb_motion.part.robot_part][joints_list] = checkpoint.pose.target_joints[:len(joints_list)]
+            timing.segments.append(TimelineSegment(step.name, part_name, timing.start, t, checkpoints))
+        if step.gaze_motion and step.gaze_motion.checkpoints:
+            n = len(step.gaze_motion.checkpoints)
+            checkpoints = [(timing.start + k*self.gaze_time, timing.start + (k + 1)*self.gaze_time) for k in range(n)]
+            timing.segments.append(TimelineSegment(step.name, 'gaze', timing.start, timing.start + n*self.gaze_time, checkpoints))
+        if step.custom_calls:
+            t = timing.start
+            checkpoints = []
+            for call in step.custom_calls:
+                duration = self.call_durations.get(call.target, 0.0)
+                checkpoints.append((t, t + duration))
+                t += duration
+            timing.segments.append(TimelineSegment(step.name, 'calls', timing.start, t, checkpoints))
+        critical = timing.critical
+        timing.end = critical.end if critical is not None else timing.start
+
+    def _criticalPath_(self, analysis):
+        if not analysis.steps:
+            return []
+        path = []
+        step = max(analysis.steps, key=lambda s: s.end)
+        while step is not None:
+            if step.critical is not None:
+                path.append(step.critical)
+            step = analysis.steps[step.origin] if step.origin is not None else None
+        path.reverse()
+        return path
+
+
+def toChromeTrace(analyses):
+    """
+    Returns:
+        dict: the Chrome trace of several ActionAnalysis (one process per action).
+    """
+    events = []
+    for pid, analysis in enumerate(analyses.values() if isinstance(analyses, dict) else analyses):
+        events.extend(analysis.traceEvents(pid))
+    return {'traceEvents': events, 'displayTimeUnit': 'ms'}
@@ -0,0 +1,297 @@
+# BSD 2-Clause License
+#
+# Copyright (c) 2025, Social Cognition in Human-Robot Interaction,
+#                     Istituto Italiano di Tecnologia, Genova
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Module: binary.py
+
+Compact binary form of the actions (*.pyact). A file is made of:
+
+    MAGIC (8 bytes) | header size (uint32, little endian) | JSON header | padding to 8 bytes | data
+
+The JSON header keeps everything but the joint arrays: names, offsets, wait flags, parts, gaze motions and custom
+calls. For every limb motion the data block holds contiguous arrays (float32 when all the values of the action are
+exactly representable, float64 otherwise) of the targets, durations, timeouts and speeds of its checkpoints, plus
+the joints lists, described in the header by (offset, count) and by the positions of the integer values, which are
+given back as int. Rows of different length are concatenated, with their lengths stored alongside. Files are read through a memory map: importBinaryFile() returns the same dict that
+iCubFullbodyAction.importFromJSONDict() takes, and toJSON() -> exportBinaryFile() -> importBinaryFile() is lossless.
+"""
+
+import json
+import mmap
+import struct
+
+import numpy as np
+
+from pyicub.utils import importFromJSONFile
+
+
+MAGIC = b'PYICUBA\x01'
+EXTENSION = '.pyact'
+ACTION_EXTENSIONS = ('.json', EXTENSION)
+ALIGNMENT = 8
+
+_HEADER_SIZE_ = struct.Struct('<I')
+
+
+def isBinaryFile(filepath):
+    return str(filepath).endswith(EXTENSION)
+
+
+def isActionFile(filepath):
+    return str(filepath).endswith(ACTION_EXTENSIONS)
+
+
+def stripExtension(filepath):
+    for ext in ACTION_EXTENSIONS:
+        if filepath.endswith(ext):
+            return filepath[:-len(ext)]
+    return filepath
+
+
+class _Writer_:
+
+    def __init__(self, dtype):
+        self.dtype = np.dtype(dtype)
+        self.chunks = []
+        self.size = 0
+
+    def add(self, values, dtype=None):
+        arr = np.ascontiguousarray(values, dtype=dtype if dtype is not None else self.dtype)
+        offset = self.size
+        self.chunks.append(arr.tobytes())
+        self.size += arr.nbytes
+        pad = -self.size % ALIGNMENT
+        if pad:
+            self.chunks.append(b'\x00'*pad)
+            self.size += pad
+        if dtype is None:
+            # integer values (e.g. the default joints speeds) are given back as int
+            ints = [i for i, v in enumerate(values) if type(v) is int]
+            if ints and len(ints) == len(values):
+                return [offset, int(arr.size), 'int']
+            if ints:
+                return [offset, int(arr.size), ints]
+        return [offset, int(arr.size)]
+
+
+def _floats_(JSON_dict):
+    for step in JSON_dict['steps']:
+        for limb_motion in step['limb_motions'].values():
+            for checkpoint in limb_motion['checkpoints']:
+                yield from checkpoint['pose']['target_joints']
+                yield checkpoint['duration']
+                yield checkpoint['timeout']
+                yield from checkpoint['joints_speed']
+
+
+def _dtype_(JSON_dict):
+    values = np.fromiter(_floats_(JSON_dict), dtype=np.float64)
+    if np.array_equal(values.astype(np.float32).astype(np.float64), values, equal_nan=True):
+        return '<f4'
+    return '<f8'
+
+
+def _rows_(rows, writer, dtype=None):
+    lengths = [len(row) for row in rows]
+    flat = [v for row in rows for v in row]
+    return {'values': writer.add(flat, dtype), 'lengths': writer.add(lengths, '<i4')}
+
+
+def encode(JSON_dict):
+    """
+    Returns:
+        bytes: the binary form of an action dict (as produced by iCubFullbodyAction.toJSON()).
+    """
+    writer = _Writer_(_dtype_(JSON_dict))
+    header = {k: v for k, v in JSON_dict.items() if k != 'steps'}
+    header['dtype'] = writer.dtype.str
+    header['steps'] = []
+    for step in JSON_dict['steps']:
+        step_header = {k: v for k, v in step.items() if k != 'limb_motions'}
+        step_header['limb_motions'] = []
+        for key, limb_motion in step['limb_motions'].items():
+            checkpoints = limb_motion['checkpoints']
+            joints_lists = [c['pose']['joints_list'] for c in checkpoints]
+            step_header['limb_motions'].append({
+                'key': key,
+                'part': limb_motion['part'],
+                'checkpoints': len(checkpoints),
+                'targets': _rows_([c['pose']['target_joints'] for c in checkpoints], writer),
+                'speeds': _rows_([c['joints_speed'] for c in checkpoints], writer),
+                'joints_lists': _rows_([j if j is not None else [] for j in joints_lists], writer, '<i4'),
+                'no_joints_list': [i for i, j in enumerate(joints_lists) if j is None],
+                'durations': writer.add([c['duration'] for c in checkpoints]),
+                'timeouts': writer.add([c['timeout'] for c in checkpoints])})
+        header['steps'].append(step_header)
+    header_bytes = json.dumps(header, ensure_ascii=False).encode('utf-8')
+    prefix = MAGIC + _HEADER_SIZE_.pack(len(header_bytes)) + header_bytes
+    prefix += b'\x00'*(-len(prefix) % ALIGNMENT)
+    return prefix + b''.join(writer.chunks)
+
+
+def exportBinaryFile(filepath, JSON_dict):
+    data = encode(JSON_dict)
+    with open(filepath, 'wb') as f:
+        f.write(data)
+    return len(data)
+
+
+class BinaryAction:
+    """
+    A memory-mapped *.pyact file. The arrays returned by limbArrays() are read-only views on the file.
+    """
+
+    def __init__(self, filepath):
+        with open(filepath, 'rb') as f:
+            self._buffer_ = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._buffer_[:len(MAGIC)] != MAGIC:
+            self._buffer_.close()
+            raise ValueError("%s is not a pyicub binary action" % filepath)
+        size, = _HEADER_SIZE_.unpack_from(self._buffer_, len(MAGIC))
+        start = len(MAGIC) + _HEADER_SIZE_.size
+        self.header = json.loads(self._buffer_[start:start + size].decode('utf-8'))
+        start += size
+        self._data_offset_ = start + (-start % ALIGNMENT)
+        self._dtype_ = np.dtype(self.header['dtype'])
+
+    @property
+    def name(self):
+        return self.header['name']
+
+    def close(self):
+        try:
+            self._buffer_.close()
+        except BufferError:
+            # arrays returned by limbArrays() are still alive: the map is released with them
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _array_(self, desc, dtype=None):
+        offset, count = desc[:2]
+        return np.frombuffer(self._buffer_, dtype=dtype if dtype is not None else self._dtype_, count=count, offset=self._data_offset_ + offset)
+
+    def _rows_(self, desc, dtype=None):
+        values = self._array_(desc['values'], dtype)
+        lengths = self._array_(desc['lengths'], '<i4')
+        if lengths.size and np.all(lengths == lengths[0]):
+            return values.reshape(lengths.size, int(lengths[0]))
+        return np.split(values, np.cumsum(lengths)[:-1])
+
+    def _list_(self, desc):
+        values = self._array_(desc).tolist()
+        if len(desc) > 2:
+            if desc[2] == 'int':
+                return [int(v) for v in values]
+            for i in desc[2]:
+                values[i] = int(values[i])
+        return values
+
+    def _rowsList_(self, desc, dtype=None):
+        values = self._list_(desc['values']) if dtype is None else self._array_(desc['values'], dtype).tolist()
+        res = []
+        start = 0
+        for length in self._array_(desc['lengths'], '<i4').tolist():
+            res.append(values[start:start + length])
+            start += length
+        return res
+
+    def limbArrays(self, step_index, part_name):
+        """
+        Returns:
+            dict: targets, speeds (2-D when all the checkpoints have the same number of joints, else lists of rows),
+            durations and timeouts of a limb motion.
+        """
+        for limb in self.header['steps'][step_index]['limb_motions']:
+            if limb['key'] == part_name:
+                return {'targets': self._rows_(limb['targets']),
+                        'speeds': self._rows_(limb['speeds']),
+                        'durations': self._array_(limb['durations']),
+                        'timeouts': self._array_(limb['timeouts'])}
+        raise KeyError(part_name)
+
+    def toJSONDict(self):
+        JSON_dict = {k: v for k, v in self.header.items() if k not in ('dtype', 'steps')}
+        steps = []
+        for step_header in self.header['steps']:
+            step = {k: v for k, v in step_header.items() if k != 'limb_motions'}
+            limb_motions = {}
+            for limb in step_header['limb_motions']:
+                targets = self._rowsList_(limb['targets'])
+                speeds = self._rowsList_(limb['speeds'])
+                joints_lists = self._rowsList_(limb['joints_lists'], '<i4')
+                durations = self._list_(limb['durations'])
+                timeouts = self._list_(limb['timeouts'])
+                no_joints_list = set(limb['no_joints_list'])
+                checkpoints = []
+                for i in range(limb['checkpoints']):
+                    checkpoints.append({'pose': {'target_joints': targets[i],
+                                                 'joints_list': None if i in no_joints_list else joints_lists[i]},
+                                        'duration': durations[i],
+                                        'timeout': timeouts[i],
+                                        'joints_speed': speeds[i]})
+                limb_motions[limb['key']] = {'part': limb['part'], 'checkpoints': checkpoints}
+            step['limb_motions'] = limb_motions
+            steps.append(step)
+        JSON_dict['steps'] = steps
+        return JSON_dict
+
+
+def importBinaryFile(filepath):
+    """
+    Returns:
+        dict: the action dict of a *.pyact file, as taken by iCubFullbodyAction.importFromJSONDict().
+    """
+    with BinaryAction(filepath) as action:
+        return action.toJSONDict()
+
+
+def readName(filepath):
+    """
+    Returns:
+        str: the action name, reading only the header.
+    """
+    with open(filepath, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError("%s is not a pyicub binary action" % filepath)
+        size, = _HEADER_SIZE_.unpack(f.read(_HEADER_SIZE_.size))
+        return json.loads(f.read(size).decode('utf-8'))['name']
+
+
+def importActionFile(filepath):
+    """
+    Returns:
+        dict: the action dict of a *.json or *.pyact file.
+    """
+    if isBinaryFile(filepath):
+        return importBinaryFile(filepath)
+    return importFromJSONFile(filepath)
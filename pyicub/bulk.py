@@ -0,0 +1,224 @@
+# BSD 2-Clause License
+#
+# Copyright (c) 2025, Social Cognition in Human-Robot Interaction,
+#                     Istituto Italiano di Tecnologia, Genova
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Module: bulk.py
+
+This module imports and exports whole action repositories across a process pool. Each worker parses a chunk of
+JSON (or binary, see pyicub.binary) files, builds the iCubFullbodyActions (or templates) and, if joint limits are given, validates them; the
+actions are sent back to the calling process. Exports serialize and write the files in the workers. A progress
+callback `progress(done, total)` is called from the calling process as the chunks complete.
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from pyicub.actions import iCubFullbodyAction, iCubActionTemplateImportedJSON, toJSONDict
+from pyicub.controllers.limits import ActionValidator
+from pyicub.binary import EXTENSION, isActionFile, importActionFile, stripExtension, exportBinaryFile
+from pyicub.utils import exportJSONFile
+
+
+DEFAULT_CHUNKSIZE = 64
+
+
+class BulkReport:
+    """
+    Outcome of a bulk import or export.
+
+    Attributes:
+        items (dict): Action id (or template name) -> imported object. Empty for the exports.
+        files (int): Number of processed files.
+        failed (dict): File -> error of the files that could not be processed.
+        invalid (dict): Action id -> ValidationReport summary of the actions outside the joint limits.
+        duration (float): Wall-clock duration (seconds).
+    """
+
+    def __init__(self):
+        self.items = {}
+        self.files = 0
+        self.failed = {}
+        self.invalid = {}
+        self.duration = 0.0
+
+    @property
+    def throughput(self):
+        return self.files/self.duration if self.duration > 0.0 else 0.0
+
+    def summary(self):
+        return "%d files in %.3fs (%.1f files/s): %d failed, %d invalid" % (self.files, self.duration, self.throughput, len(self.failed), len(self.invalid))
+
+    def toJSON(self):
+        return {'files': self.files,
+                'failed': dict(self.failed),
+                'invalid': dict(self.invalid),
+                'duration': self.duration,
+                'throughput': self.throughput}
+
+
+def _chunks_(items, chunksize):
+    return [items[i:i + chunksize] for i in range(0, len(items), chunksize)]
+
+
+def _importChunk_(path, files, name_prefix, limits, clamp, templates, use_file_names):
+    res = []
+    validator = ActionValidator(limits) if limits else None
+    for f in files:
+        try:
+            JSON_dict = importActionFile(os.path.join(path, f))
+            if templates:
+                item = iCubActionTemplateImportedJSON(JSON_dict=JSON_dict)
+            else:
+                item = iCubFullbodyAction(JSON_dict=JSON_dict)
+            key = stripExtension(f) if use_file_names else item.name
+            if name_prefix:
+                key = name_prefix + '.' + key
+            summary = None
+            if validator is not None and not templates:
+                report = validator.validateAction(item, clamp=clamp)
+                if not report.valid:
+                    summary = report.summary()
+            res.append((f, key, item, summary, None))
+        except Exception as e:
+            res.append((f, None, None, None, repr(e)))
+    return res
+
+
+def _exportChunk_(path, items, indent, binary, strict):
+    res = []
+    for key, item in items:
+        try:
+            if binary:
+                exportBinaryFile('%s/%s%s' % (path, key, EXTENSION), toJSONDict(item))
+            else:
+                exportJSONFile('%s/%s.json' % (path, key), json.dumps(toJSONDict(item), indent=indent, ensure_ascii=False))
+            res.append((key, None))
+        except Exception as e:
+            if strict:
+                raise
+            res.append((key, repr(e)))
+    return res
+
+
+def _run_(func, chunks, processes, progress, total, collect):
+    done = 0
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if processes == 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            results = func(*chunk)
+            collect(results)
+            done += len(results)
+            if progress is not None:
+                progress(done, total)
+        return
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = [executor.submit(func, *chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            results = future.result()
+            collect(results)
+            done += len(results)
+            if progress is not None:
+                progress(done, total)
+
+
+def importActions(path, processes=None, name_prefix=None, limits=None, clamp=False, progress=None, chunksize=DEFAULT_CHUNKSIZE, templates=False, use_file_names=False):
+    """
+    Parses and builds all the *.json and *.pyact actions (or templates if `templates` is True) of a directory.
+
+    Args:
+        processes (int): Number of worker processes (None: one per CPU, 1: no pool).
+        name_prefix (str): If given, the ids are `name_prefix + '.' + name`.
+        use_file_names (bool): Use the file names (without extension) instead of the action names as ids.
+        limits (dict): Part name -> JointLimits used to validate the actions (None to skip the validation).
+        clamp (bool): Clamp the invalid targets into the limits instead of reporting them.
+        progress (callable): progress(done, total), called as the files are processed.
+
+    Returns:
+        BulkReport: the imported actions in `items`, sorted by file name.
+    """
+    t0 = time.perf_counter()
+    report = BulkReport()
+    files = sorted([f for f in os.listdir(path) if isActionFile(f)])
+    chunks = [(path, chunk, name_prefix, limits, clamp, templates, use_file_names) for chunk in _chunks_(files, chunksize)]
+    results = {}
+
+    def collect(chunk_results):
+        for f, key, item, summary, error in chunk_results:
+            results[f] = (key, item, summary, error)
+
+    _run_(_importChunk_, chunks, processes, progress, len(files), collect)
+    for f in files:
+        key, item, summary, error = results[f]
+        if error is not None:
+            report.failed[f] = error
+            continue
+        report.items[key] = item
+        if summary is not None:
+            report.invalid[key] = summary
+    report.files = len(files)
+    report.duration = time.perf_counter() - t0
+    return report
+
+
+def importTemplates(path, processes=None, progress=None, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Bulk import of the *.json templates of a directory (see importActions).
+    """
+    return importActions(path, processes=processes, progress=progress, chunksize=chunksize, templates=True)
+
+
+def exportActions(actions, path, processes=None, indent=4, progress=None, chunksize=DEFAULT_CHUNKSIZE, binary=False, strict=False):
+    """
+    Writes the actions to `path`/<action id>.json from a process pool.
+
+    Args:
+        actions (dict): Action id -> iCubFullbodyAction.
+        indent (int): JSON indentation (None for the compact form).
+        binary (bool): Write <action id>.pyact files instead (see pyicub.binary).
+        strict (bool): Raise the first write error instead of reporting it.
+
+    Returns:
+        BulkReport: the files that could not be written in `failed`.
+    """
+    t0 = time.perf_counter()
+    report = BulkReport()
+    os.makedirs(path, exist_ok=True)
+    chunks = [(path, chunk, indent, binary, strict) for chunk in _chunks_(list(actions.items()), chunksize)]
+
+    def collect(chunk_results):
+        for key, error in chunk_results:
+            if error is not None:
+                report.failed[key] = error
+
+    _run_(_exportChunk_, chunks, processes, progress, len(actions), collect)
+    report.files = len(actions)
+    report.duration = time.perf_counter() - t0
+    return report
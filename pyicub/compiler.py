@@ -0,0 +1,356 @@
+# BSD 2-Clause License
+#
+# Copyright (c) 2025, Social Cognition in Human-Robot Interaction,
+#                     Istituto Italiano di Tecnologia, Genova
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Module: compiler.py
+
+This module turns an iCubFullbodyAction into a flat ActionPlan bound to the resources of an iCub helper: position
+controllers, gaze methods and custom-call targets are resolved once, joint targets and speeds are stored as numpy
+arrays, request names and nominal timings are precomputed, and the joint targets are validated against the joint
+limits. Plans are cached by the helper per action id and recompiled when the action version changes
+(see ActionsManager.getActionVersion). A running plan is tracked by a PlanExecution, that can be preempted.
+"""
+
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from pyicub.actions import iCubFullbodyAction
+from pyicub.controllers.planner import SpeedProfilePlanner
+
+
+class CheckpointPlan:
+    """
+    A resolved limb checkpoint. `pose` is the original JointPose, passed as is to PositionController.move().
+    """
+
+    __slots__ = ('pose', 'joints_list', 'target', 'duration', 'timeout', 'joints_speed')
+
+    def __init__(self, checkpoint):
+        self.pose = checkpoint.pose
+        self.joints_list = list(checkpoint.pose.joints_list)
+        self.target = np.asarray(checkpoint.pose.target_joints[:len(self.joints_list)], dtype=float)
+        self.duration = checkpoint.duration
+        self.timeout = checkpoint.timeout
+        self.joints_speed = checkpoint.joints_speed
+
+
+class LimbPlan:
+    """
+    The checkpoints of a robot part with its resolved PositionController.
+    """
+
+    def __init__(self, limb_motion, controller):
+        self.part = limb_motion.part
+        self.part_name = limb_motion.part.name
+        self.controller = controller
+        self.suffix = '/' + self.part_name
+        self.checkpoints = [CheckpointPlan(checkpoint) for checkpoint in limb_motion.checkpoints]
+        self.durations = np.array([checkpoint.duration for checkpoint in self.checkpoints], dtype=float)
+
+    @property
+    def targets(self):
+        """
+        Returns:
+            np.ndarray: (checkpoints, joints) joint targets, NaN-padded when the checkpoints move different joints.
+        """
+        width = max([len(c.target) for c in self.checkpoints], default=0)
+        res = np.full((len(self.checkpoints), width), np.nan)
+        for i, checkpoint in enumerate(self.checkpoints):
+            res[i, :len(checkpoint.target)] = checkpoint.target
+        return res
+
+    @property
+    def nominal_duration(self):
+        return float(self.durations.sum())
+
+
+class GazePlan:
+    """
+    The checkpoints of a gaze motion with the resolved GazeController method.
+    """
+
+    def __init__(self, gaze_motion, method):
+        self.lookat_method = gaze_motion.lookat_method
+        self.method = method
+        self.suffix = '/' + gaze_motion.lookat_method
+        self.checkpoints = [tuple(checkpoint) for checkpoint in gaze_motion.checkpoints]
+
+
+class CallPlan:
+    """
+    A custom call with its resolved target callable.
+    """
+
+    def __init__(self, custom_call, target):
+        self.name = custom_call.target
+        self.target = target
+        self.args = tuple(custom_call.args)
+        self.suffix = '/' + custom_call.target
+
+
+class StepPlan:
+    """
+    A step of an ActionPlan. `step` is the original iCubFullbodyStep, used by the runtime speed planning and by
+    the single-thread dispatcher. The runtime speed planning is skipped for `timed` steps (see
+    SpeedProfilePlanner.isTimed) played at their nominal speed.
+    """
+
+    def __init__(self, step, request_name, wait_for_completed):
+        self.step = step
+        self.timed = SpeedProfilePlanner.isTimed(step)
+        self.name = step.name
+        self.request_name = request_name
+        self.wait_for_completed = wait_for_completed
+        self.offset = step.offset_ms/1000.0 if step.offset_ms else 0.0
+        self.gaze = None
+        self.calls = []
+        self.limbs = {}
+
+    @property
+    def nominal_duration(self):
+        return max([limb.nominal_duration for limb in self.limbs.values()], default=0.0)
+
+
+class ActionPlan:
+    """
+    A compiled action.
+
+    Attributes:
+        action_id (str): The id of the action in the ActionsManager (None for actions compiled on the fly).
+        version (int): The action version the plan has been compiled from.
+        warnings (list): The parts, gaze methods and custom calls that could not be resolved (and are skipped).
+        validation (ValidationReport): The joint targets outside the joint limits.
+    """
+
+    def __init__(self, action, action_id=None, version=None):
+        self.action = action
+        self.action_id = action_id
+        self.version = version
+        self.name = action.name
+        self.offset_ms = action.offset_ms
+        self.request_name = '/' + action.name
+        self.steps = []
+        self.warnings = []
+        self.validation = None
+        self.compile_time = 0.0
+
+    @property
+    def nominal_duration(self):
+        return sum([step.nominal_duration + step.offset for step in self.steps])
+
+    def toJSON(self):
+        return {'action_id': self.action_id,
+                'name': self.name,
+                'version': self.version,
+                'steps': [{'name': step.name,
+                           'offset': step.offset,
+                           'wait_for_completed': step.wait_for_completed,
+                           'parts': {part: len(limb.checkpoints) for part, limb in step.limbs.items()},
+                           'gaze': len(step.gaze.checkpoints) if step.gaze else 0,
+                           'calls': [call.name for call in step.calls],
+                           'nominal_duration': step.nominal_duration} for step in self.steps],
+                'nominal_duration': self.nominal_duration,
+                'warnings': list(self.warnings),
+                'valid': self.validation.valid if self.validation is not None else True,
+                'compile_time': self.compile_time}
+
+
+class ActionCompiler:
+    """
+    Compiles actions against the resources of an iCub helper.
+    """
+
+    def __init__(self, icub):
+        self._icub_ = icub
+
+    def resolveCall(self, target):
+        """
+        Returns:
+            callable: the attribute chain `target` (e.g. 'emo.smile') resolved from the helper, or None.
+        """
+        foo = self._icub_
+        try:
+            for call in target.split('.'):
+                foo = getattr(foo, call)
+        except AttributeError:
+            return None
+        return foo if callable(foo) else None
+
+    def compile(self, action: iCubFullbodyAction, action_id=None, version=None):
+        """
+        Compiles an action. Parts without a controller, gaze motions without a gaze controller and unresolved
+        custom calls are logged, recorded in `ActionPlan.warnings` and left out of the plan.
+
+        Returns:
+            ActionPlan: the compiled action.
+        """
+        t0 = time.perf_counter()
+        icub = self._icub_
+        plan = ActionPlan(action, action_id=action_id, version=version)
+        for i, step in enumerate(action.steps):
+            wait_for_completed = action.wait_for_steps[i] if i < len(action.wait_for_steps) else True
+            step_plan = StepPlan(step, "%s/%s" % (plan.request_name, step.name), wait_for_completed)
+            if step.gaze_motion:
+                gaze = icub.gaze
+                method = getattr(gaze, step.gaze_motion.lookat_method, None) if gaze is not None else None
+                if method is None:
+                    plan.warnings.append("step <%s>: gaze method <%s> not available" % (step.name, step.gaze_motion.lookat_method))
+                else:
+                    step_plan.gaze = GazePlan(step.gaze_motion, method)
+            for custom_call in step.custom_calls:
+                target = self.resolveCall(custom_call.target)
+                if target is None:
+                    plan.warnings.append("step <%s>: custom call <%s> not resolved" % (step.name, custom_call.target))
+                else:
+                    step_plan.calls.append(CallPlan(custom_call, target))
+            for part_name, limb_motion in step.limb_motions.items():
+                ctrl = icub.getPositionController(limb_motion.part)
+                if ctrl is None:
+                    plan.warnings.append("step <%s>: part <%s> not available" % (step.name, part_name))
+                else:
+                    step_plan.limbs[part_name] = LimbPlan(limb_motion, ctrl)
+            plan.steps.append(step_plan)
+        plan.validation = icub.validateAction(action)
+        for warning in plan.warnings:
+            icub.logger.warning('Action <%s> %s' % (action.name, warning))
+        if not plan.validation.valid:
+            icub.logger.error(plan.validation.summary())
+        plan.compile_time = time.perf_counter() - t0
+        return plan
+
+
+class PlanExecution:
+    """
+    A running ActionPlan. Once preempted, the execution does not start any further step, checkpoint, gaze motion or
+    custom call, and its pending timeline events are cancelled. The preemption check and the start of each motion
+    are serialized on `lock`, so that a preempted execution never commands a part after the action replacing it.
+
+    Attributes:
+        blend_time (float): Minimum duration (seconds) of the first checkpoint of each part, when blending from a
+                            preempted action.
+        preempted_at (float): time.monotonic() time the previous action was preempted, for the switch latency.
+        switch_latency (float): Seconds between the preemption of the previous action and the start of the first step.
+        time_scale (float): Factor applied to the step offsets and to the checkpoint durations of this execution only
+                            (see iCub.retimeAction). The checkpoints are never faster than the joints maximum speeds.
+    """
+
+    def __init__(self, plan: ActionPlan, timeline, blend_time=0.0, preempted_at=None, time_scale=1.0):
+        self.plan = plan
+        self.blend_time = blend_time
+        self.time_scale = time_scale
+        self.preempted_at = preempted_at
+        self.switch_latency = None
+        self.request = None
+        self.events = []
+        self.lock = threading.Lock()
+        self._timeline_ = timeline
+        self._preempted_ = False
+        self._done_ = threading.Event()
+
+    @property
+    def preempted(self):
+        return self._preempted_
+
+    @property
+    def done(self):
+        return self._done_.is_set()
+
+    @property
+    def parts(self):
+        return set([part for step in self.plan.steps for part in step.limbs.keys()])
+
+    @property
+    def uses_gaze(self):
+        return any([step.gaze is not None for step in self.plan.steps])
+
+    def preempt(self):
+        """
+        Returns:
+            bool: False if the execution was already preempted or completed.
+        """
+        with self.lock:
+            if self._preempted_ or self.done:
+                return False
+            self._preempted_ = True
+        for event in self.events:
+            self._timeline_.cancel(event)
+        return True
+
+    def stepStarted(self, step_plan: StepPlan):
+        """
+        Returns:
+            float: the switch latency, when `step_plan` is the first step of an action blended from a preempted one.
+        """
+        if self.preempted_at is None or self.switch_latency is not None or step_plan is not self.plan.steps[0]:
+            return None
+        self.switch_latency = self._timeline_.now() - self.preempted_at
+        return self.switch_latency
+
+    def finish(self):
+        self._done_.set()
+
+    def wait(self, timeout=None):
+        return self._done_.wait(timeout)
+
+
+class SwitchStats:
+    """
+    Switch latencies of the last blended actions.
+    """
+
+    HISTORY_SIZE = 1000
+
+    def __init__(self, history_size=HISTORY_SIZE):
+        self._latencies_ = deque(maxlen=history_size)
+        self._preempted_ = 0
+
+    def record(self, latency):
+        self._latencies_.append(latency)
+
+    def recordPreempted(self, count=1):
+        self._preempted_ += count
+
+    def info(self):
+        """
+        Returns:
+            dict: switches, preempted executions and switch latency statistics (milliseconds).
+        """
+        latencies = np.asarray(self._latencies_, dtype=float)*1000.0
+        res = {'switches': int(latencies.size),
+               'preempted': self._preempted_,
+               'latency_mean_ms': 0.0,
+               'latency_p99_ms': 0.0,
+               'latency_max_ms': 0.0}
+        if latencies.size:
+            res['latency_mean_ms'] = float(latencies.mean())
+            res['latency_p99_ms'] = float(np.percentile(latencies, 99))
+            res['latency_max_ms'] = float(latencies.max())
+        return res
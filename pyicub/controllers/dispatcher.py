@@ -0,0 +1,279 @@
+# BSD 2-Clause License
+#
+# Copyright (c) 2025, Social Cognition in Human-Robot Interaction,
+#                     Istituto Italiano di Tecnologia, Genova
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+Module: dispatcher.py
+
+This module plays the limb motions of an iCubFullbodyStep from a single control thread: the first checkpoint
+of every part is issued in the same tick, then an event loop polls the parts at a fixed period and starts the
+next checkpoint of each part as soon as its current one is done. No thread is created per limb or per checkpoint.
+The compiled steps (see pyicub.compiler) are played with the blend, time scale and preemption rules of their
+PlanExecution.
+"""
+
+import time
+
+
+class PartDispatch:
+    """
+    Playback state of the checkpoints of a robot part.
+    """
+    def __init__(self, controller, checkpoints, durations=None, tag='', timeout_scale=1.0, execution=None):
+        """
+        Args:
+            checkpoints (list): JointsTrajectoryCheckpoints or CheckpointPlans.
+            durations (list): Per-checkpoint requested times, overriding the checkpoints durations.
+            timeout_scale (float): Factor of the checkpoints timeouts.
+            execution (PlanExecution): No checkpoint is started once it is preempted.
+        """
+        self.controller = controller
+        self.checkpoints = checkpoints
+        self.durations = durations
+        self.tag = tag
+        self.timeout_scale = timeout_scale
+        self.execution = execution
+        self.index = -1
+        self.handle = None
+        self.started = False
+        self.first_start = None
+        self.first_sent = None
+        self.results = []
+        self.elapsed = []
+
+    def _startMove_(self, checkpoint, req_time):
+        return self.controller.startMove(checkpoint.pose,
+                                         req_time=req_time,
+                                         timeout=checkpoint.timeout*self.timeout_scale,
+                                         joints_speed=checkpoint.joints_speed,
+                                         tag=self.tag)
+
+    def startNext(self):
+        """
+        Starts the next checkpoint (skipping the rejected ones).
+
+        Returns:
+            bool: False if there are no more checkpoints or the execution has been preempted.
+        """
+        while self.index < len(self.checkpoints) - 1:
+            self.index += 1
+            checkpoint = self.checkpoints[self.index]
+            req_time = self.durations[self.index] if self.durations else checkpoint.duration
+            if self.execution is None:
+                self.handle = self._startMove_(checkpoint, req_time)
+            else:
+                with self.execution.lock:
+                    if self.execution.preempted:
+                        break
+                    self.handle = self._startMove_(checkpoint, req_time)
+            self.started = False
+            if self.handle is not None:
+                if self.first_start is None:
+                    self.first_start = self.handle.t_start
+                    self.first_sent = time.perf_counter()
+                return True
+            self.results.append(False)
+            self.elapsed.append(0.0)
+        self.handle = None
+        return False
+
+    def poll(self, now):
+        """
+        Checks the current checkpoint.
+
+        Returns:
+            bool or None: True/False if the checkpoint completed/timed out, None if it is still running.
+        """
+        handle = self.handle
+        elapsed = now - handle.t_start
+        joints = handle.moving_joints
+        if not joints:
+            res = True
+        else:
+            done = self.controller.isMotionDone(joints)
+            if not done:
+                self.started = True
+            if done and (self.started or elapsed >= handle.motion_time*self.controller.MOTION_COMPLETE_AT):
+                res = True
+            elif elapsed > handle.timeout:
+                res = False
+            else:
+                return None
+        self.controller.completeMove(handle, res)
+        self.results.append(res)
+        self.elapsed.append(elapsed)
+        self.handle = None
+        return res
+
+
+class DispatchReport:
+    """
+    Outcome of a dispatched step.
+
+    Attributes:
+        parts (dict): Part name -> dict with first_start and first_sent (perf_counter times before and after its
+                      first command, see PositionController.startMove), results and elapsed times of its checkpoints.
+        duration (float): Wall-clock duration of the step (seconds).
+    """
+    def __init__(self, name):
+        self.name = name
+        self.parts = {}
+        self.duration = 0.0
+
+    @property
+    def start_skew(self):
+        """
+        Returns:
+            float: time from the first command of the first started part to the return of the first command of
+            the last one (seconds). The parts are commanded one after the other: the skew includes the whole
+            startMove() of all but one of them (limits check, control mode, logging, command), so it grows with
+            the number of parts and depends on the backend.
+        """
+        parts = [p for p in self.parts.values() if p['first_start'] is not None]
+        if len(parts) < 2:
+            return 0.0
+        return float(max([p['first_sent'] for p in parts]) - min([p['first_start'] for p in parts]))
+
+    @property
+    def success(self):
+        return all(all(p['results']) for p in self.parts.values())
+
+    def toJSON(self):
+        return {'name': self.name,
+                'duration': self.duration,
+                'start_skew_ms': self.start_skew*1000.0,
+                'success': self.success,
+                'parts': {name: {'results': p['results'], 'elapsed': p['elapsed']} for name, p in self.parts.items()}}
+
+
+class StepDispatcher:
+    """
+    Single-thread dispatcher of the limb motions of a step.
+    """
+
+    PERIOD = 0.005
+
+    def __init__(self, controllers=None, period=PERIOD, logger=None):
+        """
+        Args:
+            controllers (dict): Part name -> PositionController, for dispatch().
+            period (float): Polling period of the event loop (seconds).
+            logger: Logger instance for debugging.
+        """
+        self._controllers_ = controllers if controllers is not None else {}
+        self._period_ = period
+        self._logger_ = logger
+
+    @property
+    def period(self):
+        return self._period_
+
+    def dispatch(self, step, durations=None, tag=''):
+        """
+        Plays all the limb motions of a step and returns when all of them are completed.
+
+        Parameters
+        ----------
+        step : iCubFullbodyStep
+            The step to play (its gaze motion and custom calls are ignored).
+        durations : dict, optional
+            Part name -> per-checkpoint requested times (e.g. StepProfile.durations), overriding the checkpoints durations.
+        tag : str, optional
+            Tag of the motions.
+
+        Returns
+        -------
+        DispatchReport
+        """
+        parts = {}
+        for part_name, limb_motion in step.limb_motions.items():
+            ctrl = self._controllers_.get(part_name, None)
+            if ctrl is None:
+                if self._logger_:
+                    self._logger_.warning('StepDispatcher: part <%s> ignored!', part_name)
+                continue
+            parts[part_name] = PartDispatch(ctrl, limb_motion.checkpoints, durations.get(part_name) if durations else None, tag=tag)
+        return self._run_(step.name, parts)
+
+    def dispatchPlan(self, step_plan, durations=None, tag='', blend_time=0.0, execution=None):
+        """
+        Plays the LimbPlans of a compiled step with their resolved controllers, as the threaded playback of the
+        plans does: the first checkpoint of each part lasts at least `blend_time`, the timeouts are scaled by the
+        time scale of `execution` (when it slows the action down) and no checkpoint is started once `execution`
+        is preempted.
+
+        Parameters
+        ----------
+        step_plan : StepPlan
+            The step to play (its gaze motion and custom calls are ignored).
+        durations : dict, optional
+            Part name -> per-checkpoint requested times (e.g. retimed StepProfile durations).
+        tag : str, optional
+            Tag prefix of the motions, followed by the part name.
+        execution : PlanExecution, optional
+            The running plan.
+
+        Returns
+        -------
+        DispatchReport
+        """
+        timeout_scale = max(1.0, execution.time_scale) if execution is not None else 1.0
+        parts = {}
+        for part_name, limb_plan in step_plan.limbs.items():
+            part_durations = durations.get(part_name) if durations else None
+            if blend_time > 0.0:
+                part_durations = list(part_durations) if part_durations is not None else [checkpoint.duration for checkpoint in limb_plan.checkpoints]
+                if part_durations:
+                    part_durations[0] = max(part_durations[0], blend_time)
+            parts[part_name] = PartDispatch(limb_plan.controller, limb_plan.checkpoints, part_durations, tag=tag + limb_plan.suffix,
+                                            timeout_scale=timeout_scale, execution=execution)
+        return self._run_(step_plan.name, parts)
+
+    def _run_(self, name, parts):
+        report = DispatchReport(name)
+        t0 = time.perf_counter()
+        active = [p for p in parts.values() if p.startNext()]
+        k = 0
+        while active:
+            k += 1
+            remaining = t0 + k*self._period_ - time.perf_counter()
+            if remaining > 0.0:
+                time.sleep(remaining)
+            now = time.perf_counter()
+            still_active = []
+            for p in active:
+                if p.poll(now) is None or p.startNext():
+                    still_active.append(p)
+            active = still_active
+
+        report.duration = time.perf_counter() - t0
+        for part_name, p in parts.items():
+            report.parts[part_name] = {'first_start': p.first_start, 'first_sent': p.first_sent, 'results': p.results, 'elapsed': p.elapsed}
+        if self._logger_:
+            self._logger_.debug('Step <%s> dispatched! duration=%.3f start_skew_ms=%.3f', name, report.duration, report.start_skew*1000.0)
+        return report
@@ -0,0 +1,215 @@
+# BSD 2-Clause License
+#
+# Copyright (c) 2025, Social Cognition in Human-Robot Interaction,
+#                     Istituto Italiano di Tecnologia, Genova
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+Module: limits.py
+
+This module provides vectorized validation and clamping of joint targets against the joint limits of the
+robot parts, for single poses as well as for whole iCubFullbodyAction objects.
+"""
+
+import numpy as np
+
+
+class JointLimits:
+    """
+    Joint limits of a robot part, indexed by joint index.
+
+    Attributes:
+        min_limits (numpy.ndarray): Lower limit of each joint.
+        max_limits (numpy.ndarray): Upper limit of each joint.
+    """
+    def __init__(self, min_limits, max_limits):
+        self.min_limits = np.asarray(min_limits, dtype=float)
+        self.max_limits = np.asarray(max_limits, dtype=float)
+
+    def violations(self, joints_list, target_joints, tolerance=0.0):
+        """
+        Parameters
+        ----------
+        joints_list : list of int
+            Joint indices of the targets.
+        target_joints : array_like
+            Joint targets, (J,) for a single pose or (K, J) for K poses.
+        tolerance : float, optional
+            Allowed excess over the limits.
+
+        Returns
+        -------
+        numpy.ndarray
+            Boolean mask, with the same shape of `target_joints`, of the targets outside the limits.
+        """
+        targets = np.asarray(target_joints, dtype=float)
+        return (targets < self.min_limits[joints_list] - tolerance) | (targets > self.max_limits[joints_list] + tolerance)
+
+    def isValid(self, joints_list, target_joints, tolerance=0.0):
+        return not self.violations(joints_list, target_joints, tolerance).any()
+
+    def clamp(self, joints_list, target_joints):
+        """
+        Returns:
+            numpy.ndarray: The targets clipped into the limits.
+        """
+        return np.clip(np.asarray(target_joints, dtype=float), self.min_limits[joints_list], self.max_limits[joints_list])
+
+    def toJSON(self):
+        return {'min_limits': self.min_limits.tolist(),
+                'max_limits': self.max_limits.tolist()}
+
+
+class ValidationReport:
+    """
+    Result of the validation of an action against the joint limits.
+
+    Attributes:
+        name (str): Name of the validated object.
+        violations (list[dict]): One entry per invalid joint target.
+        clamped (int): Number of targets clamped into the limits.
+        checkpoints (int): Number of validated checkpoints.
+    """
+    def __init__(self, name=''):
+        self.name = name
+        self.violations = []
+        self.clamped = 0
+        self.checkpoints = 0
+
+    @property
+    def valid(self):
+        return len(self.violations) == 0
+
+    def addViolation(self, step, part, checkpoint, joint, target, min_limit=None, max_limit=None, reason='limits'):
+        self.violations.append({'step': step,
+                                'part': part,
+                                'checkpoint': checkpoint,
+                                'joint': joint,
+                                'target': target,
+                                'min': min_limit,
+                                'max': max_limit,
+                                'reason': reason})
+
+    def summary(self, max_items=5):
+        if self.valid:
+            return "Action <%s> is valid (%d checkpoints)" % (self.name, self.checkpoints)
+        items = []
+        for v in self.violations[:max_items]:
+            if v['reason'] == 'limits':
+                items.append("step=%s part=%s checkpoint=%d joint=%d target=%.2f limits=[%.2f, %.2f]" % (v['step'], v['part'], v['checkpoint'], v['joint'], v['target'], v['min'], v['max']))
+            else:
+                items.append("step=%s part=%s checkpoint=%d %s" % (v['step'], v['part'], v['checkpoint'], v['reason']))
+        if len(self.violations) > max_items:
+            items.append("... %d more" % (len(self.violations) - max_items))
+        return "Action <%s> has %d invalid joint targets: %s" % (self.name, len(self.violations), '; '.join(items))
+
+    def toJSON(self):
+        return {'name': self.name,
+                'valid': self.valid,
+                'checkpoints': self.checkpoints,
+                'clamped': self.clamped,
+                'violations': self.violations}
+
+    def __str__(self):
+        return self.summary()
+
+
+class ActionValidator:
+    """
+    Validates (and optionally clamps) all the joint targets of iCubFullbodyAction objects.
+
+    The checkpoints of each limb motion sharing the same joints list are stacked in a single array and
+    checked in one vectorized operation.
+    """
+    def __init__(self, limits, tolerance=0.0):
+        """
+        Args:
+            limits (dict): Part name -> JointLimits of the corresponding robot part.
+            tolerance (float): Allowed excess over the limits.
+        """
+        self._limits_ = limits
+        self._tolerance_ = tolerance
+
+    def validateLimbMotion(self, limb_motion, report=None, step_name='', clamp=False):
+        if report is None:
+            report = ValidationReport(limb_motion.part.name)
+        part_name = limb_motion.part.name
+        report.checkpoints += len(limb_motion.checkpoints)
+        if not part_name in self._limits_.keys():
+            return report
+        limits = self._limits_[part_name]
+
+        groups = {}
+        for i, checkpoint in enumerate(limb_motion.checkpoints):
+            joints_list = checkpoint.pose.joints_list
+            if not joints_list:
+                joints_list = limb_motion.part.joints_list
+            if len(checkpoint.pose.target_joints) < len(joints_list):
+                report.addViolation(step_name, part_name, i, None, None, reason='expected %d targets, got %d' % (len(joints_list), len(checkpoint.pose.target_joints)))
+                continue
+            if max(joints_list) >= limits.min_limits.size:
+                report.addViolation(step_name, part_name, i, None, None, reason='joint index %d out of range' % max(joints_list))
+                continue
+            groups.setdefault(tuple(joints_list), []).append(i)
+
+        for joints_list, indexes in groups.items():
+            joints_list = list(joints_list)
+            targets = np.array([limb_motion.checkpoints[i].pose.target_joints[:len(joints_list)] for i in indexes], dtype=float)
+            mask = limits.violations(joints_list, targets, self._tolerance_)
+            if not mask.any():
+                continue
+            if clamp:
+                clamped = limits.clamp(joints_list, targets)
+                for row in np.unique(np.nonzero(mask)[0]):
+                    pose = limb_motion.checkpoints[indexes[row]].pose
+                    pose.target_joints = clamped[row].tolist() + list(pose.target_joints[len(joints_list):])
+                report.clamped += int(np.count_nonzero(mask))
+            else:
+                for row, col in zip(*np.nonzero(mask)):
+                    j = joints_list[col]
+                    report.addViolation(step_name, part_name, indexes[row], j, float(targets[row, col]), float(limits.min_limits[j]), float(limits.max_limits[j]))
+        return report
+
+    def validateAction(self, action, clamp=False):
+        """
+        Parameters
+        ----------
+        action : iCubFullbodyAction
+            The action to validate.
+        clamp : bool, optional
+            If True, the invalid targets are clamped into the limits (modifying the action) instead of being reported.
+
+        Returns
+        -------
+        ValidationReport
+        """
+        report = ValidationReport(action.name)
+        for step in action.steps:
+            for limb_motion in step.limb_motions.values():
+                self.validateLimbMotion(limb_motion, report=report, step_name=step.name, clamp=clamp)
+        if report.clamped:
+            action.invalidate()
+        return report
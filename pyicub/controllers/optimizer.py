@@ -0,0 +1,407 @@
+# BSD 2-Clause License
+#
+# Copyright (c) 2025, Social Cognition in Human-Robot Interaction,
+#                     Istituto Italiano di Tecnologia, Genova
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+Module: optimizer.py
+
+This module provides an optimisation pass for the checkpoints of LimbMotion objects and whole
+iCubFullbodyAction objects: tolerance-bounded simplification (Douglas-Peucker in joint space), uniform
+resampling and re-timing. Each removed checkpoint saves a full command/wait cycle when the action is played.
+StepMerger joins consecutive steps that move disjoint robot parts, so that they are played together.
+"""
+
+import copy
+
+import numpy as np
+
+from pyicub.controllers.trajectory import douglasPeucker
+from pyicub.controllers.position import ICUB_PARTS
+
+
+class OptimizationReport:
+    """
+    Checkpoint counts and predicted durations before and after an optimisation pass.
+
+    Attributes:
+        entries (list): One dict per optimized limb motion with step, part, checkpoints_before, checkpoints_after,
+                        duration_before and duration_after.
+    """
+    def __init__(self, name=''):
+        self.name = name
+        self.entries = []
+
+    def add(self, step, part, checkpoints_before, checkpoints_after, duration_before, duration_after):
+        self.entries.append({'step': step,
+                             'part': part,
+                             'checkpoints_before': checkpoints_before,
+                             'checkpoints_after': checkpoints_after,
+                             'duration_before': duration_before,
+                             'duration_after': duration_after})
+
+    def _total_(self, key):
+        return sum(entry[key] for entry in self.entries)
+
+    def _duration_(self, key):
+        steps = {}
+        for entry in self.entries:
+            steps[entry['step']] = max(steps.get(entry['step'], 0.0), entry[key])
+        return float(sum(steps.values()))
+
+    @property
+    def checkpoints_before(self):
+        return self._total_('checkpoints_before')
+
+    @property
+    def checkpoints_after(self):
+        return self._total_('checkpoints_after')
+
+    @property
+    def duration_before(self):
+        """
+        Returns:
+            float: predicted duration before the pass (sum over the steps of their slowest limb motion).
+        """
+        return self._duration_('duration_before')
+
+    @property
+    def duration_after(self):
+        return self._duration_('duration_after')
+
+    def summary(self):
+        return "Action <%s>: checkpoints %d -> %d, predicted duration %.3fs -> %.3fs" % (self.name,
+                                                                                          self.checkpoints_before,
+                                                                                          self.checkpoints_after,
+                                                                                          self.duration_before,
+                                                                                          self.duration_after)
+
+    def toJSON(self):
+        return {'name': self.name,
+                'checkpoints_before': self.checkpoints_before,
+                'checkpoints_after': self.checkpoints_after,
+                'duration_before': self.duration_before,
+                'duration_after': self.duration_after,
+                'entries': self.entries}
+
+    def __str__(self):
+        return self.summary()
+
+
+class ActionOptimizer:
+    """
+    Reduces, resamples and re-times the checkpoints of limb motions.
+
+    Checkpoints are processed in runs of consecutive checkpoints sharing the same joints_list. The first
+    checkpoint of a run (whose start pose depends on the robot state) is never changed. Runs made only of
+    speed-driven checkpoints (duration 0.0) stay speed-driven; otherwise the durations of the kept checkpoints
+    are the times elapsed between them in the original motion.
+    """
+
+    CHECKPOINT_OVERHEAD = 0.05
+
+    def __init__(self, tolerance=0.5, resample_period=None, time_scale=1.0, respect_speeds=True, speed_scaling=1.0):
+        """
+        Args:
+            tolerance (float): Maximum joint deviation (degrees) allowed when removing checkpoints (0.0 to disable).
+            resample_period (float): If set, timed runs are resampled uniformly at this period before the simplification.
+            time_scale (float): Factor applied to the durations of the timed checkpoints (e.g. 0.5 plays twice as fast).
+            respect_speeds (bool): Never shorten a timed checkpoint below the time needed at the joints maximum speeds.
+            speed_scaling (float): Scaling factor of the joints speeds (see PositionController.SPEED_SCALING).
+        """
+        self.tolerance = tolerance
+        self.resample_period = resample_period
+        self.time_scale = time_scale
+        self.respect_speeds = respect_speeds
+        self.speed_scaling = speed_scaling
+
+    def _runs_(self, checkpoints):
+        runs = []
+        for i, checkpoint in enumerate(checkpoints):
+            joints_list = list(checkpoint.pose.joints_list) if checkpoint.pose.joints_list else None
+            if runs and runs[-1][0] == joints_list:
+                runs[-1][1].append(i)
+            else:
+                runs.append((joints_list, [i]))
+        return runs
+
+    def _segments_(self, positions, speeds, durations):
+        """
+        Returns:
+            tuple of numpy.ndarray: the minimum time of each segment at the (scaled) maximum speeds and
+            the time of each segment (the explicit duration if set), both (K,) with 0.0 for the first checkpoint.
+        """
+        disp = np.abs(np.diff(positions, axis=0))
+        max_speeds = speeds[1:]*self.speed_scaling
+        times = np.zeros_like(disp)
+        np.divide(disp, max_speeds, out=times, where=max_speeds > 0.0)
+        min_times = np.concatenate([[0.0], times.max(axis=1)]) if disp.size else np.zeros(len(positions))
+        seg = np.where(durations > 0.0, durations, min_times)
+        seg[0] = 0.0
+        return min_times, seg
+
+    def predictDuration(self, limb_motion):
+        """
+        Returns:
+            float: predicted duration of a limb motion from its first checkpoint, including CHECKPOINT_OVERHEAD per checkpoint.
+        """
+        total = 0.0
+        for joints_list, indices in self._runs_(limb_motion.checkpoints):
+            positions, speeds, durations = self._arrays_(limb_motion, indices)
+            _, seg = self._segments_(positions, speeds, durations)
+            total += float(seg.sum()) + durations[0]
+        return total + self.CHECKPOINT_OVERHEAD*len(limb_motion.checkpoints)
+
+    def _arrays_(self, limb_motion, indices):
+        checkpoints = [limb_motion.checkpoints[i] for i in indices]
+        J = min(len(c.pose.target_joints) for c in checkpoints)
+        positions = np.array([c.pose.target_joints[:J] for c in checkpoints], dtype=float)
+        speeds = np.zeros((len(checkpoints), J))
+        for k, c in enumerate(checkpoints):
+            joints_speed = c.joints_speed if c.joints_speed else limb_motion.part.joints_speed
+            n = min(J, len(joints_speed))
+            speeds[k, :n] = joints_speed[:n]
+        durations = np.array([c.duration for c in checkpoints], dtype=float)
+        return positions, speeds, durations
+
+    def _optimizeRun_(self, limb_motion, indices):
+        checkpoints = [limb_motion.checkpoints[i] for i in indices]
+        if len(checkpoints) < 3 and self.time_scale == 1.0 and self.resample_period is None:
+            return checkpoints
+        positions, speeds, durations = self._arrays_(limb_motion, indices)
+        timed = bool((durations[1:] > 0.0).any())
+        min_times, seg = self._segments_(positions, speeds, durations)
+        times = np.cumsum(seg)
+
+        first = checkpoints[0]
+        template = checkpoints[-1]
+        if timed and self.resample_period and times[-1] > 0.0:
+            n = int(np.ceil(times[-1]/self.resample_period - 1e-9))
+            new_times = np.append(np.arange(0, n)*self.resample_period, times[-1])
+            positions = np.stack([np.interp(new_times, times, positions[:, j]) for j in range(positions.shape[1])], axis=1)
+            times = new_times
+            speeds = np.repeat(speeds[-1:], len(times), axis=0)
+
+        keep = douglasPeucker(times, positions, self.tolerance) if self.tolerance > 0.0 else np.arange(len(times))
+        kept_times = times[keep]
+        kept_positions = positions[keep]
+        new_durations = np.concatenate([[first.duration], np.diff(kept_times)]) if timed else np.zeros(len(keep))
+        if timed:
+            new_durations[1:] *= self.time_scale
+            if self.respect_speeds:
+                kept_min, _ = self._segments_(kept_positions, speeds[keep], np.zeros(len(keep)))
+                new_durations[1:] = np.maximum(new_durations[1:], kept_min[1:])
+
+        res = [first]
+        for k in range(1, len(keep)):
+            source = checkpoints[keep[k]] if self.resample_period is None or not timed else template
+            checkpoint = copy.copy(source)
+            checkpoint.pose = copy.copy(source.pose)
+            checkpoint.pose.target_joints = kept_positions[k].tolist() + list(source.pose.target_joints[positions.shape[1]:])
+            checkpoint.duration = float(new_durations[k])
+            res.append(checkpoint)
+        return res
+
+    def optimizeLimbMotion(self, limb_motion, report=None, step_name=''):
+        """
+        Optimizes the checkpoints of a LimbMotion in place.
+
+        Returns:
+            OptimizationReport: the report (the given one, if any, extended with this limb motion).
+        """
+        if report is None:
+            report = OptimizationReport(limb_motion.part.name)
+        before = len(limb_motion.checkpoints)
+        duration_before = self.predictDuration(limb_motion)
+        checkpoints = []
+        for joints_list, indices in self._runs_(limb_motion.checkpoints):
+            checkpoints.extend(self._optimizeRun_(limb_motion, indices))
+        limb_motion.checkpoints = checkpoints
+        report.add(step_name, limb_motion.part.name, before, len(checkpoints), duration_before, self.predictDuration(limb_motion))
+        return report
+
+    def optimizeAction(self, action):
+        """
+        Optimizes in place all the limb motions of an iCubFullbodyAction.
+
+        Returns:
+            OptimizationReport
+        """
+        report = OptimizationReport(action.name)
+        for step in action.steps:
+            for limb_motion in step.limb_motions.values():
+                self.optimizeLimbMotion(limb_motion, report, step.name)
+        action.invalidate()
+        return report
+
+
+class MergeReport:
+    """
+    Steps merged by a StepMerger pass and predicted durations (see pyicub.analyzer) before and after it.
+
+    Attributes:
+        groups (list): The names of the steps of each merged group.
+    """
+    def __init__(self, name=''):
+        self.name = name
+        self.groups = []
+        self.steps_before = 0
+        self.steps_after = 0
+        self.duration_before = 0.0
+        self.duration_after = 0.0
+
+    @property
+    def saving(self):
+        return self.duration_before - self.duration_after
+
+    def summary(self):
+        return "Action <%s>: steps %d -> %d, predicted duration %.3fs -> %.3fs (%.3fs saved)" % (self.name,
+                                                                                                 self.steps_before,
+                                                                                                 self.steps_after,
+                                                                                                 self.duration_before,
+                                                                                                 self.duration_after,
+                                                                                                 self.saving)
+
+    def toJSON(self):
+        return {'name': self.name,
+                'groups': [list(group) for group in self.groups],
+                'steps_before': self.steps_before,
+                'steps_after': self.steps_after,
+                'duration_before': self.duration_before,
+                'duration_after': self.duration_after,
+                'saving': self.saving}
+
+    def __str__(self):
+        return self.summary()
+
+
+class StepMerger:
+    """
+    Merges runs of consecutive waited steps that can be played together (iCubFullbodyStep.join semantics).
+
+    A step joins the previous one when the previous one is waited for, it has no offset (its start would
+    otherwise depend on the end of the previous one), the robot parts of their limb motions are disjoint, at most
+    one of them has a gaze motion and the gaze does not share the head with a limb motion. Custom calls are
+    ordering points (e.g. a speech after a gesture): steps with custom calls are merged only with `merge_calls`.
+    The merged step is waited for if the last step of its group was.
+
+    The parts (and the gaze) last moved by a step that is not waited for may still be moving when the next steps
+    start: a step using them is never merged, since it would start earlier, while they are still moving.
+    """
+
+    GAZE_PARTS = (ICUB_PARTS.HEAD,)
+
+    def __init__(self, merge_calls=False, analyzer=None):
+        self.merge_calls = merge_calls
+        self.analyzer = analyzer
+
+    def _resources_(self, step):
+        parts = set(limb_motion.part.robot_part for limb_motion in step.limb_motions.values())
+        gaze = step.gaze_motion is not None and bool(step.gaze_motion.checkpoints)
+        return parts, gaze
+
+    def _overlap_(self, resources, step_resources):
+        parts, gaze = resources
+        step_parts, step_gaze = step_resources
+        if parts & step_parts:
+            return True
+        if gaze and step_gaze:
+            return True
+        return bool((gaze and step_parts.intersection(self.GAZE_PARTS)) or (step_gaze and parts.intersection(self.GAZE_PARTS)))
+
+    def canMerge(self, previous, wait_for_previous, step, in_flight=None):
+        """
+        Args:
+            in_flight (tuple): The parts (set) and the gaze (bool) that may still be moving because of earlier steps
+                               not waited for.
+        """
+        if not wait_for_previous or step.offset_ms:
+            return False
+        if not self.merge_calls and (previous.custom_calls or step.custom_calls):
+            return False
+        step_resources = self._resources_(step)
+        if in_flight is not None and self._overlap_(in_flight, step_resources):
+            return False
+        return not self._overlap_(self._resources_(previous), step_resources)
+
+    def _join_(self, group):
+        merged = copy.copy(group[0])
+        merged.limb_motions = dict(merged.limb_motions)
+        merged.custom_calls = list(merged.custom_calls)
+        for step in group[1:]:
+            merged.join(step)
+        merged.name = '+'.join(step.name for step in group)
+        return merged
+
+    def mergeAction(self, action):
+        """
+        Merges in place the steps of an iCubFullbodyAction.
+
+        Returns:
+            MergeReport
+        """
+        if self.analyzer is None:
+            from pyicub.analyzer import ActionAnalyzer
+            self.analyzer = ActionAnalyzer()
+        report = MergeReport(action.name)
+        report.steps_before = len(action.steps)
+        report.duration_before = self.analyzer.analyze(action).duration
+        groups = []
+        # the resources whose last command comes from a step not waited for, before the last group
+        in_flight_parts, in_flight_gaze = set(), False
+        for step, wait in zip(action.steps, action.wait_for_steps):
+            if groups:
+                group, group_wait = groups[-1]
+                merged = self._join_(group) if len(group) > 1 else group[0]
+                if self.canMerge(merged, group_wait, step, (in_flight_parts, in_flight_gaze)):
+                    group.append(step)
+                    groups[-1] = (group, wait)
+                    continue
+                for grouped in group:
+                    parts, gaze = self._resources_(grouped)
+                    if group_wait:
+                        in_flight_parts -= parts
+                        in_flight_gaze = in_flight_gaze and not gaze
+                    else:
+                        in_flight_parts |= parts
+                        in_flight_gaze = in_flight_gaze or gaze
+            groups.append(([step], wait))
+        steps = []
+        wait_for_steps = []
+        for group, wait in groups:
+            if len(group) > 1:
+                report.groups.append([step.name for step in group])
+                steps.append(self._join_(group))
+            else:
+                steps.append(group[0])
+            wait_for_steps.append(wait)
+        action.steps = steps
+        action.wait_for_steps = wait_for_steps
+        action.invalidate()
+        report.steps_after = len(steps)
+        report.duration_after = self.analyzer.analyze(action).duration
+        return report
@@ -0,0 +1,308 @@
+# BSD 2-Clause License
+#
+# Copyright (c) 2025, Social Cognition in Human-Robot Interaction,
+#                     Istituto Italiano di Tecnologia, Genova
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+Module: planner.py
+
+This module provides a NumPy-based speed profile planner for position controlled motions.
+Given the current joints configuration and a target pose, it computes the reference speed of each joint
+so that all the joints of a checkpoint reach their target at the same time, and it extends the same rule
+to all the limb motions of an iCubFullbodyStep.
+"""
+
+import numpy as np
+
+
+class JointsSpeedProfile:
+    """
+    Reference speeds planned for a single joint-space motion.
+
+    Attributes:
+        joints_list (list[int]): Joint indices the profile refers to.
+        displacements (numpy.ndarray): Absolute displacement of each joint.
+        speeds (numpy.ndarray): Reference speed of each joint (0.0 for joints that do not move).
+        duration (float): Predicted duration of the motion in seconds.
+        min_duration (float): Duration of the motion at the (scaled) maximum joint speeds, the shortest one allowed.
+    """
+    def __init__(self, joints_list, displacements, speeds, duration, min_duration=None):
+        self.joints_list = joints_list
+        self.displacements = displacements
+        self.speeds = speeds
+        self.duration = duration
+        self.min_duration = duration if min_duration is None else min_duration
+
+    @property
+    def moving(self):
+        """
+        Returns:
+            numpy.ndarray: Boolean mask of the joints that actually need to move.
+        """
+        return self.displacements > SpeedProfilePlanner.MIN_DISPLACEMENT
+
+    def retimed(self, duration):
+        """
+        Returns:
+            JointsSpeedProfile: the same motion stretched (or shrunk) to the given duration.
+        """
+        if self.duration <= 0.0 or duration <= 0.0:
+            return self
+        return JointsSpeedProfile(self.joints_list, self.displacements, self.speeds*(self.duration/duration), duration, self.min_duration)
+
+    def toJSON(self):
+        return {'joints_list': list(self.joints_list),
+                'displacements': self.displacements.tolist(),
+                'speeds': self.speeds.tolist(),
+                'duration': self.duration,
+                'min_duration': self.min_duration}
+
+
+class StepProfile:
+    """
+    Predicted timing of an iCubFullbodyStep.
+
+    Attributes:
+        durations (dict): Part name -> list of per-checkpoint durations (seconds).
+        profiles (dict): Part name -> list of JointsSpeedProfile, one per checkpoint.
+        predicted (dict): Part name -> list of per-checkpoint durations learned by a MotionProfiler (empty without it).
+    """
+    def __init__(self):
+        self.durations = {}
+        self.profiles = {}
+        self.predicted = {}
+
+    @property
+    def duration(self):
+        """
+        Returns:
+            float: Predicted duration of the whole step, i.e. the duration of its slowest limb motion.
+        """
+        if not self.durations:
+            return 0.0
+        return max(self.limbDuration(part_name) for part_name in self.durations.keys())
+
+    @property
+    def predicted_duration(self):
+        """
+        Returns:
+            float: Duration of the step learned by a MotionProfiler, or the nominal duration without it.
+        """
+        if not self.predicted:
+            return self.duration
+        return max(float(sum(durations)) for durations in self.predicted.values())
+
+    def limbDuration(self, part_name):
+        return float(sum(self.durations[part_name]))
+
+    def retimed(self, time_scale, predicted=False):
+        """
+        Returns:
+            dict: Part name -> per-checkpoint durations multiplied by `time_scale` (the learned durations if
+            `predicted` and available). A shortened checkpoint is never faster than the maximum joint speeds, or
+            than it was if it already exceeded them.
+        """
+        source = self.predicted if predicted and self.predicted else self.durations
+        return {part_name: [max(d*time_scale, min(d, profile.min_duration)) for d, profile in zip(durations, self.profiles[part_name])]
+                for part_name, durations in source.items()}
+
+    def toJSON(self):
+        return {'duration': self.duration,
+                'durations': self.durations,
+                'predicted_duration': self.predicted_duration,
+                'predicted': self.predicted}
+
+
+class SpeedProfilePlanner:
+    """
+    Computes time-synchronized reference speeds for position controlled motions.
+
+    With a requested time the speed of each joint is simply its displacement divided by that time.
+    Without it, the duration of the motion is set by the joint that needs more time at its maximum speed
+    (scaled by speed_scaling) and every other joint is slowed down to arrive at the same instant.
+    """
+
+    MIN_DISPLACEMENT = 0.001
+
+    def __init__(self, speed_scaling=1.0, synchronize=True):
+        """
+        Args:
+            speed_scaling (float): Scaling factor in (0.0, 1.0] applied to the maximum joint speeds.
+            synchronize (bool): If False, each joint moves at its own maximum speed (legacy behaviour).
+        """
+        self.speed_scaling = speed_scaling
+        self.synchronize = synchronize
+
+    def plan(self, start, target, max_speeds, req_time=0.0, joints_list=None, speed_scaling=None, synchronize=None):
+        """
+        Plans the reference speeds of a motion from start to target.
+
+        Parameters
+        ----------
+        start : array_like
+            Current position of the joints to move.
+        target : array_like
+            Target position of the joints to move.
+        max_speeds : array_like
+            Maximum speed of each joint. Used only if `req_time` is less than or equal to 0.
+        req_time : float, optional
+            The requested time to complete the motion.
+        joints_list : list of int, optional
+            Joint indices the positions refer to (stored in the returned profile).
+        speed_scaling : float, optional
+            Overrides the planner speed scaling for this motion.
+        synchronize : bool, optional
+            Overrides the planner synchronization for this motion.
+
+        Returns
+        -------
+        JointsSpeedProfile
+            The planned speeds and the predicted duration.
+        """
+        if speed_scaling is None:
+            speed_scaling = self.speed_scaling
+        if synchronize is None:
+            synchronize = self.synchronize
+        start = np.asarray(start, dtype=float)
+        target = np.asarray(target, dtype=float)
+        disp = np.abs(target - start)
+        if joints_list is None:
+            joints_list = list(range(0, disp.size))
+
+        if req_time > 0.0:
+            # the maximum speeds only bound the retiming (see StepProfile.retimed): they may be missing
+            speeds = np.zeros(disp.size)
+            if max_speeds is not None:
+                n = min(disp.size, len(max_speeds))
+                speeds[:n] = max_speeds[:n]
+            max_speeds = speeds
+        max_speeds = np.asarray(max_speeds[:disp.size], dtype=float)*speed_scaling
+        moving = (disp > self.MIN_DISPLACEMENT) & (max_speeds > 0.0)
+        times = np.zeros(disp.size)
+        np.divide(disp, max_speeds, out=times, where=moving)
+        duration = float(times.max()) if disp.size else 0.0
+
+        if req_time > 0.0:
+            return JointsSpeedProfile(joints_list, disp, disp/req_time, float(req_time), duration)
+
+        speeds = np.zeros(disp.size)
+        if duration > 0.0:
+            if synchronize:
+                speeds[moving] = disp[moving]/duration
+            else:
+                speeds[moving] = max_speeds[moving]
+        return JointsSpeedProfile(joints_list, disp, speeds, duration, duration)
+
+    def planLimbMotion(self, limb_motion, encoders):
+        """
+        Plans every checkpoint of a LimbMotion, each one starting where the previous one ends.
+
+        Parameters
+        ----------
+        limb_motion : LimbMotion
+            The limb motion to plan.
+        encoders : array_like
+            Current encoders of the whole robot part (indexed by joint index).
+
+        Returns
+        -------
+        list of JointsSpeedProfile
+        """
+        positions = np.array(encoders, dtype=float)
+        profiles = []
+        for checkpoint in limb_motion.checkpoints:
+            joints_list = checkpoint.pose.joints_list
+            if not joints_list:
+                joints_list = limb_motion.part.joints_list
+            joints_speed = checkpoint.joints_speed
+            if not joints_speed:
+                joints_speed = limb_motion.part.joints_speed
+            target = np.asarray(checkpoint.pose.target_joints[:len(joints_list)], dtype=float)
+            profile = self.plan(start=positions[joints_list],
+                                target=target,
+                                max_speeds=joints_speed,
+                                req_time=checkpoint.duration,
+                                joints_list=joints_list)
+            positions[joints_list] = target
+            profiles.append(profile)
+        return profiles
+
+    @staticmethod
+    def isTimed(step):
+        """
+        Returns:
+            bool: True if every checkpoint of the step has an explicit duration. planStep() would leave all of
+            them untouched, so the runtime planning (and its encoder reads) can be skipped.
+        """
+        return all(checkpoint.duration > 0.0 for limb_motion in step.limb_motions.values() for checkpoint in limb_motion.checkpoints)
+
+    def planStep(self, step, encoders, profiler=None):
+        """
+        Plans all the limb motions of an iCubFullbodyStep so that they complete together.
+
+        Limb motions driven only by speeds (all checkpoint durations equal to 0) are stretched to the duration
+        of the slowest limb motion of the step, so their joints never exceed the planned maximum speeds.
+        Limb motions with explicit durations are left untouched.
+
+        Parameters
+        ----------
+        step : iCubFullbodyStep
+            The step to plan.
+        encoders : dict
+            Part name -> current encoders of the corresponding robot part. Parts missing from the dictionary are ignored.
+        profiler : MotionProfiler, optional
+            If given, the learned duration of each checkpoint is stored in `StepProfile.predicted`.
+
+        Returns
+        -------
+        StepProfile
+        """
+        step_profile = StepProfile()
+        for part_name, limb_motion in step.limb_motions.items():
+            if not part_name in encoders.keys():
+                continue
+            profiles = self.planLimbMotion(limb_motion, encoders[part_name])
+            step_profile.profiles[part_name] = profiles
+            step_profile.durations[part_name] = [profile.duration for profile in profiles]
+
+        if self.synchronize:
+            step_duration = step_profile.duration
+            for part_name, limb_motion in step.limb_motions.items():
+                if not part_name in step_profile.durations.keys():
+                    continue
+                if any(checkpoint.duration > 0.0 for checkpoint in limb_motion.checkpoints):
+                    continue
+                limb_duration = step_profile.limbDuration(part_name)
+                if limb_duration > 0.0:
+                    ratio = step_duration/limb_duration
+                    step_profile.durations[part_name] = [d*ratio for d in step_profile.durations[part_name]]
+
+        if profiler is not None:
+            for part_name, profiles in step_profile.profiles.items():
+                step_profile.predicted[part_name] = [profiler.predict(part_name, profile.retimed(duration))
+                                                     for profile, duration in zip(profiles, step_profile.durations[part_name])]
+        return step_profile
@@ -41,7 +41,14 @@ except ImportError:
 
 import os
 import time
+import logging
+import threading
+import numpy as np
 import pyicub.utils as utils
+from pyicub.controllers.planner import SpeedProfilePlanner
+from pyicub.controllers.limits import JointLimits
+from pyicub.controllers.profiler import MotionProfiler
+from pyicub.core.motionlog import MotionLog, MotionEvent, BinaryMotionSink
 
 
 DEFAULT_TIMEOUT = 30.0
@@ -154,7 +161,7 @@ class RemoteControlboard:
         props = yarp.Property()
         props.put("device","remote_controlboard")
         props.put("local","/pyicub/" + self.__pid__ + "/" + self.__robot_name__ + "/" + self.__part__.name)
-        props.put("remote", "/" + self.__robot_name__ + "/" + self.__part__.robot_part)
+        props.put("remote", self.remote)
         return props
 
     def getDriver(self):
@@ -163,6 +170,91 @@ class RemoteControlboard:
         """
         return self.__driver__
 
+    @property
+    def remote(self):
+        return "/" + self.__robot_name__ + "/" + self.__part__.robot_part
+
+class MotionHandle:
+    """
+    A motion started with PositionController.startMove().
+
+    Attributes:
+        tag (str): Tag of the motion.
+        joints_list (list[int]): Moved joints.
+        target_joints (list[float]): Targets of the moved joints.
+        joints_speed (list[float]): Maximum speeds of the moved joints.
+        req_time (float): Requested duration.
+        timeout (float): Timeout of the motion.
+        profile (JointsSpeedProfile): Planned motion.
+        t0 (float): perf_counter() time of the request.
+        t_start (float): perf_counter() time of the first command.
+    """
+    def __init__(self, tag, joints_list, target_joints, joints_speed, req_time, timeout, profile, t0, t_start):
+        self.tag = tag
+        self.joints_list = joints_list
+        self.target_joints = target_joints
+        self.joints_speed = joints_speed
+        self.req_time = req_time
+        self.timeout = timeout
+        self.profile = profile
+        self.t0 = t0
+        self.t_start = t_start
+
+    @property
+    def motion_time(self):
+        return self.profile.duration
+
+    @property
+    def moving_joints(self):
+        return [j for j, moving in zip(self.joints_list, self.profile.moving) if moving]
+
+
+class ControlModeCache:
+    """
+    Control mode of each joint of a remote control board as last read or commanded by pyicub.
+
+    The cache is shared by all the PositionController objects connected to the same board (e.g. HEAD, NECK
+    and EYES), whose joints_list index the same joints. Unknown modes are stored as UNKNOWN.
+    """
+
+    UNKNOWN = -1
+
+    _caches_ = {}
+    _registry_lock_ = threading.Lock()
+
+    @classmethod
+    def getCache(cls, remote, joints_nr):
+        with cls._registry_lock_:
+            cache = cls._caches_.get(remote, None)
+            if cache is None or len(cache.modes) != joints_nr:
+                cache = ControlModeCache(joints_nr)
+                cls._caches_[remote] = cache
+            return cache
+
+    def __init__(self, joints_nr):
+        self.modes = np.full(joints_nr, self.UNKNOWN, dtype=np.int64)
+        self.lock = threading.Lock()
+
+    def refresh(self, icontrolmode):
+        """
+        Reads the control modes of all the joints with a single getControlModes call.
+        """
+        with self.lock:
+            modes = yarp.IVector(len(self.modes))
+            if icontrolmode.getControlModes(modes):
+                self.modes[:] = [modes[j] for j in range(len(self.modes))]
+            else:
+                self.modes[:] = [icontrolmode.getControlMode(j) for j in range(len(self.modes))]
+        return self.modes
+
+    def invalidate(self, joints_list=None):
+        with self.lock:
+            if joints_list is None:
+                self.modes[:] = self.UNKNOWN
+            else:
+                self.modes[list(joints_list)] = self.UNKNOWN
+
+
 class PositionController:
     """
     Controls joint movement of a robot part.
@@ -172,6 +264,15 @@ class PositionController:
 
     SPEED_SCALING = 1.0
 
+    SYNC_JOINTS = True
+    TIGHT_TIMEOUT = True
+    TIMEOUT_FACTOR = 1.5
+    TIMEOUT_MARGIN = 2.0
+
+    CACHE_CONTROL_MODES = True
+    VALIDATE_LIMITS = True
+    CLAMP_TO_LIMITS = False
+
     def __init__(self, robot_name, part, logger):
         """
         Initializes the position controller.
@@ -188,8 +289,14 @@ class PositionController:
         self.__IControlLimits__   = None
         self.__IControlMode__   = None
         self.__IPositionControl__   = None
+        self.__IPositionDirect__   = None
         self.__joints__   = None
         self.__waitMotionDone__ = self.waitMotionDone
+        self.__planner__ = SpeedProfilePlanner()
+        self.__limits__ = None
+        self.__motionlog__ = MotionLog(logger)
+        self.__profiler__ = None
+        self.__modes__ = None
 
     def isValid(self):
         return self.PolyDriver.isValid()
@@ -202,7 +309,11 @@ class PositionController:
         self.__IControlLimits__   = self.PolyDriver.viewIControlLimits()
         self.__IControlMode__     = self.PolyDriver.viewIControlMode()
         self.__IPositionControl__ = self.PolyDriver.viewIPositionControl()
+        self.__IPositionDirect__  = self.PolyDriver.viewIPositionDirect()
         self.__joints__           = self.__IPositionControl__.getAxes()
+        self.refreshJointLimits()
+        self.__modes__ = ControlModeCache.getCache(self.__driver__.remote, self.__joints__)
+        self.refreshControlModes()
     
     @property
     def PolyDriver(self):
@@ -221,9 +332,45 @@ class PositionController:
         return self.__part__
 
 
+    @property
+    def motionlog(self):
+        return self.__motionlog__
+
+    def setMotionSink(self, sink: BinaryMotionSink):
+        """
+        Attaches a binary sink receiving every motion event of this controller, regardless
+        of the logging level. Pass None to detach it.
+        """
+        self.__motionlog__.setSink(sink)
+
+    @property
+    def profiler(self):
+        return self.__profiler__
+
+    def setProfiler(self, profiler: MotionProfiler):
+        """
+        Attaches a MotionProfiler recording the actual duration of every move and providing adaptive timeouts.
+        Pass None to detach it.
+        """
+        self.__profiler__ = profiler
+
     def getIPositionControl(self):
         return self.__IPositionControl__
 
+    def getIPositionDirect(self):
+        return self.__IPositionDirect__
+
+    def createPositionDirectBuffers(self, joints_list):
+        """
+        Returns:
+            tuple: (yarp.IVector, yarp.DVector) the joint indices and the references of the subset
+            IPositionDirect.setPositions(n_joint, joints, refs) call, to be refilled and reused at each setpoint.
+        """
+        joints = yarp.IVector(len(joints_list))
+        for i, j in enumerate(joints_list):
+            joints[i] = j
+        return joints, yarp.DVector(len(joints_list))
+
     def getIEncoders(self):
         return self.__IEncoders__
 
@@ -242,6 +389,21 @@ class PositionController:
             yarp.delay(0.1)
         return encs
 
+    def getEncodersArray(self):
+        """
+        Returns the current joint positions as a numpy array.
+        """
+        encs = self.getEncoders()
+        return np.array([encs[j] for j in range(0, self.__joints__)])
+
+    @property
+    def planner(self):
+        """
+        Returns:
+            SpeedProfilePlanner: The planner computing the joints reference speeds.
+        """
+        return self.__planner__
+
     def getEncodersSpeeds(self):
         """
         Returns the current joint speeds.
@@ -251,15 +413,84 @@ class PositionController:
             yarp.delay(0.1)
         return vel
     
-    def getJointLimits(self):
+    def getJointLimits(self, refresh=False):
         """
         Returns the joint limits for the robot part.
+
+        Parameters
+        ----------
+        refresh : bool, optional
+            If True, the limits are read again from the robot instead of using the cached ones.
+
+        Returns
+        -------
+        tuple of yarp.Vector
+            The minimum and maximum limits of each joint.
         """
+        if refresh or self.__limits__ is None:
+            self.refreshJointLimits()
         min_limits = yarp.Vector(self.__joints__)
         max_limits = yarp.Vector(self.__joints__)
-        self.__IControlLimits__.getLimits(min_limits.data(), max_limits.data())
+        for j in range(0, self.__joints__):
+            min_limits.set(j, float(self.__limits__.min_limits[j]))
+            max_limits.set(j, float(self.__limits__.max_limits[j]))
         return min_limits, max_limits
 
+    def refreshJointLimits(self):
+        """
+        Reads the joint limits from the robot and updates the cache used to validate poses.
+
+        Returns
+        -------
+        JointLimits
+            The cached joint limits.
+        """
+        min_limits = [0.0]*self.__joints__
+        max_limits = [0.0]*self.__joints__
+        min_v = yarp.Vector(1)
+        max_v = yarp.Vector(1)
+        for j in range(0, self.__joints__):
+            self.__IControlLimits__.getLimits(j, min_v.data(), max_v.data())
+            min_limits[j] = min_v[0]
+            max_limits[j] = max_v[0]
+        self.__limits__ = JointLimits(min_limits, max_limits)
+        return self.__limits__
+
+    @property
+    def jointLimits(self):
+        """
+        Returns:
+            JointLimits: The cached joint limits of the robot part (None before init).
+        """
+        return self.__limits__
+
+    def validatePose(self, pose: JointPose, clamp=False):
+        """
+        Checks a pose against the cached joint limits.
+
+        Parameters
+        ----------
+        pose : JointPose
+            The pose to validate.
+        clamp : bool, optional
+            If True, the pose targets are clamped into the limits (modifying the pose).
+
+        Returns
+        -------
+        list of tuples
+            The invalid targets (before clamping) in the format (joint_index, target_value, min_limit, max_limit).
+        """
+        joints_list = pose.joints_list
+        if joints_list is None:
+            joints_list = self.part.joints_list
+        if self.__limits__ is None:
+            return []
+        targets = pose.target_joints[:len(joints_list)]
+        mask = self.__limits__.violations(joints_list, targets)
+        invalid = [(joints_list[i], targets[i], float(self.__limits__.min_limits[joints_list[i]]), float(self.__limits__.max_limits[joints_list[i]])) for i in mask.nonzero()[0]]
+        if invalid and clamp:
+            pose.target_joints = self.__limits__.clamp(joints_list, targets).tolist() + list(pose.target_joints[len(joints_list):])
+        return invalid
 
     def __move__(self, target_joints, joints_list, req_time, joints_speed):
         """
@@ -278,7 +509,11 @@ class PositionController:
         Returns
         -------
         float
-            The time taken to complete the motion.
+            The predicted time to complete the motion.
+        Notes
+        -----
+        When `SYNC_JOINTS` is True and `req_time` is 0, the joints speeds are planned so that all the joints
+        reach their target together, none of them exceeding its (scaled) speed in `joints_speed`.
         """
 
         # assert syntax: 
@@ -287,44 +522,34 @@ class PositionController:
         # See https://stackoverflow.com/questions/5142418/what-is-the-use-of-assert-in-python
         assert self.SPEED_SCALING > 0.0 and self.SPEED_SCALING <= 1.0, f"PositionController.SPEED_SCALING must be in (0.0, 1.0] interval. PositionController.SPEED_SCALING={self.SPEED_SCALING} is outside!"
 
-        joints_speed = [int(s*self.SPEED_SCALING) for s in joints_speed]
-
-        disp  = [0]*len(joints_list)
-        speeds = [0]*len(joints_list)
-        times = [0]*len(joints_list)
-        tmp   = yarp.Vector(self.__joints__)
-        encs  = yarp.Vector(self.__joints__)
+        return self.__dispatch__(target_joints, joints_list, req_time, joints_speed).duration
 
-        while not self.__IEncoders__.getEncoders(encs.data()):
-            yarp.delay(0.1)
-        i = 0
+    def __dispatch__(self, target_joints, joints_list, req_time, joints_speed):
+        """
+        Plans the motion and sends the reference speeds and positions of the joints that need to move.
 
-        if req_time > 0.0:
-            for j in joints_list:
-                tmp.set(i, target_joints[i])
-                disp[i] = target_joints[i] - encs[j]
-                if disp[i] < 0.0:
-                    disp[i] =- disp[i]
-                speeds[i] = disp[i]/req_time
-                self.__IPositionControl__.setRefSpeed(j, speeds[i]) 
-                self.__IPositionControl__.positionMove(j, tmp[i]) 
-                i+=1
-            motion_time = req_time
-        else:
-            for j in joints_list:
-                tmp.set(i, target_joints[i])
-                disp[i] = float(target_joints[i] - encs[j])
-                if disp[i] < 0.0:
-                    disp[i] =- disp[i]
-                if abs(disp[i]) > 0.001:
-                    speeds[i] = joints_speed[i]
-                    times[i] = disp[i]/speeds[i]
-                    self.__IPositionControl__.setRefSpeed(j, speeds[i])
-                    self.__IPositionControl__.positionMove(j, tmp[i])
-                i+=1
-            motion_time = max(times)
-        
-        return motion_time
+        Returns
+        -------
+        JointsSpeedProfile
+            The planned motion.
+        """
+        encs = self.getEncoders()
+        start = [encs[j] for j in joints_list]
+        profile = self.__planner__.plan(start=start,
+                                        target=target_joints[:len(joints_list)],
+                                        max_speeds=joints_speed,
+                                        req_time=req_time,
+                                        joints_list=joints_list,
+                                        speed_scaling=self.SPEED_SCALING,
+                                        synchronize=self.SYNC_JOINTS)
+
+        moving = profile.moving
+        for i, j in enumerate(joints_list):
+            if req_time > 0.0 or moving[i]:
+                self.__IPositionControl__.setRefSpeed(j, float(profile.speeds[i]))
+                self.__IPositionControl__.positionMove(j, float(target_joints[i]))
+
+        return profile
 
     def stop(self, joints_list=None):
         """
@@ -347,8 +572,19 @@ class PositionController:
             self.__IPositionControl__.setRefSpeed(j, 0.0)
         return 0.0
 
+    def hold(self, joints_list=None):
+        """
+        Stops the specified joints (all the joints if None) where they are, keeping their reference speeds.
+        Used to interrupt a motion that is not followed by a new one.
+        """
+        if joints_list is None:
+            joints_list = range(0, self.__joints__)
+        for j in joints_list:
+            self.__IPositionControl__.stop(j)
+        return True
+
 
-    def move(self, pose: JointPose, req_time: float=0.0, timeout: float=DEFAULT_TIMEOUT, joints_speed: list=[], waitMotionDone: bool=True, tag: str='default'):
+    def move(self, pose: JointPose, req_time: float=0.0, timeout: float=DEFAULT_TIMEOUT, joints_speed: list=None, waitMotionDone: bool=True, tag: str='default'):
         """
         Moves the robot to the specified joint positions.
         Parameters
@@ -360,7 +596,7 @@ class PositionController:
         timeout : float, optional
             The maximum time to wait for the motion to complete (default is DEFAULT_TIMEOUT).
         joints_speed : list, optional
-            The speed for each joint (default is an empty list, which sets all speeds to 10.0).
+            The speed for each joint (default is None, which sets all speeds to 10.0).
         waitMotionDone : bool, optional
             Whether to wait for the motion to complete before returning (default is True).
         tag : str, optional
@@ -368,13 +604,47 @@ class PositionController:
         Returns
         -------
         bool
-            True if the motion completed successfully, False if it timed out.
+            True if the motion completed successfully, False if it timed out or
+            if the pose is outside the joint limits.
         Notes
         -----
         This method sets the position control mode for the specified joints, 
         initiates the motion, and optionally waits for the motion to complete.
         It logs the start and end of the motion, including whether it completed 
-        successfully or timed out.
+        successfully or timed out, as `MotionEvent` records that are only built and
+        formatted if the logger is enabled for their level or a motion sink is attached.
+        When `VALIDATE_LIMITS` is True the pose is checked against the cached joint limits
+        before any command is sent: invalid poses are rejected, or clamped into the limits
+        when `CLAMP_TO_LIMITS` is True.
+        """
+        handle = self.startMove(pose, req_time=req_time, timeout=timeout, joints_speed=joints_speed, tag=tag)
+        if handle is None:
+            return False
+
+        if waitMotionDone is True:
+            return self.waitMove(handle)
+
+    def waitMove(self, handle):
+        """
+        Waits for a motion started with startMove() and records its outcome.
+
+        Returns
+        -------
+        bool
+            True if the motion completed, False if it timed out.
+        """
+        res = self.__waitMotionDone__(motion_time=handle.motion_time, timeout=handle.timeout)
+        self.completeMove(handle, res)
+        return res
+
+    def startMove(self, pose: JointPose, req_time: float=0.0, timeout: float=DEFAULT_TIMEOUT, joints_speed: list=None, tag: str='default'):
+        """
+        Starts a motion without waiting for it (see move() for the parameters).
+
+        Returns
+        -------
+        MotionHandle
+            The started motion, to be passed to completeMove() once done, or None if the pose has been rejected.
         """
         t0 = time.perf_counter()
         target_joints = pose.target_joints
@@ -382,89 +652,139 @@ class PositionController:
         if joints_list is None:
             joints_list = self.part.joints_list
 
+        if self.VALIDATE_LIMITS and self.__limits__ is not None:
+            invalid = self.__limits__.violations(joints_list, target_joints[:len(joints_list)])
+            if invalid.any():
+                if not self.CLAMP_TO_LIMITS:
+                    self.__motionlog__.emit(logging.ERROR, MotionEvent.REJECTED, tag, self.__part__.name, joints_list, target_joints[:len(joints_list)], req_time=req_time, timeout=timeout)
+                    return None
+                target_joints = self.__limits__.clamp(joints_list, target_joints[:len(joints_list)]).tolist()
+                self.__motionlog__.emit(logging.WARNING, MotionEvent.CLAMPED, tag, self.__part__.name, joints_list, target_joints, req_time=req_time, timeout=timeout)
+
         self.setPositionControlMode(joints_list=joints_list)
-            
+
         if not joints_speed:
-            for j in joints_list:
-                ref_speed = 10.0
-                joints_speed.append(ref_speed)
-
-        self.__logger__.info("""Motion STARTED!
-                                tag: %s,
-                                robot_part:%s,
-                                target_joints:%s,
-                                req_time:%.2f,
-                                joints_list=%s,
-                                waitMotionDone=%s,
-                                timeout=%s,
-                                speed=%s""" %
-                                (
-                                  tag,
-                                  self.__part__.name,
-                                  str(target_joints)      ,
-                                  req_time                ,
-                                  str(joints_list)        ,
-                                  str(waitMotionDone)     ,
-                                  str(timeout)            ,
-                                  str(joints_speed)
-                                )
-                            )
-
-        motion_time = self.__move__(target_joints, joints_list, req_time, joints_speed)
+            joints_speed = [10.0]*len(joints_list)
 
-        if waitMotionDone is True:
-            res = self.__waitMotionDone__(motion_time=motion_time, timeout=timeout)
-            elapsed_time = time.perf_counter() - t0
-            if res:
-                self.__logger__.info("""Motion COMPLETED!
-                                elapsed_time: %s,
-                                tag: %s,
-                                robot_part:%s,
-                                target_joints:%s
-                                req_time:%.2f,
-                                joints_list=%s,
-                                waitMotionDone=%s,
-                                timeout=%s,
-                                speed=%s""" %
-                                (
-                                    elapsed_time,
-                                    tag,
-                                    self.__part__.name,
-                                    str(target_joints)      ,
-                                    req_time                ,
-                                    str(joints_list)        ,
-                                    str(waitMotionDone)     ,
-                                    str(timeout),
-                                    str(joints_speed)
-                                ))
-            else:
-                self.__logger__.warning("""Motion TIMEOUT!
-                                elapsed_time: %s,
-                                tag: %s,
-                                robot_part:%s,
-                                target_joints:%s
-                                req_time:%.2f,
-                                joints_list=%s,
-                                waitMotionDone=%s,
-                                timeout=%s,
-                                speed=%s""" %
-                                (
-                                    elapsed_time,
-                                    tag,
-                                    self.__part__.name,
-                                    str(target_joints)      ,
-                                    req_time                ,
-                                    str(joints_list)        ,
-                                    str(waitMotionDone)     ,
-                                    str(timeout),
-                                    str(joints_speed)
-                                ))
-            return res
+        self.__motionlog__.emit(logging.INFO, MotionEvent.STARTED, tag, self.__part__.name, joints_list, target_joints[:len(joints_list)], joints_speed, req_time, timeout)
+
+        t_start = time.perf_counter()
+        profile = self.__dispatch__(target_joints, joints_list, req_time, joints_speed)
+        timeout = self.motionTimeout(profile.duration, timeout, profile)
+        return MotionHandle(tag, joints_list, target_joints[:len(joints_list)], joints_speed, req_time, timeout, profile, t0, t_start)
+
+    def completeMove(self, handle, res):
+        """
+        Records the outcome of a motion started with startMove(): feeds the motion profiler and logs it.
+        """
+        elapsed_time = time.perf_counter() - handle.t0
+        if self.__profiler__ is not None and handle.profile.moving.any():
+            self.__profiler__.record(self.__part__.name, handle.profile, time.perf_counter() - handle.t_start, res)
+        if res:
+            self.__motionlog__.emit(logging.INFO, MotionEvent.COMPLETED, handle.tag, self.__part__.name, handle.joints_list, handle.target_joints, handle.joints_speed, handle.req_time, handle.timeout, elapsed_time)
+        else:
+            self.invalidateControlModes(handle.joints_list)
+            self.__motionlog__.emit(logging.WARNING, MotionEvent.TIMEOUT, handle.tag, self.__part__.name, handle.joints_list, handle.target_joints, handle.joints_speed, handle.req_time, handle.timeout, elapsed_time)
+
+    def isMotionDone(self, joints_list=None):
+        """
+        Returns True if the given joints (all the joints of the robot part if None) reached their targets.
+        """
+        if joints_list is None:
+            return not self.isMoving()
+        for j in joints_list:
+            if not self.__IPositionControl__.checkMotionDone(j):
+                return False
+        return True
                 
 
+    def motionTimeout(self, motion_time, timeout=DEFAULT_TIMEOUT, profile=None):
+        """
+        Returns the timeout to use when waiting for a motion with a predicted duration.
+
+        Parameters
+        ----------
+        motion_time : float
+            The predicted duration of the motion.
+        timeout : float, optional
+            The maximum timeout allowed (default is DEFAULT_TIMEOUT).
+        profile : JointsSpeedProfile, optional
+            The planned motion, used to query the motion profiler (if any).
+
+        Returns
+        -------
+        float
+            When `TIGHT_TIMEOUT` is True, the adaptive timeout learned by the motion profiler or, without
+            enough samples, `timeout` tightened to `motion_time*TIMEOUT_FACTOR + TIMEOUT_MARGIN`.
+        """
+        if not self.TIGHT_TIMEOUT or motion_time <= 0.0:
+            return timeout
+        if profile is not None and self.__profiler__ is not None:
+            learned = self.__profiler__.timeout(self.__part__.name, profile, timeout)
+            if learned is not None:
+                return learned
+        return min(timeout, motion_time*self.TIMEOUT_FACTOR + self.TIMEOUT_MARGIN)
+
+    def predictMotionTime(self, profile):
+        """
+        Returns:
+            float: the duration of a planned motion learned by the motion profiler, or its nominal duration.
+        """
+        if self.__profiler__ is None:
+            return profile.duration
+        return self.__profiler__.predict(self.__part__.name, profile)
+
+    def refreshControlModes(self):
+        """
+        Reads the control modes of the robot part into the cache used to skip redundant setControlMode calls.
+        """
+        return self.__modes__.refresh(self.__IControlMode__)
+
+    def getControlModes(self, refresh=False):
+        """
+        Returns:
+            list of int: the control mode (yarp VOCAB_CM_*) of each joint, as cached unless `refresh` is True.
+        """
+        if refresh:
+            self.refreshControlModes()
+        return self.__modes__.modes.tolist()
+
+    def invalidateControlModes(self, joints_list=None):
+        """
+        Forgets the cached control modes, so that the next mode change is always sent to the robot.
+        """
+        self.__modes__.invalidate(joints_list)
+
+    def setControlMode(self, joints_list, mode):
+        """
+        Sets the control mode of the given joints.
+
+        When `CACHE_CONTROL_MODES` is True only the joints whose cached mode differs are commanded.
+
+        Returns
+        -------
+        int
+            The number of setControlMode calls sent to the robot.
+        """
+        if self.__modes__ is None:
+            for j in joints_list:
+                self.__IControlMode__.setControlMode(j, mode)
+            return len(joints_list)
+        sent = 0
+        with self.__modes__.lock:
+            modes = self.__modes__.modes
+            for j in joints_list:
+                if not self.CACHE_CONTROL_MODES or modes[j] != mode:
+                    self.__IControlMode__.setControlMode(j, mode)
+                    modes[j] = mode
+                    sent += 1
+        return sent
+
     def setPositionControlMode(self, joints_list):
-        for j in joints_list:
-            self.__IControlMode__.setControlMode(j, yarp.VOCAB_CM_POSITION)
+        return self.setControlMode(joints_list, yarp.VOCAB_CM_POSITION)
+
+    def setPositionDirectControlMode(self, joints_list):
+        return self.setControlMode(joints_list, yarp.VOCAB_CM_POSITION_DIRECT)
 
     def setCustomWaitMotionDone(self, motion_complete_at=MOTION_COMPLETE_AT):
         self.__waitMotionDone__ = self.waitMotionDone2
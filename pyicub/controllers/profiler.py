@@ -0,0 +1,325 @@
+# BSD 2-Clause License
+#
+# Copyright (c) 2025, Social Cognition in Human-Robot Interaction,
+#                     Istituto Italiano di Tecnologia, Genova
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+Module: profiler.py
+
+This module records the actual completion time of position controlled motions and learns, for each robot part
+and joint, how it relates to the nominal duration planned from displacements and reference speeds.
+The learned models provide realistic predicted durations and adaptive timeouts, so that a motion that does
+not complete is detected within seconds instead of after the default timeout.
+"""
+
+import threading
+import numpy as np
+
+
+class MotionSamples:
+    """
+    Ring buffer of the motions executed by a robot part.
+
+    Attributes:
+        displacements (numpy.ndarray): (capacity, MAX_JOINTS) absolute displacement of each joint.
+        speeds (numpy.ndarray): (capacity, MAX_JOINTS) reference speed of each joint.
+        predicted (numpy.ndarray): Nominal duration planned for each motion.
+        actual (numpy.ndarray): Measured duration of each motion.
+        completed (numpy.ndarray): False for the motions that timed out.
+    """
+
+    MAX_JOINTS = 16
+
+    def __init__(self, capacity):
+        self.displacements = np.zeros((capacity, self.MAX_JOINTS), dtype=np.float32)
+        self.speeds = np.zeros((capacity, self.MAX_JOINTS), dtype=np.float32)
+        self.predicted = np.zeros(capacity, dtype=np.float32)
+        self.actual = np.zeros(capacity, dtype=np.float32)
+        self.completed = np.zeros(capacity, dtype=bool)
+        self.count = 0
+
+    @property
+    def capacity(self):
+        return len(self.predicted)
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def append(self, joints_list, displacements, speeds, predicted, actual, completed):
+        i = self.count % self.capacity
+        self.displacements[i] = 0.0
+        self.speeds[i] = 0.0
+        self.displacements[i, joints_list] = displacements
+        self.speeds[i, joints_list] = speeds
+        self.predicted[i] = predicted
+        self.actual[i] = actual
+        self.completed[i] = completed
+        self.count += 1
+
+    def nominalTimes(self):
+        """
+        Returns:
+            numpy.ndarray: (N, MAX_JOINTS) displacement/speed of each joint, 0.0 for the joints that did not move.
+        """
+        n = len(self)
+        disp = self.displacements[:n]
+        speeds = self.speeds[:n]
+        return np.divide(disp, speeds, out=np.zeros_like(disp), where=speeds > 0.0)
+
+    def toArrays(self):
+        n = len(self)
+        return {'displacements': self.displacements[:n],
+                'speeds': self.speeds[:n],
+                'predicted': self.predicted[:n],
+                'actual': self.actual[:n],
+                'completed': self.completed[:n]}
+
+
+class JointTimingModel:
+    """
+    Linear model actual = offset + gain*nominal of the motions dominated by a joint (or by a whole part),
+    with the standard deviation of its residuals.
+    """
+    def __init__(self, offset, gain, sigma, samples):
+        self.offset = offset
+        self.gain = gain
+        self.sigma = sigma
+        self.samples = samples
+
+    @staticmethod
+    def fit(nominal, actual):
+        if np.ptp(nominal) < 1e-3:
+            offset, gain = float(np.mean(actual - nominal)), 1.0
+        else:
+            A = np.stack([np.ones_like(nominal), nominal], axis=1)
+            (offset, gain), *_ = np.linalg.lstsq(A, actual, rcond=None)
+            offset, gain = float(offset), float(gain)
+        sigma = float(np.std(actual - (offset + gain*nominal)))
+        return JointTimingModel(offset, gain, sigma, len(actual))
+
+    def predict(self, nominal):
+        return max(0.0, self.offset + self.gain*nominal)
+
+    def toJSON(self):
+        return {'offset': self.offset,
+                'gain': self.gain,
+                'sigma': self.sigma,
+                'samples': self.samples}
+
+
+class PartTimingModel:
+    """
+    Timing models of a robot part: one per joint, fitted on the motions that joint dominates,
+    plus one for the whole part used as a fallback.
+    """
+    def __init__(self, part_model, joint_models):
+        self.part_model = part_model
+        self.joint_models = joint_models
+
+    def model(self, joint):
+        return self.joint_models.get(joint, self.part_model)
+
+    def toJSON(self):
+        return {'part': self.part_model.toJSON() if self.part_model else None,
+                'joints': {str(j): m.toJSON() for j, m in self.joint_models.items()}}
+
+
+class MotionProfiler:
+    """
+    Records the predicted and the actual duration of the motions of each robot part and learns
+    per-joint timing models from them.
+
+    Thread-safe: position controllers of different parts can record concurrently.
+    """
+
+    CAPACITY = 4096
+    MIN_SAMPLES = 5
+    TIMEOUT_SIGMAS = 4.0
+    TIMEOUT_MARGIN = 0.5
+    MIN_TIMEOUT = 1.0
+
+    def __init__(self, capacity=CAPACITY):
+        self._capacity = capacity
+        self._samples = {}
+        self._models = {}
+        self._lock = threading.Lock()
+
+    @property
+    def parts(self):
+        return list(self._samples.keys())
+
+    def samples(self, part_name):
+        return self._samples.get(part_name, None)
+
+    def record(self, part_name, profile, actual, completed=True):
+        """
+        Records a motion.
+
+        Parameters
+        ----------
+        part_name : str
+            Name of the robot part.
+        profile : JointsSpeedProfile
+            The planned motion.
+        actual : float
+            Measured duration of the motion in seconds.
+        completed : bool, optional
+            False if the motion timed out; such samples are kept for the report but not used for fitting.
+        """
+        with self._lock:
+            if not part_name in self._samples.keys():
+                self._samples[part_name] = MotionSamples(self._capacity)
+            self._samples[part_name].append(profile.joints_list, profile.displacements, profile.speeds,
+                                            profile.duration, actual, completed)
+            self._models.pop(part_name, None)
+
+    def model(self, part_name):
+        """
+        Returns:
+            PartTimingModel: the timing model of the part, refitted lazily after new samples (None without enough samples).
+        """
+        with self._lock:
+            if part_name in self._models.keys():
+                return self._models[part_name]
+            samples = self._samples.get(part_name, None)
+            model = None
+            if samples is not None:
+                model = self._fit_(samples)
+            self._models[part_name] = model
+            return model
+
+    def _fit_(self, samples):
+        n = len(samples)
+        completed = samples.completed[:n]
+        if np.count_nonzero(completed) < self.MIN_SAMPLES:
+            return None
+        nominal = samples.nominalTimes()[completed]
+        actual = samples.actual[:n][completed].astype(float)
+        dominant = np.argmax(nominal, axis=1)
+        dominant_time = nominal.max(axis=1).astype(float)
+
+        part_model = JointTimingModel.fit(dominant_time, actual)
+        joint_models = {}
+        for j in np.unique(dominant):
+            mask = dominant == j
+            if np.count_nonzero(mask) >= self.MIN_SAMPLES:
+                joint_models[int(j)] = JointTimingModel.fit(dominant_time[mask], actual[mask])
+        return PartTimingModel(part_model, joint_models)
+
+    def _dominant_(self, profile):
+        disp = np.asarray(profile.displacements, dtype=float)
+        speeds = np.asarray(profile.speeds, dtype=float)
+        if disp.size == 0:
+            return None, 0.0
+        nominal = np.divide(disp, speeds, out=np.zeros_like(disp), where=speeds > 0.0)
+        i = int(np.argmax(nominal))
+        return profile.joints_list[i], float(nominal[i])
+
+    def predict(self, part_name, profile):
+        """
+        Returns:
+            float: the learned duration of the planned motion, or its nominal duration if the part has no model yet.
+        """
+        model = self.model(part_name)
+        if model is None:
+            return profile.duration
+        joint, nominal = self._dominant_(profile)
+        if joint is None:
+            return profile.duration
+        return model.model(joint).predict(nominal)
+
+    def timeout(self, part_name, profile, max_timeout):
+        """
+        Returns:
+            float: adaptive timeout of the planned motion (learned duration plus TIMEOUT_SIGMAS residual deviations
+            and TIMEOUT_MARGIN), never above max_timeout. None if the part has no model yet.
+        """
+        model = self.model(part_name)
+        if model is None:
+            return None
+        joint, nominal = self._dominant_(profile)
+        if joint is None:
+            return None
+        joint_model = model.model(joint)
+        timeout = joint_model.predict(nominal) + self.TIMEOUT_SIGMAS*joint_model.sigma + self.TIMEOUT_MARGIN
+        return min(max_timeout, max(self.MIN_TIMEOUT, timeout))
+
+    def report(self):
+        """
+        Returns:
+            dict: part name -> number of motions, timeouts, prediction errors of the nominal and learned durations, models.
+        """
+        res = {}
+        for part_name in self.parts:
+            samples = self._samples[part_name]
+            n = len(samples)
+            completed = samples.completed[:n]
+            actual = samples.actual[:n]
+            predicted = samples.predicted[:n]
+            entry = {'motions': n,
+                     'timeouts': int(n - np.count_nonzero(completed)),
+                     'actual_mean': float(actual[completed].mean()) if completed.any() else 0.0,
+                     'nominal_error_mean': float((actual - predicted)[completed].mean()) if completed.any() else 0.0}
+            model = self.model(part_name)
+            entry['model'] = model.toJSON() if model else None
+            if model is not None:
+                nominal = samples.nominalTimes()[completed]
+                dominant = np.argmax(nominal, axis=1)
+                learned = np.array([model.model(int(j)).predict(t) for j, t in zip(dominant, nominal.max(axis=1))])
+                entry['learned_error_mean'] = float(np.abs(actual[completed] - learned).mean())
+            res[part_name] = entry
+        return res
+
+    def save(self, path):
+        arrays = {}
+        with self._lock:
+            for part_name, samples in self._samples.items():
+                for key, value in samples.toArrays().items():
+                    arrays['%s__%s' % (part_name, key)] = value
+        np.savez_compressed(path, **arrays)
+
+    def load(self, path):
+        """
+        Loads the motions saved with save(), appending them to the ones already recorded.
+        """
+        data = np.load(path)
+        parts = sorted(set(key.rsplit('__', 1)[0] for key in data.files))
+        with self._lock:
+            for part_name in parts:
+                if not part_name in self._samples.keys():
+                    self._samples[part_name] = MotionSamples(self._capacity)
+                samples = self._samples[part_name]
+                disp = data['%s__displacements' % part_name]
+                speeds = data['%s__speeds' % part_name]
+                joints_list = list(range(disp.shape[1]))
+                for i in range(len(disp)):
+                    samples.append(joints_list, disp[i], speeds[i],
+                                   data['%s__predicted' % part_name][i],
+                                   data['%s__actual' % part_name][i],
+                                   data['%s__completed' % part_name][i])
+                self._models.pop(part_name, None)
+        return self
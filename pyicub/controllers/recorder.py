@@ -0,0 +1,397 @@
+# BSD 2-Clause License
+#
+# Copyright (c) 2025, Social Cognition in Human-Robot Interaction,
+#                     Istituto Italiano di Tecnologia, Genova
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+Module: recorder.py
+
+This module records the encoders of one or more robot parts at a fixed rate (e.g. while a demonstrator moves
+the robot by hand) into preallocated NumPy ring buffers. Recordings can be written in chunks while recording,
+saved as .npz or memory-mappable .npy files, converted into an iCubFullbodyAction with automatic checkpoint
+reduction, or replayed directly by streaming the recorded samples.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from pyicub.actions import iCubFullbodyAction
+from pyicub.controllers.position import iCubPart, DEFAULT_TIMEOUT
+from pyicub.controllers.trajectory import JointsTrajectory
+
+
+class EncodersRingBuffer:
+    """
+    Preallocated ring buffer of timestamped joint positions. When full, the oldest samples are overwritten.
+    """
+    def __init__(self, capacity, joints_nr):
+        self.times = np.zeros(capacity)
+        self.positions = np.zeros((capacity, joints_nr))
+        self.count = 0
+
+    @property
+    def capacity(self):
+        return self.times.size
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def append(self, t, q):
+        i = self.count % self.capacity
+        self.times[i] = t
+        self.positions[i] = q
+        self.count += 1
+
+    def slice(self, start, stop):
+        """
+        Returns:
+            tuple of numpy.ndarray: copies of the samples start..stop-1, counted from the first appended one.
+        """
+        idx = np.arange(start, stop) % self.capacity
+        return self.times[idx], self.positions[idx]
+
+    def arrays(self):
+        """
+        Returns:
+            tuple of numpy.ndarray: copies of the buffered samples (times (N,), positions (N, J)), oldest first.
+        """
+        return self.slice(self.count - len(self), self.count)
+
+
+class PartRecording:
+    """
+    Samples recorded from a robot part.
+
+    Attributes:
+        part (iCubPart): The recorded part.
+        times (numpy.ndarray): Sample times in seconds from the start of the recording (N,).
+        positions (numpy.ndarray): Positions of the joints in part.joints_list (N, J).
+    """
+    def __init__(self, part, times, positions):
+        self.part = part
+        self.times = times
+        self.positions = positions
+
+    @property
+    def duration(self):
+        return float(self.times[-1] - self.times[0]) if len(self.times) else 0.0
+
+    def trajectory(self):
+        """
+        Returns:
+            JointsTrajectory: the recording as a dense trajectory starting at time 0.
+        """
+        return JointsTrajectory(self.part.joints_list, self.times - self.times[0], self.positions)
+
+
+class Recording:
+    """
+    A multi-part recording.
+
+    Attributes:
+        parts (dict): Part name -> PartRecording.
+        period (float): Nominal sampling period (seconds).
+    """
+
+    META_FILE = 'recording.json'
+
+    def __init__(self, parts=None, period=0.0):
+        self.parts = parts if parts is not None else {}
+        self.period = period
+
+    @property
+    def duration(self):
+        if not self.parts:
+            return 0.0
+        return max(part.duration for part in self.parts.values())
+
+    @property
+    def samples(self):
+        return sum(len(part.times) for part in self.parts.values())
+
+    def _meta_(self):
+        return {'period': self.period,
+                'parts': {name: rec.part.__dict__ for name, rec in self.parts.items()}}
+
+    @staticmethod
+    def _parts_(meta):
+        return {name: iCubPart(p['name'], p['robot_part'], p['joints_nr'], p['joints_list'], p['joints_speed'])
+                for name, p in meta['parts'].items()}
+
+    def save(self, path):
+        """
+        Saves the recording to a single (uncompressed) .npz file.
+        """
+        arrays = {'__meta__': np.array(json.dumps(self._meta_()))}
+        for name, rec in self.parts.items():
+            arrays['%s__times' % name] = rec.times
+            arrays['%s__positions' % name] = rec.positions
+        np.savez(path, **arrays)
+
+    def saveArrays(self, path):
+        """
+        Saves the recording as a directory of .npy files that Recording.load can memory-map.
+        """
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, self.META_FILE), 'w') as f:
+            json.dump(self._meta_(), f)
+        for name, rec in self.parts.items():
+            np.save(os.path.join(path, '%s.times.npy' % name), rec.times)
+            np.save(os.path.join(path, '%s.positions.npy' % name), rec.positions)
+
+    @staticmethod
+    def load(path, mmap_mode=None):
+        """
+        Loads a recording saved with save() (.npz file), saveArrays() or written in chunks by
+        KinestheticRecorder (directory).
+
+        Parameters
+        ----------
+        path : str
+            The .npz file or the recording directory.
+        mmap_mode : str, optional
+            Memory-map the .npy arrays of a directory (e.g. 'r') instead of reading them.
+        """
+        if not os.path.isdir(path):
+            data = np.load(path)
+            meta = json.loads(str(data['__meta__']))
+            parts = Recording._parts_(meta)
+            return Recording({name: PartRecording(part, data['%s__times' % name], data['%s__positions' % name])
+                              for name, part in parts.items()}, meta['period'])
+
+        with open(os.path.join(path, Recording.META_FILE)) as f:
+            meta = json.load(f)
+        recordings = {}
+        for name, part in Recording._parts_(meta).items():
+            times_file = os.path.join(path, '%s.times.npy' % name)
+            if os.path.exists(times_file):
+                times = np.load(times_file, mmap_mode=mmap_mode)
+                positions = np.load(os.path.join(path, '%s.positions.npy' % name), mmap_mode=mmap_mode)
+            else:
+                chunks = sorted(f for f in os.listdir(path) if f.startswith(name + '.') and f.endswith('.npz'))
+                data = [np.load(os.path.join(path, f)) for f in chunks]
+                times = np.concatenate([d['times'] for d in data]) if data else np.zeros(0)
+                positions = np.concatenate([d['positions'] for d in data]) if data else np.zeros((0, len(part.joints_list)))
+            recordings[name] = PartRecording(part, times, positions)
+        return Recording(recordings, meta['period'])
+
+    def toAction(self, name, tolerance=0.5, description=None, timeout=DEFAULT_TIMEOUT):
+        """
+        Converts the recording into a single-step iCubFullbodyAction.
+
+        Each part becomes a LimbMotion whose checkpoints are the recorded samples reduced with
+        Douglas-Peucker (see JointsTrajectory.simplify), timed with the recorded durations.
+
+        Parameters
+        ----------
+        name : str
+            Name of the action.
+        tolerance : float, optional
+            Maximum joint deviation (degrees) allowed by the checkpoint reduction.
+        description : str, optional
+            Description of the action.
+        timeout : float, optional
+            Timeout of each checkpoint.
+
+        Returns
+        -------
+        iCubFullbodyAction
+        """
+        limb_motions = {}
+        for part_name, rec in self.parts.items():
+            if len(rec.times) < 2:
+                continue
+            trajectory = rec.trajectory().simplify(tolerance)
+            durations = np.diff(trajectory.times)
+            checkpoints = []
+            for k in range(1, trajectory.times.size):
+                checkpoints.append({'pose': {'target_joints': trajectory.positions[k].tolist(), 'joints_list': list(rec.part.joints_list)},
+                                    'duration': float(durations[k - 1]),
+                                    'timeout': timeout,
+                                    'joints_speed': list(rec.part.joints_speed)})
+            limb_motions[part_name] = {'part': rec.part.__dict__, 'checkpoints': checkpoints}
+
+        step = {'name': name, 'offset_ms': None, 'limb_motions': limb_motions, 'gaze_motion': None, 'custom_calls': []}
+        return iCubFullbodyAction(JSON_dict={'name': name,
+                                             'description': description,
+                                             'offset_ms': None,
+                                             'steps': [step],
+                                             'wait_for_steps': [True]})
+
+
+class KinestheticRecorder:
+    """
+    Samples the encoders of a set of PositionController objects at a fixed rate from a single thread.
+
+    Samples are kept in ring buffers (the last `capacity` samples of each part). If a `path` is given,
+    they are also written to `<path>/<part>.<chunk>.npz` every `chunk_size` samples by a writer thread,
+    so recordings of any length can be loaded with Recording.load(path).
+    """
+
+    DEFAULT_PERIOD = 0.01
+    CAPACITY = 60000
+    CHUNK_SIZE = 1000
+
+    def __init__(self, controllers, period=DEFAULT_PERIOD, capacity=CAPACITY, path=None, chunk_size=CHUNK_SIZE, logger=None):
+        """
+        Args:
+            controllers (list): PositionController objects of the parts to record.
+            period (float): Sampling period in seconds.
+            capacity (int): Number of samples kept in memory for each part.
+            path (str): Optional directory where the samples are written in chunks.
+            chunk_size (int): Number of samples of each chunk (must not exceed capacity).
+            logger: Logger instance for debugging.
+        """
+        self._controllers_ = list(controllers)
+        self._period_ = period
+        self._path_ = path
+        self._chunk_size_ = min(chunk_size, capacity)
+        self._logger_ = logger
+        self._buffers_ = {ctrl.part.name: EncodersRingBuffer(capacity, len(ctrl.part.joints_list)) for ctrl in self._controllers_}
+        self._flushed_ = {name: 0 for name in self._buffers_.keys()}
+        self._chunks_ = {name: 0 for name in self._buffers_.keys()}
+        self._lateness_ = deque(maxlen=capacity)
+        self._thread_ = None
+        self._writer_ = None
+        self._queue_ = queue.Queue()
+        self._stop_event_ = threading.Event()
+
+    @property
+    def period(self):
+        return self._period_
+
+    @property
+    def lateness(self):
+        """
+        Returns:
+            numpy.ndarray: delay of the last `capacity` sampling ticks with respect to their schedule (seconds).
+        """
+        return np.asarray(self._lateness_, dtype=float)
+
+    def isRunning(self):
+        return self._thread_ is not None and self._thread_.is_alive()
+
+    def start(self):
+        if self.isRunning():
+            raise Exception("KinestheticRecorder is already running!")
+        if self._path_:
+            os.makedirs(self._path_, exist_ok=True)
+            with open(os.path.join(self._path_, Recording.META_FILE), 'w') as f:
+                json.dump({'period': self._period_, 'parts': {ctrl.part.name: ctrl.part.__dict__ for ctrl in self._controllers_}}, f)
+            self._writer_ = threading.Thread(target=self._write_, daemon=True)
+            self._writer_.start()
+        self._stop_event_.clear()
+        self._thread_ = threading.Thread(target=self._run_, daemon=True)
+        self._thread_.start()
+
+    def record(self, duration):
+        """
+        Records for `duration` seconds (blocking).
+
+        Returns:
+            Recording: the recorded samples.
+        """
+        self.start()
+        self._stop_event_.wait(duration)
+        return self.stop()
+
+    def stop(self):
+        """
+        Stops the recording and flushes the pending chunks.
+
+        Returns:
+            Recording: the samples in memory or, if a path was given, the whole recording loaded from it.
+        """
+        self._stop_event_.set()
+        if self._thread_ is not None:
+            self._thread_.join()
+        if self._writer_ is not None:
+            for name in self._buffers_.keys():
+                self._flush_(name, final=True)
+            self._queue_.put(None)
+            self._writer_.join()
+            self._writer_ = None
+            return Recording.load(self._path_)
+        return self.recording()
+
+    def recording(self):
+        """
+        Returns:
+            Recording: the samples currently held in the ring buffers.
+        """
+        parts = {}
+        for ctrl in self._controllers_:
+            times, positions = self._buffers_[ctrl.part.name].arrays()
+            parts[ctrl.part.name] = PartRecording(ctrl.part, times, positions)
+        return Recording(parts, self._period_)
+
+    def _flush_(self, name, final=False):
+        buf = self._buffers_[name]
+        start = self._flushed_[name]
+        stop = buf.count if final else start + self._chunk_size_
+        if stop <= start or stop > buf.count:
+            return
+        times, positions = buf.slice(start, stop)
+        self._queue_.put((name, self._chunks_[name], times, positions))
+        self._flushed_[name] = stop
+        self._chunks_[name] += 1
+
+    def _write_(self):
+        while True:
+            item = self._queue_.get()
+            if item is None:
+                break
+            name, chunk, times, positions = item
+            np.savez(os.path.join(self._path_, '%s.%06d.npz' % (name, chunk)), times=times, positions=positions)
+
+    def _run_(self):
+        joints = [(ctrl, self._buffers_[ctrl.part.name], ctrl.part.joints_list) for ctrl in self._controllers_]
+        t0 = time.perf_counter()
+        k = 0
+        while True:
+            deadline = t0 + k*self._period_
+            remaining = deadline - time.perf_counter()
+            if remaining > 0.0:
+                if self._stop_event_.wait(remaining):
+                    break
+            elif self._stop_event_.is_set():
+                break
+            now = time.perf_counter()
+            self._lateness_.append(now - deadline)
+            for ctrl, buf, joints_list in joints:
+                buf.append(now - t0, ctrl.getEncodersArray()[joints_list])
+                if self._writer_ is not None and buf.count - self._flushed_[ctrl.part.name] >= self._chunk_size_:
+                    self._flush_(ctrl.part.name)
+            k += 1
+        if self._logger_:
+            self._logger_.debug("Recording COMPLETED! samples=%d", k)
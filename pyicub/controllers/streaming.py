@@ -0,0 +1,210 @@
+# BSD 2-Clause License
+#
+# Copyright (c) 2025, Social Cognition in Human-Robot Interaction,
+#                     Istituto Italiano di Tecnologia, Genova
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+Module: streaming.py
+
+This module provides a playback engine that streams precomputed joint-space trajectories to a robot part
+in position-direct mode, at a fixed rate and from a single scheduler thread.
+"""
+
+import threading
+import time
+
+import numpy as np
+
+from pyicub.controllers.trajectory import JointsTrajectory
+
+
+class StreamingStats:
+    """
+    Timing statistics of a streamed trajectory.
+
+    Attributes:
+        period (float): Nominal streaming period (seconds).
+        lateness (numpy.ndarray): Delay of each setpoint with respect to its schedule (seconds).
+        duration (float): Wall-clock duration of the playback (seconds).
+    """
+    def __init__(self, period, lateness, duration):
+        self.period = period
+        self.lateness = np.asarray(lateness, dtype=float)
+        self.duration = duration
+
+    @property
+    def samples(self):
+        return int(self.lateness.size)
+
+    @property
+    def overruns(self):
+        """
+        Returns:
+            int: Number of setpoints sent more than one period late.
+        """
+        return int(np.count_nonzero(self.lateness > self.period))
+
+    def toJSON(self):
+        res = {'period_ms': self.period*1000.0,
+               'samples': self.samples,
+               'duration': self.duration,
+               'overruns': self.overruns}
+        if self.samples:
+            lateness_ms = self.lateness*1000.0
+            res['mean_ms'] = float(lateness_ms.mean())
+            res['std_ms'] = float(lateness_ms.std())
+            res['p99_ms'] = float(np.percentile(lateness_ms, 99))
+            res['max_ms'] = float(lateness_ms.max())
+        return res
+
+
+class TrajectoryStreamer:
+    """
+    Streams a LimbMotion to a PositionController in position-direct mode.
+
+    The whole trajectory is computed in advance (a cubic spline through the checkpoints or minimum-jerk segments)
+    and a single scheduler thread sends one setpoint per period, against absolute deadlines so that delays
+    do not accumulate.
+    """
+
+    DEFAULT_PERIOD = 0.01
+
+    def __init__(self, controller, period=DEFAULT_PERIOD, method=JointsTrajectory.SPLINE, logger=None):
+        """
+        Args:
+            controller (PositionController): Controller of the part to stream to.
+            period (float): Streaming period in seconds.
+            method (str): Interpolation method (see JointsTrajectory.sample).
+            logger: Logger instance for debugging.
+        """
+        self._controller_ = controller
+        self._period_ = period
+        self._method_ = method
+        self._logger_ = logger
+        self._thread_ = None
+        self._stop_event_ = threading.Event()
+        self._stats_ = None
+
+    @property
+    def period(self):
+        return self._period_
+
+    @property
+    def stats(self):
+        """
+        Returns:
+            StreamingStats: Statistics of the last playback (None if nothing has been played).
+        """
+        return self._stats_
+
+    def prepare(self, limb_motion, speed_scaling=1.0):
+        """
+        Computes the setpoints of a LimbMotion from the current encoders.
+
+        Returns:
+            tuple: (joints_list, times, positions) ready to be streamed.
+        """
+        encoders = self._controller_.getEncodersArray()
+        trajectory = JointsTrajectory.fromLimbMotion(limb_motion, encoders, speed_scaling=speed_scaling)
+        times, positions = trajectory.sample(self._period_, method=self._method_)
+        return trajectory.joints_list, times, positions
+
+    def isRunning(self):
+        return self._thread_ is not None and self._thread_.is_alive()
+
+    def play(self, limb_motion, wait=True, speed_scaling=1.0):
+        """
+        Streams a LimbMotion.
+
+        Parameters
+        ----------
+        limb_motion : LimbMotion
+            The motion to play. Its part must be the one of the controller.
+        wait : bool, optional
+            Whether to block until the playback is completed (default is True).
+        speed_scaling : float, optional
+            Scaling factor applied to the joints speeds of checkpoints without duration.
+
+        Returns
+        -------
+        StreamingStats or None
+            The playback statistics if `wait` is True.
+        """
+        joints_list, times, positions = self.prepare(limb_motion, speed_scaling=speed_scaling)
+        self.start(joints_list, times, positions)
+        if wait:
+            return self.wait()
+        return None
+
+    def start(self, joints_list, times, positions):
+        """
+        Starts streaming precomputed setpoints from the scheduler thread.
+        """
+        if self.isRunning():
+            raise Exception("TrajectoryStreamer of part %s is already running!" % self._controller_.part.name)
+        self._stop_event_.clear()
+        self._controller_.setPositionDirectControlMode(joints_list)
+        self._thread_ = threading.Thread(target=self._run_, args=(list(joints_list), np.asarray(times), np.asarray(positions)), daemon=True)
+        self._thread_.start()
+
+    def wait(self, timeout=None):
+        if self._thread_ is not None:
+            self._thread_.join(timeout)
+        return self._stats_
+
+    def stop(self):
+        """
+        Interrupts the playback, leaving the joints at the last streamed setpoint.
+        """
+        self._stop_event_.set()
+        return self.wait()
+
+    def _run_(self, joints_list, times, positions):
+        ipd = self._controller_.getIPositionDirect()
+        # one message per setpoint: all the joints of a sample are applied together
+        n_joint = len(joints_list)
+        joints, refs = self._controller_.createPositionDirectBuffers(joints_list)
+        lateness = np.zeros(times.size)
+        sent = 0
+        t0 = time.perf_counter()
+        for k in range(0, times.size):
+            deadline = t0 + times[k]
+            remaining = deadline - time.perf_counter()
+            if remaining > 0.0:
+                if self._stop_event_.wait(remaining):
+                    break
+            elif self._stop_event_.is_set():
+                break
+            lateness[k] = time.perf_counter() - deadline
+            row = positions[k]
+            for i in range(0, n_joint):
+                refs[i] = float(row[i])
+            ipd.setPositions(n_joint, joints, refs)
+            sent += 1
+        self._stats_ = StreamingStats(self._period_, lateness[:sent], time.perf_counter() - t0)
+        if self._logger_:
+            self._logger_.debug("Streaming of part %s COMPLETED! stats=%s" % (self._controller_.part.name, str(self._stats_.toJSON())))
@@ -0,0 +1,217 @@
+# BSD 2-Clause License
+#
+# Copyright (c) 2025, Social Cognition in Human-Robot Interaction,
+#                     Istituto Italiano di Tecnologia, Genova
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+Module: trajectory.py
+
+This module provides NumPy tools to turn sparse or dense sequences of joint-space checkpoints into
+densely sampled trajectories, using minimum-jerk segments or C1 cubic splines.
+"""
+
+import numpy as np
+
+from pyicub.controllers.planner import SpeedProfilePlanner
+
+
+def minimumJerk(s):
+    """
+    Minimum-jerk time scaling.
+
+    Args:
+        s (numpy.ndarray): Normalized time in [0, 1].
+
+    Returns:
+        numpy.ndarray: Normalized position in [0, 1], with zero velocity and acceleration at both ends.
+    """
+    s = np.clip(s, 0.0, 1.0)
+    return s*s*s*(10.0 + s*(-15.0 + 6.0*s))
+
+
+def douglasPeucker(times, positions, tolerance):
+    """
+    Tolerance-bounded simplification of a timed joint-space polyline (Douglas-Peucker).
+
+    The error of a dropped waypoint is its largest joint deviation from the linear interpolation in time
+    between the kept neighbours, so the simplified trajectory stays within `tolerance` (same units of the
+    positions) of the original one at every original waypoint time.
+
+    Args:
+        times (numpy.ndarray): Strictly increasing waypoint times (K,).
+        positions (numpy.ndarray): Waypoint positions (K, J).
+        tolerance (float): Maximum deviation allowed.
+
+    Returns:
+        numpy.ndarray: Sorted indices of the waypoints to keep (always including the first and the last one).
+    """
+    times = np.asarray(times, dtype=float)
+    positions = np.atleast_2d(np.asarray(positions, dtype=float))
+    n = times.size
+    if n <= 2:
+        return np.arange(n)
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        a, b = stack.pop()
+        if b - a < 2:
+            continue
+        s = ((times[a + 1:b] - times[a])/(times[b] - times[a]))[:, None]
+        interp = positions[a] + (positions[b] - positions[a])*s
+        err = np.abs(positions[a + 1:b] - interp).max(axis=1)
+        i = int(np.argmax(err))
+        if err[i] > tolerance:
+            k = a + 1 + i
+            keep[k] = True
+            stack.append((a, k))
+            stack.append((k, b))
+    return np.nonzero(keep)[0]
+
+
+class JointsTrajectory:
+    """
+    A joint-space trajectory defined by timed waypoints.
+
+    Attributes:
+        joints_list (list[int]): Joint indices of the trajectory columns.
+        times (numpy.ndarray): Strictly increasing waypoint times (K,), starting at 0.0.
+        positions (numpy.ndarray): Waypoint positions (K, J).
+    """
+
+    MINIMUM_JERK = 'minjerk'
+    SPLINE = 'spline'
+
+    def __init__(self, joints_list, times, positions):
+        self.joints_list = list(joints_list)
+        self.times = np.asarray(times, dtype=float)
+        self.positions = np.atleast_2d(np.asarray(positions, dtype=float))
+
+    @property
+    def duration(self):
+        return float(self.times[-1]) if self.times.size else 0.0
+
+    @staticmethod
+    def fromLimbMotion(limb_motion, encoders, speed_scaling=1.0):
+        """
+        Builds the waypoints of a LimbMotion, starting from the current encoders.
+
+        The time of each segment is the checkpoint duration if set, otherwise the time-synchronized duration
+        computed by SpeedProfilePlanner from the checkpoint joints speeds. Segments without displacement are dropped.
+
+        Parameters
+        ----------
+        limb_motion : LimbMotion
+            The limb motion to convert.
+        encoders : array_like
+            Current encoders of the whole robot part (indexed by joint index).
+        speed_scaling : float, optional
+            Scaling factor applied to the joints speeds.
+
+        Returns
+        -------
+        JointsTrajectory
+        """
+        planner = SpeedProfilePlanner(speed_scaling=speed_scaling)
+        joints_list = list(limb_motion.part.joints_list)
+        current = np.array(encoders, dtype=float)
+        times = [0.0]
+        positions = [current[joints_list].copy()]
+        for checkpoint in limb_motion.checkpoints:
+            pose_joints = checkpoint.pose.joints_list
+            if not pose_joints:
+                pose_joints = joints_list
+            joints_speed = checkpoint.joints_speed
+            if not joints_speed:
+                joints_speed = limb_motion.part.joints_speed
+            target = np.asarray(checkpoint.pose.target_joints[:len(pose_joints)], dtype=float)
+            profile = planner.plan(start=current[pose_joints], target=target, max_speeds=joints_speed, req_time=checkpoint.duration)
+            if profile.duration <= 0.0:
+                continue
+            current[pose_joints] = target
+            times.append(times[-1] + profile.duration)
+            positions.append(current[joints_list].copy())
+        return JointsTrajectory(joints_list, times, positions)
+
+    def sample(self, period, method=SPLINE):
+        """
+        Samples the trajectory at a fixed rate.
+
+        Parameters
+        ----------
+        period : float
+            Sampling period in seconds.
+        method : str, optional
+            JointsTrajectory.SPLINE (C1 cubic spline through the waypoints, stopping only at the ends, default) or
+            JointsTrajectory.MINIMUM_JERK (rest-to-rest minimum-jerk segments, stopping at every waypoint).
+
+        Returns
+        -------
+        tuple of numpy.ndarray
+            Sample times (N,) and positions (N, J). The last sample is always the final waypoint.
+        """
+        if self.times.size < 2:
+            return np.zeros(1), self.positions[-1:].copy()
+        n = int(np.ceil(self.duration/period - 1e-9))
+        t = np.append(np.arange(0, n)*period, self.duration)
+        k = np.clip(np.searchsorted(self.times, t, side='right') - 1, 0, self.times.size - 2)
+        t0 = self.times[k]
+        h = self.times[k + 1] - t0
+        s = ((t - t0)/h)[:, None]
+        p0 = self.positions[k]
+        p1 = self.positions[k + 1]
+
+        if method == JointsTrajectory.MINIMUM_JERK:
+            q = p0 + (p1 - p0)*minimumJerk(s)
+        elif method == JointsTrajectory.SPLINE:
+            m = self.tangents()
+            m0 = m[k]*h[:, None]
+            m1 = m[k + 1]*h[:, None]
+            s2 = s*s
+            s3 = s2*s
+            q = (2*s3 - 3*s2 + 1)*p0 + (s3 - 2*s2 + s)*m0 + (-2*s3 + 3*s2)*p1 + (s3 - s2)*m1
+        else:
+            raise Exception("Unknown trajectory interpolation method '%s'" % method)
+        return t, q
+
+    def simplify(self, tolerance):
+        """
+        Returns:
+            JointsTrajectory: the trajectory reduced to the waypoints needed to stay within `tolerance` (see douglasPeucker).
+        """
+        keep = douglasPeucker(self.times, self.positions, tolerance)
+        return JointsTrajectory(self.joints_list, self.times[keep], self.positions[keep])
+
+    def tangents(self):
+        """
+        Returns:
+            numpy.ndarray: Catmull-Rom velocities at the waypoints (K, J), zero at both ends.
+        """
+        m = np.zeros_like(self.positions)
+        if self.times.size > 2:
+            m[1:-1] = (self.positions[2:] - self.positions[:-2])/(self.times[2:] - self.times[:-2])[:, None]
+        return m
@@ -50,21 +50,32 @@ class _Logger:
     def enable_logs(self):
         self._logging = True
 
-    def error(self, msg):
-        if self._logging:
-            self._logger.error(msg)
-
-    def warning(self, msg):
-        if self._logging:
-            self._logger.warning(msg)
-
-    def debug(self, msg):
-        if self._logging:
-            self._logger.debug(msg)
-
-    def info(self, msg):
-        if self._logging:
-            self._logger.info(msg)
+    def isEnabledFor(self, level):
+        """
+        Returns True if a message of the given logging level would be emitted.
+        Callers can use it to skip building expensive messages.
+        """
+        if not self._logging:
+            return False
+        if hasattr(self._logger, 'isEnabledFor'):
+            return self._logger.isEnabledFor(level)
+        return True
+
+    def error(self, msg, *args):
+        if self.isEnabledFor(logging.ERROR):
+            self._logger.error(msg % args if args else msg)
+
+    def warning(self, msg, *args):
+        if self.isEnabledFor(logging.WARNING):
+            self._logger.warning(msg % args if args else msg)
+
+    def debug(self, msg, *args):
+        if self.isEnabledFor(logging.DEBUG):
+            self._logger.debug(msg % args if args else msg)
+
+    def info(self, msg, *args):
+        if self.isEnabledFor(logging.INFO):
+            self._logger.info(msg % args if args else msg)
 
 
 class YarpLogger(_Logger):
@@ -0,0 +1,218 @@
+# BSD 2-Clause License
+#
+# Copyright (c) 2025, Social Cognition in Human-Robot Interaction,
+#                     Istituto Italiano di Tecnologia, Genova
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Module: motionlog.py
+
+Structured and lazily formatted motion events.
+
+A `MotionEvent` is a compact record (part, tag, timings, targets) that is only turned into
+text when a handler actually emits it. `MotionLog` checks the logger level before building
+any event, and optionally forwards every event to a `BinaryMotionSink` for high-rate telemetry.
+"""
+
+import logging
+import threading
+import time
+import numpy as np
+
+
+class MotionEvent:
+    """
+    A single motion event. Targets and speeds are kept as numpy arrays and formatted only on demand.
+    """
+
+    STARTED   = 'STARTED'
+    COMPLETED = 'COMPLETED'
+    TIMEOUT   = 'TIMEOUT'
+    REJECTED  = 'REJECTED'
+    CLAMPED   = 'CLAMPED'
+
+    CODES = (STARTED, COMPLETED, TIMEOUT, REJECTED, CLAMPED)
+
+    __slots__ = ('event', 'tag', 'part', 'timestamp', 'elapsed_time', 'req_time', 'timeout', 'joints_list', 'targets', 'speeds')
+
+    def __init__(self, event, tag, part, joints_list, targets, speeds=None, req_time=0.0, timeout=0.0, elapsed_time=0.0):
+        self.event = event
+        self.tag = tag
+        self.part = part
+        self.timestamp = time.time()
+        self.elapsed_time = elapsed_time
+        self.req_time = req_time
+        self.timeout = timeout
+        self.joints_list = np.asarray(joints_list, dtype=np.int16)
+        self.targets = np.asarray(targets, dtype=float)
+        self.speeds = np.asarray(speeds if speeds is not None else (), dtype=float)
+
+    def __str__(self):
+        return "Motion %s! tag=%s part=%s elapsed=%.3f req_time=%.2f timeout=%.2f joints=%s targets=%s speeds=%s" % (
+            self.event, self.tag, self.part, self.elapsed_time, self.req_time, self.timeout,
+            self.joints_list.tolist(), np.round(self.targets, 2).tolist(), np.round(self.speeds, 2).tolist())
+
+    def toJSON(self):
+        return {'event': self.event,
+                'tag': self.tag,
+                'part': self.part,
+                'timestamp': self.timestamp,
+                'elapsed_time': self.elapsed_time,
+                'req_time': self.req_time,
+                'timeout': self.timeout,
+                'joints_list': self.joints_list.tolist(),
+                'targets': self.targets.tolist(),
+                'speeds': self.speeds.tolist()}
+
+
+class BinaryMotionSink:
+    """
+    Appends motion events to a binary file of fixed-size numpy records.
+    Events are buffered in memory and written in blocks; `read()` loads a whole file back
+    as a structured array. Writing to a closed sink raises a ValueError.
+    """
+
+    MAX_JOINTS = 16
+    BUFFER_SIZE = 256
+
+    DTYPE = np.dtype([('timestamp', '<f8'),
+                      ('elapsed_time', '<f4'),
+                      ('req_time', '<f4'),
+                      ('timeout', '<f4'),
+                      ('event', 'u1'),
+                      ('joints_nr', 'u1'),
+                      ('part', 'S24'),
+                      ('tag', 'S40'),
+                      ('joints_list', '<i2', (MAX_JOINTS,)),
+                      ('targets', '<f4', (MAX_JOINTS,)),
+                      ('speeds', '<f4', (MAX_JOINTS,))])
+
+    def __init__(self, path, buffer_size=BUFFER_SIZE):
+        self._path = path
+        self._buffer = np.zeros(buffer_size, dtype=self.DTYPE)
+        self._count = 0
+        self._written = 0
+        self._lock = threading.Lock()
+        self._file = open(path, 'ab')
+
+    @property
+    def path(self):
+        return self._path
+
+    @property
+    def records(self):
+        return self._written + self._count
+
+    def write(self, event: MotionEvent):
+        n = min(len(event.joints_list), self.MAX_JOINTS)
+        with self._lock:
+            if self._file is None:
+                raise ValueError("BinaryMotionSink <%s> is closed" % self._path)
+            rec = self._buffer[self._count]
+            rec['timestamp'] = event.timestamp
+            rec['elapsed_time'] = event.elapsed_time
+            rec['req_time'] = event.req_time
+            rec['timeout'] = event.timeout
+            rec['event'] = MotionEvent.CODES.index(event.event)
+            rec['joints_nr'] = n
+            rec['part'] = event.part.encode()
+            rec['tag'] = str(event.tag).encode()
+            rec['joints_list'][:] = -1
+            rec['targets'][:] = np.nan
+            rec['speeds'][:] = np.nan
+            rec['joints_list'][:n] = event.joints_list[:n]
+            rec['targets'][:min(n, len(event.targets))] = event.targets[:n]
+            rec['speeds'][:min(n, len(event.speeds))] = event.speeds[:n]
+            self._count += 1
+            if self._count == len(self._buffer):
+                self._flush_()
+
+    def _flush_(self):
+        if self._count > 0 and self._file is not None:
+            self._buffer[:self._count].tofile(self._file)
+            self._file.flush()
+            self._written += self._count
+            self._count = 0
+
+    def flush(self):
+        with self._lock:
+            self._flush_()
+
+    def close(self):
+        with self._lock:
+            self._flush_()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self._count = 0
+
+    @staticmethod
+    def read(path):
+        return np.fromfile(path, dtype=BinaryMotionSink.DTYPE)
+
+    @staticmethod
+    def eventName(code):
+        return MotionEvent.CODES[code]
+
+
+class MotionLog:
+    """
+    Level-gated motion event log. An event is built only if the logger would emit it at the
+    requested level, or if a binary sink is attached.
+    """
+
+    def __init__(self, logger, sink: BinaryMotionSink=None):
+        self._logger = logger
+        self._sink = sink
+
+    @property
+    def sink(self):
+        return self._sink
+
+    def setSink(self, sink: BinaryMotionSink):
+        self._sink = sink
+
+    def isEnabledFor(self, level):
+        if hasattr(self._logger, 'isEnabledFor'):
+            return self._logger.isEnabledFor(level)
+        return True
+
+    def emit(self, level, event, tag, part, joints_list, targets, speeds=None, req_time=0.0, timeout=0.0, elapsed_time=0.0):
+        enabled = self.isEnabledFor(level)
+        if not enabled and self._sink is None:
+            return None
+        ev = MotionEvent(event, tag, part, joints_list, targets, speeds, req_time, timeout, elapsed_time)
+        if self._sink is not None:
+            self._sink.write(ev)
+        if enabled:
+            if level >= logging.ERROR:
+                self._logger.error("%s", ev)
+            elif level >= logging.WARNING:
+                self._logger.warning("%s", ev)
+            elif level >= logging.INFO:
+                self._logger.info("%s", ev)
+            else:
+                self._logger.debug("%s", ev)
+        return ev
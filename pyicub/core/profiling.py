@@ -0,0 +1,326 @@
+# BSD 2-Clause License
+#
+# Copyright (c) 2025, Social Cognition in Human-Robot Interaction,
+#                     Istituto Italiano di Tecnologia, Genova
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Module: profiling.py
+
+On-demand profiling of a running process.
+
+A `ProfilingSession` runs either a sampling profiler (a background thread that periodically reads the stacks of all
+the threads) or a deterministic profiler (cProfile around each profiled request target), for a given duration or
+for the next N requests of a target. Sampled stacks are exported in collapsed format (flame graph input), cProfile
+results as pstats text. The CPU time of each thread is attributed to the tag of the iCubRequest it is running and to
+the component executing the sampled stack (flask, json, request_manager, yarp, pyicub, application).
+"""
+
+import cProfile
+import functools
+import io
+import os
+import pstats
+import sys
+import sysconfig
+import threading
+import time
+
+
+class ProfilingSession:
+    """
+    A sampling or deterministic profiling session.
+
+    Attributes:
+        SAMPLING (str): Periodic stack sampling of all the threads.
+        DETERMINISTIC (str): cProfile around the profiled request targets.
+        DEFAULT_INTERVAL (float): Sampling period in seconds.
+        MAX_DEPTH (int): Maximum number of frames kept per sampled stack.
+    """
+
+    SAMPLING      = 'sampling'
+    DETERMINISTIC = 'deterministic'
+
+    DEFAULT_INTERVAL = 0.005
+    MAX_DEPTH = 64
+
+    STDLIB = sysconfig.get_paths()['stdlib']
+
+    COMPONENTS = (('yarp', ('yarp', os.sep + 'fake' + os.sep)),
+                  ('json', (os.sep + 'json' + os.sep,)),
+                  ('flask', ('werkzeug', 'flask')))
+
+    def __init__(self, mode=SAMPLING, duration=None, requests=None, target=None, interval=DEFAULT_INTERVAL, thread_tags=None):
+        """
+        Args:
+            mode (str): SAMPLING or DETERMINISTIC.
+            duration (float): Stop after this many seconds (None: until stop() or the requests count is reached).
+            requests (int): Stop after this many profiled requests (None: no limit).
+            target (str): Profile only the requests of this target name (None: all of them).
+            interval (float): Sampling period in seconds.
+            thread_tags (dict): Thread ident -> request tag of the running requests (e.g. iCubRequest.THREAD_TAGS).
+        """
+        if not mode in (self.SAMPLING, self.DETERMINISTIC):
+            raise ValueError("Unknown profiling mode '%s'. Choose '%s' or '%s'" % (mode, self.SAMPLING, self.DETERMINISTIC))
+        self._mode_ = mode
+        self._duration_ = duration
+        self._requests_ = requests
+        self._target_ = target
+        self._interval_ = interval
+        self._thread_tags_ = thread_tags if thread_tags is not None else {}
+        self._lock_ = threading.Lock()
+        self._stop_event_ = threading.Event()
+        self._sampler_ = None
+        self._timer_ = None
+        self._started_ = None
+        self._stopped_ = None
+        self._profiled_ = 0
+        self._profiles_ = []
+        self._stacks_ = {}
+        self._samples_ = 0
+        self._cpu_ = {}
+        self._last_cpu_ = {}
+
+    @property
+    def mode(self):
+        return self._mode_
+
+    @property
+    def active(self):
+        return self._started_ is not None and self._stopped_ is None
+
+    @property
+    def profiled_requests(self):
+        return self._profiled_
+
+    def start(self):
+        self._started_ = time.perf_counter()
+        if self._mode_ == self.SAMPLING:
+            self._sampler_ = threading.Thread(target=self._sample_loop_, name='pyicub-profiler', daemon=True)
+            self._sampler_.start()
+        if self._duration_:
+            self._timer_ = threading.Timer(self._duration_, self.stop)
+            self._timer_.daemon = True
+            self._timer_.start()
+        return self.info()
+
+    def stop(self):
+        with self._lock_:
+            if not self.active:
+                return self.info()
+            self._stopped_ = time.perf_counter()
+        self._stop_event_.set()
+        if self._timer_ is not None:
+            self._timer_.cancel()
+        if self._sampler_ is not None and self._sampler_ is not threading.current_thread():
+            self._sampler_.join()
+        return self.info()
+
+    def wait(self, timeout=None):
+        return self._stop_event_.wait(timeout)
+
+    def info(self):
+        elapsed = None
+        if self._started_ is not None:
+            elapsed = (self._stopped_ or time.perf_counter()) - self._started_
+        return {'mode': self._mode_,
+                'active': self.active,
+                'target': self._target_,
+                'duration': self._duration_,
+                'requests': self._requests_,
+                'profiled_requests': self._profiled_,
+                'samples': self._samples_,
+                'interval': self._interval_,
+                'elapsed': elapsed}
+
+    # Request targets
+
+    def wrap(self, target_name, func):
+        """
+        Returns `func` instrumented for this session if it is a profiled target, `func` itself otherwise.
+        Deterministic sessions run the call under cProfile; every session counts the completed calls and stops
+        when the requests count is reached.
+        """
+        if not self.active or (self._target_ and target_name != self._target_):
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not self.active:
+                return func(*args, **kwargs)
+            try:
+                if self._mode_ == self.DETERMINISTIC:
+                    profile = cProfile.Profile()
+                    try:
+                        return profile.runcall(func, *args, **kwargs)
+                    finally:
+                        with self._lock_:
+                            self._profiles_.append(profile)
+                return func(*args, **kwargs)
+            finally:
+                self._requestDone_()
+        return wrapper
+
+    def _requestDone_(self):
+        with self._lock_:
+            self._profiled_ += 1
+            done = self._requests_ is not None and self._profiled_ >= self._requests_
+        if done:
+            self.stop()
+
+    # Sampling
+
+    @staticmethod
+    def _frameName_(frame):
+        code = frame.f_code
+        return "%s (%s:%d)" % (code.co_name, os.path.basename(code.co_filename), code.co_firstlineno)
+
+    @classmethod
+    def component(cls, frame):
+        """
+        Returns:
+            str: the component executing a stack, decided by its innermost frame belonging to yarp, json,
+            flask/werkzeug or pyicub. Code run by a request (not belonging to them) is 'application', the request
+            manager itself 'request_manager', anything else 'python'.
+        """
+        application = False
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            for name, patterns in cls.COMPONENTS:
+                for pattern in patterns:
+                    if pattern in filename:
+                        return name
+            if filename.endswith(os.path.join('pyicub', 'requests.py')):
+                return 'application' if application else 'request_manager'
+            if os.sep + 'pyicub' + os.sep in filename:
+                return 'pyicub'
+            if not filename.startswith(cls.STDLIB):
+                application = True
+            frame = frame.f_back
+        return 'application' if application else 'python'
+
+    @staticmethod
+    def _threadCPUTime_(ident):
+        try:
+            return time.clock_gettime(time.pthread_getcpuclockid(ident))
+        except (AttributeError, OSError, ValueError):
+            return None
+
+    def _sample_loop_(self):
+        me = threading.get_ident()
+        next_time = time.perf_counter()
+        while not self._stop_event_.is_set():
+            self._sample_(me)
+            next_time += self._interval_
+            delay = next_time - time.perf_counter()
+            if delay > 0.0:
+                self._stop_event_.wait(delay)
+            else:
+                next_time = time.perf_counter()
+
+    def _snapshot_(self, me):
+        # the frames of the other threads are walked while they are suspended: the switch interval is raised so that
+        # the GIL is not handed over before the walk is done (a frame that returned meanwhile is no longer valid)
+        snapshot = []
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1.0)
+        try:
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = []
+                f = frame
+                while f is not None and len(stack) < self.MAX_DEPTH:
+                    stack.append(self._frameName_(f))
+                    f = f.f_back
+                snapshot.append((ident, self._thread_tags_.get(ident), self.component(frame), stack))
+        finally:
+            sys.setswitchinterval(switch_interval)
+        return snapshot
+
+    def _sample_(self, me):
+        names = {t.ident: t.name for t in threading.enumerate()}
+        snapshot = self._snapshot_(me)
+        self._samples_ += 1
+        for ident, tag, component, stack in snapshot:
+            thread_name = names.get(ident, str(ident))
+            tag = tag or thread_name
+            stack.append(thread_name)
+            key = ';'.join(reversed(stack))
+            self._stacks_[key] = self._stacks_.get(key, 0) + 1
+
+            cpu = self._threadCPUTime_(ident)
+            if cpu is None:
+                delta = 0.0
+            else:
+                delta = cpu - self._last_cpu_.get(ident, cpu)
+                self._last_cpu_[ident] = cpu
+            entry = self._cpu_.setdefault(tag, {})
+            entry[component] = entry.get(component, 0.0) + delta
+
+    # Results
+
+    def collapsed(self):
+        """
+        Returns:
+            str: the sampled stacks in collapsed format ('thread;outer;...;inner count' per line).
+        """
+        return '\n'.join("%s %d" % (stack, count) for stack, count in sorted(self._stacks_.items()))
+
+    def pstats(self, sort='cumulative', limit=50):
+        """
+        Returns:
+            str: the merged cProfile statistics of the profiled requests.
+        """
+        stream = io.StringIO()
+        with self._lock_:
+            profiles = list(self._profiles_)
+        if not profiles:
+            return ''
+        stats = pstats.Stats(profiles[0], stream=stream)
+        for profile in profiles[1:]:
+            stats.add(profile)
+        stats.sort_stats(sort).print_stats(limit)
+        return stream.getvalue()
+
+    def cpuTimes(self):
+        """
+        Returns:
+            dict: request tag (or thread name) -> component -> CPU seconds, measured by the sampling profiler.
+        """
+        return {tag: dict(components) for tag, components in self._cpu_.items()}
+
+    def cpuByComponent(self):
+        totals = {}
+        for components in self._cpu_.values():
+            for component, cpu in components.items():
+                totals[component] = totals.get(component, 0.0) + cpu
+        return totals
+
+    def report(self):
+        res = self.info()
+        res['cpu_by_component'] = self.cpuByComponent()
+        res['cpu_by_tag'] = self.cpuTimes()
+        return res
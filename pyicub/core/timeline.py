@@ -0,0 +1,237 @@
+# BSD 2-Clause License
+#
+# Copyright (c) 2025, Social Cognition in Human-Robot Interaction,
+#                     Istituto Italiano di Tecnologia, Genova
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Module: timeline.py
+
+This module fires timed events from a single thread. Events are kept in a heap ordered by their deadline on the
+monotonic clock; the scheduler thread sleeps until the earliest deadline (or until an earlier event is added),
+runs the callback and records how late it fired. As for the requests, each callback runs in a copy of the context
+it was scheduled from (so tracing spans keep their parent). Callbacks run on the scheduler thread and must not block:
+long work is handed over to a request (see iCub._movePlanSteps_).
+"""
+
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+
+class TimelineEvent:
+    """
+    A scheduled callback.
+
+    Attributes:
+        deadline (float): time.monotonic() time the event is due.
+        fired_at (float): time.monotonic() time the callback was actually run (None if not fired yet).
+        lateness (float): fired_at - deadline (seconds).
+    """
+
+    __slots__ = ('name', 'deadline', 'callback', 'args', 'kwargs', 'fired_at', 'lateness', 'retval', 'exception', 'cancelled', 'context', '_done_')
+
+    def __init__(self, name, deadline, callback, args, kwargs):
+        self.name = name
+        self.deadline = deadline
+        self.callback = callback
+        self.args = args
+        self.kwargs = kwargs
+        self.fired_at = None
+        self.lateness = None
+        self.retval = None
+        self.exception = None
+        self.cancelled = False
+        self.context = contextvars.copy_context()
+        self._done_ = threading.Event()
+
+    @property
+    def fired(self):
+        return self.fired_at is not None
+
+    def wait(self, timeout=None):
+        """
+        Waits until the event has fired or has been cancelled.
+
+        Returns:
+            bool: False on timeout.
+        """
+        return self._done_.wait(timeout)
+
+    def toJSON(self):
+        return {'name': self.name,
+                'deadline': self.deadline,
+                'fired_at': self.fired_at,
+                'lateness': self.lateness,
+                'cancelled': self.cancelled,
+                'exception': self.exception}
+
+
+class TimelineScheduler:
+    """
+    Single-thread scheduler of TimelineEvents. The thread is started with the first scheduled event.
+    """
+
+    HISTORY_SIZE = 10000
+
+    def __init__(self, logger=None, history_size=HISTORY_SIZE):
+        self._logger_ = logger
+        self._heap_ = []
+        self._seq_ = itertools.count()
+        self._cond_ = threading.Condition()
+        self._thread_ = None
+        self._running_ = False
+        self._lateness_ = deque(maxlen=history_size)
+        self._fired_ = 0
+        self._cancelled_ = 0
+
+    @staticmethod
+    def now():
+        return time.monotonic()
+
+    @property
+    def pending(self):
+        with self._cond_:
+            return len(self._heap_)
+
+    def start(self):
+        with self._cond_:
+            if self._running_:
+                return
+            self._running_ = True
+            self._thread_ = threading.Thread(target=self._loop_, name='pyicub-timeline', daemon=True)
+            self._thread_.start()
+
+    def stop(self):
+        """
+        Stops the scheduler thread. Pending events are cancelled.
+        """
+        with self._cond_:
+            self._running_ = False
+            events = [item[2] for item in self._heap_]
+            self._heap_.clear()
+            self._cond_.notify()
+        for event in events:
+            event.cancelled = True
+            event._done_.set()
+        if self._thread_ is not None and self._thread_ is not threading.current_thread():
+            self._thread_.join()
+        self._thread_ = None
+
+    def scheduleAt(self, deadline, callback, *args, name='', **kwargs):
+        """
+        Schedules `callback(*args, **kwargs)` at the monotonic time `deadline`.
+
+        Returns:
+            TimelineEvent: the scheduled event.
+        """
+        event = TimelineEvent(name, deadline, callback, args, kwargs)
+        if not self._running_:
+            self.start()
+        with self._cond_:
+            heapq.heappush(self._heap_, (deadline, next(self._seq_), event))
+            if self._heap_[0][2] is event:
+                self._cond_.notify()
+        return event
+
+    def schedule(self, delay, callback, *args, name='', **kwargs):
+        """
+        Schedules `callback(*args, **kwargs)` `delay` seconds from now.
+        """
+        return self.scheduleAt(self.now() + delay, callback, *args, name=name, **kwargs)
+
+    def cancel(self, event: TimelineEvent):
+        """
+        Cancels an event that has not fired yet.
+
+        Returns:
+            bool: False if the event has already fired.
+        """
+        with self._cond_:
+            if event.fired or event.cancelled:
+                return False
+            event.cancelled = True
+            self._cancelled_ += 1
+        event._done_.set()
+        return True
+
+    def _loop_(self):
+        while True:
+            with self._cond_:
+                while self._running_:
+                    if not self._heap_:
+                        self._cond_.wait()
+                        continue
+                    delay = self._heap_[0][0] - time.monotonic()
+                    if delay <= 0.0:
+                        break
+                    self._cond_.wait(delay)
+                if not self._running_:
+                    return
+                _, _, event = heapq.heappop(self._heap_)
+                if event.cancelled:
+                    continue
+                event.fired_at = time.monotonic()
+            event.lateness = event.fired_at - event.deadline
+            self._lateness_.append(event.lateness)
+            self._fired_ += 1
+            try:
+                event.retval = event.context.run(event.callback, *event.args, **event.kwargs)
+            except Exception as e:
+                event.exception = repr(e)
+                if self._logger_ is not None:
+                    self._logger_.error('Timeline event <%s> failed: %s' % (event.name, event.exception))
+            finally:
+                event._done_.set()
+
+    def resetStats(self):
+        self._lateness_.clear()
+        self._fired_ = 0
+        self._cancelled_ = 0
+
+    def info(self):
+        """
+        Returns:
+            dict: fired/cancelled/pending events and lateness statistics (milliseconds) of the last fired events.
+        """
+        lateness = np.asarray(self._lateness_, dtype=float)*1000.0
+        res = {'fired': self._fired_,
+               'cancelled': self._cancelled_,
+               'pending': self.pending,
+               'lateness_mean_ms': 0.0,
+               'lateness_p50_ms': 0.0,
+               'lateness_p99_ms': 0.0,
+               'lateness_max_ms': 0.0}
+        if lateness.size:
+            res['lateness_mean_ms'] = float(lateness.mean())
+            res['lateness_p50_ms'] = float(np.percentile(lateness, 50))
+            res['lateness_p99_ms'] = float(np.percentile(lateness, 99))
+            res['lateness_max_ms'] = float(lateness.max())
+        return res
@@ -0,0 +1,306 @@
+# BSD 2-Clause License
+#
+# Copyright (c) 2025, Social Cognition in Human-Robot Interaction,
+#                     Istituto Italiano di Tecnologia, Genova
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Module: tracing.py
+
+Lightweight tracing spans for action playback and REST requests.
+
+A span is opened with `Tracer.span(name, tag)` and closed when its `with` block exits. The current span is kept
+in a context variable, so nested spans (action -> step -> limb -> move) get their parent automatically; the
+request manager runs each target inside a copy of the caller context, so parents are propagated across the
+request threads too. Sampling is decided once per trace (at its root span): unsampled traces cost a context
+variable lookup per span. Finished spans are kept in a bounded buffer and exported as Chrome trace / Perfetto JSON.
+"""
+
+import contextvars
+import functools
+import inspect
+import itertools
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+
+from pyicub.utils import SingletonMeta
+
+
+class Span:
+    """
+    A timed operation. Times are `time.perf_counter()` seconds.
+    """
+
+    __slots__ = ('name', 'category', 'tag', 'span_id', 'parent_id', 'trace_id', 'start', 'end', 'thread_id', 'thread_name', 'args')
+
+    def __init__(self, name, category, tag, span_id, parent_id, trace_id, args=None):
+        self.name = name
+        self.category = category
+        self.tag = tag
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.trace_id = trace_id
+        self.args = args
+        thread = threading.current_thread()
+        self.thread_id = thread.ident
+        self.thread_name = thread.name
+        self.end = None
+        self.start = time.perf_counter()
+
+    @property
+    def duration(self):
+        if self.end is None:
+            return None
+        return self.end - self.start
+
+    def toJSON(self):
+        return {'name': self.name,
+                'category': self.category,
+                'tag': self.tag,
+                'span_id': self.span_id,
+                'parent_id': self.parent_id,
+                'trace_id': self.trace_id,
+                'start': self.start,
+                'end': self.end,
+                'thread_id': self.thread_id,
+                'thread_name': self.thread_name,
+                'args': self.args}
+
+
+class _NoSpan:
+    """
+    Context manager returned for unsampled traces.
+    """
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NO_SPAN_ = _NoSpan()
+_NOT_SAMPLED_ = object()
+
+
+class _SpanScope:
+
+    __slots__ = ('_tracer_', '_span_', '_token_')
+
+    def __init__(self, tracer, span):
+        self._tracer_ = tracer
+        self._span_ = span
+        self._token_ = None
+
+    def __enter__(self):
+        self._token_ = Tracer._current_.set(self._span_)
+        return self._span_
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._span_.end = time.perf_counter()
+        if exc_type is not None:
+            if self._span_.args is None:
+                self._span_.args = {}
+            self._span_.args['exception'] = repr(exc_value)
+        Tracer._current_.reset(self._token_)
+        self._tracer_._spans_.append(self._span_)
+        return False
+
+
+class Tracer(metaclass=SingletonMeta):
+    """
+    Process-wide span collector.
+
+    Attributes:
+        DEFAULT_CAPACITY (int): Maximum number of finished spans kept (the oldest ones are dropped).
+        DEFAULT_SAMPLE_RATE (float): Fraction of traces recorded, overridden by the PYICUB_TRACE_SAMPLE_RATE
+            environment variable. 0.0 disables tracing.
+    """
+
+    DEFAULT_CAPACITY = 100000
+    DEFAULT_SAMPLE_RATE = 0.0
+
+    _current_ = contextvars.ContextVar('pyicub_span', default=None)
+
+    def __init__(self, sample_rate=None, capacity=DEFAULT_CAPACITY):
+        if sample_rate is None:
+            sample_rate = float(os.getenv('PYICUB_TRACE_SAMPLE_RATE', self.DEFAULT_SAMPLE_RATE))
+        self._sample_rate_ = sample_rate
+        self._spans_ = deque(maxlen=capacity)
+        self._ids_ = itertools.count(1)
+        self._epoch_ = time.perf_counter()
+
+    @property
+    def sample_rate(self):
+        return self._sample_rate_
+
+    @property
+    def capacity(self):
+        return self._spans_.maxlen
+
+    @property
+    def spans(self):
+        return list(self._spans_)
+
+    def configure(self, sample_rate=None, capacity=None):
+        """
+        Changes the sampling rate (0.0 disables tracing, 1.0 records every trace) and/or the buffer capacity.
+        """
+        if sample_rate is not None:
+            self._sample_rate_ = min(max(float(sample_rate), 0.0), 1.0)
+        if capacity is not None and int(capacity) != self._spans_.maxlen:
+            self._spans_ = deque(self._spans_, maxlen=int(capacity))
+        return self.info()
+
+    def info(self):
+        return {'sample_rate': self._sample_rate_,
+                'capacity': self._spans_.maxlen,
+                'spans': len(self._spans_)}
+
+    def clear(self):
+        self._spans_.clear()
+
+    @staticmethod
+    def current():
+        """
+        Returns:
+            Span: the span open in the calling context, or None.
+        """
+        span = Tracer._current_.get()
+        if span is _NOT_SAMPLED_:
+            return None
+        return span
+
+    def span(self, name, tag='', category='pyicub', **args):
+        """
+        Opens a span as a child of the current one. A new trace is started (and sampled) if there is no current span.
+
+        Returns:
+            A context manager yielding the Span, or None if the trace is not sampled.
+        """
+        parent = Tracer._current_.get()
+        if parent is _NOT_SAMPLED_:
+            return _NO_SPAN_
+        if parent is None:
+            if self._sample_rate_ <= 0.0:
+                return _NO_SPAN_
+            if self._sample_rate_ < 1.0 and random.random() >= self._sample_rate_:
+                return _NotSampledScope()
+            span_id = next(self._ids_)
+            span = Span(name, category, tag, span_id, None, span_id, args or None)
+        else:
+            span = Span(name, category, tag, next(self._ids_), parent.span_id, parent.trace_id, args or None)
+        return _SpanScope(self, span)
+
+    def toChromeTrace(self, trace_id=None):
+        """
+        Exports the finished spans as Chrome trace event format (loadable in chrome://tracing and Perfetto).
+
+        Args:
+            trace_id (int): export only the spans of this trace.
+
+        Returns:
+            dict: {'traceEvents': [...], 'displayTimeUnit': 'ms'}
+        """
+        pid = os.getpid()
+        events = []
+        threads = {}
+        for span in list(self._spans_):
+            if trace_id is not None and span.trace_id != trace_id:
+                continue
+            threads[span.thread_id] = span.thread_name
+            args = {'span_id': span.span_id, 'parent_id': span.parent_id, 'trace_id': span.trace_id, 'tag': span.tag}
+            if span.args:
+                args.update(span.args)
+            events.append({'name': span.name,
+                           'cat': span.category,
+                           'ph': 'X',
+                           'ts': round((span.start - self._epoch_)*1e6, 3),
+                           'dur': round((span.end - span.start)*1e6, 3),
+                           'pid': pid,
+                           'tid': span.thread_id,
+                           'args': args})
+        for tid, thread_name in threads.items():
+            events.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': thread_name}})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def exportChromeTrace(self, path, trace_id=None):
+        with open(path, 'w', encoding='UTF-8') as f:
+            json.dump(self.toChromeTrace(trace_id), f)
+
+
+class _NotSampledScope:
+    """
+    Marks the calling context as not sampled, so that the children of an unsampled root are skipped too.
+    """
+
+    __slots__ = ('_token_',)
+
+    def __enter__(self):
+        self._token_ = Tracer._current_.set(_NOT_SAMPLED_)
+        return None
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        Tracer._current_.reset(self._token_)
+        return False
+
+
+def traced(name, tag_arg='prefix', tag_of=None, category='pyicub'):
+    """
+    Decorator opening a Tracer span around each call of the decorated function.
+
+    Args:
+        name (str): The span name.
+        tag_arg (str): The argument used as span tag (e.g. the hierarchical request prefix).
+        tag_of (callable): Optional conversion of the tag argument into the tag string.
+        category (str): The span category.
+    """
+    def decorator(func):
+        params = inspect.signature(func).parameters
+        names = list(params.keys())
+        index = names.index(tag_arg) if tag_arg in names else None
+        default = params[tag_arg].default if index is not None and params[tag_arg].default is not inspect.Parameter.empty else ''
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            tracer = Tracer()
+            if tracer._sample_rate_ <= 0.0 and Tracer._current_.get() is None:
+                return func(*args, **kwargs)
+            if tag_arg in kwargs.keys():
+                tag = kwargs[tag_arg]
+            elif index is not None and index < len(args):
+                tag = args[index]
+            else:
+                tag = default
+            if tag_of is not None:
+                tag = tag_of(tag)
+            with tracer.span(name, tag=tag, category=category):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,304 @@
+# BSD 2-Clause License
+#
+# Copyright (c) 2025, Social Cognition in Human-Robot Interaction,
+#                     Istituto Italiano di Tecnologia, Genova
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+Module: controlboard.py
+
+This module provides an in-process stand-in for a YARP remote_controlboard device.
+The FakeControlBoard exposes the IPositionControl, IPositionDirect, IEncoders, IControlMode and IControlLimits
+methods used by pyicub and integrates a simple first-order kinematic model, so that controllers and
+trajectory engines can be tested and benchmarked without a robot or a simulator.
+"""
+
+import math
+import threading
+import time
+
+import numpy as np
+
+
+def createVocab32(a, b=0, c=0, d=0):
+    a, b, c, d = [ord(x) if isinstance(x, str) else x for x in (a, b, c, d)]
+    return a + (b << 8) + (c << 16) + (d << 24)
+
+VOCAB_CM_IDLE            = createVocab32('i', 'd', 'l')
+VOCAB_CM_POSITION        = createVocab32('p', 'o', 's')
+VOCAB_CM_POSITION_DIRECT = createVocab32('p', 'o', 's', 'd')
+VOCAB_CM_VELOCITY        = createVocab32('v', 'e', 'l')
+
+
+class FakeControlBoard:
+    """
+    Simulated control board of a robot part.
+
+    Joints in position mode move towards their target at the reference speed set with `setRefSpeed`.
+    Joints in position-direct mode follow the streamed reference with a first-order lag of time constant `TAU`.
+    The model is integrated lazily, every time the board is accessed.
+
+    Attributes:
+        TIME_SCALE (float): Simulated seconds per wall-clock second (values > 1.0 speed up the simulation).
+        TAU (float): Time constant (seconds) of the position-direct first-order response.
+        MOTION_DONE_TOLERANCE (float): Distance (degrees) below which a joint is considered on target.
+    """
+
+    TIME_SCALE = 1.0
+    TAU = 0.02
+    MOTION_DONE_TOLERANCE = 0.01
+
+    DEFAULT_AXES = {
+        'head': 6,
+        'face': 1,
+        'torso': 3,
+        'left_arm': 16,
+        'right_arm': 16,
+        'left_leg': 6,
+        'right_leg': 6
+    }
+
+    DEFAULT_LIMITS = {
+        'head':  ([-40.0, -70.0, -55.0, -35.0, -50.0, 0.0], [30.0, 60.0, 55.0, 15.0, 52.0, 90.0]),
+        'face':  ([0.0], [90.0]),
+        'torso': ([-50.0, -30.0, -10.0], [50.0, 30.0, 70.0]),
+        'left_arm':  ([-95.0, 0.0, -37.0, 15.5, -60.0, -80.0, -20.0, 0.0, 10.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0],
+                      [10.0, 160.0, 80.0, 106.0, 60.0, 25.0, 25.0, 60.0, 90.0, 90.0, 90.0, 90.0, 90.0, 90.0, 90.0, 115.0]),
+        'right_arm': ([-95.0, 0.0, -37.0, 15.5, -60.0, -80.0, -20.0, 0.0, 10.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0],
+                      [10.0, 160.0, 80.0, 106.0, 60.0, 25.0, 25.0, 60.0, 90.0, 90.0, 90.0, 90.0, 90.0, 90.0, 90.0, 115.0]),
+        'left_leg':  ([-44.0, -17.0, -79.0, -125.0, -42.0, -24.0], [132.0, 119.0, 79.0, 0.0, 21.0, 24.0]),
+        'right_leg': ([-44.0, -17.0, -79.0, -125.0, -42.0, -24.0], [132.0, 119.0, 79.0, 0.0, 21.0, 24.0])
+    }
+
+    def __init__(self, name='fake', axes=None, limits=None, initial_positions=None):
+        """
+        Args:
+            name (str): Name of the board, usually the remote port (e.g. /icubSim/head).
+            axes (int): Number of joints. Defaults to the iCub value for the robot part in `name`.
+            limits (tuple): (min_limits, max_limits) lists. Defaults to the iCub limits for the robot part in `name`.
+            initial_positions (list): Initial joints configuration (defaults to zeros clipped to the limits).
+        """
+        robot_part = name.split('/')[-1]
+        if axes is None:
+            axes = self.DEFAULT_AXES.get(robot_part, 16)
+        if limits is None:
+            limits = self.DEFAULT_LIMITS.get(robot_part, ([-180.0]*axes, [180.0]*axes))
+        self._name_ = name
+        self._axes_ = axes
+        self._lock_ = threading.RLock()
+        self._min_ = np.array(limits[0][:axes], dtype=float)
+        self._max_ = np.array(limits[1][:axes], dtype=float)
+        if initial_positions is None:
+            initial_positions = np.clip(np.zeros(axes), self._min_, self._max_)
+        self._q_ = np.array(initial_positions, dtype=float)
+        self._qd_ = np.zeros(axes)
+        self._target_ = self._q_.copy()
+        self._direct_ref_ = self._q_.copy()
+        self._ref_speed_ = np.full(axes, 10.0)
+        self._modes_ = np.full(axes, VOCAB_CM_POSITION, dtype=np.int64)
+        self._last_update_ = time.perf_counter()
+        self._commands_ = 0
+
+    @property
+    def name(self):
+        return self._name_
+
+    @property
+    def commands(self):
+        """
+        Returns:
+            int: Number of commands received since creation (useful to measure command traffic).
+        """
+        return self._commands_
+
+    def _update_(self):
+        now = time.perf_counter()
+        dt = (now - self._last_update_)*self.TIME_SCALE
+        self._last_update_ = now
+        if dt <= 0.0:
+            return
+        q_prev = self._q_.copy()
+
+        pos = self._modes_ == VOCAB_CM_POSITION
+        if pos.any():
+            err = self._target_[pos] - self._q_[pos]
+            step = np.minimum(np.abs(err), self._ref_speed_[pos]*dt)
+            self._q_[pos] += np.sign(err)*step
+
+        direct = self._modes_ == VOCAB_CM_POSITION_DIRECT
+        if direct.any():
+            alpha = 1.0 - math.exp(-dt/self.TAU)
+            self._q_[direct] += (self._direct_ref_[direct] - self._q_[direct])*alpha
+
+        self._q_ = np.clip(self._q_, self._min_, self._max_)
+        self._qd_ = (self._q_ - q_prev)/dt
+
+    def _fill_(self, data, values):
+        for i in range(0, len(values)):
+            data[i] = float(values[i])
+
+    # PolyDriver
+
+    def isValid(self):
+        return True
+
+    def close(self):
+        return True
+
+    def viewIPositionControl(self):
+        return self
+
+    def viewIPositionDirect(self):
+        return self
+
+    def viewIEncoders(self):
+        return self
+
+    def viewIControlMode(self):
+        return self
+
+    def viewIControlLimits(self):
+        return self
+
+    # IPositionControl
+
+    def getAxes(self):
+        return self._axes_
+
+    def setRefSpeed(self, j, speed):
+        with self._lock_:
+            self._update_()
+            self._commands_ += 1
+            self._ref_speed_[j] = abs(speed)
+            return True
+
+    def getRefSpeed(self, j):
+        return float(self._ref_speed_[j])
+
+    def positionMove(self, j, ref):
+        with self._lock_:
+            self._update_()
+            self._commands_ += 1
+            self._target_[j] = min(max(ref, self._min_[j]), self._max_[j])
+            return True
+
+    def checkMotionDone(self, j=None):
+        with self._lock_:
+            self._update_()
+            pos = self._modes_ == VOCAB_CM_POSITION
+            err = np.abs(self._target_ - self._q_)
+            if j is None:
+                return bool(np.all(err[pos] <= self.MOTION_DONE_TOLERANCE))
+            return bool(err[j] <= self.MOTION_DONE_TOLERANCE)
+
+    def stop(self, j=None):
+        with self._lock_:
+            self._update_()
+            self._commands_ += 1
+            if j is None:
+                self._target_[:] = self._q_
+            else:
+                self._target_[j] = self._q_[j]
+            return True
+
+    # IPositionDirect
+
+    def setPosition(self, j, ref):
+        with self._lock_:
+            self._update_()
+            self._commands_ += 1
+            self._direct_ref_[j] = min(max(ref, self._min_[j]), self._max_[j])
+            return True
+
+    def setPositions(self, *args):
+        """
+        setPositions(refs) for all the joints or setPositions(n_joint, joints, refs) for a subset.
+        """
+        with self._lock_:
+            self._update_()
+            self._commands_ += 1
+            if len(args) == 1:
+                refs = args[0]
+                self._direct_ref_[:] = np.clip(np.asarray([refs[i] for i in range(0, self._axes_)], dtype=float), self._min_, self._max_)
+            else:
+                n_joint, joints, refs = args
+                for i in range(0, n_joint):
+                    j = joints[i]
+                    self._direct_ref_[j] = min(max(float(refs[i]), self._min_[j]), self._max_[j])
+            return True
+
+    def getRefPosition(self, j):
+        return float(self._direct_ref_[j])
+
+    # IEncoders
+
+    def getEncoder(self, j):
+        with self._lock_:
+            self._update_()
+            return float(self._q_[j])
+
+    def getEncoders(self, data):
+        with self._lock_:
+            self._update_()
+            self._fill_(data, self._q_)
+            return True
+
+    def getEncoderSpeeds(self, data):
+        with self._lock_:
+            self._update_()
+            self._fill_(data, self._qd_)
+            return True
+
+    # IControlMode
+
+    def setControlMode(self, j, mode):
+        with self._lock_:
+            self._update_()
+            self._commands_ += 1
+            if mode == VOCAB_CM_POSITION and self._modes_[j] != VOCAB_CM_POSITION:
+                self._target_[j] = self._q_[j]
+            if mode == VOCAB_CM_POSITION_DIRECT and self._modes_[j] != VOCAB_CM_POSITION_DIRECT:
+                self._direct_ref_[j] = self._q_[j]
+            self._modes_[j] = mode
+            return True
+
+    def getControlMode(self, j):
+        return int(self._modes_[j])
+
+    def getControlModes(self, data):
+        with self._lock_:
+            self._commands_ += 1
+        for j in range(0, len(self._modes_)):
+            data[j] = int(self._modes_[j])
+        return True
+
+    # IControlLimits
+
+    def getLimits(self, j, min_data, max_data):
+        self._commands_ += 1
+        min_data[0] = float(self._min_[j])
+        max_data[0] = float(self._max_[j])
+        return True
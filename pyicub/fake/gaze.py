@@ -0,0 +1,214 @@
+# BSD 2-Clause License
+#
+# Copyright (c) 2025, Social Cognition in Human-Robot Interaction,
+#                     Istituto Italiano di Tecnologia, Genova
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Module: gaze.py
+
+A simulated gaze controller exposing the IGazeControl methods used by pyicub.GazeController.
+The fixation angles (azimuth, elevation, vergence) follow their target with a first-order response whose
+time constant is derived from the neck trajectory time.
+"""
+
+import math
+import threading
+import time
+
+import numpy as np
+
+
+class FakeGazeController:
+    """
+    Simulated iKinGazeCtrl.
+
+    Attributes:
+        MOTION_DONE_TOLERANCE (float): Distance (degrees) below which the gaze is considered on target.
+        VERGENCE_MIN (float): Minimum vergence angle (degrees).
+    """
+
+    MOTION_DONE_TOLERANCE = 0.1
+    VERGENCE_MIN = 1.0
+
+    def __init__(self, name='fake'):
+        self._name_ = name
+        self._lock_ = threading.RLock()
+        self._angles_ = np.array([0.0, 0.0, self.VERGENCE_MIN])
+        self._target_ = self._angles_.copy()
+        self._velocity_ = np.zeros(3)
+        self._neck_tt_ = 0.75
+        self._eyes_tt_ = 0.25
+        self._tracking_ = False
+        self._blocked_ = set()
+        self._last_update_ = time.perf_counter()
+        self._commands_ = 0
+
+    @property
+    def name(self):
+        return self._name_
+
+    @property
+    def commands(self):
+        return self._commands_
+
+    def _update_(self):
+        now = time.perf_counter()
+        dt = now - self._last_update_
+        self._last_update_ = now
+        if dt <= 0.0:
+            return
+        tau = max(self._neck_tt_, 1e-3)/4.0
+        alpha = 1.0 - math.exp(-dt/tau)
+        prev = self._angles_.copy()
+        self._angles_ += (self._target_ - self._angles_)*alpha
+        self._velocity_ = (self._angles_ - prev)/dt
+
+    def _command_(self, target=None):
+        with self._lock_:
+            self._update_()
+            self._commands_ += 1
+            if target is not None:
+                target[2] = max(target[2], self.VERGENCE_MIN)
+                self._target_ = target
+
+    # PolyDriver
+
+    def isValid(self):
+        return True
+
+    def viewIGazeControl(self):
+        return self
+
+    # IGazeControl
+
+    def lookAtAbsAngles(self, angles):
+        self._command_(np.array([angles[0], angles[1], angles[2]], dtype=float))
+        return True
+
+    def lookAtRelAngles(self, angles):
+        with self._lock_:
+            self._update_()
+            base = self._angles_.copy()
+        self._command_(base + np.array([angles[0], angles[1], angles[2]], dtype=float))
+        return True
+
+    def getAngles(self, angles):
+        with self._lock_:
+            self._update_()
+            for i in range(0, 3):
+                angles[i] = float(self._angles_[i])
+        return True
+
+    def getAnglesFrom3DPoint(self, p, angles):
+        x, y, z = p[0], p[1], p[2]
+        angles[0] = math.degrees(math.atan2(y, -x))
+        angles[1] = math.degrees(math.atan2(z, math.hypot(x, y)))
+        angles[2] = max(self.VERGENCE_MIN, math.degrees(2.0*math.atan2(0.034, max(math.sqrt(x*x + y*y + z*z), 1e-3))))
+        return True
+
+    def getJointsVelocities(self, q):
+        with self._lock_:
+            self._update_()
+            for i in range(0, 3):
+                q[i] = float(self._velocity_[i])
+            for i in range(3, q.size()):
+                q[i] = 0.0
+        return True
+
+    def checkMotionDone(self):
+        with self._lock_:
+            self._update_()
+            return bool(np.all(np.abs(self._target_ - self._angles_) <= self.MOTION_DONE_TOLERANCE))
+
+    def waitMotionDone(self, period=0.1, timeout=0.0):
+        t0 = time.perf_counter()
+        while not self.checkMotionDone():
+            if timeout > 0.0 and time.perf_counter() - t0 > timeout:
+                return False
+            time.sleep(period)
+        return True
+
+    def stopControl(self):
+        with self._lock_:
+            self._update_()
+            self._commands_ += 1
+            self._target_ = self._angles_.copy()
+        return True
+
+    def setTrackingMode(self, mode):
+        self._command_()
+        self._tracking_ = bool(mode)
+        return True
+
+    def setNeckTrajTime(self, t):
+        self._command_()
+        self._neck_tt_ = float(t)
+        return True
+
+    def setEyesTrajTime(self, t):
+        self._command_()
+        self._eyes_tt_ = float(t)
+        return True
+
+    def blockEyes(self, vergence=0.0):
+        self._command_()
+        self._blocked_.add('eyes')
+        return True
+
+    def blockNeckYaw(self):
+        self._command_()
+        self._blocked_.add('neck_yaw')
+        return True
+
+    def blockNeckRoll(self):
+        self._command_()
+        self._blocked_.add('neck_roll')
+        return True
+
+    def blockNeckPitch(self):
+        self._command_()
+        self._blocked_.add('neck_pitch')
+        return True
+
+    def clearEyes(self):
+        self._command_()
+        self._blocked_.discard('eyes')
+        return True
+
+    def clearNeckYaw(self):
+        self._command_()
+        self._blocked_.discard('neck_yaw')
+        return True
+
+    def clearNeckRoll(self):
+        self._command_()
+        self._blocked_.discard('neck_roll')
+        return True
+
+    def clearNeckPitch(self):
+        self._command_()
+        self._blocked_.discard('neck_pitch')
+        return True
@@ -0,0 +1,591 @@
+# BSD 2-Clause License
+#
+# Copyright (c) 2025, Social Cognition in Human-Robot Interaction,
+#                     Istituto Italiano di Tecnologia, Genova
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Module: network.py
+
+In-process stand-ins for the YARP network, bottles and ports used by pyicub.
+Ports register themselves by name in a process-wide registry; `Network.connect` links two registered ports and
+writes on a BufferedPortBottle are delivered synchronously to every connected reader.
+RPC clients only connect to RpcServer ports opened in the same process, so remote modules (e.g. iSpeak) are
+reported as unavailable, as they would be on a robot-less machine.
+"""
+
+import logging
+import queue
+import threading
+
+
+class Value:
+    """
+    A single bottle item, mimicking yarp.Value.
+    """
+    def __init__(self, value=None):
+        self._value_ = value
+
+    def isString(self):
+        return isinstance(self._value_, str)
+
+    def isInt32(self):
+        return isinstance(self._value_, int) and not isinstance(self._value_, bool)
+
+    def isFloat64(self):
+        return isinstance(self._value_, float)
+
+    def isList(self):
+        return isinstance(self._value_, Bottle)
+
+    def isNull(self):
+        return self._value_ is None
+
+    def asString(self):
+        if self._value_ is None:
+            return ''
+        return self._value_ if isinstance(self._value_, str) else Bottle._format_(self._value_)
+
+    def asInt32(self):
+        try:
+            return int(self._value_)
+        except (TypeError, ValueError):
+            return 0
+
+    def asFloat64(self):
+        try:
+            return float(self._value_)
+        except (TypeError, ValueError):
+            return 0.0
+
+    def asBool(self):
+        return bool(self._value_)
+
+    def asVocab32(self):
+        return self.asInt32()
+
+    def asList(self):
+        return self._value_ if isinstance(self._value_, Bottle) else None
+
+    def toString(self):
+        return Bottle._format_(self._value_)
+
+
+class Bottle:
+    """
+    List of values, mimicking yarp.Bottle. `fromString`/`toString` use a whitespace separated, YARP-like text
+    form where nested lists are enclosed in parentheses and strings with spaces are double-quoted.
+    """
+    def __init__(self, text=None):
+        self._items_ = []
+        if isinstance(text, str):
+            self.fromString(text)
+
+    @staticmethod
+    def _format_(value):
+        if isinstance(value, Bottle):
+            return '(' + value.toString() + ')'
+        if isinstance(value, str):
+            if value == '' or any(c in value for c in ' ()"'):
+                return '"' + value.replace('"', '\\"') + '"'
+            return value
+        if isinstance(value, float):
+            return repr(value)
+        return str(value)
+
+    @staticmethod
+    def _tokenize_(text):
+        tokens = []
+        i, n = 0, len(text)
+        while i < n:
+            c = text[i]
+            if c.isspace():
+                i += 1
+            elif c in '()':
+                tokens.append(c)
+                i += 1
+            elif c == '"':
+                j = i + 1
+                buf = []
+                while j < n and text[j] != '"':
+                    if text[j] == '\\' and j + 1 < n:
+                        j += 1
+                    buf.append(text[j])
+                    j += 1
+                tokens.append(('"', ''.join(buf)))
+                i = j + 1
+            else:
+                j = i
+                while j < n and not text[j].isspace() and text[j] not in '()"':
+                    j += 1
+                tokens.append(text[i:j])
+                i = j
+        return tokens
+
+    @staticmethod
+    def _parse_(token):
+        if isinstance(token, tuple):
+            return token[1]
+        try:
+            return int(token)
+        except ValueError:
+            pass
+        try:
+            return float(token)
+        except ValueError:
+            return token
+
+    def fromString(self, text):
+        self._items_ = []
+        stack = [self]
+        for token in Bottle._tokenize_(text):
+            if token == '(':
+                sub = Bottle()
+                stack[-1]._items_.append(sub)
+                stack.append(sub)
+            elif token == ')':
+                if len(stack) > 1:
+                    stack.pop()
+            else:
+                stack[-1]._items_.append(Bottle._parse_(token))
+
+    def toString(self):
+        return ' '.join(Bottle._format_(v) for v in self._items_)
+
+    def copy(self, other):
+        self.fromString(other.toString())
+
+    def clear(self):
+        self._items_ = []
+
+    def size(self):
+        return len(self._items_)
+
+    def get(self, i):
+        if 0 <= i < len(self._items_):
+            return Value(self._items_[i])
+        return Value()
+
+    def addString(self, value):
+        self._items_.append(str(value))
+
+    def addInt32(self, value):
+        self._items_.append(int(value))
+
+    def addVocab32(self, value):
+        self._items_.append(int(value))
+
+    def addFloat64(self, value):
+        self._items_.append(float(value))
+
+    def addDouble(self, value):
+        self.addFloat64(value)
+
+    def addList(self):
+        sub = Bottle()
+        self._items_.append(sub)
+        return sub
+
+    def find(self, key):
+        for item in self._items_:
+            if isinstance(item, Bottle) and item.size() > 1 and item._items_[0] == key:
+                return Value(item._items_[1])
+        for i in range(0, len(self._items_) - 1):
+            if self._items_[i] == key:
+                return Value(self._items_[i + 1])
+        return Value()
+
+    def check(self, key):
+        return not self.find(key).isNull()
+
+
+class BottleCallback:
+    """
+    Reader callback base class, mimicking yarp.BottleCallback.
+    """
+    def __init__(self):
+        pass
+
+    def onRead(self, bottle, reader=None):
+        pass
+
+
+class Network:
+    """
+    Process-wide port registry, mimicking the yarp.Network static API.
+    Instances are accepted too (`yarp.Network().init()`), all methods act on the shared registry.
+    """
+
+    _ports_ = {}
+    _connections_ = set()
+    _lock_ = threading.RLock()
+    _initialized_ = 0
+
+    @classmethod
+    def init(cls):
+        cls._initialized_ += 1
+        return True
+
+    @classmethod
+    def fini(cls):
+        cls._initialized_ = max(0, cls._initialized_ - 1)
+
+    @classmethod
+    def checkNetwork(cls, timeout=0.0):
+        return True
+
+    @classmethod
+    def reset(cls):
+        with cls._lock_:
+            cls._ports_.clear()
+            cls._connections_.clear()
+
+    @classmethod
+    def register(cls, name, port):
+        with cls._lock_:
+            if name in cls._ports_.keys():
+                return False
+            cls._ports_[name] = port
+            return True
+
+    @classmethod
+    def unregister(cls, name):
+        with cls._lock_:
+            cls._ports_.pop(name, None)
+            cls._connections_ = set(c for c in cls._connections_ if name not in c)
+
+    @classmethod
+    def lookup(cls, name):
+        with cls._lock_:
+            return cls._ports_.get(name)
+
+    @classmethod
+    def exists(cls, name, quiet=True):
+        return cls.lookup(name) is not None
+
+    @classmethod
+    def queryName(cls, name):
+        return name if cls.exists(name) else None
+
+    @classmethod
+    def connect(cls, src, dst, carrier='', quiet=True):
+        with cls._lock_:
+            if not src in cls._ports_.keys() or not dst in cls._ports_.keys():
+                return False
+            cls._connections_.add((src, dst))
+            return True
+
+    @classmethod
+    def disconnect(cls, src, dst, quiet=True):
+        with cls._lock_:
+            if (src, dst) in cls._connections_:
+                cls._connections_.discard((src, dst))
+                return True
+            return False
+
+    @classmethod
+    def isConnected(cls, src, dst, quiet=True):
+        with cls._lock_:
+            return (src, dst) in cls._connections_
+
+    @classmethod
+    def readers(cls, src):
+        with cls._lock_:
+            return [cls._ports_[dst] for (s, dst) in cls._connections_ if s == src and dst in cls._ports_.keys()]
+
+
+class Port:
+    """
+    Named port, mimicking yarp.Port. Subclasses receive bottles through `deliver()`.
+    """
+    def __init__(self):
+        self._name_ = ''
+        self._open_ = False
+
+    def open(self, name):
+        if self._open_:
+            self.close()
+        if not Network.register(name, self):
+            return False
+        self._name_ = name
+        self._open_ = True
+        return True
+
+    def close(self):
+        if self._open_:
+            Network.unregister(self._name_)
+        self._open_ = False
+
+    def interrupt(self):
+        pass
+
+    def isOpen(self):
+        return self._open_
+
+    def getName(self):
+        return self._name_
+
+    def addOutput(self, name):
+        return Network.connect(self._name_, name)
+
+    def getInputCount(self):
+        with Network._lock_:
+            return len([c for c in Network._connections_ if c[1] == self._name_])
+
+    def getOutputCount(self):
+        return len(Network.readers(self._name_))
+
+    def deliver(self, bottle):
+        pass
+
+    def write(self, bottle):
+        for reader in Network.readers(self._name_):
+            reader.deliver(bottle)
+        return True
+
+
+class BufferedPortBottle(Port):
+    """
+    Buffered bottle port, mimicking yarp.BufferedPortBottle.
+    Incoming bottles are queued (or dropped to the latest one if not strict) or handed to a callback.
+    """
+    def __init__(self):
+        Port.__init__(self)
+        self._out_ = Bottle()
+        self._in_ = queue.Queue()
+        self._last_ = None
+        self._strict_ = False
+        self._callback_ = None
+        self._interrupted_ = False
+
+    def prepare(self):
+        return self._out_
+
+    def write(self, forceStrict=False):
+        msg = Bottle()
+        msg.copy(self._out_)
+        return Port.write(self, msg)
+
+    def unprepare(self):
+        self._out_.clear()
+
+    def setStrict(self, strict=True):
+        self._strict_ = strict
+
+    def useCallback(self, callback):
+        self._callback_ = callback
+
+    def disableCallback(self):
+        self._callback_ = None
+
+    def deliver(self, bottle):
+        msg = Bottle()
+        msg.copy(bottle)
+        if self._callback_ is not None:
+            self._last_ = msg
+            self._callback_.onRead(msg, self)
+            return
+        if not self._strict_:
+            while not self._in_.empty():
+                try:
+                    self._in_.get_nowait()
+                except queue.Empty:
+                    break
+        self._in_.put(msg)
+
+    def read(self, shouldWait=True):
+        while True:
+            try:
+                self._last_ = self._in_.get(block=shouldWait, timeout=0.1 if shouldWait else None)
+                return self._last_
+            except queue.Empty:
+                if not shouldWait or self._interrupted_ or not self._open_:
+                    return None
+
+    def lastRead(self):
+        return self._last_
+
+    def getPendingReads(self):
+        return self._in_.qsize()
+
+    def interrupt(self):
+        self._interrupted_ = True
+
+    def close(self):
+        self._interrupted_ = True
+        Port.close(self)
+
+
+class RpcServer(Port):
+    """
+    In-process RPC server, mimicking yarp.RpcServer. Requests are answered by the `responder(cmd, reply)`
+    callable passed to `setResponder`.
+    """
+    def __init__(self):
+        Port.__init__(self)
+        self._responder_ = None
+
+    def setResponder(self, responder):
+        self._responder_ = responder
+
+    def reply(self, cmd, reply):
+        if self._responder_ is None:
+            return False
+        res = self._responder_(cmd, reply)
+        return True if res is None else bool(res)
+
+
+class RpcClient(Port):
+    """
+    RPC client, mimicking yarp.RpcClient. Only RpcServer ports opened in the same process can be reached.
+    """
+    def __init__(self):
+        Port.__init__(self)
+        self._server_ = None
+
+    def addOutput(self, name):
+        server = Network.lookup(name)
+        if not isinstance(server, RpcServer):
+            return False
+        self._server_ = name
+        return True
+
+    def write(self, cmd, reply=None):
+        server = Network.lookup(self._server_) if self._server_ else None
+        if server is None:
+            return False
+        if reply is None:
+            reply = Bottle()
+        return server.reply(cmd, reply)
+
+    def getOutputCount(self):
+        return 1 if self._server_ and Network.exists(self._server_) else 0
+
+
+class Log:
+    """
+    Mimics yarp.Log on top of the standard `yarp` python logger.
+    """
+    def __init__(self, *args):
+        self._logger_ = logging.getLogger('yarp')
+
+    def isEnabledFor(self, level):
+        return self._logger_.isEnabledFor(level)
+
+    def trace(self, msg):
+        self._logger_.debug(msg)
+
+    def debug(self, msg):
+        self._logger_.debug(msg)
+
+    def info(self, msg):
+        self._logger_.info(msg)
+
+    def warning(self, msg):
+        self._logger_.warning(msg)
+
+    def error(self, msg):
+        self._logger_.error(msg)
+
+    def fatal(self, msg):
+        self._logger_.critical(msg)
+
+
+class ResourceFinder:
+    """
+    Command-line option lookup, mimicking yarp.ResourceFinder.
+    """
+    def __init__(self):
+        self._options_ = Bottle()
+
+    def setVerbose(self, verbose=True):
+        pass
+
+    def setDefaultContext(self, context):
+        pass
+
+    def setDefaultConfigFile(self, filename):
+        pass
+
+    def configure(self, argv):
+        tokens = []
+        for arg in argv[1:]:
+            if arg.startswith('--'):
+                tokens.append('(' + arg[2:])
+            elif tokens:
+                tokens[-1] += ' ' + Bottle._format_(arg)
+        self._options_.fromString(' '.join(t + ')' for t in tokens))
+        return True
+
+    def check(self, key):
+        return self._options_.check(key)
+
+    def find(self, key):
+        return self._options_.find(key)
+
+
+class RFModule:
+    """
+    Module life-cycle, mimicking yarp.RFModule: `runModule` calls updateModule() every getPeriod() seconds.
+    """
+    def __init__(self):
+        self._stopping_ = threading.Event()
+        self._attached_ = []
+
+    def attach(self, port):
+        self._attached_.append(port)
+        return True
+
+    def configure(self, rf):
+        return True
+
+    def getPeriod(self):
+        return 1.0
+
+    def updateModule(self):
+        return False
+
+    def interruptModule(self):
+        return True
+
+    def close(self):
+        return True
+
+    def stopModule(self, wait=False):
+        self._stopping_.set()
+
+    def isStopping(self):
+        return self._stopping_.is_set()
+
+    def runModule(self, rf=None):
+        if rf is not None and not self.configure(rf):
+            return 1
+        while not self._stopping_.is_set():
+            if not self.updateModule():
+                break
+            self._stopping_.wait(self.getPeriod())
+        self.interruptModule()
+        self.close()
+        return 0
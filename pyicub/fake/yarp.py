@@ -0,0 +1,215 @@
+# BSD 2-Clause License
+#
+# Copyright (c) 2025, Social Cognition in Human-Robot Interaction,
+#                     Istituto Italiano di Tecnologia, Genova
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+Module: yarp.py
+
+A pure-Python stand-in for the subset of the `yarp` bindings used by pyicub.
+PolyDriver instances opened with the remote_controlboard device are backed by FakeControlBoard objects shared
+by remote port name, so that different iCubPart objects of the same robot part (e.g. HEAD, NECK, EYES) see the
+same simulated joints. The gazecontrollerclient device is backed by a FakeGazeController, and ports, bottles
+and RPC clients are served by the in-process registry of pyicub.fake.network.
+
+Use `pyicub.fake.install()` (or set PYICUB_FAKE_YARP=true) to make this module importable as `yarp`, so that
+iCub, the controllers and the REST apps run unmodified without a YARP network.
+"""
+
+import threading
+import time
+
+from pyicub.fake.controlboard import FakeControlBoard, createVocab32, VOCAB_CM_IDLE, VOCAB_CM_POSITION, VOCAB_CM_POSITION_DIRECT, VOCAB_CM_VELOCITY
+from pyicub.fake.gaze import FakeGazeController
+from pyicub.fake.network import Value, Bottle, BottleCallback, Network, Port, BufferedPortBottle, RpcServer, RpcClient, Log, ResourceFinder, RFModule
+
+
+class Vector:
+    """
+    Fixed-size vector of doubles, mimicking yarp.Vector.
+    """
+    def __init__(self, size=0, value=0.0):
+        self._data_ = [float(value)]*size
+
+    def __getitem__(self, i):
+        return self._data_[i]
+
+    def __setitem__(self, i, value):
+        self._data_[i] = float(value)
+
+    def __len__(self):
+        return len(self._data_)
+
+    def data(self):
+        return self
+
+    def size(self):
+        return len(self._data_)
+
+    def get(self, i):
+        return self._data_[i]
+
+    def set(self, i, value):
+        self._data_[i] = float(value)
+
+    def toString(self):
+        return ' '.join('%f' % v for v in self._data_)
+
+
+class DVector(Vector):
+    """
+    Fixed-size vector of doubles, mimicking yarp.DVector (std::vector<double>).
+    """
+
+
+class IVector(Vector):
+    """
+    Fixed-size vector of integers, mimicking yarp.IVector.
+    """
+    def __init__(self, size=0, value=0):
+        self._data_ = [int(value)]*size
+
+    def __setitem__(self, i, value):
+        self._data_[i] = int(value)
+
+    def set(self, i, value):
+        self._data_[i] = int(value)
+
+    def toString(self):
+        return ' '.join('%d' % v for v in self._data_)
+
+
+class Property:
+    """
+    Key-value container, mimicking yarp.Property.
+    """
+    def __init__(self):
+        self._props_ = {}
+
+    def put(self, key, value):
+        self._props_[key] = value
+
+    def check(self, key):
+        return key in self._props_.keys()
+
+    def find(self, key):
+        return self._props_.get(key)
+
+
+class PolyDriver:
+    """
+    Device driver factory, mimicking yarp.PolyDriver.
+    """
+
+    _boards_ = {}
+    _gazes_ = {}
+    _lock_ = threading.Lock()
+
+    def __init__(self, props=None):
+        self._device_ = None
+        if props is not None:
+            self.open(props)
+
+    @classmethod
+    def getBoard(cls, remote):
+        with cls._lock_:
+            if not remote in cls._boards_.keys():
+                cls._boards_[remote] = FakeControlBoard(name=remote)
+            return cls._boards_[remote]
+
+    @classmethod
+    def getGaze(cls, remote):
+        with cls._lock_:
+            if not remote in cls._gazes_.keys():
+                cls._gazes_[remote] = FakeGazeController(name=remote)
+            return cls._gazes_[remote]
+
+    @classmethod
+    def reset(cls):
+        with cls._lock_:
+            cls._boards_.clear()
+            cls._gazes_.clear()
+
+    def open(self, props):
+        device = props.find("device")
+        if device == "remote_controlboard":
+            self._device_ = PolyDriver.getBoard(props.find("remote"))
+        elif device == "gazecontrollerclient":
+            self._device_ = PolyDriver.getGaze(props.find("remote"))
+        return self.isValid()
+
+    def isValid(self):
+        return self._device_ is not None
+
+    def close(self):
+        self._device_ = None
+        return True
+
+    def __getattr__(self, name):
+        if name.startswith('view') and self.__dict__.get('_device_') is not None:
+            return getattr(self._device_, name)
+        raise AttributeError(name)
+
+
+class ImageRgb:
+    """
+    RGB image, mimicking yarp.ImageRgb.
+    """
+    def __init__(self):
+        self._width_ = 0
+        self._height_ = 0
+
+    def resize(self, width, height):
+        self._width_ = width
+        self._height_ = height
+
+    def copy(self, other):
+        self.resize(other.width(), other.height())
+
+    def width(self):
+        return self._width_
+
+    def height(self):
+        return self._height_
+
+
+class BufferedPortImageRgb(BufferedPortBottle):
+    """
+    Image port, mimicking yarp.BufferedPortImageRgb. No simulated camera publishes images.
+    """
+    def prepare(self):
+        return ImageRgb()
+
+    def write(self, forceStrict=False):
+        return True
+
+
+def delay(seconds):
+    time.sleep(seconds)
+
+def now():
+    return time.time()
@@ -30,7 +30,15 @@ import yarp
 yarp.Network().init()
 
 from pyicub.controllers.gaze import GazeController
+from pyicub.controllers.planner import SpeedProfilePlanner, StepProfile
+from pyicub.controllers.limits import ActionValidator, ValidationReport
+from pyicub.controllers.profiler import MotionProfiler
+from pyicub.controllers.streaming import TrajectoryStreamer, StreamingStats
+from pyicub.controllers.trajectory import JointsTrajectory
+from pyicub.controllers.recorder import KinestheticRecorder, Recording
+from pyicub.controllers.dispatcher import StepDispatcher, DispatchReport
 from pyicub.controllers.position import PositionController, JointPose, iCubPart, ICUB_HEAD, ICUB_EYELIDS, ICUB_EYES, ICUB_NECK, ICUB_TORSO, ICUB_RIGHTARM_FULL, ICUB_LEFTARM_FULL, ICUB_RIGHTARM, ICUB_LEFTARM, ICUB_LEFTHAND, ICUB_RIGHTHAND
+from pyicub.binary import importActionFile, EXTENSION as BINARY_EXTENSION
 from pyicub.actions import PyiCubCustomCall, LimbMotion, GazeMotion, iCubFullbodyStep, iCubFullbodyAction, JointsTrajectoryCheckpoint, iCubActionTemplate, ActionsManager, TemplateParameter
 from pyicub.modules.emotions import emotionsPyCtrl
 from pyicub.modules.speech import iSpeakPyCtrl
@@ -41,15 +49,24 @@ from pyicub.modules.attention import VisualAttention
 from pyicub.modules.llm import iGPT
 from pyicub.core.ports import BufferedReadPort
 from pyicub.core.logger import PyicubLogger, YarpLogger
+from pyicub.core.motionlog import BinaryMotionSink
+from pyicub.core.tracing import Tracer, traced
+from pyicub.core.timeline import TimelineScheduler
+from pyicub.repository import ActionRepository
+from pyicub.store import ActionStore
+from pyicub.analyzer import ActionAnalyzer
+from pyicub.compiler import ActionCompiler, ActionPlan, StepPlan, LimbPlan, PlanExecution, SwitchStats
 from pyicub.requests import iCubRequest, iCubRequestsManager
 from pyicub.utils import SingletonMeta, getPublicMethods, firstAvailablePort, importFromJSONFile, exportJSONFile
 from collections import deque
 from enum import Enum
 
+import copy
 import threading
 import os
 import time
 import inspect
+import numpy as np
 
 
 
@@ -66,6 +83,8 @@ class iCubSingleton(type):
 
 class iCub(metaclass=iCubSingleton):
 
+    SINGLE_THREAD_DISPATCH = False
+
     def __init__(self, robot_name="icub", request_manager: iCubRequestsManager=None, action_repository_path='', proxy_host=None):
         SIMULATION = os.getenv('ICUB_SIMULATION')
 
@@ -81,9 +100,19 @@ class iCub(metaclass=iCubSingleton):
         self._attention_              = None
         self._gpt_                   = None
         self._monitors_               = []
+        self._motion_sink_            = None
+        self._profiler_               = MotionProfiler()
+        self._tracer_                 = Tracer()
         self._logger_                 = PyicubLogger.getLogger() #YarpLogger.getLogger()
         self._request_manager_        = request_manager
         self._actions_manager_        = ActionsManager()
+        self._compiler_               = ActionCompiler(self)
+        self._plans_                  = {}
+        self._timeline_               = TimelineScheduler(self._logger_)
+        self._executions_             = set()
+        self._executions_lock_        = threading.Lock()
+        self._switch_stats_           = SwitchStats()
+        self._action_store_           = ActionStore()
         self._action_repository_path_ = action_repository_path
         self._proxy_host_             = proxy_host
 
@@ -108,12 +137,12 @@ class iCub(metaclass=iCubSingleton):
 
         self._robot_name_ = robot_name
 
-        if action_repository_path:
-            self.__importActions__(path=action_repository_path)
-
         self._initPositionControllers_()
         self._initGazeController_()
 
+        if action_repository_path:
+            self.__importActions__(path=action_repository_path)
+
         if not self._request_manager_:
             self._request_manager_ = iCubRequestsManager(self._logger_)
 
@@ -125,9 +154,7 @@ class iCub(metaclass=iCubSingleton):
         yarp.Network().fini()
 
     def __importActions__(self, path):
-        json_files = [pos_json for pos_json in os.listdir(path) if pos_json.endswith('.json')]
-        for f in json_files:
-            self.importAction(os.path.join(path, f))
+        self.addActionRepository(path)
     
     def _initPositionControllers_(self):
         for part in self._icub_parts_.values():
@@ -140,6 +167,7 @@ class iCub(metaclass=iCubSingleton):
         if ctrl.isValid():
             self._position_controllers_[part.name] = ctrl
             self._position_controllers_[part.name].init()
+            self._position_controllers_[part.name].setProfiler(self._profiler_)
         else:
             self._logger_.warning('PositionController <%s> not callable! Are you sure the robot part is available?' % part.robot_part)
 
@@ -156,6 +184,8 @@ class iCub(metaclass=iCubSingleton):
         if len(self._monitors_) > 0:
             for v in self._monitors_:
                 v.stop()
+        self._timeline_.stop()
+        self.setMotionTelemetry(None)
     @property
     def logger(self):
         return self._logger_
@@ -214,6 +244,10 @@ class iCub(metaclass=iCubSingleton):
     def actions_manager(self):
         return self._actions_manager_
 
+    @property
+    def action_store(self):
+        return self._action_store_
+
     @property
     def emo(self):
         if self._emo_ is None:
@@ -262,6 +296,7 @@ class iCub(metaclass=iCubSingleton):
     def deleteAction(self, action_id: str):
         if action_id in self.actions_manager.getActions():
             self.actions_manager.deleteAction(action_id)
+            self._action_store_.unbind(action_id)
             return True
         else:
             self._logger_.error('Action <%s> not found!' % action_id)
@@ -269,11 +304,150 @@ class iCub(metaclass=iCubSingleton):
         
     def flushActions(self, name_prefix=None):
         self.actions_manager.flushActions(name_prefix=name_prefix)
+        self._action_store_.unbindAll(name_prefix=name_prefix)
         return True
 
+    def missingActions(self, hashes):
+        """
+        Returns:
+            list: the hashes (see pyicub.store.actionHash) of the actions not present in the action store.
+        """
+        return self._action_store_.missing(hashes)
+
+    def storeActions(self, JSON_dicts):
+        """
+        Adds action dicts to the action store, without binding them to action ids (see bindActions).
+
+        Returns:
+            list: the hashes of the stored actions.
+        """
+        return [self._action_store_.put(JSON_dict) for JSON_dict in JSON_dicts]
+
+    def bindActions(self, hashes, name_prefix=None, flush_prefixes=None):
+        """
+        Binds the stored actions to the ids `name_prefix.<action name>`. The actions whose id is already bound to
+        the same hash are left untouched; the other actions with one of the `flush_prefixes` are deleted. Nothing
+        is changed if some of the hashes are missing: store them (see storeActions) and bind again.
+
+        Returns:
+            dict: 'missing' hashes and bound 'action_ids'.
+        """
+        missing = self._action_store_.missing(hashes)
+        if missing:
+            return {'missing': missing, 'action_ids': []}
+        bound = {}
+        for action_hash in hashes:
+            name = self._action_store_.get(action_hash)['name']
+            bound[name_prefix + '.' + name if name_prefix else name] = action_hash
+        for prefix in (flush_prefixes or []):
+            for action_id in list(self.actions_manager.getActions()):
+                if action_id.startswith(prefix) and bound.get(action_id) != self.__boundHash__(action_id):
+                    self.actions_manager.deleteAction(action_id)
+                    self._action_store_.unbind(action_id)
+        action_ids = []
+        for action_id, action_hash in bound.items():
+            if self.__boundHash__(action_id) == action_hash:
+                self._action_store_.bind(action_id, action_hash, self.actions_manager.getActionVersion(action_id), reused=True)
+            else:
+                if action_id in self.actions_manager.getActions():
+                    self.actions_manager.deleteAction(action_id)
+                # the stored dict must keep matching its hash, the action gets its own copy
+                action = iCubFullbodyAction(JSON_dict=copy.deepcopy(self._action_store_.get(action_hash)))
+                report = self.validateAction(action)
+                if not report.valid:
+                    self._logger_.error(report.summary())
+                    raise Exception(report.summary())
+                self.actions_manager.addAction(action, action_id=action_id)
+                self._action_store_.bind(action_id, action_hash, self.actions_manager.getActionVersion(action_id))
+            action_ids.append(action_id)
+        return {'missing': [], 'action_ids': action_ids}
+
+    def __boundHash__(self, action_id):
+        binding = self._action_store_.binding(action_id)
+        if binding is None or binding[1] != self.actions_manager.getActionVersion(action_id):
+            return None
+        return binding[0]
+
+    def addActionRepository(self, path, name_prefix=None, memory_budget=ActionRepository.DEFAULT_MEMORY_BUDGET):
+        """
+        Indexes the JSON actions in `path` without loading them: each action is parsed and validated (see
+        validateAction) on first use. See pyicub.repository.ActionRepository.
+        """
+        repository = ActionRepository(path, name_prefix=name_prefix, memory_budget=memory_budget, logger=self._logger_, validator=self.validateAction)
+        return self.actions_manager.addRepository(repository)
+
+    def rescanActions(self):
+        """
+        Reloads the changed files of the action repositories. The plans of the changed actions are compiled again
+        on their next use.
+        """
+        return self.actions_manager.rescanRepositories()
+
+    def compileAction(self, action: iCubFullbodyAction, action_id=None):
+        """
+        Compiles an action into an ActionPlan (see pyicub.compiler).
+        """
+        version = self.actions_manager.getActionVersion(action_id) if action_id else None
+        return self._compiler_.compile(action, action_id=action_id, version=version)
+
+    def getActionPlan(self, action_id: str):
+        """
+        Returns the cached plan of an action, compiling it again if the action has changed since.
+
+        Returns:
+            ActionPlan: the compiled action.
+        """
+        plan = self._plans_.get(action_id)
+        if plan is None or plan.version != self.actions_manager.getActionVersion(action_id):
+            plan = self.compileAction(self.actions_manager.getAction(action_id), action_id=action_id)
+            self._plans_[action_id] = plan
+        return plan
+
+    def invalidatePlans(self, action_id=None):
+        if action_id:
+            self._plans_.pop(action_id, None)
+        else:
+            self._plans_.clear()
+
     def exists(self):
         return len(self._position_controllers_.keys()) > 0
 
+    @property
+    def profiler(self):
+        return self._profiler_
+
+    @property
+    def tracer(self):
+        return self._tracer_
+
+    @property
+    def timeline(self):
+        return self._timeline_
+
+    def saveMotionProfile(self, path):
+        """
+        Saves the motions recorded by the motion profiler, to be reloaded with loadMotionProfile()
+        or inspected with `python -m pyicub.proc.motionprofiler report`.
+        """
+        self._profiler_.save(path)
+
+    def loadMotionProfile(self, path):
+        self._profiler_.load(path)
+
+    def setMotionTelemetry(self, path):
+        """
+        Records every motion event of every position controller into the binary file `path`
+        (see `BinaryMotionSink.read`). Pass None to stop recording.
+        """
+        previous = self._motion_sink_
+        self._motion_sink_ = BinaryMotionSink(path) if path else None
+        # the controllers are switched first: a closed sink refuses the events
+        for ctrl in self._position_controllers_.values():
+            ctrl.setMotionSink(self._motion_sink_)
+        if previous is not None:
+            previous.close()
+        return self._motion_sink_
+
     def getPositionController(self, part: iCubPart):
         if part.name in self._position_controllers_.keys():
             return self._position_controllers_[part.name]
@@ -283,6 +457,7 @@ class iCub(metaclass=iCubSingleton):
     def portmonitor(self, yarp_src_port, activate_function, callback):
         self._monitors_.append(PortMonitor(yarp_src_port, activate_function, callback, period=0.01, autostart=True))
 
+    @traced('execCustomCall')
     def execCustomCall(self, custom_call: PyiCubCustomCall, prefix='', ts_ref=0.0):
         calls = custom_call.target.split('.')
         foo = self
@@ -299,9 +474,12 @@ class iCub(metaclass=iCubSingleton):
         for call in calls:
             self.execCustomCall(call, prefix, ts_ref)
 
-    def exportAction(self, action_id: str, path):
+    def exportAction(self, action_id: str, path, binary=False):
         action = self.actions_manager.getAction(action_id)
-        action.exportJSONFile('%s/%s.json' % (path, action_id))
+        if binary:
+            action.exportBinaryFile('%s/%s%s' % (path, action_id, BINARY_EXTENSION))
+        else:
+            action.exportJSONFile('%s/%s.json' % (path, action_id))
 
     def getAction(self, action_id):
         return self.actions_manager.getAction(action_id)
@@ -312,16 +490,45 @@ class iCub(metaclass=iCubSingleton):
     def importAction(self, JSON_file):
         return self.importActionFromJSONFile(JSON_file=JSON_file)
 
-    def importActionFromJSONDict(self, JSON_dict, name_prefix=None):
+    def importActionFromJSONDict(self, JSON_dict, name_prefix=None, validate=True, clamp=False):
         action = iCubFullbodyAction(JSON_dict=JSON_dict)
+        if validate:
+            report = self.validateAction(action, clamp=clamp)
+            if not report.valid:
+                self._logger_.error(report.summary())
+                raise Exception(report.summary())
         if name_prefix:
             action_id=name_prefix + '.' + action.name
         else:
             action_id=None
         return self.addAction(action, action_id=action_id)
 
+    def validateAction(self, action: iCubFullbodyAction, clamp=False):
+        """
+        Checks all the joint targets of an action against the cached joint limits of the available parts.
+
+        Args:
+            action (iCubFullbodyAction): The action to validate.
+            clamp (bool): If True, invalid targets are clamped into the limits instead of being reported.
+
+        Returns:
+            ValidationReport: The invalid targets found (empty if the action is valid).
+        """
+        limits = {}
+        for name, ctrl in self._position_controllers_.items():
+            if not ctrl.jointLimits is None:
+                limits[name] = ctrl.jointLimits
+        for step in action.steps:
+            for part_name, limb_motion in step.limb_motions.items():
+                if not part_name in limits.keys():
+                    for ctrl in self._position_controllers_.values():
+                        if ctrl.part.robot_part == limb_motion.part.robot_part and not ctrl.jointLimits is None:
+                            limits[part_name] = ctrl.jointLimits
+                            break
+        return ActionValidator(limits).validateAction(action, clamp=clamp)
+
     def importActionFromJSONFile(self, JSON_file):
-        JSON_dict = importFromJSONFile(JSON_file)
+        JSON_dict = importActionFile(JSON_file)
         return self.importActionFromJSONDict(JSON_dict=JSON_dict)
 
     def importActionFromTemplate(self, template: iCubActionTemplate, action_id=None):
@@ -331,7 +538,50 @@ class iCub(metaclass=iCubSingleton):
     def importTemplate(self, JSON_file):
         return self.actions_manager.importTemplateFromJSONFile(JSON_file=JSON_file)
 
-    def movePart(self, limb_motion: LimbMotion, prefix='', ts_ref=0.0):
+    def planStep(self, step: iCubFullbodyStep):
+        """
+        Predicts the timing of a step from the current encoders of the involved parts.
+
+        Returns:
+            StepProfile: per-checkpoint durations of each limb motion, synchronized so that all the
+            limbs complete together when PositionController.SYNC_JOINTS is True.
+        """
+        encoders = {}
+        for part_name, limb_motion in step.limb_motions.items():
+            ctrl = self.getPositionController(limb_motion.part)
+            if not ctrl is None:
+                encoders[part_name] = ctrl.getEncodersArray()
+        planner = SpeedProfilePlanner(speed_scaling=PositionController.SPEED_SCALING, synchronize=PositionController.SYNC_JOINTS)
+        return planner.planStep(step, encoders, self._profiler_)
+
+    def analyzeAction(self, action_id: str, call_durations=None):
+        """
+        Predicts the timeline of an action from the current encoders and the motions learned by the profiler,
+        without moving the robot (see pyicub.analyzer).
+
+        Returns:
+            ActionAnalysis: per-limb timeline, duration and critical path.
+        """
+        return self.__analyzer__(call_durations).analyze(self.actions_manager.getAction(action_id), action_id=action_id)
+
+    def retimeAction(self, action_id: str, duration, call_durations=None):
+        """
+        Finds the time scale that makes an action last `duration` seconds from the current encoders. Pass it to
+        playAction (or use its `duration` argument): it applies to that call only.
+
+        Returns:
+            Retiming: the time scale, the predicted duration and whether the target can be reached.
+        """
+        return self.__analyzer__(call_durations).fitTimeScale(self.actions_manager.getAction(action_id), duration)
+
+    def __analyzer__(self, call_durations=None):
+        initial_pose = {}
+        for ctrl in self._position_controllers_.values():
+            initial_pose[ctrl.part.robot_part] = ctrl.getEncodersArray()
+        return ActionAnalyzer(initial_pose=initial_pose, profiler=self._profiler_, call_durations=call_durations)
+
+    @traced('movePart')
+    def movePart(self, limb_motion: LimbMotion, prefix='', ts_ref=0.0, durations=None):
         requests = []
         ctrl = self.getPositionController(limb_motion.part)
         for i in range(0, len(limb_motion.checkpoints)):
@@ -342,11 +592,15 @@ class iCub(metaclass=iCubSingleton):
                                                   target=ctrl.move,
                                                   name=prefix + '/' + limb_motion.part.name,
                                                   ts_ref=ts_ref)
+                if durations:
+                    req_time = durations[i]
+                else:
+                    req_time = limb_motion.checkpoints[i].duration
 
                 self.request_manager.run_request(req,
                                                  wait_for_completed=True,
                                                  pose=limb_motion.checkpoints[i].pose,
-                                                 req_time=limb_motion.checkpoints[i].duration,
+                                                 req_time=req_time,
                                                  timeout=limb_motion.checkpoints[i].timeout,
                                                  joints_speed=limb_motion.checkpoints[i].joints_speed,
                                                  tag=req.tag)
@@ -357,13 +611,98 @@ class iCub(metaclass=iCubSingleton):
         return requests
 
 
+    def streamPart(self, limb_motion: LimbMotion, period=TrajectoryStreamer.DEFAULT_PERIOD, method=JointsTrajectory.SPLINE, wait_for_completed=True):
+        """
+        Plays a LimbMotion as a single interpolated trajectory streamed in position-direct mode,
+        instead of one positionMove and one wait per checkpoint.
+
+        Returns:
+            StreamingStats: timing statistics of the playback (None if `wait_for_completed` is False or the part is not available).
+        """
+        ctrl = self.getPositionController(limb_motion.part)
+        if ctrl is None:
+            self._logger_.warning('streamPart <%s> ignored!' % limb_motion.part.name)
+            return None
+        streamer = TrajectoryStreamer(ctrl, period=period, method=method, logger=self._logger_)
+        return streamer.play(limb_motion, wait=wait_for_completed, speed_scaling=PositionController.SPEED_SCALING)
+
+    def recordParts(self, parts, period=KinestheticRecorder.DEFAULT_PERIOD, path=None, autostart=True):
+        """
+        Records the encoders of the given parts (e.g. during a kinesthetic demonstration).
+
+        Returns:
+            KinestheticRecorder: the recorder; call its stop() method to get the Recording.
+        """
+        controllers = []
+        for part in parts:
+            ctrl = self.getPositionController(part)
+            if ctrl is None:
+                self._logger_.warning('recordParts <%s> ignored!' % part.name)
+            else:
+                controllers.append(ctrl)
+        recorder = KinestheticRecorder(controllers, period=period, path=path, logger=self._logger_)
+        if autostart:
+            recorder.start()
+        return recorder
+
+    def replayRecording(self, recording: Recording, wait_for_completed=True):
+        """
+        Replays a Recording by streaming its samples in position-direct mode, after moving each part
+        to its first recorded sample.
+
+        Returns:
+            dict: part name -> StreamingStats of the playback (empty if `wait_for_completed` is False).
+        """
+        streamers = {}
+        for part_name, rec in recording.parts.items():
+            ctrl = self.getPositionController(rec.part)
+            if ctrl is None or len(rec.times) == 0:
+                self._logger_.warning('replayRecording <%s> ignored!' % part_name)
+                continue
+            ctrl.move(JointPose(target_joints=np.asarray(rec.positions[0]).tolist(), joints_list=list(rec.part.joints_list)))
+            streamers[part_name] = TrajectoryStreamer(ctrl, period=recording.period, logger=self._logger_)
+        for part_name, streamer in streamers.items():
+            rec = recording.parts[part_name]
+            streamer.start(rec.part.joints_list, np.asarray(rec.times) - rec.times[0], np.asarray(rec.positions))
+        if not wait_for_completed:
+            return {}
+        return {part_name: streamer.wait() for part_name, streamer in streamers.items()}
+
+    def dispatchStep(self, step: iCubFullbodyStep, durations=None, tag=''):
+        """
+        Plays the limb motions of a step from the calling thread with a StepDispatcher: the first checkpoints
+        of all the parts are issued one after the other in the same tick and the next ones as soon as each part
+        is done.
+
+        Returns:
+            DispatchReport: results of the checkpoints and start skew between the parts.
+        """
+        controllers = {}
+        for part_name, limb_motion in step.limb_motions.items():
+            ctrl = self.getPositionController(limb_motion.part)
+            if ctrl is None:
+                self._logger_.warning('dispatchStep <%s> ignored!' % part_name)
+            else:
+                controllers[part_name] = ctrl
+        return StepDispatcher(controllers, logger=self._logger_).dispatch(step, durations=durations, tag=tag)
+
     def moveStep(self, step, prefix='', ts_ref=0.0):
+        # the step offset is an event of the timeline (moveSteps schedules the steps at their offsets instead)
+        if step.offset_ms:
+            self._timeline_.schedule(step.offset_ms/1000.0, lambda: None, name=prefix).wait()
+        return self._moveStep_(step, prefix, ts_ref)
+
+    @traced('moveStep')
+    def _moveStep_(self, step, prefix='', ts_ref=0.0):
         if ts_ref == 0.0:
             ts_ref = round(time.perf_counter(), 4)
         requests = []
-        self._logger_.debug('Step <%s> STARTED!' % step.name)
-        if step.offset_ms:
-            time.sleep(step.offset_ms/1000.0)
+        step_profile = None
+        if PositionController.SYNC_JOINTS and step.limb_motions and not SpeedProfilePlanner.isTimed(step):
+            step_profile = self.planStep(step)
+            self._logger_.debug('Step <%s> STARTED! nominal_duration=%.3f predicted_duration=%.3f', step.name, step_profile.duration, step_profile.predicted_duration)
+        else:
+            self._logger_.debug('Step <%s> STARTED!' % step.name)
         if step.gaze_motion:
             req = self.request_manager.create(timeout=iCubRequest.TIMEOUT_REQUEST,
                                               target=self.moveGaze,
@@ -386,67 +725,340 @@ class iCub(metaclass=iCubSingleton):
                                              step.custom_calls,
                                              req.tag,
                                              ts_ref)
-        for part, limb_motion in step.limb_motions.items():
-            req = self.request_manager.create(timeout=iCubRequest.TIMEOUT_REQUEST,
-                                              target=self.movePart,
-                                              name=prefix + '/limb',
-                                              ts_ref=ts_ref)
-            requests.append(req)
-            self.request_manager.run_request(req,
-                                             False,
-                                             limb_motion,
-                                             req.tag,
-                                             ts_ref)
+        if self.SINGLE_THREAD_DISPATCH:
+            durations = step_profile.durations if step_profile else None
+            self.dispatchStep(step, durations=durations, tag=prefix + '/limb')
+        else:
+            for part, limb_motion in step.limb_motions.items():
+                durations = None
+                if step_profile and part in step_profile.durations.keys():
+                    durations = step_profile.durations[part]
+                req = self.request_manager.create(timeout=iCubRequest.TIMEOUT_REQUEST,
+                                                  target=self.movePart,
+                                                  name=prefix + '/limb',
+                                                  ts_ref=ts_ref)
+                requests.append(req)
+                self.request_manager.run_request(req,
+                                                 False,
+                                                 limb_motion,
+                                                 req.tag,
+                                                 ts_ref,
+                                                 durations)
         self.request_manager.join_requests(requests)
         self._logger_.debug('Step <%s> COMPLETED!' % step.name)
         return requests
     
+    @traced('moveSteps')
     def moveSteps(self, steps, checkpoints, prefix, offset_ms=0.0):
-        time.sleep(offset_ms/1000.0)
+        # the steps are started by the timeline thread at their offsets, as the steps of the compiled actions
         requests = []
+        events = []
         t0 = round(time.perf_counter(), 4)
+        start = self._timeline_.now() + offset_ms/1000.0
         for i in range(0, len(steps)):
-            prefix = "%s/%s" % (prefix, steps[i].name)
             req = self.request_manager.create(timeout=iCubRequest.TIMEOUT_REQUEST,
-                                              target=self.moveStep,
-                                              name=prefix,
+                                              target=self._moveStep_,
+                                              name="%s/%s" % (prefix, steps[i].name),
                                               ts_ref=t0)
             requests.append(req)
-            self.request_manager.run_request(req,
-                                             checkpoints[i],
-                                             steps[i],
-                                             req.tag,
-                                             t0)
+            event = self._timeline_.scheduleAt(start + (steps[i].offset_ms or 0.0)/1000.0,
+                                               self.request_manager.run_request,
+                                               req,
+                                               False,
+                                               steps[i],
+                                               req.tag,
+                                               t0,
+                                               name=req.tag)
+            events.append(event)
+            if checkpoints[i]:
+                event.wait()
+                req.wait_for_completed()
+                start = self._timeline_.now()
+        for event in events:
+            event.wait()
         self.request_manager.join_requests(requests)
         return requests
 
 
-    def playAction(self, action_id: str, wait_for_completed=True, offset_ms=0.0):
-        action = self.actions_manager.getAction(action_id)
-        return self.runAction(action, wait_for_completed, offset_ms)
+    def playAction(self, action_id: str, wait_for_completed=True, offset_ms=0.0, duration=None, time_scale=1.0):
+        """
+        Plays an action. With `duration` (seconds) the action is retimed to last that long (see retimeAction);
+        otherwise `time_scale` multiplies its step offsets and checkpoint durations. Both apply to this call only.
+        """
+        if duration is not None:
+            time_scale = self.retimeAction(action_id, duration).time_scale
+        return self.runPlan(self.getActionPlan(action_id), wait_for_completed, offset_ms, time_scale=time_scale)
+
+    def runAction(self, action: iCubFullbodyAction, wait_for_completed=True, offset_ms=0.0, duration=None, time_scale=1.0):
+        if duration is not None:
+            time_scale = self.__analyzer__().fitTimeScale(action, duration).time_scale
+        return self.runPlan(self.compileAction(action), wait_for_completed, offset_ms, time_scale=time_scale)
 
-    def runAction(self, action: iCubFullbodyAction, wait_for_completed=True, offset_ms=0.0):
+    @property
+    def executions(self):
+        with self._executions_lock_:
+            return list(self._executions_)
+
+    @property
+    def switch_stats(self):
+        return self._switch_stats_
+
+    def preemptActions(self, hold=True, keep_parts=(), keep_gaze=False):
+        """
+        Preempts the running actions: no further step, checkpoint, gaze motion or custom call is started.
+
+        Args:
+            hold (bool): If True, the parts moved by the preempted actions are stopped where they are, except
+                         `keep_parts`; the gaze is stopped as well, unless `keep_gaze`.
+
+        Returns:
+            list: the preempted PlanExecutions.
+        """
+        preempted = [execution for execution in self.executions if execution.preempt()]
+        if hold:
+            parts = set()
+            for execution in preempted:
+                parts |= execution.parts
+            for part_name in parts - set(keep_parts):
+                ctrl = self._position_controllers_.get(part_name)
+                if not ctrl is None:
+                    ctrl.hold(ctrl.part.joints_list)
+            if not keep_gaze and self.gaze is not None and any([execution.uses_gaze for execution in preempted]):
+                self.gaze.IGazeControl.stopControl()
+        self._switch_stats_.recordPreempted(len(preempted))
+        return preempted
+
+    def blendAction(self, action_id: str, blend_time=0.0, wait_for_completed=False, time_scale=1.0):
+        """
+        Preempts the running actions and plays the action `action_id` from the current encoders.
+        """
+        return self.blendPlan(self.getActionPlan(action_id), blend_time, wait_for_completed, time_scale)
+
+    def blendPlan(self, plan: ActionPlan, blend_time=0.0, wait_for_completed=False, time_scale=1.0):
+        """
+        Preempts the running actions and starts `plan` right away (the action offset is ignored). The parts and the
+        gaze used by `plan` are not stopped: their first targets are commanded from wherever they are, and the first
+        checkpoint of each part lasts at least `blend_time` seconds. The parts of the preempted actions that `plan`
+        does not move are held. The switch latency is recorded in `switch_stats`.
+
+        Returns:
+            iCubRequest: the request of the new action.
+        """
+        preempted_at = self._timeline_.now()
+        self.preemptActions(hold=True, keep_parts=plan.steps[0].limbs.keys() if plan.steps else (), keep_gaze=any([step.gaze is not None for step in plan.steps]))
+        execution = PlanExecution(plan, self._timeline_, blend_time=blend_time, preempted_at=preempted_at, time_scale=time_scale)
+        return self.runPlan(plan, wait_for_completed, execution=execution)
+
+    @traced('runAction', tag_arg='plan', tag_of=lambda plan: plan.request_name)
+    def runPlan(self, plan: ActionPlan, wait_for_completed=True, offset_ms=0.0, execution: PlanExecution=None, time_scale=1.0):
         t0 = round(time.perf_counter(), 4)
-        self._logger_.debug('Playing action <%s>' % action.name)
-        if action.offset_ms:
-            offset_ms = action.offset_ms
+        self._logger_.debug('Playing action <%s>' % plan.name)
+        if execution is None:
+            execution = PlanExecution(plan, self._timeline_, time_scale=time_scale)
+            if plan.offset_ms:
+                offset_ms = plan.offset_ms
+        else:
+            offset_ms = 0.0
+        with self._executions_lock_:
+            self._executions_.add(execution)
 
-        prefix = "/%s" % action.name
         req = self.request_manager.create(timeout=iCubRequest.TIMEOUT_REQUEST,
-                                          target=self.moveSteps,
-                                          name=prefix,
+                                          target=self._movePlanSteps_,
+                                          name=plan.request_name,
                                           ts_ref=t0)
-        
+        execution.request = req
         self.request_manager.run_request(req,
                                          wait_for_completed,
-                                         action.steps,
-                                         action.wait_for_steps,
+                                         plan,
                                          req.tag,
-                                         offset_ms)
+                                         offset_ms,
+                                         execution)
         if wait_for_completed:
-            self._logger_.debug('Action <%s> finished!' % action.name)
+            self._logger_.debug('Action <%s> finished!' % plan.name)
         return req
 
+    @traced('moveSteps')
+    def _movePlanSteps_(self, plan: ActionPlan, prefix, offset_ms=0.0, execution: PlanExecution=None):
+        # the limb motions, gaze motion and custom calls of each step are started by the timeline thread at the
+        # step offset, instead of sleeping in the request threads
+        requests = []
+        t0 = round(time.perf_counter(), 4)
+        start = self._timeline_.now() + offset_ms/1000.0
+        try:
+            for step_plan in plan.steps:
+                req = self.request_manager.create(timeout=iCubRequest.TIMEOUT_REQUEST,
+                                                  target=self._movePlanStep_,
+                                                  name=prefix + '/' + step_plan.name,
+                                                  ts_ref=t0)
+                started = []
+                if step_plan.gaze:
+                    started.append((self.request_manager.create(timeout=iCubRequest.TIMEOUT_REQUEST,
+                                                                target=self._movePlanGaze_,
+                                                                name=req.tag + '/gaze',
+                                                                ts_ref=t0), step_plan.gaze))
+                if step_plan.calls:
+                    started.append((self.request_manager.create(timeout=iCubRequest.TIMEOUT_REQUEST,
+                                                                target=self._execPlanCalls_,
+                                                                name=req.tag + '/custom',
+                                                                ts_ref=t0), step_plan.calls))
+                with execution.lock:
+                    if execution.preempted:
+                        break
+                    deadline = start + step_plan.offset*execution.time_scale
+                    # same deadline: the gaze and calls events fire before the step event, that joins their requests
+                    for side_req, side_plan in started:
+                        execution.events.append(self._timeline_.scheduleAt(deadline,
+                                                                           self._startPlanRequest_,
+                                                                           side_req,
+                                                                           side_plan,
+                                                                           t0,
+                                                                           execution,
+                                                                           name=side_req.tag))
+                    event = self._timeline_.scheduleAt(deadline,
+                                                       self._startPlanStep_,
+                                                       req,
+                                                       step_plan,
+                                                       t0,
+                                                       execution,
+                                                       [side_req for side_req, _ in started],
+                                                       name=req.tag)
+                    execution.events.append(event)
+                requests.append(req)
+                if step_plan.wait_for_completed:
+                    event.wait()
+                    req.wait_for_completed()
+                    start = self._timeline_.now()
+            for event in execution.events:
+                event.wait()
+            self.request_manager.join_requests(requests)
+        finally:
+            with self._executions_lock_:
+                self._executions_.discard(execution)
+            execution.finish()
+        return requests
+
+    def _startPlanRequest_(self, req, target_plan, ts_ref, execution: PlanExecution):
+        self.request_manager.run_request(req, False, target_plan, req.tag, ts_ref, execution)
+
+    def _startPlanStep_(self, req, step_plan: StepPlan, ts_ref, execution: PlanExecution, started=()):
+        latency = execution.stepStarted(step_plan)
+        if latency is not None:
+            self._switch_stats_.record(latency)
+        self.request_manager.run_request(req, False, step_plan, req.tag, ts_ref, execution, started)
+
+    @traced('moveStep')
+    def _movePlanStep_(self, step_plan: StepPlan, prefix='', ts_ref=0.0, execution: PlanExecution=None, started=()):
+        # `started`: the requests of the gaze motion and custom calls of the step, started by their timeline events
+        if ts_ref == 0.0:
+            ts_ref = round(time.perf_counter(), 4)
+        requests = list(started)
+        step_profile = None
+        retimed = None
+        if step_plan.limbs and (execution.time_scale != 1.0 or (PositionController.SYNC_JOINTS and not step_plan.timed)):
+            step_profile = self.planStep(step_plan.step)
+            if execution.time_scale != 1.0:
+                retimed = step_profile.retimed(execution.time_scale)
+            self._logger_.debug('Step <%s> STARTED! nominal_duration=%.3f predicted_duration=%.3f', step_plan.name, step_profile.duration, step_profile.predicted_duration)
+        else:
+            self._logger_.debug('Step <%s> STARTED!' % step_plan.name)
+        blend = execution.blend_time if step_plan is execution.plan.steps[0] else 0.0
+        if self.SINGLE_THREAD_DISPATCH:
+            durations = retimed if retimed is not None else (step_profile.durations if step_profile else None)
+            StepDispatcher(logger=self._logger_).dispatchPlan(step_plan, durations=durations, tag=prefix + '/limb', blend_time=blend, execution=execution)
+        else:
+            for part, limb_plan in step_plan.limbs.items():
+                durations = None
+                if retimed is not None and part in retimed.keys():
+                    durations = retimed[part]
+                elif step_profile and part in step_profile.durations.keys():
+                    durations = step_profile.durations[part]
+                if blend > 0.0:
+                    durations = list(durations) if durations is not None else [checkpoint.duration for checkpoint in limb_plan.checkpoints]
+                    if durations:
+                        durations[0] = max(durations[0], blend)
+                req = self.request_manager.create(timeout=iCubRequest.TIMEOUT_REQUEST,
+                                                  target=self._movePlanLimb_,
+                                                  name=prefix + '/limb',
+                                                  ts_ref=ts_ref)
+                requests.append(req)
+                self.request_manager.run_request(req,
+                                                 False,
+                                                 limb_plan,
+                                                 req.tag,
+                                                 ts_ref,
+                                                 durations,
+                                                 execution)
+        self.request_manager.join_requests(requests)
+        self._logger_.debug('Step <%s> COMPLETED!' % step_plan.name)
+        return requests
+
+    @traced('movePart')
+    def _movePlanLimb_(self, limb_plan: LimbPlan, prefix='', ts_ref=0.0, durations=None, execution: PlanExecution=None):
+        requests = []
+        name = prefix + limb_plan.suffix
+        for i, checkpoint in enumerate(limb_plan.checkpoints):
+            if execution.preempted:
+                break
+            req = self.request_manager.create(timeout=iCubRequest.TIMEOUT_REQUEST, 
+                                              target=self._movePlanCheckpoint_,
+                                              name=name,
+                                              ts_ref=ts_ref)
+            self.request_manager.run_request(req,
+                                             True,
+                                             limb_plan.controller,
+                                             checkpoint,
+                                             durations[i] if durations is not None else checkpoint.duration,
+                                             req.tag,
+                                             execution)
+            requests.append(req)
+        self.request_manager.join_requests(requests)       
+        return requests
+
+    def _movePlanCheckpoint_(self, ctrl: PositionController, checkpoint, req_time, tag, execution: PlanExecution):
+        with execution.lock:
+            if execution.preempted:
+                return False
+            handle = ctrl.startMove(checkpoint.pose,
+                                    req_time=req_time,
+                                    timeout=checkpoint.timeout*max(1.0, execution.time_scale),
+                                    joints_speed=checkpoint.joints_speed,
+                                    tag=tag)
+        if handle is None:
+            return False
+        return ctrl.waitMove(handle)
+
+    @traced('moveGaze')
+    def _movePlanGaze_(self, gaze_plan, prefix='', ts_ref=0.0, execution: PlanExecution=None):
+        requests = []
+        name = prefix + gaze_plan.suffix
+        for checkpoint in gaze_plan.checkpoints:
+            if execution.preempted:
+                break
+            req = self.request_manager.create(timeout=iCubRequest.TIMEOUT_REQUEST, 
+                                              target=gaze_plan.method, 
+                                              name=name, 
+                                              ts_ref=ts_ref)
+            self.request_manager.run_request(req, True, *checkpoint)
+            requests.append(req)
+        self.request_manager.join_requests(requests)
+        return requests
+
+    def _execPlanCalls_(self, calls, prefix='', ts_ref=0.0, execution: PlanExecution=None):
+        for call in calls:
+            if execution.preempted:
+                break
+            self._execPlanCall_(call, prefix, ts_ref)
+
+    @traced('execCustomCall')
+    def _execPlanCall_(self, call_plan, prefix='', ts_ref=0.0):
+        req = self.request_manager.create(timeout=iCubRequest.TIMEOUT_REQUEST,
+                                          target=call_plan.target, 
+                                          name=prefix + call_plan.suffix, 
+                                          ts_ref=ts_ref)
+        self.request_manager.run_request(req, True, *call_plan.args)
+        req.wait_for_completed()
+
+    @traced('moveGaze')
     def moveGaze(self, gaze_motion: GazeMotion, prefix='', ts_ref=0.0):
         requests = []
 
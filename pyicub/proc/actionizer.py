@@ -27,35 +27,141 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 from pyicub.actions import ActionsManager
+from pyicub.analyzer import ActionAnalyzer, DEFAULT_GAZE_TIME, toChromeTrace
+from pyicub.bulk import importActions, importTemplates
+from pyicub.controllers.profiler import MotionProfiler
 from pyicub.helper import iCub
 
 import argparse
+import json
+import os
+import sys
+
+def printProgress(done, total):
+    sys.stderr.write("\r%d/%d" % (done, total))
+    if done == total:
+        sys.stderr.write("\n")
+    sys.stderr.flush()
 
 def main():
     parser = argparse.ArgumentParser(description="PyiCub Actionizer")
 
-    subparsers = parser.add_subparsers(dest="command", help="Choose 'build' or 'run'.")
+    subparsers = parser.add_subparsers(dest="command", help="Choose 'build', 'run', 'optimize', 'import', 'convert' or 'analyze'.")
 
     build_parser = subparsers.add_parser("build", help="Build process")
     build_parser.add_argument("--module", nargs="+", required=True, help="Module name")
     build_parser.add_argument("--target", nargs="+", required=True, help="Target path")
+    build_parser.add_argument("--processes", type=int, default=None, help="Worker processes writing the actions (default one per CPU)")
+    build_parser.add_argument("--binary", action="store_true", help="Write binary *.pyact actions instead of JSON")
 
     execute_parser = subparsers.add_parser("run", help="Running process")
     execute_parser.add_argument("--actions", nargs="+", required=True, help="List of actions to process (action id)")
     execute_parser.add_argument("--source", nargs="+", required=True, help="Source path JSON repository")
 
+    optimize_parser = subparsers.add_parser("optimize", help="Checkpoint reduction, resampling and re-timing of JSON actions")
+    optimize_parser.add_argument("--source", nargs="+", required=True, help="Source path JSON repository")
+    optimize_parser.add_argument("--target", nargs="+", required=True, help="Target path")
+    optimize_parser.add_argument("--tolerance", type=float, default=0.5, help="Maximum joint deviation in degrees (default 0.5)")
+    optimize_parser.add_argument("--resample", type=float, default=None, help="Uniform resampling period in seconds")
+    optimize_parser.add_argument("--time-scale", type=float, default=1.0, help="Factor applied to the checkpoints durations")
+    optimize_parser.add_argument("--json", action="store_true", help="Print the reports as JSON")
+    optimize_parser.add_argument("--processes", type=int, default=None, help="Worker processes parsing and writing the actions (default one per CPU)")
+    optimize_parser.add_argument("--binary", action="store_true", help="Write binary *.pyact actions instead of JSON")
+    optimize_parser.add_argument("--merge-steps", action="store_true", help="Merge the consecutive steps moving disjoint parts")
+    optimize_parser.add_argument("--merge-calls", action="store_true", help="With --merge-steps, merge also the steps with custom calls")
+
+    import_parser = subparsers.add_parser("import", help="Parse and build a whole JSON repository, reporting the failed files")
+    import_parser.add_argument("--source", nargs="+", required=True, help="Source path JSON repository")
+    import_parser.add_argument("--templates", action="store_true", help="The repository contains templates")
+    import_parser.add_argument("--processes", type=int, default=None, help="Worker processes (default one per CPU)")
+    import_parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+
+    convert_parser = subparsers.add_parser("convert", help="Convert a repository between the JSON and the binary (*.pyact) formats")
+    convert_parser.add_argument("--source", nargs="+", required=True, help="Source path repository")
+    convert_parser.add_argument("--target", nargs="+", required=True, help="Target path")
+    convert_parser.add_argument("--to", choices=["binary", "json"], default="binary", help="Target format (default binary)")
+    convert_parser.add_argument("--processes", type=int, default=None, help="Worker processes (default one per CPU)")
+
+    analyze_parser = subparsers.add_parser("analyze", help="Predict the timeline, duration and critical path of the actions without a robot")
+    analyze_parser.add_argument("--source", nargs="+", required=True, help="Source path repository")
+    analyze_parser.add_argument("--actions", nargs="+", default=None, help="Actions to analyze (default all)")
+    analyze_parser.add_argument("--profiles", default=None, help="Motions recorded by a MotionProfiler (*.npz) to predict the durations")
+    analyze_parser.add_argument("--gaze-time", type=float, default=DEFAULT_GAZE_TIME, help="Duration of a gaze checkpoint in seconds")
+    analyze_parser.add_argument("--trace", default=None, help="Write the timelines as Chrome trace events to this file")
+    analyze_parser.add_argument("--json", action="store_true", help="Print the analyses as JSON")
+    analyze_parser.add_argument("--processes", type=int, default=None, help="Worker processes parsing the actions (default one per CPU)")
+
     args = parser.parse_args()
 
     if args.command == "build":
         mgr = ActionsManager()
         mgr.importActionsFromModule(args.module[0])
-        mgr.exportActions(args.target[0])
+        report = mgr.exportActions(args.target[0], processes=args.processes, progress=printProgress, binary=args.binary)
+        print(report.summary())
     elif args.command == "run":
         icub = iCub(action_repository_path=args.source[0])
         for action in args.actions:
             icub.playAction(action)
+    elif args.command == "optimize":
+        mgr = ActionsManager()
+        mgr.importActions(args.source[0], processes=args.processes, progress=printProgress, use_file_names=True)
+        reports = mgr.optimizeActions(tolerance=args.tolerance, resample_period=args.resample, time_scale=args.time_scale)
+        merge_reports = mgr.mergeActionsSteps(merge_calls=args.merge_calls) if args.merge_steps else {}
+        os.makedirs(args.target[0], exist_ok=True)
+        export_report = mgr.exportActions(args.target[0], processes=args.processes, binary=args.binary)
+        for action_id, error in export_report.failed.items():
+            print("Could not write <%s>: %s" % (action_id, error), file=sys.stderr)
+        if args.json:
+            res = {k: r.toJSON() for k, r in reports.items()}
+            for k, r in merge_reports.items():
+                res[k]['merge'] = r.toJSON()
+            print(json.dumps(res, indent=4))
+        else:
+            for action_id, report in reports.items():
+                print(report.summary())
+                if action_id in merge_reports.keys():
+                    print(merge_reports[action_id].summary())
+    elif args.command == "import":
+        if args.templates:
+            report = importTemplates(args.source[0], processes=args.processes, progress=printProgress)
+        else:
+            report = importActions(args.source[0], processes=args.processes, progress=printProgress)
+        if args.json:
+            print(json.dumps(report.toJSON(), indent=4))
+        else:
+            print(report.summary())
+            for f, error in report.failed.items():
+                print("%s: %s" % (f, error))
+        sys.exit(1 if report.failed else 0)
+    elif args.command == "convert":
+        mgr = ActionsManager()
+        report = mgr.importActions(args.source[0], processes=args.processes, progress=printProgress, use_file_names=True)
+        for f, error in report.failed.items():
+            print("%s: %s" % (f, error))
+        print(mgr.exportActions(args.target[0], processes=args.processes, binary=args.to == "binary").summary())
+        sys.exit(1 if report.failed else 0)
+    elif args.command == "analyze":
+        report = importActions(args.source[0], processes=args.processes)
+        actions = report.items
+        if args.actions:
+            actions = {k: actions[k] for k in args.actions}
+        profiler = None
+        if args.profiles:
+            profiler = MotionProfiler()
+            profiler.load(args.profiles)
+        analyses = ActionAnalyzer(profiler=profiler, gaze_time=args.gaze_time).analyzeActions(actions)
+        if args.trace:
+            with open(args.trace, 'w') as f:
+                json.dump(toChromeTrace(analyses), f)
+        if args.json:
+            print(json.dumps({k: a.toJSON() for k, a in analyses.items()}, indent=4))
+        else:
+            for action_id, analysis in analyses.items():
+                print("%s: %.3fs, critical path %s" % (action_id, analysis.duration, " -> ".join("%s/%s" % (s.step, s.resource) for s in analysis.critical_path)))
+                for warning in analysis.warnings:
+                    print("  %s" % warning)
     else:
-        print("Invalid command. Choose 'build' or 'run'.")
+        print("Invalid command. Choose 'build', 'run', 'optimize', 'import', 'convert' or 'analyze'.")
     
 
 if __name__ == "__main__":
@@ -0,0 +1,450 @@
+# BSD 2-Clause License
+#
+# Copyright (c) 2022, Social Cognition in Human-Robot Interaction,
+#                     Istituto Italiano di Tecnologia, Genova
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+PyiCub Benchmark
+
+Measures the overhead of the request manager, action playback, position commands, template instantiation, REST
+targets and bulk import/export of a synthetic action repository against the in-process fake backend (pyicub.fake), so that it runs without a robot or a YARP network.
+
+    python -m pyicub.proc.benchmark run --output baseline.json
+    python -m pyicub.proc.benchmark run --compare baseline.json --threshold 0.25
+    python -m pyicub.proc.benchmark compare --baseline baseline.json --current current.json
+
+Results are stored as JSON; the comparison flags every benchmark whose median or p99 latency grew more than
+`threshold` (relative) with respect to the baseline, and exits with status 1 if any regression is found.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+
+BENCHMARKS = ['requests', 'run_action_1', 'run_action_10', 'run_action_100', 'play_action_10', 'compile_action_10', 'move', 'template_get_action', 'rest_sync', 'rest_async', 'bulk_import_5000', 'bulk_export_5000']
+
+DEFAULT_ITERATIONS = 50
+DEFAULT_THRESHOLD = 0.25
+
+
+def statistics(samples, total_time=None):
+    """
+    Summarizes a list of latencies (seconds).
+
+    Returns:
+        dict: samples number, mean, median, p90, p99, min, max, std (seconds) and throughput (calls/s).
+    """
+    s = np.asarray(samples, dtype=float)
+    if total_time is None:
+        total_time = float(s.sum())
+    return {'samples': int(s.size),
+            'mean': float(s.mean()),
+            'median': float(np.median(s)),
+            'p90': float(np.percentile(s, 90)),
+            'p99': float(np.percentile(s, 99)),
+            'min': float(s.min()),
+            'max': float(s.max()),
+            'std': float(s.std()),
+            'throughput': float(s.size/total_time) if total_time > 0.0 else 0.0}
+
+
+def compareResults(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """
+    Compares two benchmark results (as produced by `runBenchmarks`).
+
+    Returns:
+        list: one entry per benchmark present in both results, with the median and p99 ratios (current/baseline)
+        and a `regression` flag set when any of them exceeds 1 + threshold.
+    """
+    rows = []
+    for name, base in baseline['benchmarks'].items():
+        if not name in current['benchmarks'].keys():
+            continue
+        cur = current['benchmarks'][name]
+        median_ratio = cur['median']/base['median'] if base['median'] > 0.0 else 1.0
+        p99_ratio = cur['p99']/base['p99'] if base['p99'] > 0.0 else 1.0
+        rows.append({'benchmark': name,
+                     'baseline_median': base['median'],
+                     'current_median': cur['median'],
+                     'median_ratio': median_ratio,
+                     'baseline_p99': base['p99'],
+                     'current_p99': cur['p99'],
+                     'p99_ratio': p99_ratio,
+                     'regression': median_ratio > 1.0 + threshold or p99_ratio > 1.0 + threshold})
+    return rows
+
+
+class BenchmarkSuite:
+    """
+    Builds the fake robot (and, on demand, a local REST server) and runs the benchmarks.
+    The fake backend must be installed (pyicub.fake.install()) before the suite is created.
+    """
+
+    ROBOT_NAME = 'icubSim'
+
+    def __init__(self, iterations=DEFAULT_ITERATIONS):
+        from pyicub.helper import iCub
+        self._iterations_ = iterations
+        self._icub_ = iCub(robot_name=self.ROBOT_NAME)
+        self._rest_ = None
+        self._repository_ = None
+        self._icub_.addRuntimeModule('benchmark', self)
+
+    @property
+    def icub(self):
+        return self._icub_
+
+    def noop(self, *args):
+        return True
+
+    def _time_(self, func, iterations=None):
+        samples = []
+        if iterations is None:
+            iterations = self._iterations_
+        t0 = time.perf_counter()
+        for _ in range(iterations):
+            t = time.perf_counter()
+            func()
+            samples.append(time.perf_counter() - t)
+        return statistics(samples, time.perf_counter() - t0)
+
+    def benchRequests(self):
+        manager = self._icub_.request_manager
+        def run():
+            req = manager.create(timeout=1.0, target=self.noop, name='/benchmark')
+            manager.run_request(req, True)
+        return self._time_(run)
+
+    def _noopAction_(self, steps_nr):
+        from pyicub.actions import iCubFullbodyAction, iCubFullbodyStep
+
+        class NoopStep(iCubFullbodyStep):
+
+            def prepare(self):
+                self.createCustomCall('benchmark.noop')
+
+        class NoopAction(iCubFullbodyAction):
+
+            def prepare(self):
+                for _ in range(steps_nr):
+                    self.addStep(NoopStep())
+
+        return NoopAction(name='benchmark_%d' % steps_nr)
+
+    def benchRunAction(self, steps_nr):
+        action = self._noopAction_(steps_nr)
+        iterations = max(3, self._iterations_//steps_nr)
+        return self._time_(lambda: self._icub_.runAction(action), iterations)
+
+    def benchPlayAction(self, steps_nr):
+        """
+        Repeated playAction() of a registered action: the plan is compiled once and then served from the cache.
+        """
+        action_id = 'benchmark.play_%d' % steps_nr
+        if not action_id in self._icub_.getActions():
+            self._icub_.addAction(self._noopAction_(steps_nr), action_id=action_id)
+        iterations = max(3, self._iterations_//steps_nr)
+        return self._time_(lambda: self._icub_.playAction(action_id), iterations)
+
+    def benchCompileAction(self, steps_nr):
+        action = self._noopAction_(steps_nr)
+        return self._time_(lambda: self._icub_.compileAction(action))
+
+    def benchMove(self):
+        from pyicub.controllers.position import JointPose, ICUB_HEAD
+        ctrl = self._icub_.getPositionController(ICUB_HEAD)
+        poses = [JointPose(target_joints=[5.0, 0.0, 0.0, 0.0, 0.0, 0.0]), JointPose(target_joints=[0.0, 0.0, 0.0, 0.0, 0.0, 0.0])]
+        counter = [0]
+        def move():
+            counter[0] += 1
+            ctrl.move(poses[counter[0] % 2], joints_speed=[100.0]*6, waitMotionDone=False, tag='benchmark')
+        res = self._time_(move)
+        ctrl.stop()
+        return res
+
+    def benchTemplate(self):
+        from pyicub.actions import iCubActionTemplate, iCubFullbodyStep
+        from pyicub.controllers.position import JointPose, ICUB_HEAD
+
+        class LookStep(iCubFullbodyStep):
+
+            def __init__(self, pitch, yaw):
+                self.pitch = pitch
+                self.yaw = yaw
+                iCubFullbodyStep.__init__(self)
+
+            def prepare(self):
+                motion = self.createLimbMotion(ICUB_HEAD)
+                motion.createJointsTrajectory(JointPose(target_joints=[self.pitch, 0.0, self.yaw, 0.0, 0.0, 0.0]), duration=1.0)
+
+        class BenchmarkTemplate(iCubActionTemplate):
+
+            def prepare_params(self):
+                self.createParam('yaw')
+
+            def prepare(self):
+                for i in range(10):
+                    self.addStep(LookStep(float(i), self.getParam('yaw')))
+
+        template = BenchmarkTemplate()
+        template.setParam('yaw', 10.0)
+        return self._time_(lambda: template.getAction())
+
+    def syntheticRepository(self, actions_nr):
+        """
+        Writes `actions_nr` synthetic actions (4 steps, head and torso, 5 checkpoints each) to a temporary directory,
+        removed by close().
+
+        Returns:
+            str: the repository path.
+        """
+        from pyicub.actions import iCubFullbodyAction, iCubFullbodyStep
+        from pyicub.controllers.position import JointPose, ICUB_HEAD, ICUB_TORSO
+
+        if self._repository_ is not None and self._repository_[1] == actions_nr:
+            return self._repository_[0]
+
+        class SyntheticStep(iCubFullbodyStep):
+
+            def prepare(self):
+                head = self.createLimbMotion(ICUB_HEAD)
+                torso = self.createLimbMotion(ICUB_TORSO)
+                for i in range(5):
+                    head.createJointsTrajectory(JointPose(target_joints=[float(i), 0.0, -float(i), 0.0, 0.0, 5.0]), duration=0.5)
+                    torso.createJointsTrajectory(JointPose(target_joints=[0.0, 0.0, float(i)]), duration=0.5)
+
+        class SyntheticAction(iCubFullbodyAction):
+
+            def prepare(self):
+                for _ in range(4):
+                    self.addStep(SyntheticStep())
+
+        self.close()
+        path = tempfile.mkdtemp(prefix='pyicub_benchmark_')
+        JSON_dict = SyntheticAction().toJSONDict()
+        for i in range(actions_nr):
+            JSON_dict['name'] = 'synthetic_%05d' % i
+            with open(os.path.join(path, JSON_dict['name'] + '.json'), 'w', encoding='UTF-8') as f:
+                json.dump(JSON_dict, f, indent=4)
+        self._repository_ = (path, actions_nr)
+        return path
+
+    def benchBulkImport(self, actions_nr):
+        from pyicub.bulk import importActions
+        path = self.syntheticRepository(actions_nr)
+        return self._time_(lambda: importActions(path), max(1, min(3, self._iterations_)))
+
+    def benchBulkExport(self, actions_nr):
+        from pyicub.bulk import importActions, exportActions
+        actions = importActions(self.syntheticRepository(actions_nr)).items
+        target = tempfile.mkdtemp(prefix='pyicub_benchmark_export_')
+        try:
+            return self._time_(lambda: exportActions(actions, target), max(1, min(3, self._iterations_)))
+        finally:
+            shutil.rmtree(target, ignore_errors=True)
+
+    def close(self):
+        if self._repository_ is not None:
+            shutil.rmtree(self._repository_[0], ignore_errors=True)
+            self._repository_ = None
+
+    def startRESTServer(self):
+        """
+        Starts an iCubRESTApp on a free local port, served by a background thread.
+
+        Returns:
+            PyiCubRESTfulClient: a client connected to the server.
+        """
+        if self._rest_ is not None:
+            return self._rest_
+        from pyicub.utils import firstAvailablePort
+        port = firstAvailablePort('127.0.0.1', 9001)
+        os.environ['PYICUB_API'] = 'true'
+        os.environ['PYICUB_API_RESTMANAGER_HOST'] = '127.0.0.1'
+        os.environ['PYICUB_API_RESTMANAGER_PORT'] = str(port)
+        os.environ['PYICUB_API_PROXY_HOST'] = '127.0.0.1'
+        os.environ['PYICUB_API_PROXY_PORT'] = str(port)
+        from pyicub.rest import iCubRESTApp, PyiCubRESTfulClient, rest_service
+
+        class BenchmarkApp(iCubRESTApp):
+
+            @rest_service
+            def ping(self, value=0):
+                return value
+
+        app = BenchmarkApp(robot_name=self.ROBOT_NAME)
+        threading.Thread(target=app.rest_manager.run_forever, daemon=True).start()
+        client = PyiCubRESTfulClient('127.0.0.1', app.rest_manager._port_)
+        t0 = time.perf_counter()
+        while True:
+            try:
+                client.get_version()
+                break
+            except Exception:
+                if time.perf_counter() - t0 > 10.0:
+                    raise
+                time.sleep(0.05)
+        self._rest_ = (app, client)
+        return self._rest_
+
+    def benchREST(self, sync):
+        app, client = self.startRESTServer()
+        robot_name, app_name = self.ROBOT_NAME, app.name
+        target_name = app_name + '.ping'
+        if sync:
+            return self._time_(lambda: client.run_target(robot_name, app_name, target_name, value=1))
+        res = self._time_(lambda: client.run_target_async(robot_name, app_name, target_name, value=1))
+        app.request_manager.join_pending_requests()
+        return res
+
+    def run(self, name):
+        if name == 'requests':
+            return self.benchRequests()
+        if name.startswith('run_action_'):
+            return self.benchRunAction(int(name[len('run_action_'):]))
+        if name.startswith('play_action_'):
+            return self.benchPlayAction(int(name[len('play_action_'):]))
+        if name.startswith('compile_action_'):
+            return self.benchCompileAction(int(name[len('compile_action_'):]))
+        if name == 'move':
+            return self.benchMove()
+        if name == 'template_get_action':
+            return self.benchTemplate()
+        if name == 'rest_sync':
+            return self.benchREST(sync=True)
+        if name == 'rest_async':
+            return self.benchREST(sync=False)
+        if name.startswith('bulk_import_'):
+            return self.benchBulkImport(int(name[len('bulk_import_'):]))
+        if name.startswith('bulk_export_'):
+            return self.benchBulkExport(int(name[len('bulk_export_'):]))
+        raise ValueError("Unknown benchmark '%s'. Choose among %s" % (name, BENCHMARKS))
+
+
+def runBenchmarks(names=None, iterations=DEFAULT_ITERATIONS, suite=None):
+    """
+    Runs the given benchmarks (all of them if None) on the fake backend.
+
+    Returns:
+        dict: environment metadata and the statistics of each benchmark.
+    """
+    import pyicub
+    if suite is None:
+        import pyicub.fake
+        pyicub.fake.install()
+        suite = BenchmarkSuite(iterations)
+    if not names:
+        names = BENCHMARKS
+    results = {'pyicub': pyicub.__version__,
+               'python': platform.python_version(),
+               'platform': platform.platform(),
+               'timestamp': time.time(),
+               'iterations': iterations,
+               'benchmarks': {}}
+    for name in names:
+        results['benchmarks'][name] = suite.run(name)
+    suite.close()
+    return results
+
+
+def printResults(results):
+    print("%-22s %8s %12s %12s %12s %12s" % ("benchmark", "samples", "median[ms]", "p99[ms]", "mean[ms]", "calls/s"))
+    for name, stats in results['benchmarks'].items():
+        print("%-22s %8d %12.3f %12.3f %12.3f %12.1f" % (name, stats['samples'], stats['median']*1000.0, stats['p99']*1000.0, stats['mean']*1000.0, stats['throughput']))
+
+
+def printComparison(rows, threshold):
+    print("%-22s %12s %12s %8s %12s %12s %8s" % ("benchmark", "base_med[ms]", "cur_med[ms]", "ratio", "base_p99[ms]", "cur_p99[ms]", "ratio"))
+    for row in rows:
+        print("%-22s %12.3f %12.3f %8.2f %12.3f %12.3f %8.2f%s" % (row['benchmark'],
+                                                                   row['baseline_median']*1000.0, row['current_median']*1000.0, row['median_ratio'],
+                                                                   row['baseline_p99']*1000.0, row['current_p99']*1000.0, row['p99_ratio'],
+                                                                   "  REGRESSION" if row['regression'] else ""))
+    regressions = [row['benchmark'] for row in rows if row['regression']]
+    if regressions:
+        print("%d regression(s) above %.0f%%: %s" % (len(regressions), threshold*100.0, ', '.join(regressions)))
+    else:
+        print("No regressions above %.0f%%" % (threshold*100.0))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PyiCub Benchmark")
+
+    subparsers = parser.add_subparsers(dest="command", help="Choose 'run' or 'compare'.")
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmarks on the fake backend")
+    run_parser.add_argument("--benchmarks", nargs="+", default=None, choices=BENCHMARKS, help="Benchmarks to run (default all)")
+    run_parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS, help="Iterations per benchmark (default %d)" % DEFAULT_ITERATIONS)
+    run_parser.add_argument("--output", default=None, help="Save the results as a JSON baseline")
+    run_parser.add_argument("--compare", default=None, help="Compare the results with a JSON baseline")
+    run_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Relative slowdown flagged as regression (default %.2f)" % DEFAULT_THRESHOLD)
+    run_parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+
+    compare_parser = subparsers.add_parser("compare", help="Compare two JSON results")
+    compare_parser.add_argument("--baseline", required=True, help="Baseline JSON results")
+    compare_parser.add_argument("--current", required=True, help="Current JSON results")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Relative slowdown flagged as regression (default %.2f)" % DEFAULT_THRESHOLD)
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        results = runBenchmarks(args.benchmarks, args.iterations)
+        if args.output:
+            with open(args.output, 'w', encoding='UTF-8') as f:
+                json.dump(results, f, indent=4)
+        if args.json:
+            print(json.dumps(results, indent=4))
+        else:
+            printResults(results)
+        if args.compare:
+            with open(args.compare, encoding='UTF-8') as f:
+                baseline = json.load(f)
+            rows = compareResults(baseline, results, args.threshold)
+            printComparison(rows, args.threshold)
+            sys.exit(1 if any(row['regression'] for row in rows) else 0)
+    elif args.command == "compare":
+        with open(args.baseline, encoding='UTF-8') as f:
+            baseline = json.load(f)
+        with open(args.current, encoding='UTF-8') as f:
+            current = json.load(f)
+        rows = compareResults(baseline, current, args.threshold)
+        printComparison(rows, args.threshold)
+        sys.exit(1 if any(row['regression'] for row in rows) else 0)
+    else:
+        print("Invalid command. Choose 'run' or 'compare'.")
+
+
+if __name__ == "__main__":
+    main()
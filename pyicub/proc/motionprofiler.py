@@ -0,0 +1,69 @@
+# BSD 2-Clause License
+#
+# Copyright (c) 2022, Social Cognition in Human-Robot Interaction,
+#                     Istituto Italiano di Tecnologia, Genova
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from pyicub.controllers.profiler import MotionProfiler
+
+import argparse
+import json
+
+def main():
+    parser = argparse.ArgumentParser(description="PyiCub Motion Profiler")
+
+    subparsers = parser.add_subparsers(dest="command", help="Choose 'report'.")
+
+    report_parser = subparsers.add_parser("report", help="Report the motion timings saved with iCub.saveMotionProfile()")
+    report_parser.add_argument("--source", nargs="+", required=True, help="Motion profile files (.npz)")
+    report_parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+
+    args = parser.parse_args()
+
+    if args.command == "report":
+        profiler = MotionProfiler()
+        for path in args.source:
+            profiler.load(path)
+        report = profiler.report()
+        if args.json:
+            print(json.dumps(report, indent=4))
+            return
+        print("%-16s %8s %8s %10s %12s %12s" % ("part", "motions", "timeouts", "actual[s]", "nominal_err", "learned_err"))
+        for part_name, entry in report.items():
+            print("%-16s %8d %8d %10.3f %12.3f %12s" % (part_name,
+                                                        entry['motions'],
+                                                        entry['timeouts'],
+                                                        entry['actual_mean'],
+                                                        entry['nominal_error_mean'],
+                                                        "%.3f" % entry['learned_error_mean'] if 'learned_error_mean' in entry else "-"))
+            if entry['model']:
+                for joint, model in sorted(entry['model']['joints'].items(), key=lambda item: int(item[0])):
+                    print("    joint %2s: actual = %.3f + %.3f*nominal (sigma=%.3f, samples=%d)" % (joint, model['offset'], model['gain'], model['sigma'], model['samples']))
+    else:
+        print("Invalid command. Choose 'report'.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# BSD 2-Clause License
+#
+# Copyright (c) 2022, Social Cognition in Human-Robot Interaction,
+#                     Istituto Italiano di Tecnologia, Genova
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from pyicub.rest import PyiCubRESTfulClient
+
+import argparse
+import json
+
+def main():
+    parser = argparse.ArgumentParser(description="PyiCub Tracer")
+    parser.add_argument("--host", default="localhost", help="REST manager host (default localhost)")
+    parser.add_argument("--port", type=int, default=9001, help="REST manager port (default 9001)")
+
+    subparsers = parser.add_subparsers(dest="command", help="Choose 'configure' or 'export'.")
+
+    configure_parser = subparsers.add_parser("configure", help="Set the sampling rate and buffer capacity of the tracer")
+    configure_parser.add_argument("--sample-rate", type=float, default=None, help="Fraction of traces recorded (0 disables tracing)")
+    configure_parser.add_argument("--capacity", type=int, default=None, help="Maximum number of spans kept")
+    configure_parser.add_argument("--clear", action="store_true", help="Drop the recorded spans")
+
+    export_parser = subparsers.add_parser("export", help="Export the recorded spans as Chrome trace / Perfetto JSON")
+    export_parser.add_argument("--output", required=True, help="Output JSON file")
+    export_parser.add_argument("--trace-id", type=int, default=None, help="Export only the spans of this trace")
+    export_parser.add_argument("--clear", action="store_true", help="Drop the spans once exported")
+
+    args = parser.parse_args()
+    client = PyiCubRESTfulClient(args.host, args.port)
+
+    if args.command == "configure":
+        print(json.dumps(client.configure_trace(sample_rate=args.sample_rate, capacity=args.capacity, clear=args.clear), indent=4))
+    elif args.command == "export":
+        trace = client.get_trace(trace_id=args.trace_id, clear=args.clear)
+        with open(args.output, 'w', encoding='UTF-8') as f:
+            json.dump(trace, f)
+        print("%d spans exported to %s" % (len([e for e in trace['traceEvents'] if e['ph'] == 'X']), args.output))
+    else:
+        print("Invalid command. Choose 'configure' or 'export'.")
+
+
+if __name__ == "__main__":
+    main()
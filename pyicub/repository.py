@@ -0,0 +1,367 @@
+# BSD 2-Clause License
+#
+# Copyright (c) 2025, Social Cognition in Human-Robot Interaction,
+#                     Istituto Italiano di Tecnologia, Genova
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Module: repository.py
+
+This module indexes a directory of JSON actions without loading them. The index keeps, for every action, its
+file, mtime, size and content hash, and is saved in the user cache directory ($XDG_CACHE_HOME/pyicub, ~/.cache/pyicub
+by default) so that the next startup only needs to stat the files. An action is parsed on its first getAction() and kept in an LRU cache bounded by a memory budget;
+rescan() reloads only the files whose mtime or size changed (and whose content hash differs). A file whose mtime
+and size match its index entry is trusted without being read: an edit that keeps both is not detected.
+
+Actions modified in place (see touch) are pinned out of the LRU cache, with a new version, until their file changes.
+
+The name of an indented JSON action (as written by exportJSONFile) is found without parsing the file; files with
+the same action id are reported and only the first one (by file name) is indexed under it.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+
+from pyicub.actions import iCubFullbodyAction, ActionsManager
+from pyicub.binary import isActionFile, isBinaryFile, readName
+
+
+_FIRST_KEY_ = re.compile(rb'\s*\{\r?\n([ \t]+)"')
+
+
+def readJSONName(data):
+    """
+    Returns:
+        str: the 'name' of a JSON action. In an indented file the top-level keys are the only ones at the
+        indentation of the first key, so the name is searched at that indentation; other files are parsed.
+    """
+    first_key = _FIRST_KEY_.match(data)
+    if first_key is not None:
+        indent = re.escape(first_key.group(1))
+        name = re.search(rb'\n' + indent + rb'"name"\s*:\s*("(?:[^"\\\n]|\\.)*")', data)
+        if name is not None:
+            return json.loads(name.group(1))
+    return json.loads(data)['name']
+
+
+class RepositoryEntry:
+    """
+    An indexed action file. `version` changes only when the content of the file changes, `validated` tells if the
+    action has already passed the validation of its first load.
+    """
+
+    __slots__ = ('action_id', 'file', 'mtime', 'size', 'hash', 'version', 'validated')
+
+    def __init__(self, action_id, file, mtime, size, hash, version=None):
+        self.action_id = action_id
+        self.file = file
+        self.mtime = mtime
+        self.size = size
+        self.hash = hash
+        self.version = version
+        self.validated = False
+
+    def toJSON(self):
+        return {'action_id': self.action_id,
+                'file': self.file,
+                'mtime': self.mtime,
+                'size': self.size,
+                'hash': self.hash}
+
+
+class ActionRepository:
+    """
+    Lazy, indexed repository of JSON actions.
+
+    Args:
+        path (str): The directory of the actions (*.json and *.pyact files).
+        name_prefix (str): If given, the action ids are `name_prefix + '.' + action name`.
+        memory_budget (int): Estimated memory (bytes) of the parsed actions kept in cache.
+        index_file (str): The index file, relative to `path` if not absolute. CACHE_INDEX_FILE (default) for a file
+            of the user cache directory named after the path and prefix, None to not save the index.
+        validator (callable): Called with each action on its first load, returns its ValidationReport (e.g.
+            iCub.validateAction): an invalid action is not loaded.
+    """
+
+    INDEX_FILE = '.pyicub_actions.idx'
+    CACHE_INDEX_FILE = ''
+    INDEX_VERSION = 1
+    DEFAULT_MEMORY_BUDGET = 256*1024*1024
+    PARSED_SIZE_FACTOR = 8
+
+    def __init__(self, path, name_prefix=None, memory_budget=DEFAULT_MEMORY_BUDGET, index_file=CACHE_INDEX_FILE, logger=None, validator=None):
+        self._path_ = path
+        self._validator_ = validator
+        self._name_prefix_ = name_prefix
+        self._memory_budget_ = memory_budget
+        self._index_file_ = index_file
+        self._logger_ = logger
+        self._entries_ = {}
+        self._files_ = {}
+        self._cache_ = OrderedDict()
+        self._pinned_ = {}
+        self._cache_bytes_ = 0
+        self._lock_ = threading.RLock()
+        self._hits_ = 0
+        self._misses_ = 0
+        self._evictions_ = 0
+        self.rescan()
+
+    @property
+    def path(self):
+        return self._path_
+
+    def __contains__(self, action_id):
+        return action_id in self._entries_
+
+    def __len__(self):
+        return len(self._entries_)
+
+    def keys(self):
+        return list(self._entries_.keys())
+
+    def getEntry(self, action_id):
+        return self._entries_.get(action_id)
+
+    def getVersion(self, action_id):
+        entry = self._entries_.get(action_id)
+        return entry.version if entry is not None else None
+
+    def _actionId_(self, name):
+        if self._name_prefix_:
+            return self._name_prefix_ + '.' + name
+        return name
+
+    @staticmethod
+    def cacheDir():
+        return os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'), 'pyicub')
+
+    def indexPath(self):
+        """
+        Returns:
+            str: the path of the index file, None if the index is not saved.
+        """
+        if self._index_file_ is None:
+            return None
+        if self._index_file_ == self.CACHE_INDEX_FILE:
+            # the entries hold the action ids: the index depends on the name prefix too
+            key = hashlib.sha1(('%s\0%s' % (os.path.abspath(self._path_), self._name_prefix_ or '')).encode('utf-8')).hexdigest()
+            return os.path.join(self.cacheDir(), 'actions_%s.idx' % key)
+        return os.path.join(self._path_, self._index_file_)
+
+    def _loadIndex_(self):
+        if self.indexPath() is None:
+            return {}
+        try:
+            with open(self.indexPath(), encoding='UTF-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if index.get('version') != self.INDEX_VERSION:
+            return {}
+        return {e['file']: RepositoryEntry(e['action_id'], e['file'], e['mtime'], e['size'], e['hash'], next(ActionsManager._VERSIONS_)) for e in index['entries']}
+
+    def saveIndex(self):
+        index_path = self.indexPath()
+        if index_path is None:
+            return False
+        index = {'version': self.INDEX_VERSION, 'entries': [entry.toJSON() for entry in self._files_.values()]}
+        try:
+            os.makedirs(os.path.dirname(index_path), exist_ok=True)
+            with open(index_path, 'w', encoding='UTF-8') as f:
+                json.dump(index, f)
+        except OSError as e:
+            if self._logger_ is not None:
+                self._logger_.warning('ActionRepository: index of <%s> not saved (%s)' % (self._path_, e))
+            return False
+        return True
+
+    def _readEntry_(self, file, stat):
+        with open(os.path.join(self._path_, file), 'rb') as f:
+            data = f.read()
+        if isBinaryFile(file):
+            name = readName(os.path.join(self._path_, file))
+        else:
+            name = readJSONName(data)
+        return RepositoryEntry(self._actionId_(name), file, stat.st_mtime, stat.st_size, hashlib.sha1(data).hexdigest())
+
+    def rescan(self):
+        """
+        Updates the index: new files are indexed, removed files forgotten, and files whose mtime or size changed
+        are hashed again. The cached action of a file is dropped only if its content has changed. Files are
+        trusted on their mtime and size alone: those matching their entry are neither read nor hashed. The index
+        file is saved only if an entry changed. At the first scan, the actions of the saved index are not
+        reported as added.
+
+        Returns:
+            dict: the ids of the 'added', 'changed' and 'removed' actions, and the 'duplicates' action ids of
+            several files (-> the files, the first one being the indexed one).
+        """
+        res = {'added': [], 'changed': [], 'removed': [], 'duplicates': {}}
+        with self._lock_:
+            known = self._files_ if self._files_ else self._loadIndex_()
+            files = {}
+            dirty = False
+            for item in os.scandir(self._path_):
+                if not isActionFile(item.name) or not item.is_file():
+                    continue
+                stat = item.stat()
+                entry = known.get(item.name)
+                if entry is not None and entry.mtime == stat.st_mtime and entry.size == stat.st_size:
+                    files[item.name] = entry
+                    continue
+                try:
+                    new_entry = self._readEntry_(item.name, stat)
+                except (OSError, ValueError, KeyError) as e:
+                    if self._logger_ is not None:
+                        self._logger_.error('ActionRepository: <%s> not indexed (%s)' % (item.name, repr(e)))
+                    continue
+                dirty = True
+                if entry is not None and entry.hash == new_entry.hash and entry.action_id == new_entry.action_id:
+                    entry.mtime = new_entry.mtime
+                    files[item.name] = entry
+                else:
+                    files[item.name] = new_entry
+            entries = {}
+            for file in sorted(files.keys()):
+                entry = files[file]
+                if entry.action_id in entries.keys():
+                    res['duplicates'].setdefault(entry.action_id, [entries[entry.action_id].file]).append(file)
+                else:
+                    entries[entry.action_id] = entry
+            for action_id, duplicates in res['duplicates'].items():
+                if self._logger_ is not None:
+                    self._logger_.error('ActionRepository: action <%s> defined by several files %s, <%s> is used' % (action_id, duplicates, duplicates[0]))
+            for file, entry in files.items():
+                if entry.version is None:
+                    entry.version = next(ActionsManager._VERSIONS_)
+                    previous = known.get(file)
+                    if entries[entry.action_id] is not entry:
+                        if previous is not None:
+                            self._drop_(previous.action_id)
+                    elif previous is None:
+                        res['added'].append(entry.action_id)
+                    else:
+                        res['changed'].append(entry.action_id)
+                        self._drop_(previous.action_id)
+            for file, entry in known.items():
+                if not file in files.keys():
+                    # the action of a removed file may still be defined by one of its duplicates
+                    res['changed' if entry.action_id in entries.keys() else 'removed'].append(entry.action_id)
+                    self._drop_(entry.action_id)
+                    dirty = True
+            self._files_ = files
+            self._entries_ = entries
+            if dirty:
+                self.saveIndex()
+        return res
+
+    def forget(self, action_id):
+        """
+        Removes an action from the index (the file is left untouched).
+        """
+        with self._lock_:
+            entry = self._entries_.pop(action_id, None)
+            if entry is not None:
+                self._files_.pop(entry.file, None)
+                self._drop_(action_id)
+            return entry is not None
+
+    def _drop_(self, action_id):
+        item = self._cache_.pop(action_id, None)
+        if item is not None:
+            self._cache_bytes_ -= item[1]
+        self._pinned_.pop(action_id, None)
+
+    def touch(self, action_id, action=None):
+        """
+        Marks an action as modified in place (e.g. by ActionsManager.optimizeAction): it gets a new version and is
+        kept, out of the LRU cache, until its file changes. The file is left untouched.
+
+        Args:
+            action (iCubFullbodyAction): The modified action (default: the cached one).
+        """
+        with self._lock_:
+            entry = self._entries_.get(action_id)
+            if entry is None:
+                return False
+            item = self._cache_.pop(action_id, None)
+            if item is not None:
+                self._cache_bytes_ -= item[1]
+                action = action if action is not None else item[0]
+            if action is not None:
+                self._pinned_[action_id] = action
+            entry.version = next(ActionsManager._VERSIONS_)
+            return True
+
+    def getAction(self, action_id):
+        """
+        Returns the action, parsing its file if it is not in cache.
+        """
+        with self._lock_:
+            action = self._pinned_.get(action_id)
+            if action is not None:
+                self._hits_ += 1
+                return action
+            item = self._cache_.get(action_id)
+            if item is not None:
+                self._cache_.move_to_end(action_id)
+                self._hits_ += 1
+                return item[0]
+            entry = self._entries_.get(action_id)
+            if entry is None:
+                raise Exception("action_id '%s' not found! Please provide an action identifier previously imported!" % action_id)
+            self._misses_ += 1
+            action = iCubFullbodyAction(JSON_file=os.path.join(self._path_, entry.file))
+            if self._validator_ is not None and not entry.validated:
+                report = self._validator_(action)
+                if not report.valid:
+                    if self._logger_ is not None:
+                        self._logger_.error(report.summary())
+                    raise Exception(report.summary())
+                entry.validated = True
+            cost = entry.size*self.PARSED_SIZE_FACTOR
+            self._cache_[action_id] = (action, cost)
+            self._cache_bytes_ += cost
+            while self._cache_bytes_ > self._memory_budget_ and len(self._cache_) > 1:
+                _, (_, evicted) = self._cache_.popitem(last=False)
+                self._cache_bytes_ -= evicted
+                self._evictions_ += 1
+            return action
+
+    def info(self):
+        return {'path': self._path_,
+                'actions': len(self._entries_),
+                'cached': len(self._cache_),
+                'pinned': len(self._pinned_),
+                'cache_bytes': self._cache_bytes_,
+                'memory_budget': self._memory_budget_,
+                'hits': self._hits_,
+                'misses': self._misses_,
+                'evictions': self._evictions_}
@@ -29,6 +29,7 @@
 
 import time
 import concurrent.futures
+import contextvars
 import threading
 import csv
 import ctypes
@@ -51,6 +52,8 @@ class iCubRequest:
 
     TIMEOUT_REQUEST = 120.0
 
+    THREAD_TAGS = {}
+
     def __init__(self, req_id, timeout, target, logger, ts_ref=0.0, tag=''):
         self._ts_ref_ = ts_ref
         self._logger_ = logger
@@ -122,12 +125,23 @@ class iCubRequest:
         return str(self.info())
 
     def run(self, *args, **kwargs):
-        self._future_target_ = self._target_executor_.submit(self._target_, *args, **kwargs)
+        # the target runs in a copy of the caller context, so that tracing spans opened by it get the caller span as parent
+        ctx = contextvars.copy_context()
+        self._future_target_ = self._target_executor_.submit(ctx.run, self._run_target_, *args, **kwargs)
         self._logger_.debug("iCubRequest tag=%s, req_id=%s STARTED!" % (self.tag, self.req_id))
         self._status_ = iCubRequest.RUNNING
         self._start_time_ = round(time.perf_counter() - self._ts_ref_, 4)
         self._future_req_ = self._req_executor_.submit(self._execute_)
 
+    def _run_target_(self, *args, **kwargs):
+        # THREAD_TAGS maps the thread running the target to the request tag, for the profilers
+        ident = threading.get_ident()
+        iCubRequest.THREAD_TAGS[ident] = self._tag_
+        try:
+            return self._target_(*args, **kwargs)
+        finally:
+            iCubRequest.THREAD_TAGS.pop(ident, None)
+
     def _stop_request_(self):
         self._target_executor_.shutdown(wait=False)
         for t in self._target_executor_._threads:
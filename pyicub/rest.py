@@ -35,8 +35,12 @@ except ImportError:
 from pyicub.requests import iCubRequest
 from pyicub.utils import SingletonMeta, getPyiCubInfo, getPublicMethods, getDecoratedMethods, firstAvailablePort, importFromJSONFile, exportJSONFile
 from pyicub.core.logger import PyicubLogger, YarpLogger
+from pyicub.core.tracing import Tracer, traced
+from pyicub.core.profiling import ProfilingSession
 from pyicub.requests import iCubRequestsManager, iCubRequest
 from pyicub.fsm import FSM
+from pyicub.binary import importActionFile, isActionFile
+from pyicub.store import actionHash
 from pyicub.actions import iCubFullbodyAction, iCubActionTemplate, TemplateParameter
 from flask import Flask, jsonify, request
 from flask_cors import CORS
@@ -352,6 +356,10 @@ class iCubRESTManager(iCubRESTServer):
         self._request_manager_ = icubrequestmanager
         self._flaskapp_.add_url_rule("/%s/requests" % self._rule_prefix_, methods=['GET'], view_func=self.requests)
         self._flaskapp_.add_url_rule("/%s/processes" % self._rule_prefix_, methods=['GET'], view_func=self.processes)
+        self._flaskapp_.add_url_rule("/%s/trace" % self._rule_prefix_, methods=['GET', 'POST'], view_func=self.trace)
+        self._flaskapp_.add_url_rule("/%s/profile" % self._rule_prefix_, methods=['GET', 'POST'], view_func=self.profile)
+        self._flaskapp_.add_url_rule("/%s/profile/stop" % self._rule_prefix_, methods=['POST'], view_func=self.stop_profile)
+        self._profiling_ = None
         self._flaskapp_.add_url_rule("/%s/<robot_name>/<app_name>/<target_name>/<local_id>" % (self._rule_prefix_), methods=['GET'], view_func=self.single_req_info)
     
     def __del__(self):
@@ -441,11 +449,74 @@ class iCubRESTManager(iCubRESTServer):
     def pending_requests(self):
         return self.status_requests(status="RUNNING")
 
+    def trace(self):
+        """
+        GET: returns the recorded spans as Chrome trace JSON (args: trace_id, clear).
+        POST: configures the tracer with a JSON body {"sample_rate": float, "capacity": int, "clear": bool} and returns its state.
+        """
+        tracer = Tracer()
+        if request.method == 'POST':
+            conf = request.get_json(force=True, silent=True) or {}
+            if conf.get('clear', False):
+                tracer.clear()
+            return jsonify(tracer.configure(sample_rate=conf.get('sample_rate'), capacity=conf.get('capacity')))
+        trace_id = request.args.get('trace_id')
+        res = tracer.toChromeTrace(int(trace_id) if trace_id else None)
+        if 'clear' in request.args:
+            tracer.clear()
+        return jsonify(res)
+
+    @property
+    def profiling(self):
+        return self._profiling_
+
+    def start_profiling(self, mode=ProfilingSession.SAMPLING, duration=None, requests=None, target=None, interval=ProfilingSession.DEFAULT_INTERVAL):
+        """
+        Starts a profiling session (see ProfilingSession), replacing any previous one.
+        """
+        if self._profiling_ is not None:
+            self._profiling_.stop()
+        self._profiling_ = ProfilingSession(mode=mode, duration=duration, requests=requests, target=target, interval=interval, thread_tags=iCubRequest.THREAD_TAGS)
+        return self._profiling_.start()
+
+    def profile(self):
+        """
+        POST: starts a profiling session, JSON body {"mode": "sampling"|"deterministic", "duration": s, "requests": N, "target": name, "interval": s}.
+        GET: returns the last session results (arg format: json (default), collapsed, pstats).
+        """
+        if request.method == 'POST':
+            conf = request.get_json(force=True, silent=True) or {}
+            try:
+                return jsonify(self.start_profiling(mode=conf.get('mode', ProfilingSession.SAMPLING),
+                                                    duration=conf.get('duration'),
+                                                    requests=conf.get('requests'),
+                                                    target=conf.get('target'),
+                                                    interval=conf.get('interval', ProfilingSession.DEFAULT_INTERVAL)))
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+        if self._profiling_ is None:
+            return jsonify({})
+        fmt = request.args.get('format', 'json')
+        if fmt == 'collapsed':
+            return self._profiling_.collapsed(), 200, {'Content-Type': 'text/plain'}
+        if fmt == 'pstats':
+            return self._profiling_.pstats(sort=request.args.get('sort', 'cumulative')), 200, {'Content-Type': 'text/plain'}
+        return jsonify(self._profiling_.report())
+
+    def stop_profile(self):
+        if self._profiling_ is None:
+            return jsonify({})
+        return jsonify(self._profiling_.stop())
+
+    @traced('process_target', tag_arg='service', tag_of=lambda service: service.name, category='rest')
     def process_target(self, service):
         res = request.get_json(force=True)
         kwargs =  res
         wait_for_completed=False
-        req = self.request_manager.create(timeout=iCubRequest.TIMEOUT_REQUEST, target=service.target, name=service.name, prefix=service.url)
+        target = service.target
+        if self._profiling_ is not None:
+            target = self._profiling_.wrap(service.name, target)
+        req = self.request_manager.create(timeout=iCubRequest.TIMEOUT_REQUEST, target=target, name=service.name, prefix=service.url)
         
         self._requests_[req.req_id] = {'robot_name': service.robot_name,
                                        'app_name': service.app_name,
@@ -746,10 +817,7 @@ class iCubRESTApp(PyiCubRESTfulServer):
         
         self.configure(input_args)
         if self.fsm:
-            self.flushActions(name_prefix=self.name + '.FSM')
-            self.flushActions(name_prefix=self.name + '.iCubFSM')
-            for action in self.fsm.actions.values():
-                self.importAction(action, name_prefix=self.name + '.' + self.fsm.name)
+            self.syncActions(list(self.fsm.actions.values()), name_prefix=self.name + '.' + self.fsm.name, flush_prefixes=[self.name + '.FSM', self.name + '.iCubFSM'])
         
         return True
         
@@ -777,6 +845,8 @@ class iCubRESTApp(PyiCubRESTfulServer):
             self.__register_method__(robot_name=self.__robot_name__, app_name=app_name, method=self.getActions, target_name='actions.getActions')
             self.__register_method__(robot_name=self.__robot_name__, app_name=app_name, method=self.importActionFromJSONDict, target_name='actions.importAction')
             self.__register_method__(robot_name=self.__robot_name__, app_name=app_name, method=self.flushActions, target_name='actions.flushActions')
+            self.__register_method__(robot_name=self.__robot_name__, app_name=app_name, method=self.icub.bindActions, target_name='actions.bindActions')
+            self.__register_method__(robot_name=self.__robot_name__, app_name=app_name, method=self.icub.storeActions, target_name='actions.storeActions')
         if self.icub.gaze:
             self.__register_class__(robot_name=self.__robot_name__, app_name=app_name, cls=self.icub.gaze, class_name='gaze')
         if self.icub.speech:
@@ -793,11 +863,15 @@ class iCubRESTApp(PyiCubRESTfulServer):
             self.__register_class__(robot_name=self.__robot_name__, app_name=app_name, cls=self.icub.gpt, class_name='gpt')
 
     def importActionFromJSONFile(self, JSON_file):
-        JSON_dict = importFromJSONFile(JSON_file)
+        JSON_dict = importActionFile(JSON_file)
         return self.importActionFromJSONDict(JSON_dict=JSON_dict)
   
     def importActions(self, path):
-        json_files = [pos_json for pos_json in os.listdir(path) if pos_json.endswith('.json')]
+        if self.icub:
+            # local helper: the actions are indexed and parsed on their first use
+            self.icub.addActionRepository(path, name_prefix=self.__class__.__name__)
+            return
+        json_files = [pos_json for pos_json in os.listdir(path) if isActionFile(pos_json)]
         for f in json_files:
             self.importActionFromJSONFile(os.path.join(path, f))
 
@@ -816,6 +890,35 @@ class iCubRESTApp(PyiCubRESTfulServer):
             action_id = res.json()['retval']
         return action_id
     
+    def syncActions(self, actions, name_prefix=None, flush_prefixes=None):
+        """
+        Makes the helper hold exactly `actions` under `name_prefix` (see iCub.bindActions): the action hashes are
+        sent first and only the actions the helper does not have yet are uploaded. Unchanged actions cost a
+        single round trip.
+
+        Returns:
+            list: the action ids.
+        """
+        if not name_prefix:
+            name_prefix = self.__class__.__name__
+        JSON_dicts = {}
+        for action in actions:
+            JSON_dicts[actionHash(action)] = action.toJSONDict()
+        res = self.__helperCall__('bindActions', hashes=list(JSON_dicts.keys()), name_prefix=name_prefix, flush_prefixes=flush_prefixes)
+        if res['missing']:
+            self.__helperCall__('storeActions', JSON_dicts=[JSON_dicts[h] for h in res['missing']])
+            res = self.__helperCall__('bindActions', hashes=list(JSON_dicts.keys()), name_prefix=name_prefix, flush_prefixes=flush_prefixes)
+        return res['action_ids']
+
+    def __helperCall__(self, method, **kwargs):
+        if self.icub:
+            return getattr(self.icub, method)(**kwargs)
+        url = self.rest_manager.proxy_rule() + '/' + self.__robot_name__ + '/helper/actions.' + method + '?sync'
+        res = requests.post(url=url, json=kwargs).json()
+        if res is None:
+            raise Exception("The helper request actions.%s failed" % method)
+        return res
+
     def deleteAction(self, action_id: str):
         if self.icub:
             req = self.icub.deleteAction(action_id=action_id)
@@ -827,13 +930,15 @@ class iCubRESTApp(PyiCubRESTfulServer):
             res = requests.post(url=url, json=data)
             return res.json()
 
-    def playAction(self, action_id: str, wait_for_completed=True):
+    def playAction(self, action_id: str, wait_for_completed=True, duration=None):
         if self.icub:
-            req = self.icub.playAction(action_id=action_id, wait_for_completed=wait_for_completed)
+            req = self.icub.playAction(action_id=action_id, wait_for_completed=wait_for_completed, duration=duration)
             return 
         else:
             data = {}
             data['action_id'] = action_id
+            if duration is not None:
+                data['duration'] = duration
             if(wait_for_completed):
                 url = self.rest_manager.proxy_rule() + '/' + self.__robot_name__ + '/helper/actions.playAction?sync'
                 res = requests.post(url=url, json=data)
@@ -850,7 +955,7 @@ class iCubRESTApp(PyiCubRESTfulServer):
     def importAction(self, action: iCubFullbodyAction, name_prefix=None):
         if not name_prefix:
             name_prefix = self.__class__.__name__        
-        json_dict = json.loads(action.toJSON())
+        json_dict = action.toJSONDict()
         return self.importActionFromJSONDict(JSON_dict=json_dict, name_prefix=name_prefix)
 
     def flushActions(self, name_prefix=None):
@@ -1040,6 +1145,32 @@ class PyiCubRESTfulClient:
         res = requests.get(url="http://%s:%d" % (self._host_, self._port_))
         return res.json()['Version']
 
+    def get_trace(self, trace_id=None, clear=False):
+        params = {}
+        if trace_id is not None:
+            params['trace_id'] = trace_id
+        if clear:
+            params['clear'] = ''
+        res = requests.get(url=self._header_ + '/trace', params=params)
+        return res.json()
+
+    def configure_trace(self, sample_rate=None, capacity=None, clear=False):
+        res = requests.post(url=self._header_ + '/trace', json={'sample_rate': sample_rate, 'capacity': capacity, 'clear': clear})
+        return res.json()
+
+    def start_profiling(self, mode='sampling', duration=None, requests_nr=None, target=None, interval=0.005):
+        res = requests.post(url=self._header_ + '/profile', json={'mode': mode, 'duration': duration, 'requests': requests_nr, 'target': target, 'interval': interval})
+        return res.json()
+
+    def stop_profiling(self):
+        return requests.post(url=self._header_ + '/profile/stop', json={}).json()
+
+    def get_profile(self, fmt='json'):
+        res = requests.get(url=self._header_ + '/profile', params={'format': fmt})
+        if fmt == 'json':
+            return res.json()
+        return res.text
+
     def get_robots(self):
         res = requests.get(url=self._header_)
         json_robots = res.json()
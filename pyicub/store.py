@@ -0,0 +1,175 @@
+# BSD 2-Clause License
+#
+# Copyright (c) 2025, Social Cognition in Human-Robot Interaction,
+#                     Istituto Italiano di Tecnologia, Genova
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Module: store.py
+
+Content-addressed store of JSON actions, kept by the helper that owns the robot. An action is identified by the
+hash of its canonical JSON form, so a client can ask which of its actions are missing, upload only those and bind
+names to hashes (see iCub.bindActions). Bindings whose action is unchanged are kept as they are, so re-binding the
+same actions does not rebuild, validate or recompile them.
+
+The store keeps every action bound to at least one action id. The others (uploaded and not yet bound, or no longer
+bound) are kept up to a number of them, the least recently used being evicted first.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+
+def canonicalJSON(JSON_dict):
+    return json.dumps(JSON_dict, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+
+
+def actionHash(JSON_dict):
+    """
+    Returns:
+        str: the sha256 of the canonical JSON form of an action dict (or of an object with a toCanonicalJSON() or
+        toJSON() method).
+    """
+    if hasattr(JSON_dict, 'toCanonicalJSON'):
+        data = JSON_dict.toCanonicalJSON()
+    else:
+        if hasattr(JSON_dict, 'toJSON'):
+            JSON_dict = json.loads(JSON_dict.toJSON())
+        data = canonicalJSON(JSON_dict)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+class ActionStore:
+    """
+    Attributes:
+        DEFAULT_MAX_UNBOUND (int): Default number of unbound actions kept.
+    """
+
+    DEFAULT_MAX_UNBOUND = 256
+
+    def __init__(self, max_unbound=DEFAULT_MAX_UNBOUND):
+        """
+        Args:
+            max_unbound (int): Number of actions kept while no action id is bound to them.
+        """
+        self._actions_ = {}
+        self._bindings_ = {}
+        self._refs_ = {}
+        self._unbound_ = OrderedDict()
+        self._max_unbound_ = max_unbound
+        self._lock_ = threading.Lock()
+        self._uploads_ = 0
+        self._binds_ = 0
+        self._reused_ = 0
+        self._evicted_ = 0
+
+    def __contains__(self, action_hash):
+        return action_hash in self._actions_
+
+    def __len__(self):
+        return len(self._actions_)
+
+    def missing(self, hashes):
+        with self._lock_:
+            return [h for h in hashes if not h in self._actions_]
+
+    def put(self, JSON_dict):
+        """
+        Stores an action dict under its hash, computed here.
+
+        Returns:
+            str: the hash.
+        """
+        action_hash = actionHash(JSON_dict)
+        with self._lock_:
+            self._actions_.setdefault(action_hash, JSON_dict)
+            self._uploads_ += 1
+            if not action_hash in self._refs_:
+                self._release_(action_hash)
+        return action_hash
+
+    def get(self, action_hash):
+        return self._actions_[action_hash]
+
+    def discard(self, action_hash):
+        with self._lock_:
+            self._unbound_.pop(action_hash, None)
+            return self._actions_.pop(action_hash, None) is not None
+
+    def _release_(self, action_hash):
+        # the action is no longer bound: it is kept among the most recently used unbound actions
+        self._unbound_[action_hash] = None
+        self._unbound_.move_to_end(action_hash)
+        while len(self._unbound_) > self._max_unbound_:
+            evicted, _ = self._unbound_.popitem(last=False)
+            self._actions_.pop(evicted, None)
+            self._evicted_ += 1
+
+    def _unref_(self, binding):
+        if binding is None:
+            return
+        action_hash = binding[0]
+        self._refs_[action_hash] -= 1
+        if self._refs_[action_hash] == 0:
+            del self._refs_[action_hash]
+            if action_hash in self._actions_:
+                self._release_(action_hash)
+
+    def binding(self, action_id):
+        """
+        Returns:
+            tuple: (hash, version) bound to the action id, None if unbound.
+        """
+        return self._bindings_.get(action_id)
+
+    def bind(self, action_id, action_hash, version, reused=False):
+        with self._lock_:
+            self._refs_[action_hash] = self._refs_.get(action_hash, 0) + 1
+            self._unbound_.pop(action_hash, None)
+            self._unref_(self._bindings_.get(action_id))
+            self._bindings_[action_id] = (action_hash, version)
+            self._binds_ += 1
+            if reused:
+                self._reused_ += 1
+
+    def unbind(self, action_id):
+        with self._lock_:
+            self._unref_(self._bindings_.pop(action_id, None))
+
+    def unbindAll(self, name_prefix=None):
+        with self._lock_:
+            for action_id in [k for k in self._bindings_.keys() if not name_prefix or k.startswith(name_prefix)]:
+                self._unref_(self._bindings_.pop(action_id))
+
+    def info(self):
+        return {'actions': len(self._actions_),
+                'bindings': len(self._bindings_),
+                'unbound': len(self._unbound_),
+                'evicted': self._evicted_,
+                'uploads': self._uploads_,
+                'binds': self._binds_,
+                'reused': self._reused_}
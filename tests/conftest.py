@@ -0,0 +1,53 @@
+"""Shared fixtures running the iCub helper on the in-process fake YARP backend (see pyicub.fake)."""
+
+import sys
+
+import pytest
+
+import pyicub.fake.yarp as fake_yarp
+import pyicub.controllers.position as position
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path_factory, monkeypatch):
+    """
+    The user cache directory (e.g. of the action repository indexes) of the tests.
+    """
+    path = tmp_path_factory.mktemp('cache')
+    monkeypatch.setenv('XDG_CACHE_HOME', str(path))
+    return path
+
+
+@pytest.fixture
+def fake_yarp_backend(monkeypatch):
+    """
+    Installs the fake yarp module and forgets the pyicub modules imported meanwhile, so that the next tests
+    import them again against the backend they install.
+    """
+    before = set(sys.modules.keys())
+    fake_yarp.PolyDriver.reset()
+    monkeypatch.setitem(sys.modules, "yarp", fake_yarp)
+    monkeypatch.setattr(position, "yarp", fake_yarp, raising=False)
+    yield fake_yarp
+    fake_yarp.PolyDriver.reset()
+    for name in set(sys.modules.keys()) - before:
+        sys.modules.pop(name, None)
+
+
+@pytest.fixture
+def fake_icub(fake_yarp_backend):
+    """
+    An iCub helper of the simulated robot, without actions nor compiled plans and with an empty 'recorder' list
+    as runtime module (the target of the custom calls of the tests).
+    """
+    from pyicub.helper import iCub
+    icub = iCub(robot_name="icubSim")
+    icub.flushActions()
+    icub.invalidatePlans()
+    if not 'recorder' in icub.__dict__.keys():
+        icub.addRuntimeModule('recorder', [])
+    icub.recorder.clear()
+    yield icub
+    icub.flushActions()
+    icub.invalidatePlans()
+    icub.close()
@@ -0,0 +1,74 @@
+"""Unit tests for the offline action timing analyzer."""
+
+import json
+
+import pytest
+
+from pyicub.actions import iCubFullbodyAction, iCubFullbodyStep
+from pyicub.analyzer import ActionAnalyzer, toChromeTrace
+from pyicub.controllers.position import JointPose, ICUB_NECK, ICUB_TORSO
+
+
+class NeckStep(iCubFullbodyStep):
+
+    def prepare(self):
+        neck = self.createLimbMotion(ICUB_NECK)
+        # 20 degrees at the 10 deg/s of the first neck joint
+        neck.createJointsTrajectory(JointPose(target_joints=[20.0, 0.0, 0.0]))
+        neck.createJointsTrajectory(JointPose(target_joints=[20.0, 0.0, 0.0]), duration=0.5)
+
+
+class TorsoStep(iCubFullbodyStep):
+
+    def prepare(self):
+        torso = self.createLimbMotion(ICUB_TORSO)
+        torso.createJointsTrajectory(JointPose(target_joints=[0.0, 0.0, 10.0]), duration=3.0, timeout=2.0)
+        self.createGazeMotion('lookAtAbsAngles').addCheckpoint([0.0, 10.0, 0.0])
+        self.createCustomCall('speech.say', ('hello',))
+
+
+class ParallelAction(iCubFullbodyAction):
+
+    def prepare(self):
+        self.addStep(NeckStep())
+        self.addStep(TorsoStep(offset_ms=500), wait_for_completed=False)
+        self.addStep(NeckStep(offset_ms=100))
+
+
+def test_timeline_and_critical_path():
+    speed = ICUB_NECK.joints_speed[0]
+    analysis = ActionAnalyzer(speed_scaling=1.0, synchronize=True, call_durations={'speech.say': 1.5}).analyze(ParallelAction())
+    first, torso, last = analysis.steps
+
+    assert first.start == 0.0
+    assert first.end == pytest.approx(20.0/speed + 0.5)
+    assert torso.start == pytest.approx(first.end + 0.5)
+    # the torso checkpoint is cut by its timeout, the custom call is longer than the gaze
+    assert torso.end == pytest.approx(torso.start + 2.0)
+    assert len(analysis.warnings) == 1 and 'timeout' in analysis.warnings[0]
+    assert {s.resource: s.duration for s in torso.segments} == pytest.approx({'TORSO': 2.0, 'gaze': 0.75, 'calls': 1.5})
+    # the second neck step starts from 20 degrees: only its fixed-duration checkpoint takes time
+    assert last.start == pytest.approx(first.end + 0.1)
+    assert last.end == pytest.approx(last.start + 0.5)
+
+    assert analysis.duration == pytest.approx(torso.end)
+    assert [(s.step, s.resource) for s in analysis.critical_path] == [('NeckStep', 'NECK'), ('TorsoStep', 'TORSO')]
+    assert [s[0] for s in analysis.limbTimeline()['NECK']] == ['NeckStep', 'NeckStep']
+    json.dumps(analysis.toJSON())
+
+
+def test_repository_trace():
+    analyses = ActionAnalyzer().analyzeActions({'a': ParallelAction(), 'b': ParallelAction(name='other')})
+    trace = toChromeTrace(analyses)
+    slices = [e for e in trace['traceEvents'] if e['ph'] == 'X']
+    assert set(e['pid'] for e in slices) == {0, 1}
+    assert any(e['cat'] == 'critical' for e in slices)
+    assert analyses['a'].duration == analyses['b'].duration
+
+
+def test_helper_starts_from_the_encoders(fake_icub):
+    fake_icub.addAction(ParallelAction())
+    fake_icub.getPositionController(ICUB_NECK).move(JointPose(target_joints=[20.0, 0.0, 0.0]), req_time=0.1)
+    analysis = fake_icub.analyzeAction('ParallelAction')
+    # the neck is already at 20 degrees: the first step takes only its fixed-duration checkpoint
+    assert analysis.steps[0].end == pytest.approx(0.5, abs=0.05)
@@ -0,0 +1,36 @@
+"""Unit tests for the benchmark statistics, the baseline comparison and a short run on the fake backend."""
+
+import pytest
+
+from pyicub.proc.benchmark import BenchmarkSuite, compareResults, runBenchmarks, statistics
+
+
+@pytest.fixture
+def suite(fake_yarp_backend):
+    suite = BenchmarkSuite(iterations=5)
+    yield suite
+    suite.icub.close()
+
+
+def test_statistics():
+    stats = statistics([0.001]*99 + [0.1])
+    assert stats['samples'] == 100
+    assert stats['median'] == pytest.approx(0.001)
+    assert stats['p99'] > 0.001
+    assert stats['max'] == pytest.approx(0.1)
+
+
+def test_compare_flags_regressions():
+    baseline = {'benchmarks': {'a': statistics([1.0, 1.0]), 'b': statistics([1.0, 1.0]), 'gone': statistics([1.0])}}
+    current = {'benchmarks': {'a': statistics([1.1, 1.1]), 'b': statistics([2.0, 2.0]), 'new': statistics([1.0])}}
+    rows = {row['benchmark']: row for row in compareResults(baseline, current, threshold=0.25)}
+    assert sorted(rows.keys()) == ['a', 'b']
+    assert not rows['a']['regression']
+    assert rows['b']['regression'] and rows['b']['median_ratio'] == pytest.approx(2.0)
+
+
+def test_run_on_fake_backend(suite):
+    results = runBenchmarks(['requests', 'run_action_1', 'move', 'template_get_action'], iterations=5, suite=suite)
+    assert set(results['benchmarks'].keys()) == {'requests', 'run_action_1', 'move', 'template_get_action'}
+    for stats in results['benchmarks'].values():
+        assert stats['samples'] >= 3 and stats['median'] > 0.0
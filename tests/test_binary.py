@@ -0,0 +1,103 @@
+"""Unit tests for the compact binary action format."""
+
+import json
+import os
+
+import numpy as np
+import pytest
+
+from pyicub.actions import ActionsManager, iCubFullbodyAction, iCubFullbodyStep
+from pyicub.binary import BinaryAction, encode, exportBinaryFile, importBinaryFile, readName
+from pyicub.controllers.position import JointPose, ICUB_NECK, ICUB_RIGHTARM_FULL
+from pyicub.repository import ActionRepository
+from pyicub.store import actionHash
+
+
+class WaveStep(iCubFullbodyStep):
+
+    def prepare(self):
+        neck = self.createLimbMotion(ICUB_NECK)
+        neck.createJointsTrajectory(JointPose(target_joints=[10.0, 0.0, 0.0]), duration=1.0)
+        neck.createJointsTrajectory(JointPose(target_joints=[-10.5, 0.25, 0.0]), duration=0.5)
+        arm = self.createLimbMotion(ICUB_RIGHTARM_FULL)
+        arm.createJointsTrajectory(JointPose(target_joints=[0.1, 30.0], joints_list=[0, 3]), duration=2.0)
+        self.createGazeMotion('absolute').addCheckpoint([0.0, 5.0, 2.0])
+        self.createCustomCall('gaze.blockEyes', (5.0,))
+
+
+class WaveAction(iCubFullbodyAction):
+
+    def prepare(self):
+        self.addStep(WaveStep(offset_ms=100))
+        self.addStep(WaveStep(), wait_for_completed=False)
+
+
+def test_lossless_round_trip(tmp_path):
+    action = WaveAction(description='wave')
+    path = str(tmp_path / 'wave.pyact')
+    action.exportBinaryFile(path)
+
+    expected = json.loads(action.toJSON())
+    assert importBinaryFile(path) == expected
+    # 0.1 is not a float32, the whole action is kept in float64
+    assert BinaryAction(path).header['dtype'] == '<f8'
+    assert readName(path) == 'WaveAction'
+    assert iCubFullbodyAction(JSON_file=path).toJSON() == action.toJSON()
+    assert len(encode(expected)) < len(action.toJSON())
+
+
+def test_mixed_int_and_float_lists(tmp_path):
+    JSON_dict = json.loads(WaveAction().toJSON())
+    neck = JSON_dict['steps'][0]['limb_motions']['NECK']['checkpoints']
+    neck[0]['pose']['target_joints'] = [10, 0.5, 0]
+    neck[1]['joints_speed'] = [10, 12.5, 20]
+    neck[1]['duration'] = 1
+    path = str(tmp_path / 'mixed.pyact')
+    exportBinaryFile(path, JSON_dict)
+
+    loaded = importBinaryFile(path)
+    loaded_neck = loaded['steps'][0]['limb_motions']['NECK']['checkpoints']
+    assert [type(v) for v in loaded_neck[0]['pose']['target_joints']] == [int, float, int]
+    assert [type(v) for v in loaded_neck[1]['joints_speed']] == [int, float, int]
+    assert [type(c['duration']) for c in loaded_neck] == [float, int]
+    assert actionHash(loaded) == actionHash(JSON_dict)
+
+
+def test_memory_mapped_arrays(tmp_path):
+    JSON_dict = json.loads(WaveAction().toJSON())
+    for step in JSON_dict['steps']:
+        step['limb_motions']['RIGHTARM_FULL']['checkpoints'][0]['pose']['target_joints'][0] = 0.5
+    path = str(tmp_path / 'wave.pyact')
+    exportBinaryFile(path, JSON_dict)
+
+    with BinaryAction(path) as action:
+        assert action.header['dtype'] == '<f4'
+        arrays = action.limbArrays(0, 'NECK')
+        assert arrays['targets'].shape == (2, 3)
+        np.testing.assert_array_equal(arrays['targets'][:, 0], [10.0, -10.5])
+        np.testing.assert_array_equal(arrays['durations'], [1.0, 0.5])
+        assert not arrays['targets'].flags.writeable
+        with pytest.raises(KeyError):
+            action.limbArrays(0, 'TORSO')
+
+    with open(str(tmp_path / 'bad.pyact'), 'wb') as f:
+        f.write(b'{"name": "bad"}')
+    with pytest.raises(ValueError):
+        BinaryAction(str(tmp_path / 'bad.pyact'))
+
+
+def test_manager_and_repository(tmp_path):
+    manager = ActionsManager()
+    manager.addAction(WaveAction(), action_id='wave')
+    target = str(tmp_path / 'binary')
+    manager.exportActions(target, binary=True)
+    assert os.listdir(target) == ['wave.pyact']
+
+    repository = ActionRepository(target, index_file=None)
+    assert list(repository.keys()) == ['WaveAction']
+    assert repository.getAction('WaveAction').toJSON() == WaveAction().toJSON()
+
+    imported = ActionsManager()
+    report = imported.importActions(target, processes=1, use_file_names=True)
+    assert not report.failed
+    assert json.loads(imported.getAction('wave').toJSON()) == json.loads(WaveAction().toJSON())
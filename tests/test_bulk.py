@@ -0,0 +1,90 @@
+"""Unit tests for the parallel bulk import and export of action repositories."""
+
+import json
+import os
+
+import pytest
+
+from pyicub.actions import ActionsManager, iCubFullbodyAction, iCubFullbodyStep
+from pyicub.bulk import exportActions, importActions
+from pyicub.controllers.limits import JointLimits
+from pyicub.controllers.position import JointPose, ICUB_NECK
+
+
+class NodStep(iCubFullbodyStep):
+
+    def __init__(self, pitch):
+        self.pitch = pitch
+        iCubFullbodyStep.__init__(self)
+
+    def prepare(self):
+        neck = self.createLimbMotion(ICUB_NECK)
+        neck.createJointsTrajectory(JointPose(target_joints=[self.pitch, 0.0, 0.0]))
+
+
+class NodAction(iCubFullbodyAction):
+
+    def __init__(self, pitch, name):
+        self.pitch = pitch
+        iCubFullbodyAction.__init__(self, name=name)
+
+    def prepare(self):
+        self.addStep(NodStep(self.pitch))
+
+
+@pytest.fixture
+def repo_path(tmp_path):
+    for i in range(10):
+        NodAction(float(5*i), 'nod%d' % i).exportJSONFile(str(tmp_path / ('nod%d.json' % i)))
+    with open(str(tmp_path / 'broken.json'), 'w') as f:
+        f.write('{"name": ')
+    return tmp_path
+
+
+def test_parallel_import(repo_path):
+    progress = []
+    limits = {'NECK': JointLimits([-40.0, -70.0, -55.0], [30.0, 60.0, 55.0])}
+    report = importActions(str(repo_path), processes=2, chunksize=3, limits=limits, progress=lambda done, total: progress.append((done, total)))
+
+    assert report.files == 11
+    assert sorted(report.items.keys()) == ['nod%d' % i for i in range(10)]
+    assert report.items['nod4'].steps[0].limb_motions['NECK'].checkpoints[0].pose.target_joints == [20.0, 0.0, 0.0]
+    assert list(report.failed.keys()) == ['broken.json']
+    assert sorted(report.invalid.keys()) == ['nod7', 'nod8', 'nod9']
+    assert progress[-1] == (11, 11)
+    assert "11 files" in report.summary()
+
+
+def test_export_round_trip(repo_path, tmp_path_factory):
+    actions = importActions(str(repo_path), processes=1).items
+    target = str(tmp_path_factory.mktemp('export'))
+    report = exportActions(actions, target, processes=2, indent=None, chunksize=4)
+    assert report.files == 10 and not report.failed
+
+    for action_id, action in actions.items():
+        with open(os.path.join(target, action_id + '.json')) as f:
+            assert json.load(f) == json.loads(action.toJSON())
+
+
+def test_actions_manager_bulk(repo_path, tmp_path_factory):
+    manager = ActionsManager()
+    report = manager.importActions(str(repo_path), processes=2, name_prefix='app')
+    assert len(report.items) == 10
+    assert manager.getAction('app.nod3').name == 'nod3'
+
+    target = str(tmp_path_factory.mktemp('export'))
+    manager.exportActions(target)
+    assert sorted(os.listdir(target)) == sorted(['app.nod%d.json' % i for i in range(10)])
+
+
+def test_export_errors(tmp_path):
+    manager = ActionsManager()
+    manager.addAction(NodAction(5.0, 'nod'), 'nod')
+    manager.addAction(NodAction(10.0, 'nod2'), 'nod2')
+    os.makedirs(str(tmp_path / 'nod.json'))
+
+    with pytest.raises(OSError):
+        manager.exportActions(str(tmp_path))
+    report = manager.exportActions(str(tmp_path), processes=2)
+    assert list(report.failed.keys()) == ['nod']
+    assert os.path.isfile(str(tmp_path / 'nod2.json'))
@@ -0,0 +1,96 @@
+"""Unit tests for the action compiler, the per-action plan cache and the plan execution."""
+
+import numpy as np
+import pytest
+
+from pyicub.actions import iCubFullbodyAction, iCubFullbodyStep
+from pyicub.controllers.position import JointPose, ICUB_NECK, ICUB_TORSO
+
+
+class NodStep(iCubFullbodyStep):
+
+    def prepare(self):
+        neck = self.createLimbMotion(ICUB_NECK)
+        neck.createJointsTrajectory(JointPose(target_joints=[10.0, 0.0, 0.0]), duration=0.2)
+        neck.createJointsTrajectory(JointPose(target_joints=[0.0, 0.0, 0.0]), duration=0.2)
+        self.createCustomCall('recorder.append', ('nod',))
+
+
+class LookStep(iCubFullbodyStep):
+
+    def prepare(self):
+        self.createGazeMotion('lookAtAbsAngles')
+        self.gaze_motion.addCheckpoint([10.0, 0.0, 5.0, True, 2.0])
+        self.createCustomCall('missing.call')
+
+
+class NodAction(iCubFullbodyAction):
+
+    def prepare(self):
+        self.addStep(NodStep())
+        self.addStep(LookStep())
+
+
+def test_compile_resolves_resources(fake_icub):
+    plan = fake_icub.compileAction(NodAction())
+
+    assert [step.name for step in plan.steps] == ['NodStep', 'LookStep']
+    limb = plan.steps[0].limbs['NECK']
+    assert limb.controller is fake_icub.getPositionController(ICUB_NECK)
+    np.testing.assert_allclose(limb.targets, [[10.0, 0.0, 0.0], [0.0, 0.0, 0.0]])
+    assert limb.nominal_duration == pytest.approx(0.4)
+    assert plan.steps[0].calls[0].target == fake_icub.recorder.append
+    assert plan.steps[1].gaze.checkpoints == [(10.0, 0.0, 5.0, True, 2.0)]
+    assert plan.warnings == ["step <LookStep>: custom call <missing.call> not resolved"]
+    assert plan.validation.valid
+    assert plan.toJSON()['steps'][0]['parts'] == {'NECK': 2}
+
+
+def test_plan_cache_is_invalidated_on_change(fake_icub):
+    action_id = fake_icub.addAction(NodAction())
+    plan = fake_icub.getActionPlan(action_id)
+    assert fake_icub.getActionPlan(action_id) is plan
+
+    fake_icub.actions_manager.touchAction(action_id)
+    assert fake_icub.getActionPlan(action_id) is not plan
+
+    fake_icub.deleteAction(action_id)
+    action = NodAction()
+    action.steps[0].limb_motions['NECK'].checkpoints[0].pose.target_joints = [5.0, 0.0, 0.0]
+    fake_icub.addAction(action, action_id=action_id)
+    np.testing.assert_allclose(fake_icub.getActionPlan(action_id).steps[0].limbs['NECK'].targets[0], [5.0, 0.0, 0.0])
+
+
+def test_play_action_runs_plan(fake_icub):
+    action_id = fake_icub.addAction(NodAction())
+    commands = fake_icub.gaze.IGazeControl.commands
+    req = fake_icub.playAction(action_id)
+
+    assert req.status == 'DONE'
+    assert fake_icub.recorder == ['nod']
+    assert [r.tag for r in req.retval] == ['/NodAction/1/NodStep/1', '/NodAction/1/LookStep/1']
+    assert fake_icub.gaze.IGazeControl.commands == commands + 1
+
+
+def test_move_steps_prefix_does_not_accumulate(fake_icub):
+    class TorsoStep(iCubFullbodyStep):
+        def prepare(self):
+            torso = self.createLimbMotion(ICUB_TORSO)
+            torso.createJointsTrajectory(JointPose(target_joints=[0.0, 0.0, 5.0]), duration=0.1)
+
+    requests = fake_icub.moveSteps([NodStep(), TorsoStep()], [True, True], '/steps')
+    assert [r.tag for r in requests] == ['/steps/NodStep/1', '/steps/TorsoStep/1']
+
+
+def test_timed_steps_skip_runtime_planning(fake_icub, monkeypatch):
+    planned = []
+    plan_step = fake_icub.planStep
+    monkeypatch.setattr(fake_icub, 'planStep', lambda step: planned.append(step.name) or plan_step(step))
+    plan = fake_icub.compileAction(NodAction())
+    assert [step.timed for step in plan.steps] == [True, True]
+
+    fake_icub.runPlan(plan)
+    assert planned == []
+    # the retiming needs the speed limits of the current motion
+    fake_icub.runPlan(plan, time_scale=1.5)
+    assert planned == ['NodStep']
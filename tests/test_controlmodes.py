@@ -0,0 +1,55 @@
+"""Unit tests for the control-mode cache of the PositionController."""
+
+import logging
+
+import pytest
+
+import pyicub.fake.yarp as fake_yarp
+import pyicub.controllers.position as position
+from pyicub.controllers.position import JointPose, ICUB_NECK, ICUB_HEAD
+
+
+@pytest.fixture
+def controllers(monkeypatch):
+    monkeypatch.setattr(position, "yarp", fake_yarp, raising=False)
+    fake_yarp.PolyDriver.reset()
+    neck = position.PositionController("icubSim", ICUB_NECK, logging.getLogger("test"))
+    neck.init()
+    head = position.PositionController("icubSim", ICUB_HEAD, logging.getLogger("test"))
+    head.init()
+    yield neck, head
+    fake_yarp.PolyDriver.reset()
+
+
+def test_cache_is_initialised_from_the_robot(controllers):
+    neck, head = controllers
+    board = neck.PolyDriver.viewIControlMode()
+    board.setControlMode(1, fake_yarp.VOCAB_CM_VELOCITY)
+    assert neck.getControlModes()[1] == fake_yarp.VOCAB_CM_POSITION
+    assert neck.getControlModes(refresh=True)[1] == fake_yarp.VOCAB_CM_VELOCITY
+
+
+def test_redundant_mode_changes_are_skipped(controllers):
+    neck, head = controllers
+    board = neck.PolyDriver.viewIControlMode()
+    assert neck.setPositionControlMode([0, 1, 2]) == 0
+    assert neck.setPositionDirectControlMode([0, 1]) == 2
+    assert board.getControlMode(0) == fake_yarp.VOCAB_CM_POSITION_DIRECT
+
+    # HEAD shares the board with NECK: it must see the change and switch joints 0 and 1 back
+    assert head.setPositionControlMode(ICUB_HEAD.joints_list) == 2
+    assert board.getControlMode(0) == fake_yarp.VOCAB_CM_POSITION
+
+    commands = board.commands
+    for target in [20.0, 0.0]:
+        assert neck.move(JointPose(target_joints=[target, 0.0, 0.0]), joints_speed=[200.0]*3)
+    sent = board.commands - commands
+
+    position.PositionController.CACHE_CONTROL_MODES = False
+    try:
+        commands = board.commands
+        for target in [20.0, 0.0]:
+            assert neck.move(JointPose(target_joints=[target, 0.0, 0.0]), joints_speed=[200.0]*3)
+        assert board.commands - commands == sent + 6
+    finally:
+        position.PositionController.CACHE_CONTROL_MODES = True
@@ -0,0 +1,103 @@
+"""Unit tests for the single-thread step dispatcher."""
+
+import logging
+
+import pytest
+
+import pyicub.fake.yarp as fake_yarp
+import pyicub.controllers.position as position
+from pyicub.actions import iCubFullbodyAction, iCubFullbodyStep
+from pyicub.compiler import PlanExecution
+from pyicub.controllers.dispatcher import StepDispatcher
+from pyicub.controllers.position import JointPose, ICUB_NECK, ICUB_EYES, ICUB_TORSO
+
+
+class NodStep(iCubFullbodyStep):
+
+    def prepare(self):
+        neck = self.createLimbMotion(ICUB_NECK)
+        neck.createJointsTrajectory(JointPose(target_joints=[15.0, 0.0, 0.0]), duration=0.2)
+        neck.createJointsTrajectory(JointPose(target_joints=[0.0, 0.0, 0.0]), duration=0.2)
+        eyes = self.createLimbMotion(ICUB_EYES)
+        eyes.createJointsTrajectory(JointPose(target_joints=[10.0, 0.0, 0.0]), duration=0.3)
+        torso = self.createLimbMotion(ICUB_TORSO)
+        torso.createJointsTrajectory(JointPose(target_joints=[0.0, 0.0, 10.0]), duration=0.3)
+        torso.createJointsTrajectory(JointPose(target_joints=[0.0, 0.0, 90.0]), duration=0.3)
+
+
+@pytest.fixture
+def controllers(monkeypatch):
+    monkeypatch.setattr(position, "yarp", fake_yarp, raising=False)
+    fake_yarp.PolyDriver.reset()
+    ctrls = {}
+    for part in [ICUB_NECK, ICUB_EYES, ICUB_TORSO]:
+        ctrls[part.name] = position.PositionController("icubSim", part, logging.getLogger("test"))
+        ctrls[part.name].init()
+    yield ctrls
+    fake_yarp.PolyDriver.reset()
+
+
+def test_dispatch_step(controllers):
+    report = StepDispatcher(controllers).dispatch(NodStep())
+
+    assert report.parts['NECK']['results'] == [True, True]
+    assert report.parts['EYES']['results'] == [True]
+    # the second torso target is out of limits: rejected without stopping the step
+    assert report.parts['TORSO']['results'] == [True, False]
+    assert not report.success
+    # the skew spans the first commands of all the parts, each one sent after the previous returned
+    sends = sorted((p['first_start'], p['first_sent']) for p in report.parts.values())
+    assert all(sent > start for start, sent in sends)
+    assert report.start_skew >= sends[-1][1] - sends[0][0]
+    assert report.start_skew < 0.05
+    assert 0.35 < report.duration < 1.0
+
+    board = controllers['NECK'].PolyDriver.viewIEncoders()
+    assert board.getEncoder(3) == pytest.approx(10.0, abs=0.05)
+
+
+class HeadStep(iCubFullbodyStep):
+
+    def prepare(self):
+        neck = self.createLimbMotion(ICUB_NECK)
+        neck.createJointsTrajectory(JointPose(target_joints=[10.0, 0.0, 0.0]), duration=0.1)
+        neck.createJointsTrajectory(JointPose(target_joints=[0.0, 0.0, 0.0]), duration=0.1)
+        eyes = self.createLimbMotion(ICUB_EYES)
+        eyes.createJointsTrajectory(JointPose(target_joints=[10.0, 0.0, 0.0]), duration=0.1)
+
+
+class HeadAction(iCubFullbodyAction):
+
+    def prepare(self):
+        self.addStep(HeadStep())
+
+
+def test_dispatch_plan(fake_icub):
+    plan = fake_icub.compileAction(HeadAction())
+    step_plan = plan.steps[0]
+    dispatcher = StepDispatcher(logger=fake_icub.logger)
+
+    execution = PlanExecution(plan, None, time_scale=2.0)
+    report = dispatcher.dispatchPlan(step_plan, tag='/blend', blend_time=0.4, execution=execution)
+    assert report.parts['NECK']['results'] == [True, True] and report.parts['EYES']['results'] == [True]
+    assert report.parts['NECK']['elapsed'][0] > 0.35 and report.parts['NECK']['elapsed'][1] < 0.3
+    assert report.parts['EYES']['elapsed'][0] > 0.35
+
+    # a preempted execution starts nothing
+    execution = PlanExecution(plan, None)
+    execution.preempt()
+    report = dispatcher.dispatchPlan(step_plan, execution=execution)
+    assert all(p['first_start'] is None and p['results'] == [] for p in report.parts.values())
+
+
+def test_single_thread_dispatch_of_plans(fake_icub, monkeypatch):
+    monkeypatch.setattr(type(fake_icub), 'SINGLE_THREAD_DISPATCH', True)
+    dispatched = []
+    dispatch_plan = StepDispatcher.dispatchPlan
+    monkeypatch.setattr(StepDispatcher, 'dispatchPlan', lambda self, *args, **kwargs: dispatched.append(kwargs) or dispatch_plan(self, *args, **kwargs))
+
+    fake_icub.addAction(HeadAction(), 'head')
+    fake_icub.playAction('head', time_scale=1.5)
+    assert len(dispatched) == 1 and dispatched[0]['execution'].time_scale == 1.5
+    board = fake_icub.getPositionController(ICUB_EYES).PolyDriver.viewIEncoders()
+    assert board.getEncoder(3) == pytest.approx(10.0, abs=0.05)
@@ -0,0 +1,93 @@
+"""Unit tests for the in-process fake YARP backend (gaze controller, bottles, ports and full iCub helper)."""
+
+import logging
+import time
+
+import pytest
+
+import pyicub.fake.yarp as fake_yarp
+from pyicub.controllers.position import JointPose, ICUB_HEAD
+
+
+@pytest.fixture
+def network():
+    fake_yarp.Network.reset()
+    fake_yarp.PolyDriver.reset()
+    yield fake_yarp.Network
+    fake_yarp.Network.reset()
+    fake_yarp.PolyDriver.reset()
+
+
+@pytest.fixture
+def fake_icub(network, fake_icub):
+    # the helper is created on the freshly reset network
+    yield fake_icub
+
+
+def test_bottle_text_round_trip():
+    btl = fake_yarp.Bottle()
+    btl.fromString('say "hello world" 3 (speed 1.5)')
+    assert btl.size() == 4
+    assert btl.get(1).asString() == "hello world"
+    assert btl.get(2).asInt32() == 3
+    assert btl.find("speed").asFloat64() == 1.5
+    assert btl.toString() == 'say "hello world" 3 (speed 1.5)'
+
+
+def test_buffered_ports_deliver_in_process(network):
+    received = []
+
+    class Callback(fake_yarp.BottleCallback):
+        def onRead(self, bottle, reader=None):
+            received.append(bottle.toString())
+
+    writer, reader, cb_reader = fake_yarp.BufferedPortBottle(), fake_yarp.BufferedPortBottle(), fake_yarp.BufferedPortBottle()
+    cb_reader.useCallback(Callback())
+    assert writer.open("/test/out") and reader.open("/test/in") and cb_reader.open("/test/cb")
+    assert network.connect("/test/out", "/test/in") and network.connect("/test/out", "/test/cb")
+    assert not network.connect("/test/out", "/missing")
+
+    writer.prepare().fromString("ping 1")
+    writer.write()
+    assert reader.read(False).toString() == "ping 1"
+    assert reader.read(False) is None
+    assert received == ["ping 1"]
+    writer.close()
+    assert not network.isConnected("/test/out", "/test/in")
+
+
+def test_rpc_requires_in_process_server(network):
+    client = fake_yarp.RpcClient()
+    client.open("/client")
+    assert not client.addOutput("/iSpeak")
+    server = fake_yarp.RpcServer()
+    server.open("/iSpeak")
+    server.setResponder(lambda cmd, reply: reply.addString("ack " + cmd.get(0).asString()))
+    assert client.addOutput("/iSpeak")
+    reply = fake_yarp.Bottle()
+    assert client.write(fake_yarp.Bottle("stat"), reply)
+    assert reply.toString() == '"ack stat"'
+
+
+def test_fake_gaze_first_order_response(network):
+    props = fake_yarp.Property()
+    props.put("device", "gazecontrollerclient")
+    props.put("remote", "/iKinGazeCtrl")
+    gaze = fake_yarp.PolyDriver(props).viewIGazeControl()
+    gaze.setNeckTrajTime(0.2)
+    target = fake_yarp.Vector(3)
+    target[0], target[1], target[2] = 10.0, -5.0, 5.0
+    gaze.lookAtAbsAngles(target)
+    assert not gaze.checkMotionDone()
+    assert gaze.waitMotionDone(0.01, 2.0)
+    angles = fake_yarp.Vector(3)
+    gaze.getAngles(angles)
+    assert abs(angles[0] - 10.0) < 0.2 and abs(angles[1] + 5.0) < 0.2
+
+
+def test_icub_runs_on_fake_backend(fake_icub):
+    assert fake_icub.gaze is not None
+    assert fake_icub.speech is None
+    head = fake_icub.getPositionController(ICUB_HEAD)
+    assert head.move(JointPose(target_joints=[20.0, 0.0, 0.0, 0.0, 0.0, 0.0]), req_time=0.5)
+    assert abs(head.getIEncoders().getEncoder(0) - 20.0) < 1.0
@@ -0,0 +1,120 @@
+# BSD 2-Clause License
+#
+# Copyright (c) 2025, Social Cognition in Human-Robot Interaction,
+#                     Istituto Italiano di Tecnologia, Genova
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Unit tests for the joint-limit cache and the vectorized pose/action validation."""
+
+import logging
+import time
+
+import numpy as np
+import pytest
+
+import pyicub.fake.yarp as fake_yarp
+import pyicub.controllers.position as position
+from pyicub.actions import iCubFullbodyAction, iCubFullbodyStep
+from pyicub.controllers.limits import ActionValidator, JointLimits
+from pyicub.controllers.position import JointPose, ICUB_NECK, ICUB_EYES
+
+
+class LookUpStep(iCubFullbodyStep):
+
+    def prepare(self):
+        neck = self.createLimbMotion(ICUB_NECK)
+        neck.createJointsTrajectory(JointPose(target_joints=[20.0, 0.0, 0.0]))
+        neck.createJointsTrajectory(JointPose(target_joints=[45.0, 0.0, -60.0]))
+        eyes = self.createLimbMotion(ICUB_EYES)
+        eyes.createJointsTrajectory(JointPose(target_joints=[0.0, 10.0, 100.0]))
+
+
+class LookUpAction(iCubFullbodyAction):
+
+    def prepare(self):
+        self.addStep(LookUpStep())
+
+
+HEAD_LIMITS = JointLimits([-40.0, -70.0, -55.0, -35.0, -50.0, 0.0], [30.0, 60.0, 55.0, 15.0, 52.0, 90.0])
+
+
+@pytest.fixture
+def neck_ctrl(monkeypatch):
+    monkeypatch.setattr(position, "yarp", fake_yarp, raising=False)
+    fake_yarp.PolyDriver.reset()
+    ctrl = position.PositionController("icubSim", ICUB_NECK, logging.getLogger("test"))
+    ctrl.init()
+    yield ctrl
+    fake_yarp.PolyDriver.reset()
+
+
+def test_joint_limits_violations_and_clamp():
+    mask = HEAD_LIMITS.violations([0, 1, 2], [[0.0, 0.0, 0.0], [31.0, -71.0, 0.0]])
+    assert mask.tolist() == [[False, False, False], [True, True, False]]
+    np.testing.assert_allclose(HEAD_LIMITS.clamp([0, 1], [31.0, -71.0]), [30.0, -70.0])
+
+
+def test_action_validator_reports_violations():
+    action = LookUpAction()
+    limits = {ICUB_NECK.name: HEAD_LIMITS, ICUB_EYES.name: HEAD_LIMITS}
+    report = ActionValidator(limits).validateAction(action)
+
+    assert not report.valid
+    assert report.checkpoints == 3
+    assert [(v['part'], v['checkpoint'], v['joint']) for v in report.violations] == [('NECK', 1, 0), ('NECK', 1, 2), ('EYES', 0, 5)]
+    assert "3 invalid joint targets" in report.summary()
+
+
+def test_action_validator_clamps():
+    action = LookUpAction()
+    limits = {ICUB_NECK.name: HEAD_LIMITS, ICUB_EYES.name: HEAD_LIMITS}
+    report = ActionValidator(limits).validateAction(action, clamp=True)
+
+    assert report.valid
+    assert report.clamped == 3
+    assert action.steps[0].limb_motions['NECK'].checkpoints[1].pose.target_joints == [30.0, 0.0, -55.0]
+    assert ActionValidator(limits).validateAction(action).valid
+
+
+def test_controller_caches_limits(neck_ctrl):
+    board = neck_ctrl.PolyDriver.viewIControlLimits()
+    commands = board.commands
+    min_limits, max_limits = neck_ctrl.getJointLimits()
+    assert board.commands == commands
+    assert min_limits[0] == -40.0 and max_limits[5] == 90.0
+
+    neck_ctrl.getJointLimits(refresh=True)
+    assert board.commands == commands + 6
+
+
+def test_controller_rejects_invalid_pose_fast(neck_ctrl):
+    t0 = time.perf_counter()
+    assert neck_ctrl.move(JointPose(target_joints=[80.0, 0.0, 0.0])) is False
+    assert time.perf_counter() - t0 < 0.5
+
+    pose = JointPose(target_joints=[80.0, 0.0, 0.0])
+    assert neck_ctrl.validatePose(pose, clamp=True) == [(0, 80.0, -40.0, 30.0)]
+    assert pose.target_joints == [30.0, 0.0, 0.0]
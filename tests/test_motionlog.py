@@ -0,0 +1,79 @@
+"""Unit tests for the lazily formatted motion events and the binary motion sink."""
+
+import logging
+
+import numpy as np
+import pytest
+
+import pyicub.fake.yarp as fake_yarp
+import pyicub.controllers.position as position
+from pyicub.controllers.position import JointPose, ICUB_NECK
+from pyicub.core.motionlog import BinaryMotionSink, MotionEvent, MotionLog
+
+
+class CountingEvent(MotionEvent):
+
+    __slots__ = ()
+    formatted = 0
+
+    def __str__(self):
+        CountingEvent.formatted += 1
+        return MotionEvent.__str__(self)
+
+
+@pytest.fixture
+def neck_ctrl(monkeypatch):
+    monkeypatch.setattr(position, "yarp", fake_yarp, raising=False)
+    fake_yarp.PolyDriver.reset()
+    ctrl = position.PositionController("icubSim", ICUB_NECK, logging.getLogger("test.motionlog"))
+    ctrl.init()
+    yield ctrl
+    fake_yarp.PolyDriver.reset()
+
+
+def test_motionlog_skips_disabled_levels(monkeypatch):
+    logger = logging.getLogger("test.motionlog.gating")
+    logger.setLevel(logging.WARNING)
+    monkeypatch.setattr("pyicub.core.motionlog.MotionEvent", CountingEvent)
+    CountingEvent.formatted = 0
+    log = MotionLog(logger)
+
+    assert log.emit(logging.INFO, MotionEvent.STARTED, 'tag', 'NECK', [0, 1], [10.0, 0.0]) is None
+    assert CountingEvent.formatted == 0
+    ev = log.emit(logging.WARNING, MotionEvent.TIMEOUT, 'tag', 'NECK', [0, 1], [10.0, 0.0])
+    assert isinstance(ev, CountingEvent)
+    assert CountingEvent.formatted >= 1
+
+
+def test_binary_sink_round_trip(tmp_path):
+    path = str(tmp_path / "motion.bin")
+    sink = BinaryMotionSink(path, buffer_size=2)
+    log = MotionLog(logging.getLogger("test.motionlog.sink"), sink)
+    logging.getLogger("test.motionlog.sink").setLevel(logging.CRITICAL)
+    for i in range(3):
+        log.emit(logging.INFO, MotionEvent.COMPLETED, 'step%d' % i, 'NECK', [0, 1, 2], [i, 1.0, 2.0], [10.0]*3, 1.0, 5.0, 0.5)
+    assert sink.records == 3
+    sink.close()
+    sink.close()
+    with pytest.raises(ValueError):
+        sink.write(MotionEvent(MotionEvent.COMPLETED, 'late', 'NECK', [0], [0.0]))
+
+    data = BinaryMotionSink.read(path)
+    assert len(data) == 3
+    assert data['tag'][2] == b'step2'
+    assert BinaryMotionSink.eventName(data['event'][0]) == MotionEvent.COMPLETED
+    np.testing.assert_allclose(data['targets'][2][:3], [2.0, 1.0, 2.0])
+    assert np.isnan(data['targets'][2][3])
+
+
+def test_controller_records_motion_events(neck_ctrl, tmp_path):
+    sink = BinaryMotionSink(str(tmp_path / "neck.bin"))
+    neck_ctrl.setMotionSink(sink)
+    assert neck_ctrl.move(JointPose(target_joints=[5.0, 0.0, 0.0]), joints_speed=[50.0]*3, tag='nod')
+    assert neck_ctrl.move(JointPose(target_joints=[80.0, 0.0, 0.0])) is False
+    sink.close()
+
+    data = BinaryMotionSink.read(sink.path)
+    events = [BinaryMotionSink.eventName(e) for e in data['event']]
+    assert events == [MotionEvent.STARTED, MotionEvent.COMPLETED, MotionEvent.REJECTED]
+    assert data['tag'][0] == b'nod'
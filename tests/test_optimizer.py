@@ -0,0 +1,135 @@
+"""Unit tests for the checkpoint reduction, resampling and re-timing pass."""
+
+import numpy as np
+import pytest
+
+from pyicub.actions import ActionsManager, iCubFullbodyAction, iCubFullbodyStep
+from pyicub.controllers.optimizer import ActionOptimizer, StepMerger
+from pyicub.controllers.position import JointPose, ICUB_HEAD, ICUB_NECK, ICUB_TORSO, ICUB_LEFTARM_FULL
+
+
+class DenseStep(iCubFullbodyStep):
+
+    def prepare(self):
+        neck = self.createLimbMotion(ICUB_NECK)
+        for q in np.linspace(0.0, 30.0, 31):
+            neck.createJointsTrajectory(JointPose(target_joints=[q, 0.0, 0.0]), duration=0.1)
+        for q in np.linspace(0.0, 30.0, 31)[1:]:
+            neck.createJointsTrajectory(JointPose(target_joints=[30.0, q, 0.0]), duration=0.1)
+
+
+class DenseAction(iCubFullbodyAction):
+
+    def prepare(self):
+        self.addStep(DenseStep())
+
+
+def test_simplification_keeps_corners_and_timing():
+    action = DenseAction()
+    report = ActionOptimizer(tolerance=0.1).optimizeAction(action)
+    checkpoints = action.steps[0].limb_motions['NECK'].checkpoints
+
+    assert report.checkpoints_before == 61
+    assert report.checkpoints_after == 3
+    assert [c.pose.target_joints for c in checkpoints] == [[0.0, 0.0, 0.0], [30.0, 0.0, 0.0], [30.0, 30.0, 0.0]]
+    assert [round(c.duration, 6) for c in checkpoints] == [0.1, 3.0, 3.0]
+    assert report.duration_after < report.duration_before
+
+
+def test_retiming_respects_speed_limits():
+    action = DenseAction()
+    ActionOptimizer(tolerance=0.1, time_scale=0.01).optimizeAction(action)
+    checkpoints = action.steps[0].limb_motions['NECK'].checkpoints
+    max_speed = ICUB_NECK.joints_speed[0]
+    assert checkpoints[1].duration == pytest.approx(30.0/max_speed)
+
+
+def test_actions_manager_resample():
+    mgr = ActionsManager()
+    action_id = mgr.addAction(DenseAction())
+    report = mgr.optimizeAction(action_id, tolerance=0.0, resample_period=0.5)
+    checkpoints = mgr.getAction(action_id).steps[0].limb_motions['NECK'].checkpoints
+    assert report.checkpoints_after == 13
+    assert checkpoints[1].pose.target_joints[0] == pytest.approx(5.0)
+    assert "61 -> 13" in report.summary()
+
+
+class PartStep(iCubFullbodyStep):
+
+    def __init__(self, part, target, offset_ms=None, gaze=False, call=False):
+        self.part = part
+        self.target = target
+        self.gaze = gaze
+        self.call = call
+        iCubFullbodyStep.__init__(self, offset_ms=offset_ms)
+
+    def prepare(self):
+        if self.part is not None:
+            self.createLimbMotion(self.part).createJointsTrajectory(JointPose(target_joints=self.target), duration=1.0)
+        if self.gaze:
+            self.createGazeMotion('lookAtAbsAngles').addCheckpoint([0.0, 10.0, 0.0])
+        if self.call:
+            self.createCustomCall('speech.say', ('hello',))
+
+
+class DisjointAction(iCubFullbodyAction):
+
+    MERGE_STEPS = True
+
+    def prepare(self):
+        self.addStep(PartStep(ICUB_TORSO, [0.0, 0.0, 10.0]))
+        self.addStep(PartStep(ICUB_LEFTARM_FULL, [-30.0]*16))
+        # the neck and the gaze share the head
+        self.addStep(PartStep(ICUB_NECK, [10.0, 0.0, 0.0]))
+        self.addStep(PartStep(None, None, gaze=True))
+        # the speech is an ordering point
+        self.addStep(PartStep(ICUB_TORSO, [0.0, 0.0, 0.0], call=True))
+        self.addStep(PartStep(ICUB_LEFTARM_FULL, [0.0]*16, offset_ms=200))
+
+
+def test_merge_disjoint_steps():
+    action = DisjointAction()
+    report = StepMerger().mergeAction(action)
+
+    assert report.groups == [['PartStep', 'PartStep', 'PartStep']]
+    assert report.steps_before == 6 and report.steps_after == 4
+    assert sorted(action.steps[0].limb_motions.keys()) == ['LEFTARM_FULL', 'NECK', 'TORSO']
+    assert action.steps[0].name == 'PartStep+PartStep+PartStep'
+    assert report.saving == pytest.approx(2.0)
+    assert report.duration_after == pytest.approx(report.duration_before - 2.0)
+
+
+class LongHeadStep(iCubFullbodyStep):
+
+    def prepare(self):
+        self.createLimbMotion(ICUB_HEAD).createJointsTrajectory(JointPose(target_joints=[10.0, 0.0, 0.0, 0.0, 0.0, 0.0]), duration=3.0)
+
+
+class OverlappingAction(iCubFullbodyAction):
+
+    def prepare(self):
+        self.addStep(PartStep(ICUB_LEFTARM_FULL, [-30.0]*16), wait_for_completed=False)
+        self.addStep(LongHeadStep())
+        self.addStep(PartStep(ICUB_LEFTARM_FULL, [0.0]*16))
+        self.addStep(PartStep(ICUB_TORSO, [0.0, 0.0, 10.0]))
+
+
+def test_merge_skips_parts_still_moving():
+    action = OverlappingAction()
+    report = StepMerger().mergeAction(action)
+    # the left arm of the first step may still be moving: the second left arm step is not merged with the head
+    # one, but the torso step joins it once it has been waited for
+    assert report.groups == [['PartStep', 'PartStep']]
+    assert [sorted(step.limb_motions.keys()) for step in action.steps] == [['LEFTARM_FULL'], ['HEAD'], ['LEFTARM_FULL', 'TORSO']]
+    assert report.saving == pytest.approx(1.0)
+
+
+def test_merge_opt_in():
+    manager = ActionsManager()
+    manager.addAction(DisjointAction(), action_id='merged')
+    assert len(manager.getAction('merged').steps) == 4
+    manager.addAction(DenseAction(), action_id='dense')
+    assert manager.mergeSteps('dense').groups == []
+    # the gaze joins the speech step, the offset still separates the last step
+    report = StepMerger(merge_calls=True).mergeAction(DisjointAction())
+    assert report.steps_after == 3
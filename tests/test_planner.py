@@ -0,0 +1,83 @@
+# BSD 2-Clause License
+#
+# Copyright (c) 2025, Social Cognition in Human-Robot Interaction,
+#                     Istituto Italiano di Tecnologia, Genova
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Unit tests for the time-synchronized speed profile planner."""
+
+import numpy as np
+import pytest
+
+from pyicub.actions import iCubFullbodyStep
+from pyicub.controllers.planner import SpeedProfilePlanner
+from pyicub.controllers.position import JointPose, ICUB_NECK, ICUB_TORSO
+
+
+class NeckTorsoStep(iCubFullbodyStep):
+
+    def prepare(self):
+        neck = self.createLimbMotion(ICUB_NECK)
+        neck.createJointsTrajectory(JointPose(target_joints=[20.0, 0.0, 10.0]))
+        torso = self.createLimbMotion(ICUB_TORSO)
+        torso.createJointsTrajectory(JointPose(target_joints=[0.0, 0.0, 10.0]))
+        torso.createJointsTrajectory(JointPose(target_joints=[0.0, 0.0, 0.0]))
+
+
+def test_plan_synchronizes_joints():
+    planner = SpeedProfilePlanner()
+    profile = planner.plan(start=[0.0, 0.0, 0.0], target=[20.0, 5.0, 0.0], max_speeds=[10.0, 10.0, 10.0])
+
+    assert profile.duration == pytest.approx(2.0)
+    np.testing.assert_allclose(profile.speeds, [10.0, 2.5, 0.0])
+    assert profile.moving.tolist() == [True, True, False]
+
+
+def test_plan_respects_speed_scaling_and_legacy_mode():
+    planner = SpeedProfilePlanner(speed_scaling=0.5, synchronize=False)
+    profile = planner.plan(start=[0.0, 0.0], target=[20.0, -5.0], max_speeds=[10.0, 20.0])
+
+    assert profile.duration == pytest.approx(4.0)
+    np.testing.assert_allclose(profile.speeds, [5.0, 10.0])
+
+
+def test_plan_with_requested_time():
+    planner = SpeedProfilePlanner()
+    profile = planner.plan(start=[10.0, 0.0], target=[0.0, 4.0], max_speeds=[1.0, 1.0], req_time=2.0)
+
+    assert profile.duration == 2.0
+    np.testing.assert_allclose(profile.speeds, [5.0, 2.0])
+
+
+def test_plan_step_completes_limbs_together():
+    step = NeckTorsoStep()
+    encoders = {ICUB_NECK.name: np.zeros(6), ICUB_TORSO.name: np.zeros(3)}
+    step_profile = SpeedProfilePlanner().planStep(step, encoders)
+
+    # neck: 20 deg at 10 deg/s -> 2.0 s, torso: 2 x 10 deg at 20 deg/s -> 1.0 s
+    assert step_profile.duration == pytest.approx(2.0)
+    assert step_profile.limbDuration(ICUB_TORSO.name) == pytest.approx(2.0)
+    np.testing.assert_allclose(step_profile.durations[ICUB_TORSO.name], [1.0, 1.0])
@@ -0,0 +1,75 @@
+"""Unit tests for the preemption of running actions and the blending into a new action."""
+
+import time
+
+import numpy as np
+import pytest
+
+from pyicub.actions import iCubFullbodyAction, iCubFullbodyStep
+from pyicub.controllers.position import JointPose, ICUB_NECK, ICUB_TORSO
+
+
+class SlowNodStep(iCubFullbodyStep):
+
+    def prepare(self):
+        neck = self.createLimbMotion(ICUB_NECK)
+        neck.createJointsTrajectory(JointPose(target_joints=[20.0, 0.0, 0.0]), duration=1.0)
+        neck.createJointsTrajectory(JointPose(target_joints=[-20.0, 0.0, 0.0]), duration=1.0)
+        torso = self.createLimbMotion(ICUB_TORSO)
+        torso.createJointsTrajectory(JointPose(target_joints=[0.0, 0.0, 20.0]), duration=2.0)
+
+
+class DoneStep(iCubFullbodyStep):
+
+    def prepare(self):
+        self.createCustomCall('recorder.append', ('done',))
+
+
+class SlowAction(iCubFullbodyAction):
+
+    def prepare(self):
+        self.addStep(SlowNodStep())
+        self.addStep(DoneStep())
+
+
+class LookDownStep(iCubFullbodyStep):
+
+    def prepare(self):
+        neck = self.createLimbMotion(ICUB_NECK)
+        neck.createJointsTrajectory(JointPose(target_joints=[-10.0, 0.0, 0.0]), duration=0.2)
+
+
+class LookDownAction(iCubFullbodyAction):
+
+    def prepare(self):
+        self.addStep(LookDownStep())
+
+
+def test_blend_preempts_running_action(fake_icub):
+    fake_icub.addAction(SlowAction())
+    fake_icub.addAction(LookDownAction())
+    slow = fake_icub.playAction('SlowAction', wait_for_completed=False)
+    time.sleep(0.3)
+    assert len(fake_icub.executions) == 1
+    old = fake_icub.executions[0]
+
+    fake_icub.blendAction('LookDownAction', blend_time=0.3, wait_for_completed=True)
+    slow.wait_for_completed()
+
+    assert old.preempted and old.done
+    assert fake_icub.recorder == []
+    assert fake_icub.executions == []
+    neck = fake_icub.getPositionController(ICUB_NECK).getEncodersArray()
+    torso = fake_icub.getPositionController(ICUB_TORSO).getEncodersArray()
+    np.testing.assert_allclose(neck[0], -10.0, atol=1.0)
+    assert 0.0 < torso[2] < 15.0
+
+    info = fake_icub.switch_stats.info()
+    assert info['switches'] == 1 and info['preempted'] == 1
+    assert info['latency_max_ms'] < 50.0
+
+
+def test_preempt_without_running_actions(fake_icub):
+    assert fake_icub.preemptActions() == []
+    fake_icub.runAction(LookDownAction())
+    assert fake_icub.preemptActions() == []
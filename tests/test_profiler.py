@@ -0,0 +1,73 @@
+"""Unit tests for the motion timing profiler and its adaptive timeouts."""
+
+import logging
+
+import numpy as np
+import pytest
+
+import pyicub.fake.yarp as fake_yarp
+import pyicub.controllers.position as position
+from pyicub.controllers.planner import JointsSpeedProfile
+from pyicub.controllers.position import JointPose, ICUB_NECK
+from pyicub.controllers.profiler import MotionProfiler
+
+
+def make_profile(disp, speed=10.0):
+    disp = np.asarray(disp, dtype=float)
+    speeds = np.full(len(disp), speed)
+    return JointsSpeedProfile([0, 1, 2], disp, speeds, float(disp.max()/speed))
+
+
+@pytest.fixture
+def neck_ctrl(monkeypatch):
+    monkeypatch.setattr(position, "yarp", fake_yarp, raising=False)
+    fake_yarp.PolyDriver.reset()
+    ctrl = position.PositionController("icubSim", ICUB_NECK, logging.getLogger("test"))
+    ctrl.init()
+    yield ctrl
+    fake_yarp.PolyDriver.reset()
+
+
+def test_profiler_learns_joint_model():
+    profiler = MotionProfiler()
+    assert profiler.timeout('NECK', make_profile([10.0, 0.0, 0.0]), 30.0) is None
+
+    for d in [5.0, 10.0, 20.0, 30.0, 40.0, 50.0]:
+        profile = make_profile([d, 1.0, 0.0])
+        profiler.record('NECK', profile, 0.2 + 1.5*profile.duration)
+
+    model = profiler.model('NECK')
+    assert model.joint_models[0].gain == pytest.approx(1.5, abs=1e-3)
+    assert model.joint_models[0].offset == pytest.approx(0.2, abs=1e-3)
+
+    profile = make_profile([25.0, 0.0, 0.0])
+    assert profiler.predict('NECK', profile) == pytest.approx(0.2 + 1.5*2.5, abs=1e-3)
+    timeout = profiler.timeout('NECK', profile, 30.0)
+    assert 4.0 < timeout < 5.0
+
+
+def test_profiler_ignores_timeouts_and_round_trips(tmp_path):
+    profiler = MotionProfiler(capacity=8)
+    for i in range(10):
+        profiler.record('NECK', make_profile([10.0, 0.0, 0.0]), 1.0, completed=(i % 5 != 0))
+    report = profiler.report()['NECK']
+    assert report['motions'] == 8
+    assert report['timeouts'] == 1
+
+    path = str(tmp_path / "profile.npz")
+    profiler.save(path)
+    loaded = MotionProfiler().load(path)
+    assert len(loaded.samples('NECK')) == 8
+    assert loaded.predict('NECK', make_profile([10.0, 0.0, 0.0])) == pytest.approx(1.0, abs=1e-3)
+
+
+def test_controller_feeds_profiler(neck_ctrl):
+    profiler = MotionProfiler()
+    neck_ctrl.setProfiler(profiler)
+    for target in [10.0, -10.0, 20.0, 0.0, 15.0]:
+        assert neck_ctrl.move(JointPose(target_joints=[target, 0.0, 0.0]), joints_speed=[100.0]*3)
+    assert len(profiler.samples('NECK')) == 5
+
+    profile = make_profile([10.0, 0.0, 0.0], speed=100.0)
+    assert neck_ctrl.motionTimeout(profile.duration, 30.0, profile) < 30.0
+    assert neck_ctrl.predictMotionTime(profile) > 0.0
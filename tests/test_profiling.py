@@ -0,0 +1,44 @@
+"""Unit tests for the sampling and deterministic profiling sessions."""
+
+import json
+import logging
+import time
+
+from pyicub.core.profiling import ProfilingSession
+from pyicub.requests import iCubRequest, iCubRequestsManager
+
+
+def busy_loop(duration):
+    t0 = time.perf_counter()
+    n = 0
+    while time.perf_counter() - t0 < duration:
+        n += len(json.dumps({'n': n}))
+    return n
+
+
+def test_sampling_attributes_cpu_to_request_tags():
+    manager = iCubRequestsManager(logging.getLogger("test.profiling"))
+    session = ProfilingSession(ProfilingSession.SAMPLING, duration=0.3, interval=0.002, thread_tags=iCubRequest.THREAD_TAGS)
+    session.start()
+    req = manager.create(timeout=5.0, target=busy_loop, name='/busy')
+    manager.run_request(req, True, 0.25)
+    assert session.wait(2.0)
+
+    report = session.report()
+    assert not report['active'] and report['samples'] > 10
+    assert req.tag in report['cpu_by_tag'].keys()
+    assert sum(report['cpu_by_tag'][req.tag].values()) > 0.05
+    assert set(report['cpu_by_tag'][req.tag].keys()) <= {'json', 'application', 'request_manager', 'python'}
+    assert 'busy_loop' in session.collapsed()
+
+
+def test_deterministic_profiles_next_requests_of_target():
+    session = ProfilingSession(ProfilingSession.DETERMINISTIC, requests=2, target='busy')
+    session.start()
+    assert session.wrap('other', busy_loop) is busy_loop
+    for _ in range(3):
+        session.wrap('busy', busy_loop)(0.01)
+    assert not session.active
+    assert session.profiled_requests == 2
+    assert 'busy_loop' in session.pstats()
+    assert session.wrap('busy', busy_loop) is busy_loop
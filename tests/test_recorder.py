@@ -0,0 +1,75 @@
+"""Unit tests for the kinesthetic recorder, the recording formats and the checkpoint reduction."""
+
+import logging
+import time
+
+import numpy as np
+import pytest
+
+import pyicub.fake.yarp as fake_yarp
+import pyicub.controllers.position as position
+from pyicub.controllers.position import JointPose, ICUB_NECK
+from pyicub.controllers.recorder import EncodersRingBuffer, KinestheticRecorder, Recording
+from pyicub.controllers.trajectory import douglasPeucker
+
+
+@pytest.fixture
+def neck_ctrl(monkeypatch):
+    monkeypatch.setattr(position, "yarp", fake_yarp, raising=False)
+    fake_yarp.PolyDriver.reset()
+    ctrl = position.PositionController("icubSim", ICUB_NECK, logging.getLogger("test"))
+    ctrl.init()
+    yield ctrl
+    fake_yarp.PolyDriver.reset()
+
+
+def test_douglas_peucker_keeps_corners():
+    times = np.linspace(0.0, 2.0, 201)
+    positions = np.stack([np.minimum(times, 1.0)*10.0, np.zeros_like(times)], axis=1)
+    positions[:, 1] += 0.01*np.sin(50*times)
+    keep = douglasPeucker(times, positions, tolerance=0.1)
+    assert keep.tolist() == [0, 100, 200]
+
+
+def test_ring_buffer_keeps_last_samples():
+    buf = EncodersRingBuffer(4, 2)
+    for i in range(6):
+        buf.append(float(i), [i, -i])
+    times, positions = buf.arrays()
+    assert times.tolist() == [2.0, 3.0, 4.0, 5.0]
+    assert positions[:, 1].tolist() == [-2.0, -3.0, -4.0, -5.0]
+
+
+def test_record_chunks_and_convert(neck_ctrl, tmp_path):
+    path = str(tmp_path / "demo")
+    recorder = KinestheticRecorder([neck_ctrl], period=0.005, path=path, chunk_size=20)
+    recorder.start()
+    neck_ctrl.move(JointPose(target_joints=[20.0, 0.0, 0.0]), joints_speed=[50.0]*3, waitMotionDone=False)
+    time.sleep(0.6)
+    recording = recorder.stop()
+
+    rec = recording.parts['NECK']
+    assert len(rec.times) > 40
+    assert rec.positions[-1, 0] == pytest.approx(20.0, abs=0.1)
+
+    recording.save(str(tmp_path / "demo.npz"))
+    loaded = Recording.load(str(tmp_path / "demo.npz"))
+    np.testing.assert_allclose(loaded.parts['NECK'].positions, rec.positions)
+
+    recording.saveArrays(str(tmp_path / "arrays"))
+    mapped = Recording.load(str(tmp_path / "arrays"), mmap_mode='r')
+    assert isinstance(mapped.parts['NECK'].positions, np.memmap)
+
+    action = recording.toAction('demo', tolerance=0.5)
+    checkpoints = action.steps[0].limb_motions['NECK'].checkpoints
+    assert 1 <= len(checkpoints) < 10
+    assert checkpoints[-1].pose.target_joints[0] == pytest.approx(20.0, abs=0.1)
+    assert sum(c.duration for c in checkpoints) == pytest.approx(rec.duration)
+
+
+def test_lateness_history_is_bounded(neck_ctrl):
+    recorder = KinestheticRecorder([neck_ctrl], period=0.002, capacity=10)
+    recorder.start()
+    time.sleep(0.1)
+    recorder.stop()
+    assert 0 < recorder.lateness.size <= 10
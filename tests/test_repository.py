@@ -0,0 +1,176 @@
+"""Unit tests for the lazy, indexed action repository."""
+
+import json
+import os
+
+import pytest
+
+from pyicub.actions import ActionsManager, iCubFullbodyAction, iCubFullbodyStep
+from pyicub.controllers.limits import ActionValidator, JointLimits
+from pyicub.controllers.position import JointPose, ICUB_NECK
+from pyicub.repository import ActionRepository, readJSONName
+
+
+class NodStep(iCubFullbodyStep):
+
+    def prepare(self):
+        neck = self.createLimbMotion(ICUB_NECK)
+        neck.createJointsTrajectory(JointPose(target_joints=[10.0, 0.0, 0.0]))
+
+
+class NodAction(iCubFullbodyAction):
+
+    def prepare(self):
+        self.addStep(NodStep())
+
+
+@pytest.fixture
+def repo_path(tmp_path):
+    for i in range(5):
+        NodAction(name='nod%d' % i).exportJSONFile(str(tmp_path / ('nod%d.json' % i)))
+    return tmp_path
+
+
+def test_index_is_built_without_parsing(repo_path, cache_dir):
+    repository = ActionRepository(str(repo_path), name_prefix='app')
+    assert sorted(repository.keys()) == ['app.nod%d' % i for i in range(5)]
+    assert repository.info()['cached'] == 0
+    assert os.path.dirname(repository.indexPath()) == str(cache_dir / 'pyicub')
+    assert os.path.exists(repository.indexPath())
+    assert not any(f.startswith('.') for f in os.listdir(str(repo_path)))
+    assert ActionRepository(str(repo_path)).indexPath() != repository.indexPath()
+    assert ActionRepository(str(repo_path), index_file=ActionRepository.INDEX_FILE).indexPath() == str(repo_path / ActionRepository.INDEX_FILE)
+
+    action = repository.getAction('app.nod3')
+    assert action.name == 'nod3'
+    assert repository.getAction('app.nod3') is action
+    info = repository.info()
+    assert info['misses'] == 1 and info['hits'] == 1
+
+    # the next startup only stats the files
+    def fail(*args):
+        raise AssertionError('file read')
+    reloaded = ActionRepository.__new__(ActionRepository)
+    reloaded._readEntry_ = fail
+    reloaded.saveIndex = fail
+    ActionRepository.__init__(reloaded, str(repo_path), name_prefix='app')
+    assert len(reloaded) == 5
+    assert reloaded.rescan() == {'added': [], 'changed': [], 'removed': [], 'duplicates': {}}
+    assert all(reloaded.getVersion(action_id) is not None for action_id in reloaded.keys())
+    assert reloaded.getAction('app.nod3').name == 'nod3'
+
+    # the files removed or changed while the repository was not running
+    os.remove(str(repo_path / 'nod4.json'))
+    NodAction(name='nod1', description='changed').exportJSONFile(str(repo_path / 'nod1.json'))
+    os.utime(str(repo_path / 'nod1.json'), (1, 1))
+    reloaded = ActionRepository(str(repo_path), name_prefix='app')
+    assert reloaded.getAction('app.nod1').description == 'changed'
+    assert not 'app.nod4' in reloaded
+
+
+def test_lru_memory_budget(repo_path):
+    size = os.path.getsize(str(repo_path / 'nod0.json'))
+    repository = ActionRepository(str(repo_path), memory_budget=2*size*ActionRepository.PARSED_SIZE_FACTOR, index_file=None)
+    for i in range(4):
+        repository.getAction('nod%d' % i)
+    info = repository.info()
+    assert info['cached'] == 2 and info['evictions'] == 2
+    assert info['cache_bytes'] <= info['memory_budget']
+
+
+def test_rescan_reloads_changed_files(repo_path):
+    manager = ActionsManager()
+    repository = manager.addRepository(ActionRepository(str(repo_path)))
+    assert 'nod1' in manager.getActions()
+    version = manager.getActionVersion('nod1')
+    old = manager.getAction('nod1')
+
+    path = str(repo_path / 'nod1.json')
+    data = json.load(open(path))
+    os.utime(path, (0, 0))
+    assert repository.rescan() == {'added': [], 'changed': [], 'removed': [], 'duplicates': {}}
+    assert manager.getAction('nod1') is old
+
+    data['description'] = 'changed'
+    with open(path, 'w') as f:
+        json.dump(data, f)
+    os.remove(str(repo_path / 'nod4.json'))
+    NodAction(name='nod5').exportJSONFile(str(repo_path / 'nod5.json'))
+    assert manager.rescanRepositories()[str(repo_path)] == {'added': ['nod5'], 'changed': ['nod1'], 'removed': ['nod4'], 'duplicates': {}}
+    assert manager.getActionVersion('nod1') != version
+    assert manager.getAction('nod1').description == 'changed'
+    assert not 'nod4' in manager.getActions()
+
+    manager.deleteAction('nod2')
+    assert not 'nod2' in manager.getActions()
+
+
+def test_names_and_duplicates(repo_path):
+    JSON_dict = json.loads(NodAction(name='n\u00f6d "quoted"').toJSON())
+    for indent in (4, 2, '\t', None):
+        data = json.dumps(JSON_dict, indent=indent, ensure_ascii=False).encode('utf-8')
+        assert readJSONName(data) == 'n\u00f6d "quoted"'
+    # the step names are not at the indentation of the top-level keys
+    assert readJSONName(json.dumps({'steps': [{'name': 'step'}], 'name': 'action'}, indent=4).encode()) == 'action'
+
+    NodAction(name='nod1').exportJSONFile(str(repo_path / 'copy_of_nod1.json'))
+    repository = ActionRepository(str(repo_path), index_file=None)
+    assert repository.getEntry('nod1').file == 'copy_of_nod1.json'
+    os.remove(str(repo_path / 'copy_of_nod1.json'))
+    res = repository.rescan()
+    assert res['changed'] == ['nod1'] and res['removed'] == []
+    assert repository.getEntry('nod1').file == 'nod1.json'
+
+    NodAction(name='nod2').exportJSONFile(str(repo_path / 'nod2_copy.json'))
+    assert repository.rescan()['duplicates'] == {'nod2': ['nod2.json', 'nod2_copy.json']}
+    assert repository.getEntry('nod2').file == 'nod2.json' and len(repository) == 5
+
+
+def test_actions_are_validated_on_first_load(repo_path):
+    validated = []
+    validator = ActionValidator({'NECK': JointLimits([-40.0, -70.0, -55.0], [30.0, 60.0, 55.0])})
+
+    def validate(action):
+        validated.append(action.name)
+        return validator.validateAction(action)
+
+    data = json.loads(NodAction(name='far').toJSON())
+    data['steps'][0]['limb_motions']['NECK']['checkpoints'][0]['pose']['target_joints'][0] = 50.0
+    with open(str(repo_path / 'far.json'), 'w') as f:
+        json.dump(data, f, indent=4)
+
+    size = os.path.getsize(str(repo_path / 'nod0.json'))
+    repository = ActionRepository(str(repo_path), memory_budget=size*ActionRepository.PARSED_SIZE_FACTOR, index_file=None, validator=validate)
+    repository.getAction('nod0')
+    repository.getAction('nod1')
+    repository.getAction('nod0')
+    assert validated == ['nod0', 'nod1']
+    assert repository.info()['evictions'] == 2
+    with pytest.raises(Exception, match='NECK'):
+        repository.getAction('far')
+    assert validated[-1] == 'far' and repository.info()['cached'] == 1
+
+
+def test_modified_actions_are_pinned_until_their_file_changes(repo_path):
+    size = os.path.getsize(str(repo_path / 'nod0.json'))
+    manager = ActionsManager()
+    repository = manager.addRepository(ActionRepository(str(repo_path), memory_budget=size*ActionRepository.PARSED_SIZE_FACTOR, index_file=None))
+    version = manager.getActionVersion('nod0')
+
+    action = manager.getAction('nod0')
+    action.steps[0].limb_motions['NECK'].checkpoints[0].pose.target_joints[0] = 20.0
+    manager.touchAction('nod0', action)
+    edited_version = manager.getActionVersion('nod0')
+    assert edited_version != version
+    for i in range(1, 5):
+        manager.getAction('nod%d' % i)
+    assert manager.getAction('nod0') is action
+    assert json.loads(action.toJSON())['steps'][0]['limb_motions']['NECK']['checkpoints'][0]['pose']['target_joints'][0] == 20.0
+    assert repository.info()['pinned'] == 1 and repository.info()['cached'] == 1
+
+    # the repository version of a changed file replaces the edited action
+    NodAction(name='nod0', description='changed').exportJSONFile(str(repo_path / 'nod0.json'))
+    assert repository.rescan()['changed'] == ['nod0']
+    assert not manager.getActionVersion('nod0') in (version, edited_version)
+    assert manager.getAction('nod0').description == 'changed'
+    assert repository.info()['pinned'] == 0
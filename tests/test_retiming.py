@@ -0,0 +1,68 @@
+"""Unit tests for the per-invocation retiming of the actions."""
+
+import time
+
+import pytest
+
+from pyicub.actions import iCubFullbodyAction, iCubFullbodyStep
+from pyicub.analyzer import ActionAnalyzer
+from pyicub.controllers.position import JointPose, PositionController, ICUB_NECK, ICUB_TORSO
+
+
+class NodStep(iCubFullbodyStep):
+
+    def prepare(self):
+        neck = self.createLimbMotion(ICUB_NECK)
+        neck.createJointsTrajectory(JointPose(target_joints=[5.0, 0.0, 0.0]), duration=0.2)
+        neck.createJointsTrajectory(JointPose(target_joints=[0.0, 0.0, 0.0]), duration=0.2)
+
+
+class TwistStep(iCubFullbodyStep):
+
+    def prepare(self):
+        torso = self.createLimbMotion(ICUB_TORSO)
+        torso.createJointsTrajectory(JointPose(target_joints=[0.0, 0.0, 5.0]), duration=0.2)
+        torso.createJointsTrajectory(JointPose(target_joints=[0.0, 0.0, 0.0]), duration=0.2)
+
+
+class NodAction(iCubFullbodyAction):
+
+    def prepare(self):
+        self.addStep(NodStep())
+        self.addStep(TwistStep(offset_ms=100))
+
+
+class FastAction(iCubFullbodyAction):
+
+    def prepare(self):
+        step = NodStep()
+        # far beyond the maximum speed of the first neck joint
+        step.limb_motions['NECK'].checkpoints[0].pose.target_joints = [40.0, 0.0, 0.0]
+        self.addStep(step)
+
+
+def test_fit_time_scale():
+    analyzer = ActionAnalyzer()
+    retiming = analyzer.fitTimeScale(NodAction(), 1.8)
+    assert retiming.nominal == pytest.approx(0.9)
+    assert retiming.time_scale == pytest.approx(2.0, abs=0.01) and retiming.reachable
+    assert analyzer.analyze(NodAction(), time_scale=retiming.time_scale).duration == pytest.approx(1.8, abs=1e-3)
+
+    # the joints maximum speeds bound the speed up
+    retiming = analyzer.fitTimeScale(FastAction(), 0.1)
+    assert not retiming.reachable
+    assert retiming.duration == pytest.approx(retiming.nominal)
+
+
+def test_play_action_with_duration(fake_icub):
+    fake_icub.addAction(NodAction())
+    speed_scaling = PositionController.SPEED_SCALING
+    t0 = time.perf_counter()
+    fake_icub.playAction('NodAction', duration=1.8)
+    elapsed = time.perf_counter() - t0
+    assert elapsed == pytest.approx(1.8, abs=0.3)
+    assert PositionController.SPEED_SCALING == speed_scaling
+
+    t0 = time.perf_counter()
+    fake_icub.playAction('NodAction')
+    assert time.perf_counter() - t0 == pytest.approx(0.9, abs=0.3)
@@ -0,0 +1,120 @@
+"""Unit tests for the dict and cached JSON forms of the actions."""
+
+import json
+import pickle
+
+from pyicub.actions import ActionsManager, TRANSIENT_ATTRIBUTES, iCubActionTemplate, iCubFullbodyAction, iCubFullbodyStep, toJSONDict
+from pyicub.controllers.optimizer import ActionOptimizer
+from pyicub.controllers.position import JointPose, ICUB_NECK
+from pyicub.store import actionHash, canonicalJSON
+
+
+class NodStep(iCubFullbodyStep):
+
+    def prepare(self):
+        neck = self.createLimbMotion(ICUB_NECK)
+        for pitch in (5.0, 10.0, 15.0):
+            neck.createJointsTrajectory(JointPose(target_joints=[pitch, 0.0, 0.0]), duration=0.5)
+        self.createCustomCall('speech.say', ('ciao', 1))
+        gaze = self.createGazeMotion('lookAtAbsAngles')
+        gaze.addCheckpoint([0.0, 15.0, 0.0])
+
+
+class NodAction(iCubFullbodyAction):
+
+    def prepare(self):
+        self.addStep(NodStep(offset_ms=100))
+
+
+class NodTemplate(iCubActionTemplate):
+
+    def prepare_params(self):
+        self.createParam('pitch')
+
+    def prepare(self):
+        self.addStep(NodStep())
+
+
+def legacyJSON(obj, **kwargs):
+    # the JSON text as built before the serialization cache, without the caches and revisions
+    transient = lambda o: {k: v for k, v in o.__dict__.items() if not k in TRANSIENT_ATTRIBUTES}
+    return json.dumps(transient(obj), default=transient, ensure_ascii=False, **kwargs)
+
+
+def test_dict_form_matches_the_json_text():
+    action = NodAction()
+    JSON_dict = action.toJSONDict()
+    assert JSON_dict == json.loads(legacyJSON(action))
+    assert action.toJSON() == legacyJSON(action, indent=4)
+    assert action.steps[0].toJSON() == legacyJSON(action.steps[0], indent=4)
+    assert toJSONDict(action.steps[0].custom_calls[0]) == {'target': 'speech.say', 'args': ['ciao', 1]}
+
+    # the dict is new at every call
+    JSON_dict['steps'][0]['limb_motions']['NECK']['checkpoints'][0]['pose']['target_joints'][0] = 90.0
+    assert action.steps[0].limb_motions['NECK'].checkpoints[0].pose.target_joints[0] == 5.0
+    assert action.toJSONDict() != JSON_dict
+
+
+def test_cached_forms_are_invalidated():
+    action = NodAction()
+    text = action.toJSON()
+    assert action.toJSON() is text
+    assert action.toCanonicalJSON() == canonicalJSON(json.loads(text))
+    assert actionHash(action) == actionHash(json.loads(text))
+    assert not '_serialized_' in text
+
+    action.setName('nod')
+    assert json.loads(action.toJSON())['name'] == 'nod'
+    action.addStep(NodStep())
+    assert len(json.loads(action.toJSON())['steps']) == 2
+
+    manager = ActionsManager()
+    manager.addAction(action, 'nod')
+    hash_before = actionHash(action)
+    action.steps[0].limb_motions['NECK'].checkpoints[0].pose.target_joints = [20.0, 0.0, 0.0]
+    manager.touchAction('nod')
+    assert actionHash(action) != hash_before
+
+    ActionOptimizer(tolerance=1.0).optimizeAction(action)
+    assert len(json.loads(action.toJSON())['steps'][0]['limb_motions']['NECK']['checkpoints']) == len(action.steps[0].limb_motions['NECK'].checkpoints)
+
+
+def test_step_changes_are_detected():
+    action = NodAction()
+    hash_before = actionHash(action)
+    step = action.steps[0]
+
+    step.limb_motions['NECK'].createJointsTrajectory(JointPose(target_joints=[0.0, 0.0, 0.0]), duration=0.5)
+    assert len(json.loads(action.toJSON())['steps'][0]['limb_motions']['NECK']['checkpoints']) == 4
+    step.gaze_motion.addCheckpoint([5.0, 0.0, 0.0])
+    assert len(json.loads(action.toJSON())['steps'][0]['gaze_motion']['checkpoints']) == 2
+    step.createCustomCall('speech.say', ('ciao',))
+    assert len(json.loads(action.toJSON())['steps'][0]['custom_calls']) == 2
+    assert action.toCanonicalJSON() == canonicalJSON(action.toJSONDict())
+
+    # in-place changes need an explicit invalidate()
+    text = action.toJSON()
+    step.limb_motions['NECK'].checkpoints[0].duration = 2.0
+    assert action.toJSON() is text
+    step.limb_motions['NECK'].invalidate()
+    assert json.loads(action.toJSON())['steps'][0]['limb_motions']['NECK']['checkpoints'][0]['duration'] == 2.0
+    assert actionHash(action) != hash_before
+
+    action.steps[0] = pickle.loads(pickle.dumps(NodStep(offset_ms=100)))
+    assert actionHash(action) == hash_before
+
+
+def test_pickle_drops_the_caches():
+    action = NodAction()
+    action.toJSON()
+    copied = pickle.loads(pickle.dumps(action))
+    assert copied._serialized_ == {}
+    assert copied.toJSON() == action.toJSON()
+
+    template = NodTemplate()
+    template.getAction()
+    template.setParam('pitch', 30.0)
+    assert json.loads(template.toJSON())['params'] == {'pitch': 30.0}
+    copied = pickle.loads(pickle.dumps(template))
+    assert copied.cacheInfo()['cached'] == 0
+    assert copied.toJSON() == template.toJSON()
@@ -0,0 +1,101 @@
+"""Unit tests for the content-addressed action store of the helper."""
+
+import json
+
+import pytest
+
+from pyicub.actions import iCubFullbodyAction, iCubFullbodyStep
+from pyicub.controllers.position import JointPose, ICUB_NECK
+from pyicub.store import ActionStore, actionHash
+
+
+class NodStep(iCubFullbodyStep):
+
+    def __init__(self, pitch):
+        self.pitch = pitch
+        iCubFullbodyStep.__init__(self)
+
+    def prepare(self):
+        neck = self.createLimbMotion(ICUB_NECK)
+        neck.createJointsTrajectory(JointPose(target_joints=[self.pitch, 0.0, 0.0]))
+
+
+class NodAction(iCubFullbodyAction):
+
+    def __init__(self, pitch, name):
+        self.pitch = pitch
+        iCubFullbodyAction.__init__(self, name=name)
+
+    def prepare(self):
+        self.addStep(NodStep(self.pitch))
+
+
+def test_canonical_hash():
+    action = NodAction(10.0, 'nod')
+    JSON_dict = json.loads(action.toJSON())
+    reordered = json.loads(json.dumps(dict(reversed(list(JSON_dict.items())))))
+    assert actionHash(action) == actionHash(JSON_dict) == actionHash(reordered)
+    assert actionHash(NodAction(11.0, 'nod')) != actionHash(action)
+
+    store = ActionStore()
+    assert store.missing([actionHash(action)]) == [actionHash(action)]
+    assert store.put(JSON_dict) == actionHash(action)
+    assert store.missing([actionHash(action)]) == [] and len(store) == 1
+
+
+def test_bind_only_changed_actions(fake_icub):
+    actions = [json.loads(NodAction(5.0*i, 'nod%d' % i).toJSON()) for i in range(3)]
+    hashes = [actionHash(a) for a in actions]
+
+    res = fake_icub.bindActions(hashes, name_prefix='app.FSM')
+    assert res == {'missing': hashes, 'action_ids': []}
+    fake_icub.storeActions(actions)
+    res = fake_icub.bindActions(hashes, name_prefix='app.FSM', flush_prefixes=['app.FSM'])
+    assert res['action_ids'] == ['app.FSM.nod0', 'app.FSM.nod1', 'app.FSM.nod2']
+    plan = fake_icub.getActionPlan('app.FSM.nod1')
+
+    # re-configure: nod1 is unchanged, nod2 changed and nod0 removed
+    new = json.loads(NodAction(-5.0, 'nod2').toJSON())
+    hashes = [hashes[1], actionHash(new)]
+    assert fake_icub.missingActions(hashes) == [actionHash(new)]
+    fake_icub.storeActions([new])
+    res = fake_icub.bindActions(hashes, name_prefix='app.FSM', flush_prefixes=['app.FSM'])
+    assert res['action_ids'] == ['app.FSM.nod1', 'app.FSM.nod2']
+    assert sorted(fake_icub.getActions()) == ['app.FSM.nod1', 'app.FSM.nod2']
+    assert fake_icub.getActionPlan('app.FSM.nod1') is plan
+    assert fake_icub.getAction('app.FSM.nod2').steps[0].limb_motions['NECK'].checkpoints[0].pose.target_joints[0] == -5.0
+    assert fake_icub.action_store.info()['reused'] == 1
+
+    # an action replaced by other means is bound again
+    fake_icub.deleteAction('app.FSM.nod1')
+    fake_icub.addAction(NodAction(20.0, 'nod1'), action_id='app.FSM.nod1')
+    fake_icub.bindActions(hashes, name_prefix='app.FSM', flush_prefixes=['app.FSM'])
+    assert fake_icub.getAction('app.FSM.nod1').steps[0].limb_motions['NECK'].checkpoints[0].pose.target_joints[0] == 5.0
+
+
+def test_unbound_actions_are_evicted(fake_icub):
+    actions = [json.loads(NodAction(5.0*i, 'nod%d' % i).toJSON()) for i in range(4)]
+    hashes = [actionHash(a) for a in actions]
+    store = ActionStore(max_unbound=1)
+    store.put(actions[0])
+    store.bind('nod', hashes[0], 1)
+    store.bind('nod.copy', hashes[0], 1)
+    store.put(actions[1])
+    store.put(actions[2])
+    assert store.missing(hashes[:3]) == [hashes[1]]
+
+    # the rebound and unbound actions stay until they are the least recently used unbound ones
+    store.bind('nod', hashes[2], 2)
+    store.unbind('nod.copy')
+    assert store.missing(hashes[:3]) == [hashes[1]]
+    store.put(actions[3])
+    assert store.missing(hashes) == [hashes[0], hashes[1]]
+    assert store.info()['evicted'] == 2 and store.info()['unbound'] == 1
+
+    # the helper releases the actions it deletes or flushes
+    fake_icub.storeActions(actions[:2])
+    fake_icub.bindActions(hashes[:2], name_prefix='app')
+    assert fake_icub.action_store.info()['unbound'] == 0
+    fake_icub.deleteAction('app.nod0')
+    fake_icub.flushActions('app')
+    assert fake_icub.action_store.info()['bindings'] == 0 and fake_icub.action_store.info()['unbound'] == 2
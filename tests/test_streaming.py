@@ -0,0 +1,115 @@
+# BSD 2-Clause License
+#
+# Copyright (c) 2025, Social Cognition in Human-Robot Interaction,
+#                     Istituto Italiano di Tecnologia, Genova
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Unit tests for the trajectory interpolation and the position-direct streaming engine.
+
+The PositionController runs against the in-process fake control board of pyicub.fake.
+"""
+
+import logging
+
+import numpy as np
+import pytest
+
+import pyicub.fake.yarp as fake_yarp
+import pyicub.controllers.position as position
+from pyicub.actions import LimbMotion
+from pyicub.controllers.position import JointPose, ICUB_NECK, ICUB_HEAD
+from pyicub.controllers.streaming import TrajectoryStreamer
+from pyicub.controllers.trajectory import JointsTrajectory, minimumJerk
+
+
+@pytest.fixture
+def neck_ctrl(monkeypatch):
+    monkeypatch.setattr(position, "yarp", fake_yarp, raising=False)
+    fake_yarp.PolyDriver.reset()
+    ctrl = position.PositionController("icubSim", ICUB_NECK, logging.getLogger("test"))
+    assert ctrl.isValid()
+    ctrl.init()
+    yield ctrl
+    fake_yarp.PolyDriver.reset()
+
+
+def test_minimum_jerk_boundaries():
+    s = np.array([0.0, 0.5, 1.0])
+    np.testing.assert_allclose(minimumJerk(s), [0.0, 0.5, 1.0])
+
+
+def test_trajectory_sampling_hits_waypoints():
+    trajectory = JointsTrajectory([0, 1], [0.0, 1.0, 2.0], [[0.0, 0.0], [10.0, -10.0], [20.0, 0.0]])
+    for method in (JointsTrajectory.MINIMUM_JERK, JointsTrajectory.SPLINE):
+        t, q = trajectory.sample(0.01, method=method)
+        assert t[-1] == pytest.approx(2.0)
+        np.testing.assert_allclose(q[0], [0.0, 0.0])
+        np.testing.assert_allclose(q[100], [10.0, -10.0], atol=1e-9)
+        np.testing.assert_allclose(q[-1], [20.0, 0.0])
+
+
+def test_default_sampling_does_not_stop_at_waypoints():
+    trajectory = JointsTrajectory([0], [0.0, 1.0, 2.0], [[0.0], [10.0], [20.0]])
+    t, q = trajectory.sample(0.01)
+    velocity = np.diff(q[:, 0])/0.01
+    assert velocity[100] > 5.0
+    t, q = trajectory.sample(0.01, method=JointsTrajectory.MINIMUM_JERK)
+    assert abs(np.diff(q[:, 0])[100]/0.01) < 0.1
+
+
+def test_trajectory_from_limb_motion_uses_planned_durations():
+    motion = LimbMotion(ICUB_NECK)
+    motion.createJointsTrajectory(JointPose(target_joints=[10.0, 0.0, 0.0]))
+    motion.createJointsTrajectory(JointPose(target_joints=[10.0, 0.0, 0.0]))
+    motion.createJointsTrajectory(JointPose(target_joints=[0.0, 0.0, 0.0]), duration=0.5)
+    trajectory = JointsTrajectory.fromLimbMotion(motion, np.zeros(6))
+
+    # 10 deg at 10 deg/s, the null segment is dropped, then the requested 0.5 s
+    np.testing.assert_allclose(trajectory.times, [0.0, 1.0, 1.5])
+
+
+def test_streamer_plays_limb_motion(neck_ctrl):
+    motion = LimbMotion(ICUB_NECK)
+    motion.createJointsTrajectory(JointPose(target_joints=[5.0, 2.0, -3.0]), duration=0.2)
+    motion.createJointsTrajectory(JointPose(target_joints=[8.0, 0.0, 0.0]), duration=0.1)
+
+    streamer = TrajectoryStreamer(neck_ctrl, period=0.01, method=JointsTrajectory.SPLINE)
+    board = neck_ctrl.PolyDriver.viewIPositionDirect()
+    commands = board.commands
+    stats = streamer.play(motion)
+
+    assert stats.samples == 31
+    assert stats.toJSON()["max_ms"] >= 0.0
+    # a single setPositions per setpoint (not one per joint), plus the control mode switch
+    assert board.commands - commands < 2*stats.samples
+    assert board.getControlMode(0) == fake_yarp.VOCAB_CM_POSITION_DIRECT
+    assert [board.getRefPosition(j) for j in ICUB_NECK.joints_list] == pytest.approx([8.0, 0.0, 0.0])
+
+
+def test_fake_board_is_shared_by_robot_part(neck_ctrl):
+    head_ctrl = position.PositionController("icubSim", ICUB_HEAD, logging.getLogger("test"))
+    head_ctrl.init()
+    assert head_ctrl.PolyDriver.viewIEncoders() is neck_ctrl.PolyDriver.viewIEncoders()
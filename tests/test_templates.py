@@ -0,0 +1,113 @@
+"""Unit tests for the compiled action templates and their cache of instantiated actions."""
+
+import copy
+import json
+
+from pyicub.actions import ActionsManager, iCubActionTemplate, iCubActionTemplateImportedJSON, iCubFullbodyStep, TemplateParameter
+from pyicub.controllers.position import JointPose, ICUB_HEAD
+
+
+class LookStep(iCubFullbodyStep):
+
+    def __init__(self, yaw):
+        self.yaw = yaw
+        iCubFullbodyStep.__init__(self)
+
+    def prepare(self):
+        head = self.createLimbMotion(ICUB_HEAD)
+        head.createJointsTrajectory(JointPose(target_joints=[0.0, 0.0, self.yaw, 0.0, 0.0, 0.0]), duration=1.0)
+
+
+class SayStep(iCubFullbodyStep):
+
+    def __init__(self, msg):
+        self.msg = msg
+        iCubFullbodyStep.__init__(self)
+
+    def prepare(self):
+        self.createCustomCall('speech.say', (self.msg,))
+
+
+class LookAndSay(iCubActionTemplate):
+
+    def prepare_params(self):
+        self.createParam('yaw')
+        self.createParam('msg')
+
+    def prepare(self):
+        self.addStep(LookStep(self.getParam('yaw')))
+        self.addStep(SayStep(self.getParam('msg')))
+
+
+def targets(action):
+    return action.steps[0].limb_motions['HEAD'].checkpoints[0].pose.target_joints
+
+
+def test_slots_and_cache():
+    template = LookAndSay()
+    template.setParam('yaw', 10.0)
+    template.setParam('msg', 'hello')
+    action = template.getAction('look')
+    assert action.name == 'look'
+    assert targets(action)[2] == 10.0
+    assert action.steps[1].custom_calls[0].args == ['hello']
+    # params, the yaw of the step and of its target, the msg of the step and of the call
+    assert template.cacheInfo()['slots'] == 6
+
+    again = template.getAction('look')
+    assert again is not action and again.toJSON() == action.toJSON()
+    template.setParam('yaw', -10.0)
+    other = template.getAction('look')
+    assert targets(other)[2] == -10.0 and targets(action)[2] == 10.0
+    assert template.cacheInfo()['hits'] == 1 and template.cacheInfo()['misses'] == 2
+
+    # neither the compiled template nor the cached dicts are modified through the actions
+    other.steps[0].limb_motions['HEAD'].checkpoints[0].pose.target_joints[0] = 5.0
+    other.steps[1].custom_calls[0].args.append('world')
+    other.setName('changed')
+    assert targets(template.getAction('look'))[0] == 0.0
+    assert template.getAction('look').steps[1].custom_calls[0].args == ['hello']
+    template.setParam('yaw', 0.0)
+    assert targets(template.getAction('look'))[0] == 0.0
+
+    template.addStep(SayStep('bye'))
+    assert template.cacheInfo()['cached'] == 0
+    assert len(template.getAction('look').steps) == 3
+    assert 'cache' not in template.toJSON()
+
+
+def test_lru_eviction():
+    template = LookAndSay()
+    template._cache_.size = 2
+    for yaw in (1.0, 2.0, 3.0):
+        template.setParam('yaw', yaw)
+        template.getAction()
+    info = template.cacheInfo()
+    assert info['cached'] == 2 and info['misses'] == 3
+
+
+def test_imported_template_is_not_mutated():
+    JSON_dict = json.loads(LookAndSay().toJSON())
+    template = ActionsManager().importTemplateFromJSONDict(JSON_dict=copy.deepcopy(JSON_dict))
+    assert isinstance(template, iCubActionTemplateImportedJSON)
+
+    template.setParams([TemplateParameter('yaw', 30.0), TemplateParameter('msg', 'hi')])
+    assert targets(template.getAction())[2] == 30.0
+    template.setParams([TemplateParameter('yaw', 40.0)])
+    assert targets(template.getAction())[2] == 40.0
+    assert template._json_dict_ == JSON_dict
+
+
+class ClampedLookAndSay(LookAndSay):
+
+    def setParam(self, name, value):
+        if name == 'yaw':
+            value = max(-20.0, min(20.0, value))
+        LookAndSay.setParam(self, name, value)
+
+
+def test_set_params_uses_set_param_overrides():
+    template = ClampedLookAndSay()
+    template.setParams([TemplateParameter('yaw', 45.0), TemplateParameter('msg', 'hi')])
+    assert template.getParam('yaw') == 20.0 and template.getParam('msg') == 'hi'
+    assert targets(template.getAction())[2] == 20.0
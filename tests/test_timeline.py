@@ -0,0 +1,86 @@
+"""Unit tests for the single-thread timeline scheduler and the step offsets of the compiled actions."""
+
+import threading
+import time
+
+import pytest
+
+from pyicub.actions import iCubFullbodyAction, iCubFullbodyStep
+from pyicub.core.timeline import TimelineScheduler
+
+
+class CallStep(iCubFullbodyStep):
+
+    def __init__(self, label, offset_ms):
+        self.label = label
+        iCubFullbodyStep.__init__(self, offset_ms=offset_ms)
+
+    def prepare(self):
+        self.createCustomCall('recorder.append', (self.label,))
+
+
+class OverlappingAction(iCubFullbodyAction):
+
+    def prepare(self):
+        for i in range(20):
+            self.addStep(CallStep(i, offset_ms=300 - 10*i), wait_for_completed=False)
+
+
+@pytest.fixture
+def timeline():
+    timeline = TimelineScheduler()
+    yield timeline
+    timeline.stop()
+
+
+def test_events_fire_in_deadline_order(timeline):
+    fired = []
+    events = [timeline.schedule(delay, fired.append, delay, name=str(delay)) for delay in (0.06, 0.02, 0.04)]
+    cancelled = timeline.schedule(0.03, fired.append, 'cancelled')
+    assert timeline.cancel(cancelled)
+    for event in events:
+        assert event.wait(1.0)
+    assert fired == [0.02, 0.04, 0.06]
+    assert all(event.lateness >= 0.0 for event in events)
+
+    info = timeline.info()
+    assert info['fired'] == 3 and info['cancelled'] == 1 and info['pending'] == 0
+    assert info['lateness_max_ms'] < 50.0
+    assert not timeline.cancel(events[0])
+
+
+def test_failing_callback_does_not_stop_the_timeline(timeline):
+    failing = timeline.schedule(0.0, lambda: 1/0)
+    event = timeline.schedule(0.01, lambda: 'ok')
+    assert event.wait(1.0) and event.retval == 'ok'
+    assert 'ZeroDivisionError' in failing.exception
+
+
+def test_overlapping_step_offsets(fake_icub):
+    threads = threading.active_count()
+    fake_icub.timeline.resetStats()
+    req = fake_icub.runAction(OverlappingAction(), wait_for_completed=False)
+    time.sleep(0.05)
+    # nothing is due yet: only the action request and the timeline threads are alive
+    assert fake_icub.recorder == []
+    assert threading.active_count() - threads <= 4
+    req.wait_for_completed()
+
+    assert fake_icub.recorder == list(reversed(range(20)))
+    info = fake_icub.timeline.info()
+    # a step event and a custom calls event per step
+    assert info['fired'] == 40
+    assert info['lateness_p99_ms'] < 50.0
+
+
+def test_move_steps_offsets_on_the_timeline(fake_icub):
+    fake_icub.timeline.resetStats()
+    steps = [CallStep(i, offset_ms=60 - 30*i) for i in range(3)]
+    fake_icub.moveSteps(steps, [False, False, False], '/steps', offset_ms=20)
+    assert fake_icub.recorder == [2, 1, 0]
+    assert fake_icub.timeline.info()['fired'] == 3
+
+    t0 = time.perf_counter()
+    fake_icub.moveStep(CallStep('direct', offset_ms=50))
+    assert time.perf_counter() - t0 >= 0.05
+    assert fake_icub.recorder[-1] == 'direct' and fake_icub.timeline.info()['fired'] == 4
@@ -0,0 +1,81 @@
+"""Unit tests for the tracing spans, their propagation through the request manager and the Chrome trace export."""
+
+import logging
+
+import pytest
+
+from pyicub.controllers.position import JointPose, ICUB_NECK
+from pyicub.core.tracing import Tracer, traced
+from pyicub.requests import iCubRequestsManager
+
+
+@pytest.fixture
+def tracer():
+    tracer = Tracer()
+    tracer.clear()
+    tracer.configure(sample_rate=1.0)
+    yield tracer
+    tracer.configure(sample_rate=0.0)
+    tracer.clear()
+
+
+def test_nested_spans(tracer):
+    with tracer.span('root', tag='/a') as root:
+        with tracer.span('child', tag='/a/b') as child:
+            assert Tracer.current() is child
+    spans = {s.name: s for s in tracer.spans}
+    assert spans['child'].parent_id == root.span_id
+    assert spans['child'].trace_id == root.span_id
+    assert spans['root'].parent_id is None
+    assert spans['root'].duration >= spans['child'].duration
+
+
+def test_sampling_skips_whole_traces(tracer):
+    tracer.configure(sample_rate=0.0)
+    with tracer.span('root') as root:
+        assert root is None
+    tracer.configure(sample_rate=1e-9)
+    with tracer.span('root') as root:
+        with tracer.span('child') as child:
+            assert root is None and child is None
+    assert tracer.spans == []
+
+
+def test_spans_propagate_through_requests(tracer):
+    manager = iCubRequestsManager(logging.getLogger("test.tracing"))
+
+    @traced('work', tag_arg='name')
+    def work(name):
+        return Tracer.current().parent_id
+
+    with tracer.span('root') as root:
+        req = manager.create(timeout=5.0, target=work, name='/root/work')
+        manager.run_request(req, True, 'w')
+    assert req.retval == root.span_id
+    assert [s.tag for s in tracer.spans if s.name == 'work'] == ['w']
+
+
+def test_action_trace_export(tracer, fake_icub, tmp_path):
+    from pyicub.actions import iCubFullbodyAction, iCubFullbodyStep
+
+    class NodStep(iCubFullbodyStep):
+        def prepare(self):
+            neck = self.createLimbMotion(ICUB_NECK)
+            neck.createJointsTrajectory(JointPose(target_joints=[20.0, 0.0, 0.0]), duration=0.2)
+
+    class NodAction(iCubFullbodyAction):
+        def prepare(self):
+            self.addStep(NodStep())
+
+    fake_icub.runAction(NodAction())
+    spans = {s.name: s for s in tracer.spans}
+    assert spans['runAction'].tag == '/NodAction'
+    assert spans['moveSteps'].parent_id == spans['runAction'].span_id
+    assert spans['moveStep'].parent_id == spans['moveSteps'].span_id
+    assert spans['movePart'].parent_id == spans['moveStep'].span_id
+
+    trace = tracer.toChromeTrace(trace_id=spans['runAction'].trace_id)
+    events = [e for e in trace['traceEvents'] if e['ph'] == 'X']
+    assert len(events) == 4
+    assert all(e['dur'] >= 0.0 for e in events)
+    tracer.exportChromeTrace(str(tmp_path / 'trace.json'))